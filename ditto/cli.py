@@ -10,6 +10,7 @@ import click
 
 from . import version
 from .converter import Converter
+from .fleet_converter import FleetConverter
 
 try:
     from .metric_computer import MetricComputer
@@ -90,13 +91,31 @@ def list(ctx, readers, writers):
     required=True,
     help="Metrics output directory",
 )
-@click.option("--to", help="Format for the metrics output file. xlsx or json")
+@click.option(
+    "--to", help="Format for the metrics output file. xlsx, json, parquet or csv"
+)
 @click.option(
     "--feeder",
     default=True,
     type=bool,
     help="If True computes metrics per feeder. Otherwise, compute metrics at the system level.",
 )
+@click.option(
+    "--jobs",
+    default=1,
+    type=int,
+    help="Number of processes used to compute the metrics per feeder. 0 uses all the CPUs.",
+)
+@click.option(
+    "--partition_by",
+    multiple=True,
+    help="Column used to partition the parquet or csv metrics table (ex: substation_name). Can be repeated.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Record the time spent in each metric and write it to metrics_profile.csv in the output directory.",
+)
 @click.pass_context
 def metric(ctx, **kwargs):
     """Compute metrics"""
@@ -115,6 +134,9 @@ def metric(ctx, **kwargs):
         output_format=kwargs["to"],
         output_path=kwargs["output"],
         by_feeder=kwargs["feeder"],
+        jobs=kwargs["jobs"] or None,
+        partition_by=kwargs["partition_by"],
+        profile=kwargs["profile"],
     ).compute()
 
 
@@ -123,7 +145,8 @@ def metric(ctx, **kwargs):
     "--input",
     type=click.Path(exists=True),
     required=True,
-    help="Path to input file",
+    multiple=True,
+    help="Path to input file. Repeat the option to convert several feeders, each one in output/feeder_name",
 )
 @click.option(
     "--output",
@@ -145,6 +168,12 @@ def metric(ctx, **kwargs):
 @click.option(
     "--warehouse", type=click.Path(exists=True), help="Path to synergi warehouse file"
 )
+@click.option(
+    "--jobs",
+    default=1,
+    type=int,
+    help="Number of processes used to convert the feeders, or to read the files of a single CYME feeder or the tables of a single Synergi feeder. 0 uses all the CPUs.",
+)
 @click.pass_context
 def convert(ctx, **kwargs):
     """ Convert from one type to another"""
@@ -170,17 +199,52 @@ def convert(ctx, **kwargs):
         json_path = False
         registered_json_writer_class = None
 
-    Converter(
+    # A single feeder is converted in this process: the files of a CYME feeder, or the tables of a Synergi feeder, are read in parallel by the reader itself
+    if len(kwargs["input"]) == 1:
+        Converter(
+            registered_reader_class=_load(registered_readers, kwargs["from"]),
+            registered_writer_class=_load(registered_writers, kwargs["to"]),
+            input_path=kwargs["input"][0],
+            output_path=kwargs["output"],
+            json_path=json_path,
+            registered_json_writer_class=registered_json_writer_class,
+            default_values_json=kwargs["default_values"],
+            remove_opendss_default_values_flag=kwargs["remove_opendss_default_values"],
+            synergi_warehouse_path=kwargs["warehouse"],
+            reader_jobs=kwargs["jobs"] or None,
+        ).convert()
+        return
+
+    if kwargs["jsonize"] is not None:
+        raise click.BadOptionUsage(
+            "jsonize", "Cannot serialize the DiTTo representation of several feeders"
+        )
+
+    summaries = FleetConverter(
         registered_reader_class=_load(registered_readers, kwargs["from"]),
         registered_writer_class=_load(registered_writers, kwargs["to"]),
-        input_path=kwargs["input"],
+        input_paths=kwargs["input"],
         output_path=kwargs["output"],
-        json_path=json_path,
-        registered_json_writer_class=registered_json_writer_class,
+        jobs=kwargs["jobs"] or None,
         default_values_json=kwargs["default_values"],
         remove_opendss_default_values_flag=kwargs["remove_opendss_default_values"],
         synergi_warehouse_path=kwargs["warehouse"],
+        progress=lambda done, total, summary: click.echo(
+            "[{}/{}] {}: {}".format(
+                done,
+                total,
+                summary["feeder"],
+                "failed" if summary["error"] is not None else summary["output"],
+            )
+        ),
     ).convert()
+    failed = [
+        summary["feeder"] for summary in summaries if summary["error"] is not None
+    ]
+    if len(failed) > 0:
+        raise click.ClickException(
+            "Unable to convert the feeders: {}".format(", ".join(failed))
+        )
 
 
 if __name__ == "__main__":
@@ -1,6 +1,5 @@
 
-import networkx as nx
-from ditto.network.network import Network
+from ditto.network.multi_source import MultiSourceTopology
 from ditto.models.power_source import PowerSource
 from ditto.models.load import Load
 
@@ -11,9 +10,11 @@ Parameters:
         The DiTTo storage object with the full network representation
     verbose: boolean
         Whether to print information about which nodes caused problems
+    topology: ditto.network.multi_source.MultiSourceTopology
+        Topology of the model shared between the checks. Built from the model if not provided
 
 """
-def check_loads_connected(model,verbose=True):
+def check_loads_connected(model,verbose=True,topology=None):
     all_sources = []
     all_loads = set()
     load_source_map = {}
@@ -32,19 +33,11 @@ def check_loads_connected(model,verbose=True):
         print('Model does not contain any power source')
         return False
     
-    for source in all_sources:
-        ditto_graph = Network()
-        ditto_graph.build(model,source.connecting_element)
-        ditto_graph.set_attributes(model)
-        ditto_graph.remove_open_switches(model) # This deletes the switches inside the networkx graph only
-        source_name = source.connecting_element
-        all_paths = nx.single_source_shortest_path(ditto_graph.graph,source_name)
-        
-        for load in all_loads:
-            min_dist = float('inf')
-            load_connection = load.connecting_element
-            if load_connection in all_paths:
-                load_source_map[load.name].append(source_name)
+    if topology is None:
+        topology = MultiSourceTopology(model)
+
+    for load in all_loads:
+        load_source_map[load.name] = list(topology.reachable_sources(load.connecting_element))
 
 
     result = True
@@ -56,7 +49,7 @@ def check_loads_connected(model,verbose=True):
             sourceless_loads.append(load)
         if len(load_source_map[load]) >1:
             result = False 
-            multi_source_loads[load.name] = load_source_map[load]
+            multi_source_loads[load] = load_source_map[load]
 
     if verbose:
         if len(sourceless_loads) > 0:
@@ -67,7 +60,7 @@ def check_loads_connected(model,verbose=True):
         if len(multi_source_loads)> 0:
             print('Loads with multiple sources:')
             for load in multi_source_loads:
-                print(load+ ': ' +multi_source_loads[load])
+                print(load+ ': ' +', '.join(multi_source_loads[load]))
 
     return result
 
@@ -1,5 +1,4 @@
-import networkx as nx
-from ditto.network.network import Network
+from ditto.network.multi_source import MultiSourceTopology
 from ditto.models.power_source import PowerSource
 from ditto.models.load import Load
 
@@ -11,35 +10,22 @@ Parameters:
         The DiTTo storage object with the full network representation
     verbose: boolean
         Whether to print information about which nodes caused problems
+    topology: ditto.network.multi_source.MultiSourceTopology
+        Topology of the model shared between the checks. Built from the model if not provided
 """
 
-def check_loops(model, verbose=True):
-    all_sources = []
-    for i in model.models:
-        if isinstance(i,PowerSource) and i.connecting_element is not None:
-            all_sources.append(i)
-        elif isinstance(i,PowerSource):
-            print('Warning - a PowerSource element has a None connecting element')
+def check_loops(model, verbose=True, topology=None):
+    if topology is None:
+        topology = MultiSourceTopology(model)
 
-    # TODO: Address issue in network.py where a single source is used to determine bfs order
-    if len(all_sources) == 0:
-        raise('Model does not contain any power source. Required to build networkx graph')
-
-    for source in all_sources:
-        print('Checking loops for source '+source.name)
-        ditto_graph = Network()
-        ditto_graph.build(model,source.connecting_element)
-        ditto_graph.set_attributes(model)
-        ditto_graph.remove_open_switches(model) # This deletes the switches inside the networkx graph only
-    
-        loops = nx.cycle_basis(ditto_graph.graph)
-        number_of_loops = len(loops)
-        if number_of_loops > 0:
-            if verbose:
-                print('Loops found:')
-                print(loops)
-        if number_of_loops == 0:
-            return True
-    return False
+    print('Checking loops for sources '+', '.join(topology.sources))
+    loops = topology.loops()
+    number_of_loops = len(loops)
+    if number_of_loops > 0:
+        if verbose:
+            print('Loops found:')
+            print([loop.nodes for loop in loops])
+        return False
+    return True
 
 
@@ -1,6 +1,4 @@
-import networkx as nx
-from itertools import islice
-from ditto.network.network import Network
+from ditto.network.multi_source import MultiSourceTopology
 from ditto.models.power_source import PowerSource
 from ditto.models.load import Load
 from ditto.models.powertransformer import PowerTransformer
@@ -16,9 +14,11 @@ Parameters:
         Flag for whether to show all the loads that have problems, or just the first one that's found. Used in conjunction with verbose
     verbose: boolean
         Whether to print information about which nodes caused problems
+    topology: ditto.network.multi_source.MultiSourceTopology
+        Topology of the model shared between the checks. Built from the model if not provided
 
 """
-def check_unique_path(model, needs_transformers=False, show_all=False, verbose =True):
+def check_unique_path(model, needs_transformers=False, show_all=False, verbose =True, topology=None):
     all_sources = []
     all_transformers = set()
     all_loads = set()
@@ -34,8 +34,6 @@ def check_unique_path(model, needs_transformers=False, show_all=False, verbose =
         if isinstance(i,Load):
             all_loads.add(i)
 
-    if len(all_sources) > 1:
-        print('Warning - using first source to orient the network')
     if len(all_sources) == 0:
         print('Model does not contain any power source')
         return False
@@ -45,36 +43,25 @@ def check_unique_path(model, needs_transformers=False, show_all=False, verbose =
 
     for load in all_loads:
         load_transformer_map[load.name] = []
-    for source in all_sources:
-        ditto_graph = Network()
-        ditto_graph.build(model,source.connecting_element)
-        ditto_graph.set_attributes(model)
-        ditto_graph.remove_open_switches(model) # This deletes the switches inside the networkx graph only
-        source_name = source.connecting_element
-        break_load = False
-        for load in all_loads:
-            
-            ### check there is a unique path from each load to the source
-            two_paths = nx.all_simple_paths(ditto_graph.graph, source_name, load.name) # Warning - this can take a very long time if the graph is has large numbers of loops (shouldn't hold for distribution systems)
-            num_paths = 0
-            if break_load:
-                break
-            for candidate in two_paths:
-                num_paths +=1
-                if num_paths > 1:
-                    print('Multiple paths from load '+load.name+' to '+source_name)
-                    result = False
-                    if not show_all:
-                        break_load = True
-                    all_bad_loads.append((">1",load.name))
-                    break
-            if num_paths == 0:
-                print('No path from load '+load.name+' to ' + source_name)
-                if not show_all:
-                    break_load = True
-                all_bad_loads.append(("0",load.name))
-                result = False
-                break
+    if topology is None:
+        topology = MultiSourceTopology(model)
+
+    for load in all_loads:
+        ### check there is a unique path from each load to its source
+        # The path is unique if all the edges between the source and the load are bridges of the graph
+        source_name = topology.source_of(load.name)
+        if source_name is None:
+            print('No path from load '+load.name+' to any source')
+            all_bad_loads.append(("0",load.name))
+            result = False
+        elif not topology.has_unique_path(load.name):
+            print('Multiple paths from load '+load.name+' to '+source_name)
+            all_bad_loads.append((">1",load.name))
+            result = False
+        else:
+            continue
+        if not show_all:
+            break
     if verbose:
         if show_all and len(all_bad_loads) >0:
             print('All bad loads:')
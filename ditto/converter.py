@@ -97,6 +97,9 @@ class Converter(object):
         else:
             self.synergi_warehouse_path = None
 
+        # Number of workers used by the CYME reader to read its files, or by the Synergi reader to export its tables. None uses all the CPUs
+        self.reader_jobs = kwargs.get("reader_jobs", 1)
+
         self.verbose = verbose
 
         self.m = Store()
@@ -130,6 +133,7 @@ class Converter(object):
                 "network_filename": "network.txt",
                 "equipment_filename": "equipment.txt",
                 "load_filename": "loads.txt",
+                "jobs": self.reader_jobs,
             }
 
         # GRIDLABD
@@ -148,6 +152,7 @@ class Converter(object):
             inputs = {
                 "input_file": os.path.abspath(feeder),
                 "warehouse": "warehouse.mdb",
+                "jobs": self.reader_jobs,
             }
 
         # DEW
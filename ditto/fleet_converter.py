@@ -0,0 +1,328 @@
+import os
+import io
+import pickle
+import time
+import traceback
+import zlib
+
+import logging
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .store import Store
+from .converter import Converter
+
+logger = logging.getLogger(__name__)
+
+
+class _StorePickler(pickle.Pickler):
+    """
+    Pickler of the objects of a model. The objects keep a reference to their Store,
+    which is replaced by a persistent id such that the Store itself is not serialized.
+    """
+
+    def __init__(self, file, model):
+        super(_StorePickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._store = model
+
+    def persistent_id(self, obj):
+        if obj is self._store:
+            return "model"
+        return None
+
+
+class _StoreUnpickler(pickle.Unpickler):
+    """Unpickler of the serialized objects. The Store reference is restored as the given model."""
+
+    def __init__(self, file, model):
+        super(_StoreUnpickler, self).__init__(file)
+        self._store = model
+
+    def persistent_load(self, pid):
+        return self._store
+
+
+def serialize_models(model):
+    """Returns the objects of a model as compressed bytes (See load_models)."""
+    buffer = io.BytesIO()
+    _StorePickler(buffer, model).dump(list(model.models))
+    return zlib.compress(buffer.getvalue(), 1)
+
+
+# Attributes of the objects which hold the name of another object of the feeder
+_REFERENCES = (
+    "from_element",
+    "to_element",
+    "connecting_element",
+    "connected_transformer",
+    "measuring_element",
+    "upstream_transformer_name",
+    "headnode",
+    "transformer",
+    "substation",
+    "substation_name",
+    "feeder_name",
+)
+
+
+def namespace_models(objects, prefix):
+    """
+    Prefixes the names of the objects of a feeder, and the references to these names, with prefix_
+    such that the objects of several feeders can be added to the same Store.
+    """
+    names = set(getattr(obj, "name", None) for obj in objects) - {None, ""}
+    for obj in objects:
+        for attribute in ("name",) + _REFERENCES:
+            value = getattr(obj, attribute, None)
+            if isinstance(value, str) and value in names:
+                setattr(obj, attribute, "{}_{}".format(prefix, value))
+
+
+def load_models(payload, model, prefix=None):
+    """
+    Adds the objects serialized by serialize_models to the model. Returns the number of objects added.
+    The names of the objects are prefixed if a prefix is given (See namespace_models).
+    """
+    objects = _StoreUnpickler(io.BytesIO(zlib.decompress(payload)), model).load()
+    if prefix is not None:
+        namespace_models(objects, prefix)
+    model.model_store.extend(objects)
+    return len(objects)
+
+
+def feeder_names(input_paths):
+    """
+    Returns a unique name for each input: the name of the file (or folder) without extension,
+    or the name of its directory when several inputs have the same file name (ex: master.dss).
+    """
+    names = [
+        os.path.splitext(os.path.basename(os.path.normpath(p)))[0] for p in input_paths
+    ]
+    names = [
+        (
+            os.path.basename(os.path.dirname(os.path.abspath(path)))
+            if names.count(name) > 1
+            else name
+        )
+        for name, path in zip(names, input_paths)
+    ]
+    unique = []
+    for k, name in enumerate(names):
+        if names.count(name) > 1:
+            name = "{}_{}".format(name, names[:k].count(name))
+        unique.append(name)
+    return unique
+
+
+def _convert_feeder(task):
+    """
+    Worker function of the fleet conversion: parses one feeder in a worker process.
+    Writes the feeder if an output path is given, or returns its objects serialized otherwise.
+    Returns the index of the feeder, the serialized objects (or None) and a summary of the conversion.
+    """
+    (
+        index,
+        name,
+        input_path,
+        output_path,
+        reader_class,
+        writer_class,
+        format_names,
+        kwargs,
+    ) = task
+    # The format names are set on the classes by the CLI, which is not run in the worker processes
+    reader_class.format_name = format_names[0]
+    if writer_class is not None:
+        writer_class.format_name = format_names[1]
+    summary = {
+        "feeder": name,
+        "input": input_path,
+        "output": output_path,
+        "objects": None,
+        "parse_time": None,
+        "write_time": None,
+        "error": None,
+    }
+    payload = None
+    try:
+        converter = Converter(
+            reader_class, writer_class, input_path, output_path, verbose=False, **kwargs
+        )
+        if converter._from == "opendss":
+            # OpenDSS holds one circuit per process: clear the previous feeder of this worker
+            import opendssdirect as dss
+
+            dss.run_command("clear")
+        converter.configure_reader(converter.get_inputs(input_path))
+        start = time.time()
+        converter.reader.parse(converter.m)
+        summary["parse_time"] = time.time() - start
+        summary["objects"] = len(converter.m.models)
+        if output_path is not None:
+            if not os.path.exists(output_path):
+                os.makedirs(output_path)
+            converter.configure_writer(converter.get_output(output_path))
+            start = time.time()
+            converter.writer.write(converter.m)
+            summary["write_time"] = time.time() - start
+        else:
+            payload = serialize_models(converter.m)
+    except Exception:
+        summary["error"] = traceback.format_exc()
+    return index, payload, summary
+
+
+class FleetConverter(Converter):
+    """
+    Converts or parses a list of feeders, each feeder being parsed in its own worker process.
+
+    The OpenDSS reader holds a single circuit per process (OpenDSSDirect has one global circuit),
+    so the feeders of a fleet can only be read in parallel in separate processes.
+
+    **Usage:**
+
+    Writing the feeders from the worker processes (one output folder per feeder in output_path):
+
+    >>> FleetConverter(Reader, Writer, ['a/master.dss', 'b/master.dss'], './outputs', jobs=4).convert()
+
+    Parsing the feeders in memory:
+
+    >>> fleet = FleetConverter(Reader, None, ['a/master.dss', 'b/master.dss'], None, jobs=4)
+    >>> fleet.parse()
+    >>> fleet.models['a']
+
+    With merge=True, the objects of all the feeders are added to a single Store, fleet.m.
+    The feeders usually share names (ex: sourcebus), so the names of the objects are prefixed
+    with the name of their feeder (ex: ieee_13node_sourcebus).
+
+    .. note::
+        - The feeders are serialized (compressed pickle of the objects, without the Store) to be sent back
+          from the workers, and loaded one at a time in the parent process.
+        - At most max_pending feeders (twice the number of workers by default) are submitted at once,
+          which bounds the memory used by the results waiting to be loaded.
+        - The progress is logged after each feeder, and given to the progress callback if any:
+          progress(number of feeders done, number of feeders, summary of the feeder).
+        - A feeder which cannot be converted does not stop the fleet: the error is logged and kept in its summary.
+    """
+
+    def __init__(
+        self,
+        registered_reader_class,
+        registered_writer_class,
+        input_paths,
+        output_path,
+        verbose=True,
+        jobs=None,
+        merge=False,
+        max_pending=None,
+        progress=None,
+        **kwargs
+    ):
+        """FleetConverter class CONSTRUCTOR."""
+        self.input_paths = list(input_paths)
+        self.feeder_names = feeder_names(self.input_paths)
+        self.jobs = jobs
+        self.merge = merge
+        self.max_pending = max_pending
+        self.progress = progress
+        self.kwargs = kwargs
+        # Parsed models by feeder name (parse without merge)
+        self.models = {}
+        # Summary of the conversion of each feeder, in the order of the inputs
+        self.summaries = []
+        # Call super
+        super(FleetConverter, self).__init__(
+            registered_reader_class,
+            registered_writer_class,
+            self.input_paths[0],
+            output_path,
+            verbose=verbose,
+            **kwargs
+        )
+
+    def convert(self):
+        """Converts all the feeders, each worker writing its feeder in output_path/feeder_name."""
+        if self.writer_class is None:
+            raise ValueError("Cannot convert the fleet without a writer class.")
+        return self._run(write=True)
+
+    def parse(self):
+        """Parses all the feeders in memory (See models and m)."""
+        return self._run(write=False)
+
+    def _tasks(self, write):
+        """Yields the tasks of the worker processes."""
+        format_names = (
+            self._from,
+            self._to if self.writer_class is not None else None,
+        )
+        for index, (name, input_path) in enumerate(
+            zip(self.feeder_names, self.input_paths)
+        ):
+            output_path = os.path.join(self.output_path, name) if write else None
+            yield (
+                index,
+                name,
+                input_path,
+                output_path,
+                self.reader_class,
+                self.writer_class if write else None,
+                format_names,
+                self.kwargs,
+            )
+
+    def _run(self, write):
+        """Runs the tasks in a pool of worker processes. Returns the summaries of the feeders."""
+        total = len(self.input_paths)
+        summaries = [None] * total
+        max_workers = self.jobs if self.jobs else os.cpu_count()
+        max_pending = self.max_pending or 2 * max_workers
+        tasks = self._tasks(write)
+        done = 0
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for task in tasks:
+                pending.add(executor.submit(_convert_feeder, task))
+                if len(pending) >= max_pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        done += 1
+                        self._collect(future.result(), summaries, done, total)
+            for future in pending:
+                done += 1
+                self._collect(future.result(), summaries, done, total)
+        self.summaries = summaries
+        if self.merge and not write:
+            self.m.set_names()
+        return summaries
+
+    def _collect(self, result, summaries, done, total):
+        """Loads the objects of a feeder and reports the progress."""
+        index, payload, summary = result
+        summaries[index] = summary
+        if payload is not None:
+            if self.merge:
+                load_models(payload, self.m, prefix=summary["feeder"])
+            else:
+                model = Store()
+                load_models(payload, model)
+                model.set_names()
+                self.models[summary["feeder"]] = model
+        if summary["error"] is not None:
+            logger.error(
+                "Unable to convert feeder {} ({}):\n{}".format(
+                    summary["feeder"], summary["input"], summary["error"]
+                )
+            )
+        else:
+            logger.info(
+                "Feeder {}/{} {}: {} objects parsed in {:.2f}s".format(
+                    done,
+                    total,
+                    summary["feeder"],
+                    summary["objects"],
+                    summary["parse_time"],
+                )
+            )
+        if self.progress is not None:
+            self.progress(done, total, summary)
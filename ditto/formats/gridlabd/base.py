@@ -5,20 +5,25 @@ from builtins import super, range, zip, round, map
 class GridLABDBase(object):
 
     _properties = []
+    # Properties of the class and of its parents, and their names, computed once per class
+    _all_properties = []
+    _property_names = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._all_properties = [
+            p
+            for c in cls.mro()
+            if c != object
+            for p in c.__dict__.get("_properties", [])
+        ]
+        cls._property_names = frozenset(p["name"] for p in cls._all_properties)
 
     def __init__(self, *args, **kwargs):
 
-        for p in self._build_properties():
-            self._properties = self._properties + p
-
         for k, v in kwargs.items():
             self[k] = v
 
-    def _build_properties(self):
-        for c in self.__class__.mro():
-            if c != self.__class__ and c != object:
-                yield c._properties
-
     def __getitem__(self, k):
         try:
             return getattr(self, "_{}".format(k))
@@ -28,7 +33,7 @@ class GridLABDBase(object):
             )
 
     def __setitem__(self, k, v):
-        if k not in [p["name"] for p in self._properties]:
+        if k not in self._property_names:
             raise AttributeError(
                 "Unable to set {} with {} on {}".format(k, v, self.__class__.__name__)
             )
@@ -8,6 +8,7 @@ import logging
 from .store import Store
 from .converter import Converter
 from .metrics.network_analysis import NetworkAnalyzer as network_analyzer
+from .metrics.profiling import MetricProfiler, profile_section
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +24,18 @@ class MetricComputer(Converter):
         output_path,
         by_feeder,
         verbose=True,
+        jobs=1,
+        partition_by=None,
+        profile=False,
         **kwargs
     ):
         """MetricComputer class CONSTRUCTOR."""
         self.by_feeder = by_feeder
+        self.jobs = jobs
         self.output_format = output_format
+        self.partition_by = list(partition_by) if partition_by else None
+        # Timing of the parsing and of the metrics (See NetworkAnalyzer.enable_profiling)
+        self.profiler = MetricProfiler() if profile else None
         # Call super
         super(MetricComputer, self).__init__(
             registered_reader_class,
@@ -49,15 +57,19 @@ class MetricComputer(Converter):
         inputs = self.get_inputs(self.feeder)
 
         self.configure_reader(inputs)
-        self.reader.parse(self.m)
+        with profile_section(self.profiler, "parse"):
+            self.reader.parse(self.m)
 
-        self.net = network_analyzer(self.m)
+        with profile_section(self.profiler, "build_network"):
+            self.net = network_analyzer(self.m)
+        if self.profiler is not None:
+            self.net.enable_profiling(self.profiler)
         self.net.model.set_names()
         # If we compute the metrics per feeder, we need to have the objects taged with their feeder_names
         if self.by_feeder:
             # Split the network into feeders (assumes objects have been taged)
             self.net.split_network_into_feeders()
-            self.net.compute_all_metrics_per_feeder()
+            self.net.compute_all_metrics_per_feeder(jobs=self.jobs)
         else:
             self.net.compute_all_metrics()
 
@@ -66,3 +78,19 @@ class MetricComputer(Converter):
             self.net.export_json(os.path.join(self.output_path, "metrics.json"))
         elif self.output_format.lower() in ["xlsx", "excel", "xls"]:
             self.net.export(os.path.join(self.output_path, "metrics.xlsx"))
+        elif self.output_format.lower() in ["parquet", "csv"]:
+            # Appends one part to the metrics table of the output directory
+            self.net.export_table(
+                os.path.join(self.output_path, "metrics"),
+                output_format=self.output_format.lower(),
+                partition_by=self.partition_by,
+            )
+
+        if self.profiler is not None:
+            profile_path = os.path.join(self.output_path, "metrics_profile.csv")
+            self.profiler.export(profile_path)
+            logger.info(
+                "Metric timings written to {p}:\n{r}".format(
+                    p=profile_path, r=self.profiler.report().head(20).to_string()
+                )
+            )
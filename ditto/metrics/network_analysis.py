@@ -3,12 +3,17 @@
 from __future__ import absolute_import, division, print_function
 from builtins import super, range, zip, round, map
 
+import io
 import logging
 import math
+import os
+import pickle
 import time
+import uuid
 import logging
 import json
 import json_tricks
+from concurrent.futures import ProcessPoolExecutor
 from six import string_types
 
 import networkx as nx
@@ -18,6 +23,8 @@ import pandas as pd
 from scipy.spatial import ConvexHull
 
 from ditto.network.network import Network
+from ditto.network.aggregation import DownstreamAggregator
+from ditto.metrics.profiling import MetricProfiler, profile_section, profiled
 from ditto.models.regulator import Regulator
 from ditto.models.line import Line
 from ditto.models.capacitor import Capacitor
@@ -25,6 +32,7 @@ from ditto.models.load import Load
 from ditto.models.powertransformer import PowerTransformer
 from ditto.models.node import Node
 from ditto.models.power_source import PowerSource
+from ditto.models.base import DiTToHasTraits
 from ditto.modify.system_structure import system_structure_modifier
 
 from ..readers.abstract_reader import AbstractReader
@@ -32,6 +40,229 @@ from ..readers.abstract_reader import AbstractReader
 logger = logging.getLogger(__name__)
 
 
+class _FeederPickler(pickle.Pickler):
+    """
+    Pickler used to ship the objects of a feeder to a worker process.
+    DiTTo objects keep a reference to their Store, which is replaced by a persistent id
+    such that the rest of the model is not serialized with them.
+    """
+
+    def __init__(self, file, model):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._store = model
+
+    def persistent_id(self, obj):
+        if obj is self._store:
+            return "model"
+        return None
+
+
+class _FeederUnpickler(pickle.Unpickler):
+    """Unpickler of the feeder payloads. The Store reference is restored as None."""
+
+    def persistent_load(self, pid):
+        return None
+
+
+class _FeederModel(object):
+    """
+    Minimal stand-in for the Store in the worker processes.
+    Holds the objects of a single feeder (and the objects they reference) and the lookup by name.
+    """
+
+    def __init__(self, models):
+        self.models = models
+        self._model_names = {
+            obj.name: obj
+            for obj in models
+            if hasattr(obj, "name") and obj.name is not None
+        }
+
+    def __getitem__(self, name):
+        return self._model_names[name]
+
+
+# Traits which do not change the metrics (See NetworkAnalyzer.refresh)
+_UNTRACKED_TRAITS = set(["response", "feeder_name", "substation_name"])
+_TRACKED_TRAITS = {}
+
+# Attributes defining the connections of the objects in the network
+_TOPOLOGY_ATTRIBUTES = ["name", "from_element", "to_element", "connecting_element"]
+
+
+def _fingerprint(value):
+    """
+    Returns a comparable snapshot of a value.
+    DiTTo objects are described recursively by their traits. Values which are not DiTTo objects,
+    containers or scalars are described by their identity.
+    """
+    if isinstance(value, DiTToHasTraits):
+        cls = type(value)
+        if cls not in _TRACKED_TRAITS:
+            _TRACKED_TRAITS[cls] = sorted(
+                set(cls.class_trait_names()) - _UNTRACKED_TRAITS
+            )
+        return (cls,) + tuple(
+            _fingerprint(getattr(value, name)) for name in _TRACKED_TRAITS[cls]
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_fingerprint(v) for v in value)
+    if value is None or isinstance(value, (string_types, int, float, complex)):
+        return value
+    return id(value)
+
+
+def _topology_key(obj):
+    """Returns the connections of an object (name, from_element, to_element, connecting_element)."""
+    return tuple(getattr(obj, attr, None) for attr in _TOPOLOGY_ATTRIBUTES)
+
+
+def _voltage_changed(obj, fingerprint):
+    """
+    Returns whether the edit of an object can change the nominal voltages set by the analyzer (See refresh):
+    the object is new, a transformer or a power source, or its nominal voltage was modified.
+    """
+    if fingerprint is None or isinstance(obj, (PowerTransformer, PowerSource)):
+        return True
+    names = _TRACKED_TRAITS.get(type(obj), [])
+    if "nominal_voltage" not in names:
+        return False
+    return fingerprint[names.index("nominal_voltage") + 1] != obj.nominal_voltage
+
+
+# Types of the columns of the metrics table (See NetworkAnalyzer.metrics_table)
+# Other metrics are stored as float64
+TABLE_STRING_COLUMNS = ["feeder_name", "substation_name", "feeder_type", "Feeder_type"]
+TABLE_NOT_INTEGER_COLUMNS = ["num_customers", "num_sectionalizers_per_recloser"]
+
+# Extensions of the metrics table files by format
+TABLE_FORMATS = {"parquet": ".parquet", "csv": ".csv"}
+
+
+def _table_column_type(column):
+    """Returns the pandas type of a column of the metrics table."""
+    if column in TABLE_STRING_COLUMNS:
+        return "string"
+    if column.startswith("num_") and column not in TABLE_NOT_INTEGER_COLUMNS:
+        return "Int64"
+    return "float64"
+
+
+def _cast_table(table):
+    """
+    Casts the columns of the metrics table to their types (See _table_column_type).
+    Columns with non numeric values (ex: identifiers added by the user) are stored as strings.
+    """
+    for column in table.columns:
+        column_type = _table_column_type(column)
+        if column_type != "string":
+            values = pd.to_numeric(table[column], errors="coerce")
+            if values.isna().sum() == table[column].isna().sum():
+                table[column] = values.astype(column_type)
+                continue
+        table[column] = table[column].astype("string")
+    return table
+
+
+def read_metrics_table(path):
+    """
+    Reads a metrics table written by NetworkAnalyzer.export_table, with all its appended parts and partitions.
+    The partition values (directories named column=value) are restored as columns.
+
+    :param path: Directory of the metrics table
+    :type path: str
+    :returns: The metrics of all the parts, one row per feeder
+    :rtype: pandas.DataFrame
+    """
+    parts = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        partitions = {}
+        for directory in os.path.relpath(root, path).split(os.sep):
+            if "=" in directory:
+                column, value = directory.split("=", 1)
+                partitions[column] = value
+        for filename in sorted(files):
+            extension = os.path.splitext(filename)[1]
+            if not filename.startswith("part-"):
+                continue
+            if extension == TABLE_FORMATS["parquet"]:
+                part = pd.read_parquet(os.path.join(root, filename))
+            elif extension == TABLE_FORMATS["csv"]:
+                part = pd.read_csv(
+                    os.path.join(root, filename),
+                    dtype={c: _table_column_type(c) for c in TABLE_STRING_COLUMNS},
+                )
+            else:
+                continue
+            for column, value in partitions.items():
+                part[column] = value
+            parts.append(part)
+    if len(parts) == 0:
+        return pd.DataFrame(columns=["feeder_name"])
+    return _cast_table(pd.concat(parts, ignore_index=True))
+
+
+def _trait(obj, name):
+    """
+    Returns the value of a trait of a DiTTo object without the access notification (See DiTToTraitType.get),
+    which dominates the cost of reading many attributes. Falls back to getattr (None if missing).
+    """
+    try:
+        return obj._trait_values[name]
+    except (AttributeError, KeyError):
+        return getattr(obj, name, None)
+
+
+def footprint(points):
+    """
+    Returns the footprint of a set of points given as an (n, 2) array:
+
+        - num_unique_points: Number of distinct points.
+        - width and height: Extents of the bounding box.
+        - hull_area: Area of the convex hull (0 with less than 3 points or aligned points).
+
+    The areas are in the square of the units of the coordinates.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    unique = np.unique(points, axis=0)
+    result = {
+        "num_unique_points": len(unique),
+        "width": 0.0,
+        "height": 0.0,
+        "hull_area": 0.0,
+    }
+    if len(unique) == 0:
+        return result
+    result["width"], result["height"] = (
+        unique.max(axis=0) - unique.min(axis=0)
+    ).tolist()
+    if len(unique) > 2 and np.linalg.matrix_rank(unique - unique.mean(axis=0)) == 2:
+        # In 2D, the volume of the hull is its area (its area attribute is the perimeter)
+        result["hull_area"] = ConvexHull(unique).volume
+    return result
+
+
+def _compute_feeder_metrics(payload):
+    """
+    Worker function of the parallel per-feeder mode.
+    Takes a serialized feeder payload and returns the feeder name, the raw results, the load distribution,
+    and the profiling records (None if profiling is disabled).
+    """
+    payload = _FeederUnpickler(io.BytesIO(payload)).load()
+    analyzer = NetworkAnalyzer._from_feeder_payload(payload)
+    feeder_name = payload["feeder_name"]
+    with profile_section(analyzer.profiler, "analyze_objects", len(payload["objects"])):
+        for obj in payload["objects"]:
+            analyzer.analyze_object(obj, feeder_name)
+    return (
+        feeder_name,
+        analyzer.results[feeder_name],
+        analyzer.load_distribution,
+        analyzer.profiler.records if analyzer.profiler is not None else None,
+    )
+
+
 class NetworkAnalyzer(object):
     """
     This class is used to compute validation metrics from the DiTTo representation itself.
@@ -105,19 +336,27 @@ class NetworkAnalyzer(object):
           Therefore, it is strongly recommanded to use one of these two methods when more than a few metrics are needed.
         - The class constructor is building the network (using the DiTTo Network module) which can take some time...
 
+    **Profiling:**
+
+        The time spent in each metric and in each branch of analyze_object (by object class) can be recorded:
+
+            >>> analyst.enable_profiling()
+            >>> analyst.compute_all_metrics_per_feeder()
+            >>> analyst.profiling_report()
+
+        This returns a pandas DataFrame with the number of calls, the number of objects and the wall times
+        of each metric, sorted by decreasing total time (See ditto.metrics.profiling.MetricProfiler).
+
     Author: Nicolas Gensollen. December 2017
     """
 
     def __init__(self, model, compute_network=True, *args):
         """Class CONSTRUCTOR."""
-        # Store the model as attribute
-        self.model = model
-
         if len(args) == 1:
             source = args[0]
         else:
             srcs = []
-            for obj in self.model.models:
+            for obj in model.models:
                 if isinstance(obj, PowerSource) and obj.is_sourcebus == 1:
                     srcs.append(obj.name)
             srcs = np.unique(srcs)
@@ -128,12 +367,7 @@ class NetworkAnalyzer(object):
             else:
                 source = srcs[0]
 
-        # Store the source name as attribute
-        self.source = source
-
-        # Dirty way to access the abstract reader methods
-        # TODO: Better way?
-        self.abs_reader = AbstractReader()
+        self._setup_attributes(model, source)
 
         # Build the Network if required
         #
@@ -151,13 +385,27 @@ class NetworkAnalyzer(object):
             self.edge_equipment_name = nx.get_edge_attributes(
                 self.G.graph, "equipment_name"
             )
-        else:
-            self.G = None
-            self.edge_equipment = None
-            self.edge_equipment_name = None
 
         modifier = system_structure_modifier(self.model, source)
         modifier.set_nominal_voltages()
+
+    def _setup_attributes(self, model, source, substation_transformers=None):
+        """
+        Sets the attributes of an analyzer of the model, without network (See __init__ and _from_feeder_payload).
+        The substation transformers are looked up in the model if they are not given.
+        """
+        # Store the model and the source name as attributes
+        self.model = model
+        self.source = source
+
+        # Dirty way to access the abstract reader methods
+        # TODO: Better way?
+        self.abs_reader = AbstractReader()
+
+        self.G = None
+        self.edge_equipment = None
+        self.edge_equipment_name = None
+
         # IMPORTANT: the following two parameters define what is LV and what is MV.
         # - Object is LV if object.nominal_voltage<=LV_threshold
         # - Object is MV if MV_threshold>=object.nominal_voltage>LV_threshold
@@ -173,16 +421,53 @@ class NetworkAnalyzer(object):
         self.node_feeder_mapping = {}
         self.points = {}
 
+        # Distances from the source and hop statistics, cached per network (See source_distances)
+        self._distance_cache = {}
+        self._hop_cache = {}
+
+        # Aggregation of the loads downstream of the devices (See downstream_aggregator)
+        self._aggregator = None
+
+        # Objects and nodes the results of each feeder depend on, and snapshot of the objects (See refresh)
+        self._feeder_dependencies = {}
+        self._feeder_load_distribution = {}
+        self._snapshot = None
+
+        # Timing of the metrics, None when profiling is disabled (See enable_profiling)
+        self.profiler = None
+
         # This flag indicates whether we should compute the kva density metric using transformer objects
         # Default is True. If set to False, the `transformer_connected_kva` attribute of load objects will
         # be used. This enables fair comparison between networks where LV data is missing.
         self.compute_kva_density_with_transformers = True
 
-        self.__substations = [
-            obj
-            for obj in self.model.models
-            if isinstance(obj, PowerTransformer) and obj.is_substation == 1
-        ]
+        if substation_transformers is None:
+            substation_transformers = [
+                obj
+                for obj in self.model.models
+                if isinstance(obj, PowerTransformer) and obj.is_substation == 1
+            ]
+        self.__substations = substation_transformers
+
+    def enable_profiling(self, profiler=None):
+        """
+        Records the timing of the metrics in the given MetricProfiler, or in a new one.
+        Returns the profiler.
+        """
+        if profiler is None:
+            profiler = MetricProfiler()
+        self.profiler = profiler
+        return profiler
+
+    def disable_profiling(self):
+        """Stops recording the timing of the metrics."""
+        self.profiler = None
+
+    def profiling_report(self):
+        """Returns the timing of the metrics recorded since profiling was enabled (See MetricProfiler.report)."""
+        if self.profiler is None:
+            raise ValueError("Profiling is not enabled. Use enable_profiling first.")
+        return self.profiler.report()
 
     def provide_network(self, network):
         """TODO"""
@@ -194,6 +479,9 @@ class NetworkAnalyzer(object):
             )
         self.G = network
         self.G.set_attributes(self.model)
+        self._distance_cache = {}
+        self._hop_cache = {}
+        self._aggregator = None
         self.edge_equipment = nx.get_edge_attributes(self.G.graph, "equipment")
         self.edge_equipment_name = nx.get_edge_attributes(
             self.G.graph, "equipment_name"
@@ -402,6 +690,90 @@ class NetworkAnalyzer(object):
         # Write to csv
         card.to_csv(export_path, header=True, index=False)
 
+    def metrics_table(self, **columns):
+        """
+        Returns the metrics as a typed table with one row per feeder (pandas DataFrame).
+        Only the scalar metrics are included (not the distributions).
+        Counts are nullable integers, names are strings, and other metrics are float64.
+        Non numeric metrics (ex: names missing from TABLE_STRING_COLUMNS) are stored as strings.
+
+        Additional constant columns can be given as keyword arguments (ex: run or region identifiers).
+
+        **Usage:**
+
+            >>> table=analyst.metrics_table(region="west")
+        """
+        rows = []
+        for feeder_name, data in self.results.items():
+            row = {"feeder_name": feeder_name}
+            for key, value in data.items():
+                if not isinstance(value, (dict, list, tuple, set)):
+                    row[key] = value
+            row.update(columns)
+            rows.append(row)
+        return _cast_table(pd.DataFrame(rows))
+
+    def export_table(
+        self, export_path, output_format="parquet", partition_by=None, **columns
+    ):
+        """
+        Appends the metrics table (See metrics_table) to a columnar dataset directory.
+
+        Each call writes new part files (named part-<unique id>) and never reads or rewrites the previous ones,
+        such that fleet-wide tables can be built incrementally, also from several processes.
+        With partition_by, the rows are split in sub-directories named column=value (hive style).
+        The dataset can be loaded with read_metrics_table (or pandas.read_parquet for parquet).
+
+        :param export_path: Directory of the dataset. Created if needed.
+        :type export_path: str
+        :param output_format: parquet (requires pyarrow or fastparquet) or csv
+        :type output_format: str
+        :param partition_by: Names of the columns used to partition the dataset
+        :type partition_by: List(str)
+        :returns: The paths of the written files
+        :rtype: List(str)
+        """
+        output_format = output_format.lower()
+        if output_format not in TABLE_FORMATS:
+            raise ValueError(
+                "Unsupported table format {f}. Use one of {l}".format(
+                    f=output_format, l=list(TABLE_FORMATS.keys())
+                )
+            )
+        table = self.metrics_table(**columns)
+        if partition_by is None:
+            partition_by = []
+        for column in partition_by:
+            if column not in table.columns:
+                raise ValueError("Unknown partition column {}".format(column))
+
+        if len(partition_by) > 0:
+            groups = table.groupby(partition_by, dropna=False, sort=True)
+        else:
+            groups = [((), table)]
+        part_name = "part-{}{}".format(uuid.uuid4().hex, TABLE_FORMATS[output_format])
+        paths = []
+        for values, group in groups:
+            if not isinstance(values, tuple):
+                values = (values,)
+            directory = os.path.join(
+                export_path,
+                *[
+                    "{c}={v}".format(c=column, v=value)
+                    for column, value in zip(partition_by, values)
+                ]
+            )
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            path = os.path.join(directory, part_name)
+            group = group.drop(columns=partition_by)
+            if output_format == "parquet":
+                group.to_parquet(path, index=False)
+            else:
+                group.to_csv(path, index=False)
+            paths.append(path)
+        return paths
+
     def tag_objects(self):
         """
         Loop over the objects and fill the feeder_name and substaation_name attributes.
@@ -587,6 +959,7 @@ class NetworkAnalyzer(object):
             if node not in self.feeder_nodes[idx]:
                 self.feeder_nodes[idx].append(node)
 
+    @profiled
     def setup_results_data_structure(self, *args):
         """
         This function creates the data structure which contains the result metrics for a SINGLE network.
@@ -766,6 +1139,9 @@ class NetworkAnalyzer(object):
             "trans_cust_impedance_list": {},  # Store the list of line positive sequence impedances between each customer and its distribution transformer
             "nominal_voltages": [],  # Store the different nominal voltage values
             "convex_hull_area_sqmi": 0,  # Convex hull area for the feeder
+            "convex_hull_area_km2": 0,  # Convex hull area for the feeder (in square kilometers)
+            "bbox_width_km": 0,  # Width of the bounding box of the feeder (in kilometers)
+            "bbox_height_km": 0,  # Height of the bounding box of the feeder (in kilometers)
             "substation_name": _src,
             "feeder_type": None,
         }
@@ -773,6 +1149,7 @@ class NetworkAnalyzer(object):
             results["Feeder_type"] = self.feeder_types[network]
         return results
 
+    @profiled(by_class=True)
     def analyze_object(self, obj, feeder_name):
         """
         This function takes as input a DiTTo object and the name of the corresponding feeder, and analyze it.
@@ -788,18 +1165,6 @@ class NetworkAnalyzer(object):
         except:
             _src = self.source
 
-        # If the object has some coordinate values
-        # then we add the points to the list of points for the feeder
-        if hasattr(obj, "positions") and obj.positions is not None:
-            for position in obj.positions:
-                X = position.long
-                Y = position.lat
-                if X is not None and Y is not None:
-                    if feeder_name in self.points:
-                        self.points[feeder_name].append([X, Y])
-                    else:
-                        self.points[feeder_name] = [[X, Y]]
-
         # Nominal voltage
         if hasattr(obj, "nominal_voltage"):
             if obj.nominal_voltage not in self.results[feeder_name]["nominal_voltages"]:
@@ -835,15 +1200,8 @@ class NetworkAnalyzer(object):
                     if _from.feeder_name != _to.feeder_name:
                         self.results[feeder_name]["num_links_adjacent_feeders"] += 1
 
-            # Update the counts
-            #
-            # Fuses
-            if obj.is_fuse is True:
-                self.results[feeder_name]["num_fuses"] += 1
-
-            # Switches
+            # Switch categories (the device counts are set by set_scalar_metrics)
             if obj.is_switch == 1:
-                self.results[feeder_name]["num_switches"] += 1
                 if hasattr(obj, "nameclass") and obj.nameclass is not None:
                     if (
                         obj.nameclass
@@ -857,26 +1215,7 @@ class NetworkAnalyzer(object):
                             obj.nameclass
                         ] = 1
 
-            # Reclosers
-            if obj.is_recloser == 1:
-                self.results[feeder_name]["num_reclosers"] += 1
-
-            # Breakers
-            if obj.is_breaker == 1:
-                self.results[feeder_name]["num_breakers"] += 1
-
-            # Sectionalizers
-            if obj.is_sectionalizer == 1:
-                self.results[feeder_name]["num_sectionalizers"] += 1
-
             if hasattr(obj, "wires") and obj.wires is not None:
-                # Get the phases (needed later)
-                phases = [
-                    wire.phase
-                    for wire in obj.wires
-                    if wire.phase in ["A", "B", "C"] and wire.drop != 1
-                ]
-
                 # Get the equipment name distribution
                 equipment_names = [wire.nameclass for wire in obj.wires]
                 for eq in equipment_names:
@@ -891,94 +1230,6 @@ class NetworkAnalyzer(object):
             else:
                 raise ValueError("No phase information for line {}".format(obj.name))
 
-            # If the line is low voltage
-            if (
-                obj.nominal_voltage is not None
-                and obj.nominal_voltage * math.sqrt(3) <= self.LV_threshold
-            ):
-
-                # Update the counter for low voltage line length
-                if hasattr(obj, "length") and obj.length >= 0:
-                    self.results[feeder_name]["lv_len_mi"] += obj.length
-
-                    # Update the counters for specific number of phases
-                    if phases is not None:
-
-                        # Single Phase low voltage line
-                        if len(phases) == 1:
-                            self.results[feeder_name]["lv_1ph_len_mi"] += obj.length
-
-                            # Single Phase low voltage Overhead Line
-                            if obj.line_type == "overhead":
-                                self.results[feeder_name][
-                                    "lv_oh_1ph_len_mi"
-                                ] += obj.length
-
-                        # Two Phase low voltage Line
-                        elif len(phases) == 2:
-                            self.results[feeder_name]["lv_2ph_len_mi"] += obj.length
-
-                            # Two Phase low voltage Overhead Line
-                            if obj.line_type == "overhead":
-                                self.results[feeder_name][
-                                    "lv_oh_2ph_len_mi"
-                                ] += obj.length
-
-                        # Three Phase low voltage Line
-                        elif len(phases) == 3:
-                            self.results[feeder_name]["lv_3ph_len_mi"] += obj.length
-
-                            # Three Phase low voltage Overhead Line
-                            if obj.line_type == "overhead":
-                                self.results[feeder_name][
-                                    "lv_oh_3ph_len_mi"
-                                ] += obj.length
-
-            # If the line is medium voltage
-            elif (
-                obj.nominal_voltage is not None
-                and self.MV_threshold
-                > obj.nominal_voltage * math.sqrt(3)
-                > self.LV_threshold
-            ):
-
-                # Update the counter for low voltage line length
-                if hasattr(obj, "length") and obj.length >= 0:
-                    self.results[feeder_name]["mv_len_mi"] += obj.length
-
-                    # Update the counters for specific number of phases
-                    if phases is not None:
-
-                        # Single Phase medium voltage line
-                        if len(phases) == 1:
-                            self.results[feeder_name]["mv_1ph_len_mi"] += obj.length
-
-                            # Single Phase medium voltage Overhead line
-                            if obj.line_type == "overhead":
-                                self.results[feeder_name][
-                                    "mv_oh_1ph_len_mi"
-                                ] += obj.length
-
-                        # Two Phase medium voltage line
-                        elif len(phases) == 2:
-                            self.results[feeder_name]["mv_2ph_len_mi"] += obj.length
-
-                            # Two Phase medium voltage Overhead line
-                            if obj.line_type == "overhead":
-                                self.results[feeder_name][
-                                    "mv_oh_2ph_len_mi"
-                                ] += obj.length
-
-                        # Three Phase medium voltage line
-                        elif len(phases) == 3:
-                            self.results[feeder_name]["mv_3ph_len_mi"] += obj.length
-
-                            # Three Phase medium voltage Overhead line
-                            if obj.line_type == "overhead":
-                                self.results[feeder_name][
-                                    "mv_oh_3ph_len_mi"
-                                ] += obj.length
-
             return
 
         # If we get a load
@@ -1049,67 +1300,8 @@ class NetworkAnalyzer(object):
                         _net3, trans_obj.to_element, obj.connecting_element
                     )
 
-            # If the load is low voltage
-            if hasattr(obj, "nominal_voltage") and obj.nominal_voltage is not None:
-                if obj.nominal_voltage * math.sqrt(3) <= self.LV_threshold:
-
-                    # Update the counters
-                    if hasattr(obj, "phase_loads") and obj.phase_loads is not None:
-
-                        _phase_loads_ = [p for p in obj.phase_loads if p.drop != 1]
-
-                        # One phase low voltage load count
-                        if len(_phase_loads_) == 1:
-                            self.results[feeder_name]["num_lv_1ph_loads"] += 1
-
-                        # Three phase low voltage load count
-                        elif len(_phase_loads_) == 3:
-                            self.results[feeder_name]["num_lv_3ph_loads"] += 1
-
-                        # The following block keeps track of the total active power for each phase
-                        for phase_load in _phase_loads_:
-                            if hasattr(phase_load, "phase") and phase_load.phase in [
-                                "A",
-                                "B",
-                                "C",
-                            ]:
-                                if (
-                                    hasattr(phase_load, "p")
-                                    and phase_load.p is not None
-                                ):
-
-                                    # Phase A
-                                    if phase_load.phase == "A":
-                                        self.results[feeder_name][
-                                            "sum_lv_pha_load_kw"
-                                        ] += phase_load.p
-
-                                    # Phase B
-                                    elif phase_load.phase == "B":
-                                        self.results[feeder_name][
-                                            "sum_lv_phb_load_kw"
-                                        ] += phase_load.p
-
-                                    # Phase C
-                                    elif phase_load.phase == "C":
-                                        self.results[feeder_name][
-                                            "sum_lv_phc_load_kw"
-                                        ] += phase_load.p
-
-                # If the load is medium voltage
-                elif (
-                    self.MV_threshold
-                    > obj.nominal_voltage * math.sqrt(3)
-                    > self.LV_threshold
-                ):
-                    if hasattr(obj, "phase_loads") and obj.phase_loads is not None:
-
-                        _phase_loads_ = [p for p in obj.phase_loads if p.drop != 1]
-
-                        # Update the count of three phase medium voltage loads
-                        if len(_phase_loads_) == 3:
-                            self.results[feeder_name]["num_mv_3ph_loads"] += 1
-
+            # The load counts and the low voltage load per phase are set by set_scalar_metrics
+            #
             # Total demand and total KVAR updates
             if hasattr(obj, "phase_loads") and obj.phase_loads is not None:
 
@@ -1206,22 +1398,8 @@ class NetworkAnalyzer(object):
 
             return
 
-        # If we get a regulator
-        if isinstance(obj, Regulator):
-
-            # Update the count
-            self.results[feeder_name]["num_regulators"] += 1
-
-            return
-
-        # If we get a capacitor
-        if isinstance(obj, Capacitor):
-
-            # Update the count
-            self.results[feeder_name]["num_capacitors"] += 1
-
-            return
-
+        # The regulators and capacitors are counted by set_scalar_metrics
+        #
         # If we get a Transformer
         if isinstance(obj, PowerTransformer):
 
@@ -1283,25 +1461,8 @@ class NetworkAnalyzer(object):
                                         "max_len_secondaries_mi"
                                     ] = length
 
-                # ...compute the total load KVA downstream
-                total_load_kva = 0
-                for load_name in load_names:
-                    try:
-                        load_obj = self.model[load_name]
-                    except KeyError:
-                        load_obj = None
-                    if (
-                        hasattr(load_obj, "phase_loads")
-                        and load_obj.phase_loads is not None
-                    ):
-                        for pl in load_obj.phase_loads:
-                            if (
-                                hasattr(pl, "p")
-                                and pl.p is not None
-                                and hasattr(pl, "q")
-                                and pl.q is not None
-                            ):
-                                total_load_kva += math.sqrt(pl.p ** 2 + pl.q ** 2)
+                # ...get the total load KVA downstream (in VA)
+                total_load_kva = self.transformer_load_kva.get(obj.name, 0) * 10 ** 3
                 # ...compute the transformer KVA
                 if hasattr(obj, "windings") and obj.windings is not None:
                     transformer_kva = max(
@@ -1387,9 +1548,229 @@ class NetworkAnalyzer(object):
             logger.debug("Could not find feeder for {}".format(obj.name))
             return None
 
+    def feeder_dependencies(self, feeder_names):
+        """
+        Partitions the objects by feeder and yields, for each feeder, what its metrics depend on:
+
+            - The objects of the feeder, which are analyzed, in the order of the model.
+            - The nodes of the feeder and of the paths to the substation and to the distribution transformers used by the metrics.
+            - The objects referenced by the metrics (nodes, lines on the paths, transformers, loads...), in the order of the model.
+            - The transformer load mapping restricted to the transformers of the feeder.
+
+        The items are tuples (feeder_name, objects, nodes, references, transformer_load_mapping).
+        """
+        objects_per_feeder = {k: [] for k in feeder_names}
+        objects_by_node = {}
+        model_index = {}
+        for idx, obj in enumerate(self.model.models):
+            model_index[id(obj)] = idx
+            if hasattr(obj, "name"):
+                _feeder_ref = self.get_feeder(obj)
+                if _feeder_ref is not None and _feeder_ref in objects_per_feeder:
+                    objects_per_feeder[_feeder_ref].append(obj)
+            for attr in ["name", "connecting_element", "from_element", "to_element"]:
+                node = getattr(obj, attr, None)
+                if isinstance(node, string_types):
+                    objects_by_node.setdefault(node, []).append(obj)
+
+        for feeder_name in feeder_names:
+            _net = self.feeder_networks[feeder_name]
+            _src = self.substations[feeder_name]
+            first_node = list(_net.nodes())[0]
+
+            # Nodes of the feeder and of the paths computed on the complete network
+            nodes = set(_net.nodes())
+            if not _net.has_node(_src):
+                nodes.update(nx.shortest_path(self.G.graph, _src, first_node))
+            referenced = set()
+            transformer_load_mapping = {}
+            for obj in objects_per_feeder[feeder_name]:
+                if isinstance(obj, Load) and obj.upstream_transformer_name is not None:
+                    referenced.add(obj.upstream_transformer_name)
+                    trans_obj = self.model[obj.upstream_transformer_name]
+                    if trans_obj.to_element is not None and not _net.has_node(
+                        trans_obj.to_element
+                    ):
+                        nodes.update(
+                            nx.shortest_path(
+                                self.G.graph, trans_obj.to_element, first_node
+                            )
+                        )
+                if (
+                    isinstance(obj, PowerTransformer)
+                    and obj.name in self.transformer_load_mapping
+                ):
+                    load_names = self.transformer_load_mapping[obj.name]
+                    transformer_load_mapping[obj.name] = load_names
+                    referenced.update(load_names)
+                    # Walk up from the loads to the transformer (secondary lengths)
+                    ends = [obj.from_element, obj.to_element]
+                    nodes.update([n for n in ends if self.G.graph.has_node(n)])
+                    for load_name in load_names:
+                        try:
+                            node = self.model[load_name].connecting_element
+                        except KeyError:
+                            continue
+                        while node is not None and self.G.digraph.has_node(node):
+                            nodes.add(node)
+                            if node in ends:
+                                break
+                            node = next(self.G.digraph.predecessors(node), None)
+
+            # Objects referenced by the metrics, in the order of the model
+            references = {}
+            for obj in objects_per_feeder[feeder_name]:
+                references[id(obj)] = obj
+            for node in nodes:
+                for obj in objects_by_node.get(node, []):
+                    references[id(obj)] = obj
+            for name in referenced:
+                try:
+                    obj = self.model[name]
+                except KeyError:
+                    continue
+                references[id(obj)] = obj
+            references = sorted(references.values(), key=lambda x: model_index[id(x)])
+
+            yield (
+                feeder_name,
+                objects_per_feeder[feeder_name],
+                nodes,
+                references,
+                transformer_load_mapping,
+            )
+
+    def feeder_payloads(self, feeder_names):
+        """
+        Yields, for each feeder, the serialized data needed to compute its metrics in a worker process:
+
+            - The feeder nodes and a lightweight graph (edge lengths only) containing the feeder and the paths
+              to the substation and to the distribution transformers used by the metrics.
+            - The objects of the feeder, which are analyzed, in the order of the model.
+            - The objects referenced by the metrics (nodes, lines on the paths, transformers, loads...).
+
+        .. note:: The objects are serialized without their Store.
+        """
+        for (
+            feeder_name,
+            objects,
+            nodes,
+            references,
+            transformer_load_mapping,
+        ) in self.feeder_dependencies(feeder_names):
+            _net = self.feeder_networks[feeder_name]
+            _src = self.substations[feeder_name]
+
+            subgraph = self.G.graph.subgraph(nodes)
+            graph = nx.Graph()
+            graph.add_nodes_from(subgraph.nodes())
+            graph.add_edges_from(
+                (n1, n2, {k: v for k, v in data.items() if k == "length"})
+                for n1, n2, data in subgraph.edges(data=True)
+            )
+
+            payload = {
+                "feeder_name": feeder_name,
+                "feeder_nodes": list(_net.nodes()),
+                "feeder_type": getattr(self, "feeder_types", {}).get(feeder_name),
+                "substation": _src,
+                "substation_transformers": [
+                    su for su in self.__substations if _src in su.name.replace(".", "")
+                ],
+                "source": self.source,
+                "LV_threshold": self.LV_threshold,
+                "MV_threshold": self.MV_threshold,
+                "compute_kva_density_with_transformers": self.compute_kva_density_with_transformers,
+                "profile": self.profiler is not None,
+                "transformer_load_mapping": transformer_load_mapping,
+                "transformer_load_kva": {
+                    k: self.transformer_load_kva[k] for k in transformer_load_mapping
+                },
+                "graph": graph,
+                "objects": objects,
+                "references": references,
+            }
+            buffer = io.BytesIO()
+            _FeederPickler(buffer, self.model).dump(payload)
+            yield buffer.getvalue()
+
+    @classmethod
+    def _from_feeder_payload(cls, payload):
+        """
+        Builds an analyzer restricted to a single feeder from a feeder payload (See feeder_payloads).
+        The results data structure of the feeder is set up.
+        """
+        feeder_name = payload["feeder_name"]
+        # The nominal voltages are already set in the payload objects: __init__ is not called
+        analyzer = cls.__new__(cls)
+        analyzer._setup_attributes(
+            _FeederModel(payload["references"]),
+            payload["source"],
+            substation_transformers=payload["substation_transformers"],
+        )
+        analyzer.G = Network()
+        analyzer.G.provide_graphs(payload["graph"], None)
+        analyzer.LV_threshold = payload["LV_threshold"]
+        analyzer.MV_threshold = payload["MV_threshold"]
+        analyzer.feeder_names = [feeder_name]
+        analyzer.feeder_nodes = [payload["feeder_nodes"]]
+        analyzer.substations = {feeder_name: payload["substation"]}
+        if payload["feeder_type"] is not None:
+            analyzer.feeder_types = {feeder_name: payload["feeder_type"]}
+        analyzer.feeder_networks = {
+            feeder_name: payload["graph"].subgraph(payload["feeder_nodes"])
+        }
+        analyzer.node_feeder_mapping = {n: feeder_name for n in payload["feeder_nodes"]}
+        analyzer.profiler = MetricProfiler() if payload["profile"] else None
+        analyzer.compute_kva_density_with_transformers = payload[
+            "compute_kva_density_with_transformers"
+        ]
+        analyzer.transformer_load_mapping = payload["transformer_load_mapping"]
+        analyzer.transformer_load_kva = payload["transformer_load_kva"]
+        analyzer.compute_node_line_mapping()
+        analyzer.load_distribution = []
+        analyzer.results = {
+            feeder_name: analyzer.setup_results_data_structure(feeder_name)
+        }
+        return analyzer
+
+    def analyze_feeders_in_parallel(self, feeder_names, jobs=None):
+        """
+        Analyzes the objects of the given feeders in a pool of worker processes.
+        Only the data of a feeder is shipped to the worker computing it (See feeder_payloads).
+        The results are merged in the order of feeder_names.
+
+        :param feeder_names: List of the feeder names
+        :type feeder_names: List(str)
+        :param jobs: Number of worker processes. Defaults to the number of CPUs.
+        :type jobs: int
+        """
+        self.results = {}
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for (
+                feeder_name,
+                results,
+                load_distribution,
+                records,
+            ) in executor.map(
+                _compute_feeder_metrics, self.feeder_payloads(feeder_names)
+            ):
+                self.results[feeder_name] = results
+                if records is not None and self.profiler is not None:
+                    self.profiler.merge(records)
+                self.load_distribution.extend(load_distribution)
+                self._feeder_load_distribution[feeder_name] = load_distribution
+        self.collect_points(feeder_names)
+
     def compute_all_metrics_per_feeder(self, **kwargs):
         """
         Computes all the available metrics for each feeder.
+
+        The feeders can be analyzed in parallel with the jobs keyword argument:
+
+            >>> analyst.compute_all_metrics_per_feeder(jobs=4)
+
+        Use jobs=None to use all the CPUs. The default (jobs=1) analyzes the feeders in the current process.
         """
         # Enables changing the flag
         if "compute_kva_density_with_transformers" in kwargs and isinstance(
@@ -1399,292 +1780,566 @@ class NetworkAnalyzer(object):
                 "compute_kva_density_with_transformers"
             ]
 
+        self._distance_cache = {}
+        self._hop_cache = {}
+        self._aggregator = None
         self.transformer_load_mapping = self.get_transformer_load_mapping()
+        self.transformer_load_kva = self.get_transformer_load_kva()
         self.compute_node_line_mapping()
         self.load_distribution = []
-        # List of keys that will have to be converted to miles (DiTTo is in meter)
-        keys_to_convert_to_miles = [
-            "lv_len_mi",
-            "mv_len_mi",
-            "mv_1ph_len_mi",
-            "mv_2ph_len_mi",
-            "mv_3ph_len_mi",
-            "lv_1ph_len_mi",
-            "lv_2ph_len_mi",
-            "lv_3ph_len_mi",
-            "mv_oh_1ph_len_mi",
-            "mv_oh_2ph_len_mi",
-            "mv_oh_3ph_len_mi",
-            "lv_oh_1ph_len_mi",
-            "lv_oh_2ph_len_mi",
-            "lv_oh_3ph_len_mi",
-            "max_len_secondaries_mi",
-            "avg_recloser_sub_distance_mi",
-            "avg_regulator_sub_distance_mi",
-            "avg_capacitor_sub_distance_mi",
+        self._feeder_load_distribution = {}
+        self.results = {}
+
+        mv_feeder_names = [
+            k
+            for k in self.feeder_names
+            if self.substations[k] is not None and len(self.substations[k]) > 0
         ]
 
-        # List of keys to divide by 10^3
-        keys_to_divide_by_1000 = [
-            "sum_load_kw",
-            "sum_load_kvar",
-            "sum_lv_pha_load_kw",
-            "sum_lv_phb_load_kw",
+        jobs = kwargs.get("jobs", 1)
+        if jobs != 1:
+            self.analyze_feeders_in_parallel(mv_feeder_names, jobs)
+        else:
+            self.analyze_feeders(mv_feeder_names)
+        self.set_scalar_metrics(mv_feeder_names)
+
+        # Do some post-processing of the results before returning them
+        for _feeder_ref in mv_feeder_names:
+            self.post_process_feeder_results(_feeder_ref)
+
+        # Keep track of what the results depend on (See refresh)
+        self.track_feeder_dependencies(mv_feeder_names)
+
+    def analyze_feeders(self, feeder_names):
+        """
+        Analyzes the objects of the given feeders in the current process.
+        The results, points and load distributions of these feeders are reset first.
+        """
+        # Setup the data structures for the feeders
+        for feeder_name in feeder_names:
+            self.results[feeder_name] = self.setup_results_data_structure(feeder_name)
+            self._feeder_load_distribution[feeder_name] = []
+
+        # Loop over the objects in the model and analyze them
+        with profile_section(self.profiler, "analyze_objects", len(self.model.models)):
+            for obj in self.model.models:
+                # Get the feeder of this object if it exists
+                if hasattr(obj, "name"):
+                    _feeder_ref = self.get_feeder(obj)
+                    # If we have a valid name, analyze the object
+                    if _feeder_ref is not None and _feeder_ref in feeder_names:
+                        n_loads = len(self.load_distribution)
+                        self.analyze_object(obj, _feeder_ref)
+                        self._feeder_load_distribution[_feeder_ref].extend(
+                            self.load_distribution[n_loads:]
+                        )
+        self.collect_points(feeder_names)
+
+    @profiled
+    def collect_points(self, feeder_names, all_objects=False):
+        """
+        Gathers the coordinates of the positioned objects of the given feeders in a single pass over the model,
+        and stores them in self.points as one (n, 2) NumPy array (longitude, latitude) per feeder.
+        Feeders without coordinates are removed from self.points.
+
+        With all_objects=True, the positions of all the objects go to the single name in feeder_names
+        (See compute_all_metrics).
+        """
+        feeder_index = {name: idx for idx, name in enumerate(feeder_names)}
+        X = []
+        Y = []
+        codes = []
+        for obj in self.model.models:
+            positions = _trait(obj, "positions")
+            if not positions:
+                continue
+            if all_objects:
+                code = 0
+            else:
+                # Same lookup as get_feeder
+                code = None
+                for attr in ["name", "connecting_element", "from_element"]:
+                    element = _trait(obj, attr)
+                    if element is not None and element in self.node_feeder_mapping:
+                        code = feeder_index.get(self.node_feeder_mapping[element])
+                        break
+                if code is None:
+                    continue
+            for position in positions:
+                x = _trait(position, "long")
+                y = _trait(position, "lat")
+                if x is not None and y is not None:
+                    X.append(x)
+                    Y.append(y)
+                    codes.append(code)
+
+        codes = np.array(codes, dtype=int)
+        order = np.argsort(codes, kind="stable")
+        points = np.column_stack(
+            [np.array(X, dtype=float)[order], np.array(Y, dtype=float)[order]]
+        )
+        bounds = np.searchsorted(codes[order], np.arange(len(feeder_names) + 1))
+        for idx, feeder_name in enumerate(feeder_names):
+            if bounds[idx + 1] > bounds[idx]:
+                self.points[feeder_name] = points[bounds[idx] : bounds[idx + 1]]
+            else:
+                self.points.pop(feeder_name, None)
+
+    def set_footprint_metrics(self, feeder_name, min_unique_points=3):
+        """
+        Computes the convex hull area, the bounding box and the densities of a feeder from its points (See collect_points).
+        Feeders with less than min_unique_points distinct points get no hull and NaN densities.
+
+        .. note:: As for the other lengths, the coordinates are assumed to be in meters.
+        """
+        results = self.results[feeder_name]
+        results["cust_density"] = np.nan
+        results["load_density_kw"] = np.nan
+        results["load_density_kvar"] = np.nan
+        results["kva_density"] = np.nan
+        results["cust_density_km2"] = np.nan
+        results["kva_density_km2"] = np.nan
+
+        shape = footprint(self.points.get(feeder_name, np.zeros((0, 2))))
+        results["bbox_width_km"] = shape["width"] * 10 ** -3
+        results["bbox_height_km"] = shape["height"] * 10 ** -3
+        if shape["num_unique_points"] < min_unique_points:
+            return
+
+        # Convert surface from square meters to square miles and square kilometers
+        hull_surf_sqmile = shape["hull_area"] * 3.86102 * 10 ** -7
+        hull_surf_sqkm = shape["hull_area"] * 10 ** -6
+        results["convex_hull_area_sqmi"] = hull_surf_sqmile
+        results["convex_hull_area_km2"] = hull_surf_sqkm
+        if hull_surf_sqmile != 0:
+            kva = 10 ** 3 * results["sum_distribution_transformer_mva"]
+            results["cust_density"] = float(results["num_customers"]) / hull_surf_sqmile
+            results["load_density_kw"] = (
+                float(results["sum_load_kw"]) / hull_surf_sqmile
+            )
+            results["load_density_kvar"] = (
+                float(results["sum_load_kvar"]) / hull_surf_sqmile
+            )
+            results["kva_density"] = float(kva) / hull_surf_sqmile
+            results["cust_density_km2"] = (
+                float(results["num_customers"]) / hull_surf_sqkm
+            )
+            results["kva_density_km2"] = float(kva) / hull_surf_sqkm
+
+    @profiled
+    def post_process_feeder_results(self, _feeder_ref):
+        """
+        Post-processing of the raw results of a feeder (percentages, ratios, unit conversions, densities...).
+        """
+        # List of keys that will have to be converted to miles (DiTTo is in meter)
+        keys_to_convert_to_miles = [
+            "lv_len_mi",
+            "mv_len_mi",
+            "mv_1ph_len_mi",
+            "mv_2ph_len_mi",
+            "mv_3ph_len_mi",
+            "lv_1ph_len_mi",
+            "lv_2ph_len_mi",
+            "lv_3ph_len_mi",
+            "mv_oh_1ph_len_mi",
+            "mv_oh_2ph_len_mi",
+            "mv_oh_3ph_len_mi",
+            "lv_oh_1ph_len_mi",
+            "lv_oh_2ph_len_mi",
+            "lv_oh_3ph_len_mi",
+            "max_len_secondaries_mi",
+            "avg_recloser_sub_distance_mi",
+            "avg_regulator_sub_distance_mi",
+            "avg_capacitor_sub_distance_mi",
+        ]
+
+        # List of keys to divide by 10^3
+        keys_to_divide_by_1000 = [
+            "sum_load_kw",
+            "sum_load_kvar",
+            "sum_lv_pha_load_kw",
+            "sum_lv_phb_load_kw",
             "sum_lv_phc_load_kw",
             "sum_load_pha_kw",
             "sum_load_phb_kw",
             "sum_load_phc_kw",
         ]
 
-        mv_feeder_names = [
-            k
-            for k in self.feeder_names
-            if self.substations[k] is not None and len(self.substations[k]) > 0
-        ]
-
-        # Setup the data structures for all feeders
-        self.results = {
-            k: self.setup_results_data_structure(k) for k in mv_feeder_names
-        }
+        # Compute the percentages of low voltage load kW for each phase
+        total_demand_LV = (
+            self.results[_feeder_ref]["sum_lv_pha_load_kw"]
+            + self.results[_feeder_ref]["sum_lv_phb_load_kw"]
+            + self.results[_feeder_ref]["sum_lv_phc_load_kw"]
+        )
+        if total_demand_LV != 0:
+            self.results[_feeder_ref]["perct_lv_pha_load_kw"] = (
+                float(self.results[_feeder_ref]["sum_lv_pha_load_kw"])
+                / float(total_demand_LV)
+                * 100
+            )
+            self.results[_feeder_ref]["perct_lv_phb_load_kw"] = (
+                float(self.results[_feeder_ref]["sum_lv_phb_load_kw"])
+                / float(total_demand_LV)
+                * 100
+            )
+            self.results[_feeder_ref]["perct_lv_phc_load_kw"] = (
+                float(self.results[_feeder_ref]["sum_lv_phc_load_kw"])
+                / float(total_demand_LV)
+                * 100
+            )
+        else:
+            self.results[_feeder_ref]["perct_lv_pha_load_kw"] = 0
+            self.results[_feeder_ref]["perct_lv_phb_load_kw"] = 0
+            self.results[_feeder_ref]["perct_lv_phc_load_kw"] = 0
 
-        # Loop over the objects in the model and analyze them
-        for obj in self.model.models:
-            # Get the feeder of this object if it exists
-            if hasattr(obj, "name"):
-                _feeder_ref = self.get_feeder(obj)
-                # If we have a valid name, analyze the object
-                if _feeder_ref is not None and _feeder_ref in mv_feeder_names:
-                    self.analyze_object(obj, _feeder_ref)
+        # ratio_1phto3ph_Xfrm
+        if self.results[_feeder_ref]["num_3ph_transformers"] != 0:
+            self.results[_feeder_ref]["ratio_1ph_to_3ph_transformers"] = float(
+                self.results[_feeder_ref]["num_1ph_transformers"]
+            ) / float(self.results[_feeder_ref]["num_3ph_transformers"])
+        else:
+            self.results[_feeder_ref]["ratio_1ph_to_3ph_transformers"] = np.inf
 
-        # Do some post-processing of the results before returning them
-        #
-        # Compute the percentages of low voltage load kW for each phase
-        for _feeder_ref in mv_feeder_names:
-            total_demand_LV = (
-                self.results[_feeder_ref]["sum_lv_pha_load_kw"]
-                + self.results[_feeder_ref]["sum_lv_phb_load_kw"]
-                + self.results[_feeder_ref]["sum_lv_phc_load_kw"]
+        # avg_nb_load_per_transformer
+        if len(self.results[_feeder_ref]["num_load_per_transformer"]) > 0:
+            self.results[_feeder_ref]["avg_num_load_per_transformer"] = np.mean(
+                list(self.results[_feeder_ref]["num_load_per_transformer"].values())
             )
-            if total_demand_LV != 0:
-                self.results[_feeder_ref]["perct_lv_pha_load_kw"] = (
-                    float(self.results[_feeder_ref]["sum_lv_pha_load_kw"])
-                    / float(total_demand_LV)
-                    * 100
+
+        # Convert to miles
+        for k in keys_to_convert_to_miles:
+            if k in self.results[_feeder_ref]:
+                self.results[_feeder_ref][k] *= 0.000621371
+
+        # Divide by 10^3
+        for k in keys_to_divide_by_1000:
+            if k in self.results[_feeder_ref]:
+                self.results[_feeder_ref][k] *= 10 ** -3
+
+        # Ratio of MV Line Length to Number of Customers
+        if self.results[_feeder_ref]["num_customers"] != 0:
+            self.results[_feeder_ref]["ratio_mv_len_to_num_cust"] = self.results[
+                _feeder_ref
+            ]["mv_len_mi"] / float(self.results[_feeder_ref]["num_customers"])
+        else:
+            self.results[_feeder_ref]["ratio_mv_len_to_num_cust"] = np.nan
+
+        # Percent of Overhead MV Lines
+        try:
+            self.results[_feeder_ref]["perct_mv_oh_len"] = (
+                (
+                    self.results[_feeder_ref]["mv_oh_1ph_len_mi"]
+                    + self.results[_feeder_ref]["mv_oh_2ph_len_mi"]
+                    + self.results[_feeder_ref]["mv_oh_3ph_len_mi"]
                 )
-                self.results[_feeder_ref]["perct_lv_phb_load_kw"] = (
-                    float(self.results[_feeder_ref]["sum_lv_phb_load_kw"])
-                    / float(total_demand_LV)
-                    * 100
+                / float(
+                    self.results[_feeder_ref]["lv_len_mi"]
+                    + self.results[_feeder_ref]["mv_len_mi"]
                 )
-                self.results[_feeder_ref]["perct_lv_phc_load_kw"] = (
-                    float(self.results[_feeder_ref]["sum_lv_phc_load_kw"])
-                    / float(total_demand_LV)
-                    * 100
+                * 100
+            )
+        except ZeroDivisionError:
+            self.results[_feeder_ref]["perct_mv_oh_len"] = np.nan
+
+        # Percent of Overhead LV Lines
+        try:
+            self.results[_feeder_ref]["perct_lv_oh_len"] = (
+                (
+                    self.results[_feeder_ref]["lv_oh_1ph_len_mi"]
+                    + self.results[_feeder_ref]["lv_oh_2ph_len_mi"]
+                    + self.results[_feeder_ref]["lv_oh_3ph_len_mi"]
                 )
+                / float(
+                    self.results[_feeder_ref]["lv_len_mi"]
+                    + self.results[_feeder_ref]["mv_len_mi"]
+                )
+                * 100
+            )
+        except ZeroDivisionError:
+            self.results[_feeder_ref]["perct_lv_oh_len"] = np.nan
+
+        # Sectionalizers per recloser
+        if float(self.results[_feeder_ref]["num_reclosers"]) != 0:
+            self.results[_feeder_ref]["num_sectionalizers_per_recloser"] = float(
+                self.results[_feeder_ref]["num_sectionalizers"]
+            ) / float(self.results[_feeder_ref]["num_reclosers"])
+        else:
+            self.results[_feeder_ref]["num_sectionalizers_per_recloser"] = np.nan
+
+        # Average load power factor
+        self.results[_feeder_ref]["avg_load_pf"] = np.mean(
+            self.results[_feeder_ref]["power_factor_distribution"]
+        )
+
+        # Average imbalance of load by phase
+        #
+        # sum_i |tot_demand_phase_i - 1/3 * tot_demand|
+        if self.results[_feeder_ref]["sum_load_kw"] != 0:
+            third_tot_demand = self.results[_feeder_ref]["sum_load_kw"] / 3.0
+            self.results[_feeder_ref]["avg_load_imbalance_by_phase"] = (
+                abs(self.results[_feeder_ref]["sum_load_pha_kw"] - third_tot_demand)
+                + abs(self.results[_feeder_ref]["sum_load_phb_kw"] - third_tot_demand)
+                + abs(self.results[_feeder_ref]["sum_load_phc_kw"] - third_tot_demand)
+            ) / self.results[_feeder_ref]["sum_load_kw"]
+        else:
+            self.results[_feeder_ref]["avg_load_imbalance_by_phase"] = np.nan
+
+        # Ratio of LV line length to number of customers
+        if self.results[_feeder_ref]["num_customers"] != 0:
+            self.results[_feeder_ref]["ratio_lv_len_to_num_cust"] = self.results[
+                _feeder_ref
+            ]["lv_len_mi"] / float(self.results[_feeder_ref]["num_customers"])
+        else:
+            self.results[_feeder_ref]["ratio_mv_len_to_num_cust"] = np.nan
+
+        # Line impedances
+        #
+        # Average and Maximum MV line impedance from substation to MV side of distribution transformer
+        self.results[_feeder_ref]["avg_mv_line_impedance_sub_transformers"] = {}
+        self.results[_feeder_ref]["max_mv_line_impedance_sub_transformers"] = {}
+
+        for trans_name, imp_list in self.results[_feeder_ref][
+            "sub_trans_impedance_list"
+        ].items():
+            if len(imp_list) > 0:
+                self.results[_feeder_ref]["avg_mv_line_impedance_sub_transformers"][
+                    trans_name
+                ] = np.mean(imp_list)
+                self.results[_feeder_ref]["max_mv_line_impedance_sub_transformers"][
+                    trans_name
+                ] = np.max(imp_list)
             else:
-                self.results[_feeder_ref]["perct_lv_pha_load_kw"] = 0
-                self.results[_feeder_ref]["perct_lv_phb_load_kw"] = 0
-                self.results[_feeder_ref]["perct_lv_phc_load_kw"] = 0
-
-            # ratio_1phto3ph_Xfrm
-            if self.results[_feeder_ref]["num_3ph_transformers"] != 0:
-                self.results[_feeder_ref]["ratio_1ph_to_3ph_transformers"] = float(
-                    self.results[_feeder_ref]["num_1ph_transformers"]
-                ) / float(self.results[_feeder_ref]["num_3ph_transformers"])
-            else:
-                self.results[_feeder_ref]["ratio_1ph_to_3ph_transformers"] = np.inf
+                self.results[_feeder_ref]["avg_mv_line_impedance_sub_transformers"][
+                    trans_name
+                ] = None
+                self.results[_feeder_ref]["max_mv_line_impedance_sub_transformers"][
+                    trans_name
+                ] = None
 
-            # avg_nb_load_per_transformer
-            if len(self.results[_feeder_ref]["num_load_per_transformer"]) > 0:
-                self.results[_feeder_ref]["avg_num_load_per_transformer"] = np.mean(
-                    list(self.results[_feeder_ref]["num_load_per_transformer"].values())
-                )
+        # Average and Maximum LV line impedance from distribution transformer to customer
+        self.results[_feeder_ref]["avg_lv_line_impedance_transformer_cust"] = {}
+        self.results[_feeder_ref]["max_lv_line_impedance_transformer_cust"] = {}
 
-            # Convert to miles
-            for k in keys_to_convert_to_miles:
-                if k in self.results[_feeder_ref]:
-                    self.results[_feeder_ref][k] *= 0.000621371
-
-            # Divide by 10^3
-            for k in keys_to_divide_by_1000:
-                if k in self.results[_feeder_ref]:
-                    self.results[_feeder_ref][k] *= 10 ** -3
-
-            # Ratio of MV Line Length to Number of Customers
-            if self.results[_feeder_ref]["num_customers"] != 0:
-                self.results[_feeder_ref]["ratio_mv_len_to_num_cust"] = self.results[
-                    _feeder_ref
-                ]["mv_len_mi"] / float(self.results[_feeder_ref]["num_customers"])
+        for cust_name, imp_list in self.results[_feeder_ref][
+            "trans_cust_impedance_list"
+        ].items():
+            if len(imp_list) > 0:
+                self.results[_feeder_ref]["avg_lv_line_impedance_transformer_cust"][
+                    cust_name
+                ] = np.mean(imp_list)
+                self.results[_feeder_ref]["max_lv_line_impedance_transformer_cust"][
+                    cust_name
+                ] = np.max(imp_list)
             else:
-                self.results[_feeder_ref]["ratio_mv_len_to_num_cust"] = np.nan
+                self.results[_feeder_ref]["avg_lv_line_impedance_transformer_cust"][
+                    cust_name
+                ] = None
+                self.results[_feeder_ref]["max_lv_line_impedance_transformer_cust"][
+                    cust_name
+                ] = None
 
-            # Percent of Overhead MV Lines
-            try:
-                self.results[_feeder_ref]["perct_mv_oh_len"] = (
-                    (
-                        self.results[_feeder_ref]["mv_oh_1ph_len_mi"]
-                        + self.results[_feeder_ref]["mv_oh_2ph_len_mi"]
-                        + self.results[_feeder_ref]["mv_oh_3ph_len_mi"]
-                    )
-                    / float(
-                        self.results[_feeder_ref]["lv_len_mi"]
-                        + self.results[_feeder_ref]["mv_len_mi"]
-                    )
-                    * 100
-                )
-            except ZeroDivisionError:
-                self.results[_feeder_ref]["perct_mv_oh_len"] = np.nan
+        try:
+            self.results[_feeder_ref]["nominal_medium_voltage_class"] = np.max(
+                [x for x in self.results[_feeder_ref]["nominal_voltages"] if x != None]
+            )
+        except:
+            self.results[_feeder_ref]["nominal_medium_voltage_class"] = np.nan
 
-            # Percent of Overhead LV Lines
-            try:
-                self.results[_feeder_ref]["perct_lv_oh_len"] = (
-                    (
-                        self.results[_feeder_ref]["lv_oh_1ph_len_mi"]
-                        + self.results[_feeder_ref]["lv_oh_2ph_len_mi"]
-                        + self.results[_feeder_ref]["lv_oh_3ph_len_mi"]
-                    )
-                    / float(
-                        self.results[_feeder_ref]["lv_len_mi"]
-                        + self.results[_feeder_ref]["mv_len_mi"]
-                    )
-                    * 100
-                )
-            except ZeroDivisionError:
-                self.results[_feeder_ref]["perct_lv_oh_len"] = np.nan
+        # Density metrics
+        #
+        # Ignore tiny feeders
+        self.set_footprint_metrics(_feeder_ref, min_unique_points=5)
 
-            # Sectionalizers per recloser
-            if float(self.results[_feeder_ref]["num_reclosers"]) != 0:
-                self.results[_feeder_ref]["num_sectionalizers_per_recloser"] = float(
-                    self.results[_feeder_ref]["num_sectionalizers"]
-                ) / float(self.results[_feeder_ref]["num_reclosers"])
-            else:
-                self.results[_feeder_ref]["num_sectionalizers_per_recloser"] = np.nan
+    def take_snapshot(self):
+        """
+        Returns a snapshot of the named objects of the model: a dictionary mapping the object ids to
+        (object, connections, fingerprint of the attributes).
+        """
+        return {
+            id(obj): (obj, _topology_key(obj), _fingerprint(obj))
+            for obj in self.model.models
+            if hasattr(obj, "name")
+        }
 
-            # Average load power factor
-            self.results[_feeder_ref]["avg_load_pf"] = np.mean(
-                self.results[_feeder_ref]["power_factor_distribution"]
+    def track_feeder_dependencies(self, feeder_names):
+        """
+        Records the objects and nodes the results of the given feeders depend on (See feeder_dependencies)
+        and takes a snapshot of the model, such that refresh can find the feeders affected by later edits.
+        """
+        for feeder_name, _, nodes, references, _ in self.feeder_dependencies(
+            feeder_names
+        ):
+            self._feeder_dependencies[feeder_name] = (
+                set(id(obj) for obj in references),
+                nodes,
             )
+        self._snapshot = self.take_snapshot()
 
-            # Average imbalance of load by phase
-            #
-            # sum_i |tot_demand_phase_i - 1/3 * tot_demand|
-            if self.results[_feeder_ref]["sum_load_kw"] != 0:
-                third_tot_demand = self.results[_feeder_ref]["sum_load_kw"] / 3.0
-                self.results[_feeder_ref]["avg_load_imbalance_by_phase"] = (
-                    abs(self.results[_feeder_ref]["sum_load_pha_kw"] - third_tot_demand)
-                    + abs(
-                        self.results[_feeder_ref]["sum_load_phb_kw"] - third_tot_demand
-                    )
-                    + abs(
-                        self.results[_feeder_ref]["sum_load_phc_kw"] - third_tot_demand
-                    )
-                ) / self.results[_feeder_ref]["sum_load_kw"]
-            else:
-                self.results[_feeder_ref]["avg_load_imbalance_by_phase"] = np.nan
+    def diff_snapshot(self):
+        """
+        Compares the model with the last snapshot (See take_snapshot).
+        Returns the ids of the modified, added and removed objects, the list of modified and added objects,
+        the nodes touched by modified connections, and whether the connections were modified.
+        """
+        changed_ids = set()
+        changed_objects = []
+        touched_nodes = set()
+        topology_changed = False
+        current_ids = set()
+        for obj in self.model.models:
+            if not hasattr(obj, "name"):
+                continue
+            current_ids.add(id(obj))
+            previous = self._snapshot.get(id(obj))
+            if previous is not None and previous[2] == _fingerprint(obj):
+                continue
+            changed_ids.add(id(obj))
+            changed_objects.append(obj)
+            key = _topology_key(obj)
+            if previous is None or previous[1] != key:
+                topology_changed = True
+                touched_nodes.update([n for n in key if n is not None])
+                if previous is not None:
+                    touched_nodes.update([n for n in previous[1] if n is not None])
+        for obj_id, (obj, key, _) in self._snapshot.items():
+            if obj_id not in current_ids:
+                topology_changed = True
+                changed_ids.add(obj_id)
+                touched_nodes.update([n for n in key if n is not None])
+        return changed_ids, changed_objects, touched_nodes, topology_changed
+
+    def refresh(self):
+        """
+        Recomputes the metrics of the feeders affected by the edits made to the model since the last call to
+        compute_all_metrics_per_feeder or refresh (ex: after applying a layer or Modifier.merge).
 
-            # Ratio of LV line length to number of customers
-            if self.results[_feeder_ref]["num_customers"] != 0:
-                self.results[_feeder_ref]["ratio_lv_len_to_num_cust"] = self.results[
-                    _feeder_ref
-                ]["lv_len_mi"] / float(self.results[_feeder_ref]["num_customers"])
-            else:
-                self.results[_feeder_ref]["ratio_mv_len_to_num_cust"] = np.nan
+        The objects of the model are compared with the snapshot taken after the last computation:
 
-            # Line impedances
-            #
-            # Average and Maximum MV line impedance from substation to MV side of distribution transformer
-            self.results[_feeder_ref]["avg_mv_line_impedance_sub_transformers"] = {}
-            self.results[_feeder_ref]["max_mv_line_impedance_sub_transformers"] = {}
-
-            for trans_name, imp_list in self.results[_feeder_ref][
-                "sub_trans_impedance_list"
-            ].items():
-                if len(imp_list) > 0:
-                    self.results[_feeder_ref]["avg_mv_line_impedance_sub_transformers"][
-                        trans_name
-                    ] = np.mean(imp_list)
-                    self.results[_feeder_ref]["max_mv_line_impedance_sub_transformers"][
-                        trans_name
-                    ] = np.max(imp_list)
-                else:
-                    self.results[_feeder_ref]["avg_mv_line_impedance_sub_transformers"][
-                        trans_name
-                    ] = None
-                    self.results[_feeder_ref]["max_mv_line_impedance_sub_transformers"][
-                        trans_name
-                    ] = None
-
-            # Average and Maximum LV line impedance from distribution transformer to customer
-            self.results[_feeder_ref]["avg_lv_line_impedance_transformer_cust"] = {}
-            self.results[_feeder_ref]["max_lv_line_impedance_transformer_cust"] = {}
-
-            for cust_name, imp_list in self.results[_feeder_ref][
-                "trans_cust_impedance_list"
-            ].items():
-                if len(imp_list) > 0:
-                    self.results[_feeder_ref]["avg_lv_line_impedance_transformer_cust"][
-                        cust_name
-                    ] = np.mean(imp_list)
-                    self.results[_feeder_ref]["max_lv_line_impedance_transformer_cust"][
-                        cust_name
-                    ] = np.max(imp_list)
-                else:
-                    self.results[_feeder_ref]["avg_lv_line_impedance_transformer_cust"][
-                        cust_name
-                    ] = None
-                    self.results[_feeder_ref]["max_lv_line_impedance_transformer_cust"][
-                        cust_name
-                    ] = None
+            - If only attributes were modified, the attributes of the network are updated in place.
+              The nominal voltages are set again if a transformer, a power source or a nominal voltage was modified.
+            - If objects were added or removed, or if connections were modified, the network is built again and split into feeders.
 
-            try:
-                self.results[_feeder_ref]["nominal_medium_voltage_class"] = np.max(
-                    [
-                        x
-                        for x in self.results[_feeder_ref]["nominal_voltages"]
-                        if x != None
-                    ]
-                )
-            except:
-                self.results[_feeder_ref]["nominal_medium_voltage_class"] = np.nan
+        Only the feeders depending on a modified object, or on a node touched by a modified connection,
+        are analyzed again. The results of the other feeders are kept.
 
-            # Density metrics
-            #
-            # Get the list of points for the feeder
-            self.results[_feeder_ref]["cust_density"] = np.nan
-            self.results[_feeder_ref]["load_density_kw"] = np.nan
-            self.results[_feeder_ref]["load_density_kvar"] = np.nan
-            self.results[_feeder_ref]["kva_density"] = np.nan
+        **Usage:**
 
-            try:
-                _points = np.array(self.points[_feeder_ref])
-            except KeyError:
-                _points = []
-            # Having more than 2 points to compute the convex hull surface is a good thing...
-            unique_points = set()
-            for arr in _points:
-                unique_points.add(tuple(list(arr)))
-            if len(_points) > 2 and len(unique_points) > 4:  # Ignore tiny feeders
-                hull = ConvexHull(_points)  # Compute the Convex Hull using Scipy
-                hull_surf_sqmile = (
-                    hull.area * 3.86102 * 10 ** -7
-                )  # Convert surface from square meters to square miles
-                self.results[_feeder_ref][
-                    "convex_hull_area_sqmi"
-                ] = hull_surf_sqmile  # Store the convex hull area
-                if hull_surf_sqmile != 0:
-                    self.results[_feeder_ref]["cust_density"] = float(
-                        self.results[_feeder_ref]["num_customers"]
-                    ) / float(hull_surf_sqmile)
-                    self.results[_feeder_ref]["load_density_kw"] = float(
-                        self.results[_feeder_ref]["sum_load_kw"]
-                    ) / float(hull_surf_sqmile)
-                    self.results[_feeder_ref]["load_density_kvar"] = float(
-                        self.results[_feeder_ref]["sum_load_kvar"]
-                    ) / float(hull_surf_sqmile)
-                    self.results[_feeder_ref]["kva_density"] = float(
-                        10 ** 3
-                        * self.results[_feeder_ref]["sum_distribution_transformer_mva"]
-                    ) / float(hull_surf_sqmile)
+            >>> analyst.compute_all_metrics_per_feeder()
+            >>> Modifier().merge(model, layer_model)
+            >>> analyst.refresh()
+            ['feeder_3']
+
+        :returns: The names of the recomputed feeders
+        :rtype: List(str)
+        """
+        if self._snapshot is None:
+            raise ValueError(
+                "No results to refresh. Call compute_all_metrics_per_feeder first."
+            )
+
+        changed_ids, changed_objects, touched_nodes, topology_changed = (
+            self.diff_snapshot()
+        )
+        if topology_changed or any(
+            _voltage_changed(obj, self._snapshot.get(id(obj), (None, None, None))[2])
+            for obj in changed_objects
+        ):
+            # Set the attributes derived from the topology and the transformers (nominal voltages,
+            # upstream transformers...) as done when the analyzer is created, and include their changes
+            modifier = system_structure_modifier(self.model, self.source)
+            modifier.set_nominal_voltages()
+            (
+                changed_ids,
+                changed_objects,
+                touched_nodes,
+                topology_changed,
+            ) = self.diff_snapshot()
+
+        if len(changed_ids) == 0:
+            return []
+
+        self.model.set_names()
+        previous_nodes = {
+            k: set(net.nodes()) for k, net in self.feeder_networks.items()
+        }
+        if topology_changed:
+            previous_graph_nodes = set(self.G.graph.nodes())
+            network = Network()
+            network.build(self.model, source=self.source)
+            self.provide_network(network)
+
+            # New nodes join the feeder they are connected to
+            feeder_index = {k: idx for idx, k in enumerate(self.feeder_names)}
+            stack = [n for n in self.G.graph.nodes() if n in self.node_feeder_mapping]
+            while stack:
+                node = stack.pop()
+                feeder_name = self.node_feeder_mapping[node]
+                for neighbor in self.G.graph[node]:
+                    if (
+                        neighbor not in previous_graph_nodes
+                        and neighbor not in self.node_feeder_mapping
+                    ):
+                        self.node_feeder_mapping[neighbor] = feeder_name
+                        self.feeder_nodes[feeder_index[feeder_name]].append(neighbor)
+                        stack.append(neighbor)
+
+            self.node_feeder_mapping = {}
+            self.split_network_into_feeders()
+        else:
+            self.G.set_attributes(_FeederModel(changed_objects))
+            self._distance_cache = {}
+            self._hop_cache = {}
+        self._aggregator = None
+
+        # Transformers serving different loads (or loads with a different kVA) affect their feeder
+        previous_mapping = self.transformer_load_mapping
+        previous_kva = self.transformer_load_kva
+        self.transformer_load_mapping = self.get_transformer_load_mapping()
+        self.transformer_load_kva = self.get_transformer_load_kva()
+        mapping_feeders = set()
+        for name in set(previous_mapping) | set(self.transformer_load_mapping):
+            if previous_mapping.get(name) != self.transformer_load_mapping.get(
+                name
+            ) or previous_kva.get(name) != self.transformer_load_kva.get(name):
+                try:
+                    mapping_feeders.add(self.get_feeder(self.model[name]))
+                except KeyError:
+                    pass
+        self.compute_node_line_mapping()
+
+        mv_feeder_names = [
+            k
+            for k in self.feeder_names
+            if self.substations[k] is not None and len(self.substations[k]) > 0
+        ]
+        affected = []
+        for feeder_name in mv_feeder_names:
+            dependencies = self._feeder_dependencies.get(feeder_name)
+            if (
+                dependencies is None
+                or feeder_name in mapping_feeders
+                or len(dependencies[0] & changed_ids) > 0
+                or len(dependencies[1] & touched_nodes) > 0
+                or previous_nodes.get(feeder_name)
+                != set(self.feeder_networks[feeder_name].nodes())
+            ):
+                affected.append(feeder_name)
+
+        self.analyze_feeders(affected)
+        self.set_scalar_metrics(affected)
+        for feeder_name in affected:
+            self.post_process_feeder_results(feeder_name)
+        self.load_distribution = [
+            x
+            for feeder_name in mv_feeder_names
+            for x in self._feeder_load_distribution.get(feeder_name, [])
+        ]
+
+        if topology_changed:
+            self.track_feeder_dependencies(mv_feeder_names)
+        else:
+            self.track_feeder_dependencies(affected)
+        return affected
 
     def compute_all_metrics(self, *args, **kwargs):
         """
@@ -1706,8 +2361,12 @@ class NetworkAnalyzer(object):
                 "compute_kva_density_with_transformers"
             ]
 
+        self._distance_cache = {}
+        self._hop_cache = {}
         self.results = {f_name: self.setup_results_data_structure()}
+        self._aggregator = None
         self.transformer_load_mapping = self.get_transformer_load_mapping()
+        self.transformer_load_kva = self.get_transformer_load_kva()
         self.compute_node_line_mapping()
         self.load_distribution = []
         # List of keys that will have to be converted to miles (DiTTo is in meter)
@@ -1745,11 +2404,22 @@ class NetworkAnalyzer(object):
         ]
 
         # Loop over the objects in the model and analyze them
-        for obj in self.model.models:
-            self.analyze_object(obj, f_name)
+        with profile_section(self.profiler, "analyze_objects", len(self.model.models)):
+            for obj in self.model.models:
+                self.analyze_object(obj, f_name)
+        self.collect_points([f_name], all_objects=True)
+        self.set_scalar_metrics([f_name], by_feeder=False)
 
         # Do some post-processing of the results before returning them
-        #
+        with profile_section(self.profiler, "post_processing"):
+            self._post_process_global_results(
+                f_name, keys_to_convert_to_miles, keys_to_divide_by_1000
+            )
+
+    def _post_process_global_results(
+        self, f_name, keys_to_convert_to_miles, keys_to_divide_by_1000
+    ):
+        """Post-processing of the raw results of compute_all_metrics."""
         # Compute the percentages of low voltage load kW for each phase
         _feeder_ref = f_name
 
@@ -1933,79 +2603,37 @@ class NetworkAnalyzer(object):
             self.results[_feeder_ref]["nominal_medium_voltage_class"] = np.nan
 
         # Density metrics
-        #
-        # Get the list of points for the feeder
-        self.results[_feeder_ref]["cust_density"] = np.nan
-        self.results[_feeder_ref]["load_density_kw"] = np.nan
-        self.results[_feeder_ref]["load_density_kvar"] = np.nan
-        self.results[_feeder_ref]["kva_density"] = np.nan
+        self.set_footprint_metrics(_feeder_ref)
 
-        try:
-            _points = np.array(self.points[_feeder_ref])
-        except KeyError:
-            _points = []
-        # Having more than 2 points to compute the convex hull surface is a good thing...
-        if len(_points) > 2:
-            hull = ConvexHull(_points)  # Compute the Convex Hull using Scipy
-            hull_surf_sqmile = (
-                hull.area * 3.86102 * 10 ** -7
-            )  # Convert surface from square meters to square miles
-            self.results[_feeder_ref][
-                "convex_hull_area_sqmi"
-            ] = hull_surf_sqmile  # Store the convex hull area
-            if hull_surf_sqmile != 0:
-                self.results[_feeder_ref]["cust_density"] = float(
-                    self.results[_feeder_ref]["num_customers"]
-                ) / float(hull_surf_sqmile)
-                self.results[_feeder_ref]["load_density_kw"] = float(
-                    self.results[_feeder_ref]["sum_load_kw"]
-                ) / float(hull_surf_sqmile)
-                self.results[_feeder_ref]["load_density_kvar"] = float(
-                    self.results[_feeder_ref]["sum_load_kvar"]
-                ) / float(hull_surf_sqmile)
-                self.results[_feeder_ref]["kva_density"] = float(
-                    10 ** 3
-                    * self.results[_feeder_ref]["sum_distribution_transformer_mva"]
-                ) / float(hull_surf_sqmile)
-
-    def number_of_regulators(self):
+    @profiled
+    def number_of_regulators(self, feeder_name=None):
         """Returns the number of regulators."""
-        return sum([1 for obj in self.model.models if isinstance(obj, Regulator)])
+        return len(self._select(self.extract("Regulator"), None, feeder_name))
 
-    def number_of_fuses(self):
+    @profiled
+    def number_of_fuses(self, feeder_name=None):
         """Returns the number of fuses."""
-        return sum(
-            [
-                1
-                for obj in self.model.models
-                if isinstance(obj, Line) and obj.is_fuse == 1
-            ]
-        )
+        lines = self.extract("Line")
+        return len(self._select(lines, lines["is_fuse"], feeder_name))
 
-    def number_of_reclosers(self):
+    @profiled
+    def number_of_reclosers(self, feeder_name=None):
         """Returns the number of reclosers."""
-        return sum(
-            [
-                1
-                for obj in self.model.models
-                if isinstance(obj, Line) and obj.is_recloser == 1
-            ]
-        )
+        lines = self.extract("Line")
+        return len(self._select(lines, lines["is_recloser"], feeder_name))
 
-    def number_of_switches(self):
+    @profiled
+    def number_of_switches(self, feeder_name=None):
         """Returns the number of switches."""
-        return sum(
-            [
-                1
-                for obj in self.model.models
-                if isinstance(obj, Line) and obj.is_switch == 1
-            ]
-        )
+        lines = self.extract("Line")
+        return len(self._select(lines, lines["is_switch"], feeder_name))
 
-    def number_of_capacitors(self):
+    @profiled
+    def number_of_capacitors(self, feeder_name=None):
         """Returns the number of capacitors."""
-        return sum([1 for obj in self.model.models if isinstance(obj, Capacitor)])
+        return len(self._select(self.extract("Capacitor"), None, feeder_name))
 
+    @profiled
     def average_degree(self, *args):
         """Returns the average degree of the network."""
         if args:
@@ -2013,13 +2641,19 @@ class NetworkAnalyzer(object):
         else:
             return np.mean([x[1] for x in list(nx.degree(self.G.graph))])
 
+    @profiled
     def diameter(self, *args):
         """Returns the diameter of the network."""
         if args:
-            return nx.diameter(args[0])
+            _net = args[0]
         else:
-            return nx.diameter(self.G.graph)
+            _net = self.G.graph
+        tree_statistics = self.tree_hop_statistics(_net)
+        if tree_statistics is not None:
+            return tree_statistics[0]
+        return nx.diameter(_net)
 
+    @profiled
     def loops_within_feeder(self, *args):
         """Returns the number of loops within a feeder."""
         if args:
@@ -2027,95 +2661,102 @@ class NetworkAnalyzer(object):
         else:
             return len(nx.cycle_basis(self.G.graph))
 
+    def downstream_aggregator(self):
+        """
+        Returns the aggregation of the loads and DER downstream of the devices of the network
+        (See ditto.network.aggregation). Built once from the digraph and cached.
+        """
+        if self._aggregator is None:
+            self._aggregator = DownstreamAggregator(self.model, self.G.digraph)
+        return self._aggregator
+
+    @profiled
     def get_transformer_load_mapping(self):
         """
-        Loop over the loads and go upstream in the network until a distribution transformer is found.
+        Maps every load to the closest distribution transformer upstream of it.
         Returns a dictionary where keys are transformer names and values are lists holding names of
         loads downstream of the transformer.
         """
-        transformer_load_mapping = {}
-        load_list = []
-        for _obj in self.model.models:
-            if isinstance(_obj, Load):
-                load_list.append(_obj)
-
-        # Get the connecting elements of the loads.
-        # These will be the starting points of the upstream walks in the graph
-        connecting_elements = [load.connecting_element for load in load_list]
-
-        # For each connecting element...
-        for idx, end_node in enumerate(connecting_elements):
-
-            if self.G.digraph.has_node(end_node):
-                should_continue = True
-            else:
-                should_continue = False
-
-            # Find the upstream transformer by walking the graph upstream
-            while should_continue:
-
-                # Get predecessor node of current node in the DAG
-                try:
-                    from_node = next(self.G.digraph.predecessors(end_node))
-                except StopIteration:
-                    should_continue = False
-                    continue
-
-                # Look for the type of equipment that makes the connection between from_node and to_node
-                _type = None
-                if (from_node, end_node) in self.edge_equipment:
-                    _type = self.edge_equipment[(from_node, end_node)]
-                elif (end_node, from_node) in self.edge_equipment:
-                    _type = self.edge_equipment[(end_node, from_node)]
-
-                # It could be a Line, a Transformer...
-                # If it is a transformer, then we have found the upstream transformer...
-                if _type == "PowerTransformer":
-
-                    # ...we can then stop the loop...
-                    should_continue = False
-
-                    # ...and grab the transformer name to retrieve the data from the DiTTo object
-                    if (from_node, end_node) in self.edge_equipment_name:
-                        transformer_name = self.edge_equipment_name[
-                            (from_node, end_node)
-                        ]
-                    elif (end_node, from_node) in self.edge_equipment_name:
-                        transformer_name = self.edge_equipment_name[
-                            (end_node, from_node)
-                        ]
-                    # If we cannot find the object, raise an error because it sould not be the case...
-                    else:
-                        raise ValueError(
-                            "Unable to find equipment between {_from} and {_to}".format(
-                                _from=from_node, _to=end_node
-                            )
-                        )
-
-                    if transformer_name in transformer_load_mapping:
-                        transformer_load_mapping[transformer_name].append(
-                            load_list[idx].name
-                        )
-                    else:
-                        transformer_load_mapping[transformer_name] = [
-                            load_list[idx].name
-                        ]
+        return self.downstream_aggregator().load_mapping("PowerTransformer")
 
-                # Go upstream...
-                end_node = from_node
-
-        return transformer_load_mapping
+    @profiled
+    def get_transformer_load_kva(self):
+        """
+        Returns a dictionary where keys are transformer names and values are the total kVA
+        of the loads in transformer_load_mapping.
+        """
+        aggregator = self.downstream_aggregator()
+        return {
+            transformer_name: aggregator.totals_of_loads(load_names)["kva"]
+            for transformer_name, load_names in self.transformer_load_mapping.items()
+        }
 
+    @profiled
     def average_path_length(self, *args):
         """Returns the average path length of the network."""
+        if args:
+            _net = args[0]
+        else:
+            _net = self.G.graph
+        tree_statistics = self.tree_hop_statistics(_net)
+        if tree_statistics is not None:
+            return tree_statistics[1]
         if args:
             try:
-                return nx.average_shortest_path_length(args[0])
+                return nx.average_shortest_path_length(_net)
             except ZeroDivisionError:
                 return 0
         else:
-            return nx.average_shortest_path_length(self.G.graph)
+            return nx.average_shortest_path_length(_net)
+
+    def tree_hop_statistics(self, net):
+        """
+        Returns the diameter and the average path length (in number of edges) of the network if it is a tree,
+        None otherwise. Results are cached per network.
+
+        Both are computed from BFS traversals instead of all the pairs of nodes:
+
+            - The diameter is the eccentricity of the furthest node from an arbitrary node (double sweep).
+            - Each edge lies on the paths between the nodes of the subtree under it and all the other nodes,
+              so the sum of all path lengths is the sum of size*(N-size) over the subtrees.
+        """
+        key = id(net)
+        if key in self._hop_cache and self._hop_cache[key][0] is net:
+            return self._hop_cache[key][1]
+
+        statistics = None
+        n_nodes = net.number_of_nodes()
+        if n_nodes > 0 and net.number_of_edges() == n_nodes - 1:
+            start = next(iter(net.nodes()))
+            depth = nx.single_source_shortest_path_length(net, start)
+            # A graph with N-1 edges is a tree if and only if it is connected
+            if len(depth) == n_nodes:
+                furthest = max(depth, key=depth.get)
+                diameter = max(
+                    nx.single_source_shortest_path_length(net, furthest).values()
+                )
+
+                parent = {start: None}
+                order = [start]
+                for n1, n2 in nx.bfs_edges(net, start):
+                    parent[n2] = n1
+                    order.append(n2)
+                size = dict.fromkeys(order, 1)
+                total = 0
+                for node in reversed(order):
+                    if parent[node] is not None:
+                        size[parent[node]] += size[node]
+                        total += size[node] * (n_nodes - size[node])
+                if n_nodes > 1:
+                    average_path_length = 2 * total / (n_nodes * (n_nodes - 1))
+                else:
+                    average_path_length = 0
+                statistics = (diameter, average_path_length)
 
+        self._hop_cache[key] = (net, statistics)
+        return statistics
+
+    @profiled
     def compute_node_line_mapping(self):
         """
         Compute the following mapping:
@@ -2134,6 +2775,7 @@ class NetworkAnalyzer(object):
                         (obj.from_element, obj.to_element)
                     ] = obj.name
 
+    @profiled
     def get_impedance_list_between_nodes(self, net, node1, node2):
         """TODO"""
         impedance_list = []
@@ -2174,6 +2816,7 @@ class NetworkAnalyzer(object):
                 line_list.append(self.node_line_mapping[edge[::-1]])
         return line_list
 
+    @profiled
     def average_regulator_sub_distance(self, *args):
         """
         Returns the average distance between the substation and the regulators (if any).
@@ -2187,25 +2830,18 @@ class NetworkAnalyzer(object):
         else:
             _net = self.G.graph
             _src = self.source
-        _net = _net.copy()
-        if not _net.has_node(_src):
-            _sp = nx.shortest_path(self.G.graph, _src, list(_net.nodes())[0])
-            for n1, n2 in zip(_sp[:-1], _sp[1:]):
-                _net.add_edge(n1, n2, length=self.G.graph[n1][n2]["length"])
+        dist = self.source_distances(_net, _src)
         L = []
         for obj in self.model.models:
             if isinstance(obj, Regulator):
-                if _net.has_node(obj.from_element):
-                    L.append(
-                        nx.shortest_path_length(
-                            _net, _src, obj.from_element, weight="length"
-                        )
-                    )
+                if obj.from_element in dist:
+                    L.append(dist[obj.from_element])
         if len(L) > 0:
             return np.mean(L)
         else:
             return np.nan
 
+    @profiled
     def average_capacitor_sub_distance(self, *args):
         """
         Returns the average distance between the substation and the capacitors (if any).
@@ -2219,25 +2855,18 @@ class NetworkAnalyzer(object):
         else:
             _net = self.G.graph
             _src = self.source
-        _net = _net.copy()
-        if not _net.has_node(_src):
-            _sp = nx.shortest_path(self.G.graph, _src, list(_net.nodes())[0])
-            for n1, n2 in zip(_sp[:-1], _sp[1:]):
-                _net.add_edge(n1, n2, length=self.G.graph[n1][n2]["length"])
+        dist = self.source_distances(_net, _src)
         L = []
         for obj in self.model.models:
             if isinstance(obj, Capacitor):
-                if _net.has_node(obj.connecting_element):
-                    L.append(
-                        nx.shortest_path_length(
-                            _net, _src, obj.connecting_element, weight="length"
-                        )
-                    )
+                if obj.connecting_element in dist:
+                    L.append(dist[obj.connecting_element])
         if len(L) > 0:
             return np.mean(L)
         else:
             return np.nan
 
+    @profiled
     def average_recloser_sub_distance(self, *args):
         """
         Returns the average distance between the substation and the reclosers (if any).
@@ -2251,31 +2880,29 @@ class NetworkAnalyzer(object):
         else:
             _net = self.G.graph
             _src = self.source
-        _net = _net.copy()
-        if not _net.has_node(_src):
-            _sp = nx.shortest_path(self.G.graph, _src, list(_net.nodes())[0])
-            for n1, n2 in zip(_sp[:-1], _sp[1:]):
-                _net.add_edge(n1, n2, length=self.G.graph[n1][n2]["length"])
+        dist = self.source_distances(_net, _src)
         L = []
         for obj in self.model.models:
             if isinstance(obj, Line) and obj.is_recloser == 1:
                 if hasattr(obj, "from_element") and obj.from_element is not None:
-                    if _net.has_node(obj.from_element):
-                        L.append(
-                            nx.shortest_path_length(
-                                _net, _src, obj.from_element, weight="length"
-                            )
-                        )
+                    if obj.from_element in dist:
+                        L.append(dist[obj.from_element])
         if len(L) > 0:
             return np.mean(L)
         else:
             return np.nan
 
-    def furtherest_node_miles(self, *args):
+    def source_distances(self, *args):
         """
-        Returns the maximum eccentricity from the source, in miles.
+        Returns a dictionary mapping each node of the network to its distance (in meters) from the source.
+
+        The distances are computed with a single Dijkstra traversal and cached per network and source,
+        such that all the distance metrics (furthest node, distances between the substation and the devices...) share it.
+        If the source is not in the network, the shortest path from the source to the network is added first.
+
+        **Usage:**
 
-        .. warning:: Not working....
+            >>> distances=analyst.source_distances(network, source)
         """
         if args:
             if len(args) == 1:
@@ -2286,14 +2913,35 @@ class NetworkAnalyzer(object):
         else:
             _net = self.G.graph
             _src = self.source
-        dist = {}
-        _net = _net.copy()
+        key = (id(_net), _src)
+        if key in self._distance_cache and self._distance_cache[key][0] is _net:
+            return self._distance_cache[key][1]
+
+        _net2 = _net
         if not _net.has_node(_src):
+            _net2 = _net.copy()
             _sp = nx.shortest_path(self.G.graph, _src, list(_net.nodes())[0])
             for n1, n2 in zip(_sp[:-1], _sp[1:]):
-                _net.add_edge(n1, n2, length=self.G.graph[n1][n2]["length"])
-        for node in _net.nodes():
-            dist[node] = nx.shortest_path_length(_net, _src, node, weight="length")
+                _net2.add_edge(n1, n2, length=self.G.graph[n1][n2]["length"])
+        dist = nx.single_source_dijkstra_path_length(_net2, _src, weight="length")
+        self._distance_cache[key] = (_net, dist)
+        return dist
+
+    def source_distance_distribution(self, *args):
+        """
+        Returns the distribution of the distances (eccentricities from the source) of the nodes, in miles.
+        Takes the same arguments as source_distances.
+        """
+        return [
+            d * 0.000621371 for d in self.source_distances(*args).values()
+        ]  # Convert length to miles
+
+    @profiled
+    def furtherest_node_miles(self, *args):
+        """
+        Returns the maximum eccentricity from the source, in miles.
+        """
+        dist = self.source_distances(*args)
         return np.max(list(dist.values())) * 0.000621371  # Convert length to miles
 
     def furtherest_node_miles_clever(self):
@@ -2301,136 +2949,405 @@ class NetworkAnalyzer(object):
         Returns the maximum eccentricity from the source, in miles.
 
         Relies on the assumption that the furthrest node is a leaf, which is often True in distribution systems.
+        """
+        dist = self.source_distances()
+        return (
+            np.max([d for node, d in dist.items() if self.G.graph.degree(node) == 1])
+            * 0.000621371
+        )  # Convert length to miles
+
+    @profiled
+    def build_extracts(self, class_names=None):
+        """
+        Loops once over the objects of the model and builds one columnar table (pandas DataFrame) per equipment class.
+        The scalar metrics are reductions over these tables, such that they do not loop over the model again.
+
+        The tables are:
 
-        .. warning:: Not working....
+            - Line: name, feeder, length, nominal_voltage, num_phases, num_active_phases, line_type, is_fuse, is_switch, is_recloser, is_breaker, is_sectionalizer
+            - Load: name, feeder, nominal_voltage, num_phase_loads, num_active_phase_loads, p, q, num_users
+            - PhaseLoad: load, feeder, nominal_voltage (of the load), phase, drop, p, q
+            - Regulator: name, feeder
+            - Capacitor: name, feeder
+
+        The active phases and phase loads are the ones which are not dropped.
+        The feeder column is None if the network was not split into feeders.
+        Missing numerical values are NaN.
+        Only the tables of class_names are built if given.
         """
-        dist = {}
-        for node in self.G.graph.nodes():
-            if nx.degree(self.G.graph, node) == 1:
-                dist[node] = nx.shortest_path_length(
-                    self.G.graph, self.source, node, weight="length"
-                )
-        return np.max(list(dist.values())) * 0.000621371  # Convert length to miles
+        columns = {
+            "Line": [
+                "name",
+                "feeder",
+                "length",
+                "nominal_voltage",
+                "num_phases",
+                "num_active_phases",
+                "line_type",
+                "is_fuse",
+                "is_switch",
+                "is_recloser",
+                "is_breaker",
+                "is_sectionalizer",
+            ],
+            "Load": [
+                "name",
+                "feeder",
+                "nominal_voltage",
+                "num_phase_loads",
+                "num_active_phase_loads",
+                "p",
+                "q",
+                "num_users",
+            ],
+            "PhaseLoad": [
+                "load",
+                "feeder",
+                "nominal_voltage",
+                "phase",
+                "drop",
+                "p",
+                "q",
+            ],
+            "Regulator": ["name", "feeder"],
+            "Capacitor": ["name", "feeder"],
+        }
+        if class_names is not None:
+            columns = {k: columns[k] for k in class_names}
+        numerical_columns = [
+            "length",
+            "nominal_voltage",
+            "num_phases",
+            "num_active_phases",
+            "num_phase_loads",
+            "num_active_phase_loads",
+            "p",
+            "q",
+            "num_users",
+        ]
+        rows = {k: [] for k in columns}
+        # The phase loads are read from their loads
+        classes = tuple(
+            c
+            for c, names in [
+                (Line, ["Line"]),
+                (Load, ["Load", "PhaseLoad"]),
+                (Regulator, ["Regulator"]),
+                (Capacitor, ["Capacitor"]),
+            ]
+            if any(name in columns for name in names)
+        )
 
-    def lv_length_miles(self):
-        """Returns the sum of the low voltage line lengths in miles."""
-        total_length = 0
+        has_feeders = len(self.node_feeder_mapping) > 0
         for obj in self.model.models:
-            if isinstance(obj, Line):
-                if obj.nominal_voltage <= self.LV_threshold:
-                    if hasattr(obj, "length") and obj.length >= 0:
-                        total_length += obj.length
-        return total_length * 0.000621371  # Convert length to miles
+            if not isinstance(obj, classes):
+                continue
+            feeder_name = self.get_feeder(obj) if has_feeders else None
 
-    def mv_length_miles(self):
-        """Returns the sum of the medium voltage line lengths in miles."""
-        total_length = 0
-        for obj in self.model.models:
             if isinstance(obj, Line):
-                if self.MV_threshold >= obj.nominal_voltage > self.LV_threshold:
-                    if hasattr(obj, "length") and obj.length >= 0:
-                        total_length += obj.length
-        return total_length * 0.000621371  # Convert length to miles
+                if obj.wires is not None:
+                    phases = [
+                        wire for wire in obj.wires if wire.phase in ["A", "B", "C"]
+                    ]
+                    num_phases = len(phases)
+                    num_active_phases = len([wire for wire in phases if wire.drop != 1])
+                else:
+                    num_phases = None
+                    num_active_phases = None
+                rows["Line"].append(
+                    (
+                        obj.name,
+                        feeder_name,
+                        obj.length,
+                        obj.nominal_voltage,
+                        num_phases,
+                        num_active_phases,
+                        obj.line_type,
+                        obj.is_fuse == 1,
+                        obj.is_switch == 1,
+                        obj.is_recloser == 1,
+                        obj.is_breaker == 1,
+                        obj.is_sectionalizer == 1,
+                    )
+                )
 
-    def length_mvXph_miles(self, X):
-        """Returns the sum of the medium voltage, X phase, line lengths in miles."""
+            elif isinstance(obj, Load):
+                if obj.phase_loads is not None:
+                    num_phase_loads = len(obj.phase_loads)
+                    num_active_phase_loads = len(
+                        [pl for pl in obj.phase_loads if pl.drop != 1]
+                    )
+                    p = sum([pl.p for pl in obj.phase_loads if pl.p is not None])
+                    q = sum([pl.q for pl in obj.phase_loads if pl.q is not None])
+                    if "PhaseLoad" in rows:
+                        for pl in obj.phase_loads:
+                            rows["PhaseLoad"].append(
+                                (
+                                    obj.name,
+                                    feeder_name,
+                                    obj.nominal_voltage,
+                                    pl.phase,
+                                    pl.drop == 1,
+                                    pl.p,
+                                    pl.q,
+                                )
+                            )
+                else:
+                    num_phase_loads = None
+                    num_active_phase_loads = None
+                    p = None
+                    q = None
+                if "Load" in rows:
+                    rows["Load"].append(
+                        (
+                            obj.name,
+                            feeder_name,
+                            obj.nominal_voltage,
+                            num_phase_loads,
+                            num_active_phase_loads,
+                            p,
+                            q,
+                            obj.num_users,
+                        )
+                    )
+
+            else:
+                rows[type(obj).__name__].append((obj.name, feeder_name))
+
+        extracts = {}
+        for class_name, class_columns in columns.items():
+            table = pd.DataFrame(rows[class_name], columns=class_columns)
+            for column in class_columns:
+                if column in numerical_columns:
+                    table[column] = pd.to_numeric(table[column]).astype(float)
+            extracts[class_name] = table
+        return extracts
+
+    def extract(self, class_name):
+        """
+        Returns the columnar table of the given equipment class (See build_extracts).
+        The table is built from the model on every call, such that the metrics follow the edits of the model.
+        """
+        return self.build_extracts([class_name])[class_name]
+
+    @profiled
+    def scalar_metrics_per_feeder(self, by_feeder=True):
+        """
+        Returns a pandas DataFrame with one row per feeder holding the additive metrics of the feeders,
+        computed with one group-by reduction per extract (See build_extracts). Objects that do not belong to a
+        feeder are grouped under NaN. With by_feeder=False, the table has a single row (named "global") for the model.
+
+        These are the raw results of analyze_object (lengths in meters, powers in W), with the same definitions:
+        line lengths per voltage class, number of active phases and type, device counts, load counts and
+        low voltage load per phase. The voltage classes compare the line to line voltages (sqrt(3) times
+        the nominal voltages) with the thresholds.
+
+        **Usage:**
+
+            >>> analyst.split_network_into_feeders()
+            >>> table=analyst.scalar_metrics_per_feeder()
+            >>> table.loc["feeder_1", "mv_len_mi"]
+        """
+        extracts = self.build_extracts()
+        lines = extracts["Line"]
+        loads = extracts["Load"]
+        phase_loads = extracts["PhaseLoad"]
+
+        def _groups(table):
+            if by_feeder:
+                return table["feeder"]
+            return pd.Series("global", index=table.index)
+
+        def _sum(table, mask, column):
+            return table[mask].groupby(_groups(table)[mask], dropna=False)[column].sum()
+
+        def _count(table, mask=None):
+            if mask is not None:
+                table = table[mask]
+            return table.groupby(_groups(table), dropna=False).size()
+
+        def _classes(table):
+            voltage = table["nominal_voltage"] * math.sqrt(3)
+            lv = voltage <= self.LV_threshold
+            mv = (self.MV_threshold > voltage) & (voltage > self.LV_threshold)
+            return lv, mv
+
+        lv_lines, mv_lines = _classes(lines)
+        valid_length = lines["length"] >= 0
+        overhead = lines["line_type"] == "overhead"
+        metrics = {}
+        for voltage, mask in [("lv", lv_lines & valid_length), ("mv", mv_lines & valid_length)]:
+            metrics["{v}_len_mi".format(v=voltage)] = _sum(lines, mask, "length")
+            for X in [1, 2, 3]:
+                phase_mask = mask & (lines["num_active_phases"] == X)
+                metrics["{v}_{X}ph_len_mi".format(v=voltage, X=X)] = _sum(
+                    lines, phase_mask, "length"
+                )
+                metrics["{v}_oh_{X}ph_len_mi".format(v=voltage, X=X)] = _sum(
+                    lines, phase_mask & overhead, "length"
+                )
+        for key, flag in [
+            ("num_fuses", "is_fuse"),
+            ("num_switches", "is_switch"),
+            ("num_reclosers", "is_recloser"),
+            ("num_breakers", "is_breaker"),
+            ("num_sectionalizers", "is_sectionalizer"),
+        ]:
+            metrics[key] = _count(lines, lines[flag])
+
+        lv_loads, mv_loads = _classes(loads)
+        for X in [1, 3]:
+            metrics["num_lv_{}ph_loads".format(X)] = _count(
+                loads, lv_loads & (loads["num_active_phase_loads"] == X)
+            )
+        metrics["num_mv_3ph_loads"] = _count(
+            loads, mv_loads & (loads["num_active_phase_loads"] == 3)
+        )
+        lv_phase_loads = (
+            _classes(phase_loads)[0]
+            & ~phase_loads["drop"].astype(bool)
+            & phase_loads["p"].notnull()
+        )
+        for X in ["A", "B", "C"]:
+            metrics["sum_lv_ph{}_load_kw".format(X.lower())] = _sum(
+                phase_loads, lv_phase_loads & (phase_loads["phase"] == X), "p"
+            )
+
+        metrics["num_regulators"] = _count(extracts["Regulator"])
+        metrics["num_capacitors"] = _count(extracts["Capacitor"])
+        return pd.DataFrame(metrics).fillna(0)
+
+    def set_scalar_metrics(self, feeder_names, by_feeder=True):
+        """
+        Sets the additive metrics of the results of the given feeders (or of the global results with
+        by_feeder=False) from a single group-by reduction (See scalar_metrics_per_feeder).
+        Called before the post-processing of the results.
+        """
+        table = self.scalar_metrics_per_feeder(by_feeder=by_feeder)
+        for feeder_name in feeder_names:
+            key = feeder_name if by_feeder else "global"
+            for column in table.columns:
+                if key in table.index:
+                    value = table.at[key, column]
+                else:
+                    value = 0
+                if column.startswith("num_"):
+                    value = int(value)
+                else:
+                    value = float(value)
+                self.results[feeder_name][column] = value
+
+    def _lv_mask(self, table):
+        """Mask of the low voltage rows of an extract."""
+        return table["nominal_voltage"] <= self.LV_threshold
+
+    def _mv_mask(self, table):
+        """Mask of the medium voltage rows of an extract."""
+        return (self.MV_threshold >= table["nominal_voltage"]) & (
+            table["nominal_voltage"] > self.LV_threshold
+        )
+
+    def _select(self, table, mask, feeder_name):
+        """Returns the rows of an extract matching the mask (if any) and the feeder (if any)."""
+        if feeder_name is not None:
+            feeder_mask = table["feeder"] == feeder_name
+            mask = feeder_mask if mask is None else mask & feeder_mask
+        if mask is None:
+            return table
+        return table[mask]
+
+    def _check_number_of_phases(self, X, allowed, msg):
+        """Validates the number of phases argument of the metrics."""
         if not isinstance(X, int):
             raise ValueError("Number of phases should be an integer.")
-        if not 1 <= X <= 3:
-            raise ValueError("Number of phases should be 1, 2, or 3.")
-        total_length = 0
-        for obj in self.model.models:
-            if isinstance(obj, Line):
-                if self.MV_threshold >= obj.nominal_voltage > self.LV_threshold:
-                    if hasattr(obj, "wires") and obj.wires is not None:
-                        phases = [
-                            wire.phase
-                            for wire in obj.wires
-                            if wire.phase in ["A", "B", "C"]
-                        ]
-                        if (
-                            len(phases) == X
-                            and hasattr(obj, "length")
-                            and obj.length >= 0
-                        ):
-                            total_length += obj.length
-        return total_length * 0.000621371  # Convert length to miles
+        if X not in allowed:
+            raise ValueError(msg)
+
+    @profiled
+    def lv_length_miles(self, feeder_name=None):
+        """Returns the sum of the low voltage line lengths in miles."""
+        lines = self.extract("Line")
+        lines = self._select(
+            lines, self._lv_mask(lines) & (lines["length"] >= 0), feeder_name
+        )
+        return lines["length"].sum() * 0.000621371  # Convert length to miles
+
+    @profiled
+    def mv_length_miles(self, feeder_name=None):
+        """Returns the sum of the medium voltage line lengths in miles."""
+        lines = self.extract("Line")
+        lines = self._select(
+            lines, self._mv_mask(lines) & (lines["length"] >= 0), feeder_name
+        )
+        return lines["length"].sum() * 0.000621371  # Convert length to miles
+
+    @profiled
+    def length_mvXph_miles(self, X, feeder_name=None):
+        """Returns the sum of the medium voltage, X phase, line lengths in miles."""
+        self._check_number_of_phases(
+            X, [1, 2, 3], "Number of phases should be 1, 2, or 3."
+        )
+        lines = self.extract("Line")
+        lines = self._select(
+            lines,
+            self._mv_mask(lines) & (lines["num_phases"] == X) & (lines["length"] >= 0),
+            feeder_name,
+        )
+        return lines["length"].sum() * 0.000621371  # Convert length to miles
 
-    def length_lvXph_miles(self, X):
+    @profiled
+    def length_lvXph_miles(self, X, feeder_name=None):
         """Returns the sum of the low voltage, X phase, line lengths in miles."""
-        if not isinstance(X, int):
-            raise ValueError("Number of phases should be an integer.")
-        if not 1 <= X <= 3:
-            raise ValueError("Number of phases should be 1, 2, or 3.")
-        total_length = 0
-        for obj in self.model.models:
-            if isinstance(obj, Line):
-                if obj.nominal_voltage <= self.LV_threshold:
-                    if hasattr(obj, "wires") and obj.wires is not None:
-                        phases = [
-                            wire.phase
-                            for wire in obj.wires
-                            if wire.phase in ["A", "B", "C"]
-                        ]
-                        if (
-                            len(phases) == X
-                            and hasattr(obj, "length")
-                            and obj.length >= 0
-                        ):
-                            total_length += obj.length
-        return total_length * 0.000621371  # Convert length to miles
+        self._check_number_of_phases(
+            X, [1, 2, 3], "Number of phases should be 1, 2, or 3."
+        )
+        lines = self.extract("Line")
+        lines = self._select(
+            lines,
+            self._lv_mask(lines) & (lines["num_phases"] == X) & (lines["length"] >= 0),
+            feeder_name,
+        )
+        return lines["length"].sum() * 0.000621371  # Convert length to miles
 
-    def total_demand(self):
+    @profiled
+    def total_demand(self, feeder_name=None):
         """Returns the sum of all loads active power in kW."""
-        tot_demand = 0
-        for obj in self.model.models:
-            if isinstance(obj, Load):
-                if hasattr(obj, "phase_loads") and obj.phase_loads is not None:
-                    tot_demand += np.sum(
-                        [pl.p for pl in obj.phase_loads if pl.p is not None]
-                    )
-        return tot_demand * 10 ** -3  # in kW
+        loads = self._select(self.extract("Load"), None, feeder_name)
+        return loads["p"].sum() * 10 ** -3  # in kW
 
-    def total_reactive_power(self):
+    @profiled
+    def total_reactive_power(self, feeder_name=None):
         """Returns the sum of all loads reactive power in kVar."""
-        tot_kVar = 0
-        for obj in self.model.models:
-            if isinstance(obj, Load):
-                if hasattr(obj, "phase_loads") and obj.phase_loads is not None:
-                    tot_kVar += np.sum(
-                        [pl.q for pl in obj.phase_loads if pl.q is not None]
-                    )
-        return tot_kVar * 10 ** -3  # in kW
+        loads = self._select(self.extract("Load"), None, feeder_name)
+        return loads["q"].sum() * 10 ** -3  # in kW
 
-    def number_of_loads_LV_Xph(self, X):
+    @profiled
+    def number_of_loads_LV_Xph(self, X, feeder_name=None):
         """Returns the number of low voltage, X phase, loads."""
-        if not isinstance(X, int):
-            raise ValueError("Number of phases should be an integer.")
-        if X not in [1, 3]:
-            raise ValueError("Number of phases should be 1, or 3.")
-        nb = 0
-        for obj in self.model.models:
-            if isinstance(obj, Load):
-                if hasattr(obj, "nominal_voltage") and obj.nominal_voltage is not None:
-                    if obj.nominal_voltage <= self.LV_threshold:
-                        if hasattr(obj, "phase_loads") and obj.phase_loads is not None:
-                            if len(obj.phase_loads) == X:
-                                nb += 1
-        return nb
-
-    def number_of_loads_MV_3ph(self):
+        self._check_number_of_phases(X, [1, 3], "Number of phases should be 1, or 3.")
+        loads = self.extract("Load")
+        return len(
+            self._select(
+                loads,
+                self._lv_mask(loads) & (loads["num_phase_loads"] == X),
+                feeder_name,
+            )
+        )
+
+    @profiled
+    def number_of_loads_MV_3ph(self, feeder_name=None):
         """Returns the number of medium voltage, 3 phase, loads."""
-        nb = 0
-        for obj in self.model.models:
-            if isinstance(obj, Load):
-                if hasattr(obj, "nominal_voltage") and obj.nominal_voltage is not None:
-                    if self.MV_threshold >= obj.nominal_voltage > self.LV_threshold:
-                        if hasattr(obj, "phase_loads") and obj.phase_loads is not None:
-                            if len(obj.phase_loads) == 3:
-                                nb += 1
-        return nb
+        loads = self.extract("Load")
+        return len(
+            self._select(
+                loads,
+                self._mv_mask(loads) & (loads["num_phase_loads"] == 3),
+                feeder_name,
+            )
+        )
 
-    def percentage_load_LV_kW_phX(self, X):
+    @profiled
+    def percentage_load_LV_kW_phX(self, X, feeder_name=None):
         """
         Returns the percentage of low voltage phase X in kW:
 
@@ -2441,25 +3358,14 @@ class NetworkAnalyzer(object):
         if X not in ["A", "B", "C"]:
             raise ValueError("Phase should be A, B, or C.")
 
-        demand_phase_X = 0
-        tot_demand = 0
-
-        for obj in self.model.models:
-            if isinstance(obj, Load):
-                if hasattr(obj, "nominal_voltage") and obj.nominal_voltage is not None:
-                    if obj.nominal_voltage <= self.LV_threshold:
-                        if hasattr(obj, "phase_loads") and obj.phase_loads is not None:
-                            for phase_load in obj.phase_loads:
-                                if hasattr(
-                                    phase_load, "phase"
-                                ) and phase_load.phase in ["A", "B", "C"]:
-                                    if (
-                                        hasattr(phase_load, "p")
-                                        and phase_load.p is not None
-                                    ):
-                                        if phase_load.phase == X:
-                                            demand_phase_X += phase_load.p
-                                            tot_demand += phase_load.p
-                                        else:
-                                            tot_demand += phase_load.p
+        phase_loads = self.extract("PhaseLoad")
+        phase_loads = self._select(
+            phase_loads,
+            self._lv_mask(phase_loads)
+            & phase_loads["phase"].isin(["A", "B", "C"])
+            & phase_loads["p"].notnull(),
+            feeder_name,
+        )
+        demand_phase_X = phase_loads["p"][phase_loads["phase"] == X].sum()
+        tot_demand = phase_loads["p"].sum()
         return float(demand_phase_X) / float(tot_demand) * 100
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""Timing instrumentation of the metric computations (See NetworkAnalyzer.enable_profiling)."""
+
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import functools
+import logging
+import time
+from contextlib import contextmanager
+
+import networkx as nx
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns of the profiling report
+REPORT_COLUMNS = ["calls", "objects", "total_s", "mean_s", "max_s", "share_pct"]
+
+
+class MetricProfiler(object):
+    """
+    Accumulates the wall time, the number of calls and the number of objects processed by named sections
+    of the metric computations.
+
+    **Usage:**
+
+        >>> profiler = MetricProfiler()
+        >>> with profiler.section("diameter", objects=120):
+        ...     net.diameter(graph)
+        >>> profiler.report()
+                  calls  objects  total_s  mean_s  max_s  share_pct
+        diameter      1      120    0.012   0.012  0.012      100.0
+
+    The times of nested sections are inclusive: a section calling other profiled metrics also counts their time.
+    """
+
+    def __init__(self):
+        """Class CONSTRUCTOR."""
+        # Maps the section names to [calls, objects, total time, max time]
+        self.records = {}
+
+    def record(self, name, seconds, objects=0, calls=1):
+        """Adds a measurement to the section with the given name."""
+        if name not in self.records:
+            self.records[name] = [0, 0, 0.0, 0.0]
+        entry = self.records[name]
+        entry[0] += calls
+        entry[1] += objects
+        entry[2] += seconds
+        entry[3] = max(entry[3], seconds if calls == 1 else 0.0)
+
+    @contextmanager
+    def section(self, name, objects=0):
+        """Context manager timing the enclosed code as a call of the section with the given name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, objects)
+
+    def merge(self, records):
+        """Adds the records of another profiler (ex: computed in a worker process)."""
+        for name, (calls, objects, total, maximum) in records.items():
+            if name not in self.records:
+                self.records[name] = [0, 0, 0.0, 0.0]
+            entry = self.records[name]
+            entry[0] += calls
+            entry[1] += objects
+            entry[2] += total
+            entry[3] = max(entry[3], maximum)
+
+    def reset(self):
+        """Removes all the records."""
+        self.records = {}
+
+    def report(self):
+        """
+        Returns the records as a pandas DataFrame indexed by section name, sorted by decreasing total time.
+        The share is the percentage of the total time of all the sections.
+        """
+        report = pd.DataFrame.from_dict(
+            self.records,
+            orient="index",
+            columns=["calls", "objects", "total_s", "max_s"],
+        )
+        report["mean_s"] = report["total_s"] / report["calls"]
+        total = report["total_s"].sum()
+        report["share_pct"] = report["total_s"] / total * 100 if total > 0 else 0.0
+        report.index.name = "metric"
+        return report[REPORT_COLUMNS].sort_values("total_s", ascending=False)
+
+    def export(self, path):
+        """Writes the report to a CSV file."""
+        self.report().to_csv(path)
+
+
+@contextmanager
+def _no_section():
+    yield
+
+
+def profile_section(profiler, name, objects=0):
+    """Returns profiler.section(name, objects), or a context manager doing nothing if profiler is None."""
+    if profiler is None:
+        return _no_section()
+    return profiler.section(name, objects)
+
+
+def profiled(method=None, by_class=False):
+    """
+    Decorator timing a method of an object with a profiler attribute (See NetworkAnalyzer).
+    Nothing is recorded when the profiler attribute is None.
+
+    When the first argument of the method is a networkx graph, its number of nodes is recorded as objects.
+    With by_class=True, the first argument is a DiTTo object and the calls are recorded by class name
+    (ex: analyze_object.Line).
+    """
+    if method is None:
+        return functools.partial(profiled, by_class=by_class)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = getattr(self, "profiler", None)
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        name = method.__name__
+        objects = 0
+        if by_class:
+            name = "{}.{}".format(name, type(args[0]).__name__)
+            objects = 1
+        elif len(args) > 0 and isinstance(args[0], nx.Graph):
+            objects = args[0].number_of_nodes()
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profiler.record(name, time.perf_counter() - start, objects)
+
+    return wrapper
@@ -574,10 +574,12 @@ class system_structure_modifier(Modifier):
         # For every group...
         for idx, group in enumerate(node_mapping):
 
-            # ...first node is volonteered to be searched
-            volonteer = group.pop()
-            while not isinstance(self.model[volonteer], Node):
-                volonteer = group.pop()
+            # ...first node is volonteered to be searched (it keeps its place in the group)
+            volonteer = next(
+                (n for n in group if isinstance(self.model[n], Node)), None
+            )
+            if volonteer is None:
+                continue
 
             # Get the name of the upstream transformer
             upstream_transformer_name = self.G.get_upstream_transformer(
@@ -0,0 +1,263 @@
+"""Bottom-up aggregation of the loads and DER downstream of the devices of a network.
+
+The oriented tree of the network (the digraph, oriented from the sources) is traversed once
+depth-first. The subtree below any node is then a contiguous range of the traversal order and
+the subtree sizes are accumulated bottom-up in a single post-order sweep. The totals downstream
+of every transformer, regulator and protective device are differences of prefix sums over the
+quantities attached to the nodes (loads, kVA, customers and DER).
+"""
+
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+
+from ditto.models.load import Load
+from ditto.models.line import Line
+from ditto.models.regulator import Regulator
+from ditto.models.powertransformer import PowerTransformer
+from ditto.models.photovoltaic import Photovoltaic
+from ditto.models.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+# Flags of the lines considered as protective devices
+PROTECTIVE_FLAGS = ["is_breaker", "is_fuse", "is_recloser", "is_sectionalizer"]
+
+# Quantities aggregated downstream of the devices
+QUANTITIES = ["p_kw", "q_kvar", "kva", "num_loads", "num_customers", "der_kw"]
+
+
+def device_category(obj):
+    """
+    Returns the category of a DiTTo object for the aggregation:
+    'PowerTransformer', 'Regulator', 'ProtectiveDevice' or None if the object is not a device.
+    """
+    if isinstance(obj, PowerTransformer):
+        return "PowerTransformer"
+    if isinstance(obj, Regulator):
+        return "Regulator"
+    if isinstance(obj, Line) and any(getattr(obj, f) for f in PROTECTIVE_FLAGS):
+        return "ProtectiveDevice"
+    return None
+
+
+class DownstreamAggregator(object):
+    """
+    Totals of the loads and DER downstream of every transformer, regulator and protective device.
+
+    **Usage:**
+
+        >>> aggregator = DownstreamAggregator(model, network.digraph)
+        >>> aggregator.totals("tr_1")
+        {'p_kw': 12.5, 'q_kvar': 3.1, 'kva': 12.9, 'num_loads': 3, 'num_customers': 3, 'der_kw': 0.0}
+        >>> aggregator.downstream_loads("tr_1")
+        ['load_1', 'load_2', 'load_3']
+        >>> aggregator.load_mapping("PowerTransformer")
+        {'tr_1': ['load_1', 'load_2', 'load_3'], ...}
+
+    Attributes:
+
+    - order: Nodes of the tree in depth-first order.
+    - position: Maps each node of the tree to its index in order.
+    - size: Number of nodes of the subtree of each node, ordered like order.
+    - loads: pandas DataFrame indexed by load name (in model order) with the node and the quantities of each load.
+    - devices: pandas DataFrame indexed by device name with the category, the downstream node and the downstream totals.
+
+    Powers are in kW, kvar and kVA. A load without num_users counts for one customer.
+    The DER are the Photovoltaic and Storage objects (rated_power).
+    """
+
+    def __init__(self, model, digraph):
+        """Class CONSTRUCTOR."""
+        self.model = model
+        self.digraph = digraph
+
+        self._traverse()
+
+        load_rows = []
+        der_nodes = []
+        der_kw = []
+        device_rows = []
+        for obj in model.models:
+            if isinstance(obj, Load):
+                load_rows.append(
+                    (obj.name, obj.connecting_element) + self._load_values(obj)
+                )
+            elif isinstance(obj, (Photovoltaic, Storage)):
+                if obj.connecting_element in self.position and obj.rated_power:
+                    der_nodes.append(self.position[obj.connecting_element])
+                    der_kw.append(obj.rated_power * 10 ** -3)
+            else:
+                category = device_category(obj)
+                if category is not None:
+                    node = self._downstream_node(obj)
+                    if node is not None:
+                        device_rows.append((obj.name, category, node))
+
+        self.loads = pd.DataFrame(
+            load_rows,
+            columns=["name", "node", "p_kw", "q_kvar", "kva", "num_customers"],
+        ).set_index("name")
+        # Loads are looked up by name: as in the Store, the last load with a name wins
+        self.loads = self.loads[~self.loads.index.duplicated(keep="last")]
+        assert self.loads.index.is_unique
+        self.loads["num_loads"] = 1.0
+        self.loads["der_kw"] = 0.0
+        self.loads = self.loads[["node"] + QUANTITIES]
+        self._load_position = np.array(
+            [self.position.get(node, -1) for node in self.loads["node"]], dtype=int
+        )
+
+        # Quantities attached to the nodes, ordered like order
+        values = np.zeros((len(self.order), len(QUANTITIES)))
+        in_tree = self._load_position >= 0
+        np.add.at(
+            values,
+            self._load_position[in_tree],
+            self.loads[QUANTITIES].values[in_tree],
+        )
+        np.add.at(values[:, QUANTITIES.index("der_kw")], der_nodes, der_kw)
+        self._prefix = np.vstack([np.zeros(len(QUANTITIES)), np.cumsum(values, axis=0)])
+
+        # Loads sorted by position in the traversal, for the range queries
+        self._sorted_loads = np.argsort(self._load_position, kind="stable")
+        self._sorted_positions = self._load_position[self._sorted_loads]
+
+        self.devices = pd.DataFrame(
+            device_rows, columns=["name", "category", "node"]
+        ).set_index("name")
+        start = np.array([self.position[n] for n in self.devices["node"]], dtype=int)
+        end = start + self.size[start]
+        totals = self._prefix[end] - self._prefix[start]
+        for idx, quantity in enumerate(QUANTITIES):
+            self.devices[quantity] = totals[:, idx]
+
+    def _traverse(self):
+        """
+        Depth-first traversal of the digraph from its roots, followed by one post-order sweep
+        accumulating the subtree sizes.
+        """
+        self.order = []
+        self.position = {}
+        self.parent = {}
+        roots = [n for n in self.digraph.nodes() if self.digraph.in_degree(n) == 0]
+        for root in roots:
+            self.parent[root] = None
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                self.position[node] = len(self.order)
+                self.order.append(node)
+                for child in self.digraph.successors(node):
+                    if child not in self.position:
+                        self.parent[child] = node
+                        stack.append(child)
+
+        self.size = np.ones(len(self.order), dtype=int)
+        for node in reversed(self.order):
+            upstream = self.parent[node]
+            if upstream is not None:
+                self.size[self.position[upstream]] += self.size[self.position[node]]
+
+    def _load_values(self, load):
+        """Returns the kW, kvar, kVA and number of customers of a load."""
+        p = q = kva = 0
+        if load.phase_loads is not None:
+            for pl in load.phase_loads:
+                if pl.p is not None:
+                    p += pl.p
+                if pl.q is not None:
+                    q += pl.q
+                if pl.p is not None and pl.q is not None:
+                    kva += math.sqrt(pl.p ** 2 + pl.q ** 2)
+        num_customers = load.num_users if load.num_users is not None else 1
+        return (p * 10 ** -3, q * 10 ** -3, kva * 10 ** -3, num_customers)
+
+    def _downstream_node(self, obj):
+        """Returns the end of the device which is downstream in the tree, None if the device is not an edge of the tree."""
+        if self.parent.get(obj.to_element, 0) == obj.from_element:
+            return obj.to_element
+        if self.parent.get(obj.from_element, 0) == obj.to_element:
+            return obj.from_element
+        return None
+
+    def _loads_in_subtree(self, node):
+        """Returns the indices (in self.loads) of the loads connected in the subtree of the node."""
+        start = self.position[node]
+        end = start + self.size[start]
+        lo = np.searchsorted(self._sorted_positions, start, side="left")
+        hi = np.searchsorted(self._sorted_positions, end, side="left")
+        return np.sort(self._sorted_loads[lo:hi])
+
+    def node_totals(self, node):
+        """Returns the quantities aggregated in the subtree of the given node."""
+        start = self.position[node]
+        totals = self._prefix[start + self.size[start]] - self._prefix[start]
+        return dict(zip(QUANTITIES, totals.tolist()))
+
+    def totals(self, device_name):
+        """Returns the quantities aggregated downstream of the given device."""
+        return self.node_totals(self.devices.at[device_name, "node"])
+
+    def downstream_loads(self, device_name):
+        """Returns the names of the loads downstream of the given device, in model order."""
+        indices = self._loads_in_subtree(self.devices.at[device_name, "node"])
+        return self.loads.index[indices].tolist()
+
+    def load_mapping(self, category="PowerTransformer", exclude=None, unique=False):
+        """
+        Maps each device of the given category to the loads for which it is the closest upstream device of this category.
+        The devices are found on the edges of the digraph ('equipment' and 'equipment_name' attributes),
+        the protective devices being the lines with one of the PROTECTIVE_FLAGS set.
+        Loads are listed in model order.
+
+        The exclude function, if given, is called with the edge data of each device and returns True
+        for the devices to ignore (ex: substation transformers).
+        With unique=True, only the loads with exactly one device of the category upstream are mapped.
+        """
+        nearest = {}
+        count = {}
+        for node in self.order:
+            upstream = self.parent[node]
+            if upstream is None:
+                nearest[node] = None
+                count[node] = 0
+                continue
+            nearest[node] = nearest[upstream]
+            count[node] = count[upstream]
+            data = self.digraph[upstream][node]
+            equipment = data.get("equipment")
+            if equipment == "Line" and category == "ProtectiveDevice":
+                is_device = any(data.get(f) for f in PROTECTIVE_FLAGS)
+            else:
+                is_device = equipment == category
+            if is_device and (exclude is None or not exclude(data)):
+                nearest[node] = data.get("equipment_name", data.get("name"))
+                count[node] = count[upstream] + 1
+
+        mapping = {}
+        for load_name, node in zip(self.loads.index, self.loads["node"]):
+            if nearest.get(node) is None:
+                continue
+            if unique and count[node] != 1:
+                continue
+            mapping.setdefault(nearest[node], []).append(load_name)
+        return mapping
+
+    def totals_of_loads(self, load_names):
+        """Returns the sum of the quantities of the given loads. Each load is counted once."""
+        names = list(dict.fromkeys(load_names))
+        indices = self.loads.index.get_indexer(names)
+        if (indices < 0).any():
+            raise KeyError(
+                "Unknown loads {}".format(
+                    [name for name, idx in zip(names, indices) if idx < 0]
+                )
+            )
+        totals = self.loads[QUANTITIES].values[indices].sum(axis=0)
+        return dict(zip(QUANTITIES, totals.tolist()))
@@ -0,0 +1,277 @@
+"""Switch-state-aware views of the DiTTo network.
+
+The graph of the network is never modified. The state of the switching devices
+(switches, breakers, fuses, reclosers and sectionalizers) is a boolean mask over the
+device edges. All the edges which are not switching devices are merged once into
+sections (connected groups of nodes which can never be separated), so that toggling a
+device only requires a traversal of the section graph of the affected component.
+"""
+
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import logging
+from collections import deque
+
+import numpy as np
+import networkx as nx
+
+from ditto.models.power_source import PowerSource
+from .network import Network
+from .loops import SWITCHING_FLAGS
+
+logger = logging.getLogger(__name__)
+
+
+class EnergizationView(object):
+    """
+    Energization state of a network for a given configuration of the switching devices.
+
+    **Usage:**
+
+        >>> view = EnergizationView.from_model(model)
+        >>> view.open_switch("switch_1")
+        >>> view.is_energized("node_1")
+        False
+        >>> view.close_switch("switch_1")
+        >>> view.source_of("node_1")
+        'sourcebus'
+
+    For reconfiguration sweeps, a complete state can be given as a boolean mask
+    (True means closed) ordered like switch_names:
+
+        >>> view.set_state(mask)
+        >>> view.number_of_energized_nodes()
+
+    A device is considered open when all its wires are open.
+    Nodes fed by several sources are served by the closest source, in number of switching devices.
+    """
+
+    def __init__(self, network, sources):
+        """Class CONSTRUCTOR."""
+        self.network = network
+        self.graph = network.graph
+        self.sources = []
+        for source in sources:
+            if self.graph.has_node(source) and source not in self.sources:
+                self.sources.append(source)
+
+        # Union-find over the edges which are not switching devices
+        union_find = {}
+
+        def _find(node):
+            root = node
+            while union_find.get(root, root) != root:
+                root = union_find[root]
+            while node != root:
+                union_find[node], node = root, union_find.get(node, node)
+            return root
+
+        self.switch_names = []
+        self.switch_edges = []
+        closed = []
+        for n1, n2, data in self.graph.edges(data=True):
+            if any(data.get(flag) for flag in SWITCHING_FLAGS):
+                self.switch_names.append(data.get("equipment_name", data.get("name")))
+                self.switch_edges.append((n1, n2))
+                wires = data.get("wires")
+                closed.append(not (wires and all(w.is_open for w in wires)))
+            else:
+                r1 = _find(n1)
+                r2 = _find(n2)
+                if r1 != r2:
+                    union_find[r1] = r2
+
+        # Sections
+        self.nodes = list(self.graph.nodes())
+        self.section_of = {}
+        roots = {}
+        for node in self.nodes:
+            root = _find(node)
+            if root not in roots:
+                roots[root] = len(roots)
+            self.section_of[node] = roots[root]
+        n_sections = len(roots)
+        self.section_size = np.bincount(
+            [self.section_of[node] for node in self.nodes], minlength=n_sections
+        )
+
+        # Switching devices between the sections
+        self.closed = np.array(closed, dtype=bool)
+        self.switch_sections = np.array(
+            [
+                [self.section_of[n1], self.section_of[n2]]
+                for n1, n2 in self.switch_edges
+            ],
+            dtype=int,
+        ).reshape(-1, 2)
+        self.switch_index = {
+            name: idx for idx, name in enumerate(self.switch_names) if name is not None
+        }
+        self._switch_of_edge = {
+            frozenset(edge): idx for idx, edge in enumerate(self.switch_edges)
+        }
+        self.section_switches = [[] for _ in range(n_sections)]
+        for idx, (s1, s2) in enumerate(self.switch_sections):
+            self.section_switches[s1].append(idx)
+            self.section_switches[s2].append(idx)
+
+        self.source_sections = [self.section_of[source] for source in self.sources]
+
+        # Connected component label and serving source index (-1 if de-energized) of every section
+        self.component = np.full(n_sections, -1, dtype=int)
+        self.area = np.full(n_sections, -1, dtype=int)
+        self._next_label = 0
+        self.recompute()
+
+    @classmethod
+    def from_model(cls, model, source=None):
+        """Builds the network of the model once and returns the view. The sources are the PowerSource objects."""
+        sources = []
+        for obj in model.models:
+            if isinstance(obj, PowerSource) and obj.connecting_element is not None:
+                sources.append(obj.connecting_element)
+        if len(sources) == 0:
+            raise ValueError(
+                "Model does not contain any power source. Required to build networkx graph"
+            )
+        network = Network()
+        network.build(model, source=sources[0] if source is None else source)
+        network.set_attributes(model)
+        return cls(network, sources)
+
+    def _collect(self, section):
+        """Returns the sections connected to the given section through closed devices."""
+        seen = {section}
+        queue = deque([section])
+        while queue:
+            current = queue.popleft()
+            for idx in self.section_switches[current]:
+                if self.closed[idx]:
+                    s1, s2 = self.switch_sections[idx]
+                    other = s2 if s1 == current else s1
+                    if other not in seen:
+                        seen.add(other)
+                        queue.append(other)
+        return list(seen)
+
+    def _update_areas(self, sections):
+        """Multi-source BFS restricted to the given sections, which must be complete components."""
+        sections = np.asarray(sections, dtype=int)
+        self.area[sections] = -1
+        in_scope = set(sections.tolist())
+        queue = deque()
+        for idx, section in enumerate(self.source_sections):
+            if section in in_scope and self.area[section] == -1:
+                self.area[section] = idx
+                queue.append(section)
+        while queue:
+            current = queue.popleft()
+            for idx in self.section_switches[current]:
+                if self.closed[idx]:
+                    s1, s2 = self.switch_sections[idx]
+                    other = s2 if s1 == current else s1
+                    if self.area[other] == -1:
+                        self.area[other] = self.area[current]
+                        queue.append(other)
+
+    def recompute(self):
+        """Recomputes the components and service areas of all sections."""
+        self.component[:] = -1
+        for section in range(len(self.component)):
+            if self.component[section] == -1:
+                self.component[self._collect(section)] = self._next_label
+                self._next_label += 1
+        self._update_areas(np.arange(len(self.component)))
+
+    def set_switch(self, name, closed):
+        """
+        Sets the state of a switching device and updates the affected component only.
+        Closing a device merges two components. Opening it might split one.
+        """
+        idx = self.switch_index[name]
+        if self.closed[idx] == closed:
+            return
+        self.closed[idx] = closed
+        s1, s2 = self.switch_sections[idx]
+        affected = self._collect(s1)
+        if closed:
+            self.component[affected] = self.component[s1]
+        elif s2 not in affected:
+            other = self._collect(s2)
+            self.component[other] = self._next_label
+            self._next_label += 1
+            affected.extend(other)
+        self._update_areas(affected)
+
+    def open_switch(self, name):
+        """Opens a switching device."""
+        self.set_switch(name, False)
+
+    def close_switch(self, name):
+        """Closes a switching device."""
+        self.set_switch(name, True)
+
+    def toggle_switch(self, name):
+        """Toggles a switching device."""
+        self.set_switch(name, not self.closed[self.switch_index[name]])
+
+    def set_state(self, closed):
+        """Sets the state of all the devices at once with a boolean mask ordered like switch_names."""
+        closed = np.asarray(closed, dtype=bool)
+        if closed.shape != self.closed.shape:
+            raise ValueError(
+                "Expected a mask of {n} switch states. Got {m}".format(
+                    n=len(self.closed), m=len(closed)
+                )
+            )
+        self.closed = closed.copy()
+        self.recompute()
+
+    def open_switches(self):
+        """Returns the names of the open devices."""
+        return [self.switch_names[idx] for idx in np.flatnonzero(~self.closed)]
+
+    def is_energized(self, node):
+        """Returns True if the node is connected to a source."""
+        return self.area[self.section_of[node]] >= 0
+
+    def source_of(self, node):
+        """Returns the source serving the node, None if it is not energized."""
+        idx = self.area[self.section_of[node]]
+        if idx < 0:
+            return None
+        return self.sources[idx]
+
+    def number_of_energized_nodes(self):
+        """Returns the number of energized nodes."""
+        return int(self.section_size[self.area >= 0].sum())
+
+    def energized_nodes(self):
+        """Returns the set of energized nodes."""
+        return set(node for node in self.nodes if self.area[self.section_of[node]] >= 0)
+
+    def service_area(self, source):
+        """Returns the set of nodes served by the given source."""
+        idx = self.sources.index(source)
+        return set(
+            node for node in self.nodes if self.area[self.section_of[node]] == idx
+        )
+
+    def connected_components(self):
+        """Returns the list of connected components (sets of nodes) for the current state."""
+        components = {}
+        for node in self.nodes:
+            components.setdefault(self.component[self.section_of[node]], set()).add(
+                node
+            )
+        return list(components.values())
+
+    def graph_view(self):
+        """Returns a read-only networkx view of the graph without the open devices."""
+
+        def _filter_edge(n1, n2):
+            idx = self._switch_of_edge.get(frozenset((n1, n2)))
+            return idx is None or self.closed[idx]
+
+        return nx.subgraph_view(self.graph, filter_edge=_filter_edge)
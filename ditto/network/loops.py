@@ -0,0 +1,268 @@
+"""Loop analysis of the DiTTo network based on fundamental cycles.
+
+Instead of enumerating every simple cycle of the network (which is exponential
+on meshed systems), loops are described by a spanning tree rooted at the source:
+every edge that is not in the tree (a chord) closes exactly one fundamental loop.
+There are len(edges) - len(nodes) + number_of_components such loops and any other
+loop of the network is a combination of them.
+"""
+
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Edge attributes flagging a switching or protective device
+SWITCHING_FLAGS = [
+    "is_switch",
+    "is_breaker",
+    "is_fuse",
+    "is_recloser",
+    "is_sectionalizer",
+]
+
+
+class Loop(object):
+    """
+    Fundamental loop of the network.
+
+    - nodes: ordered list of the nodes of the loop, starting with the node closest to the source.
+    - edges: list of (node1, node2) tuples following the node order. The last edge closes the loop.
+    - chord: the edge which is not part of the spanning tree.
+    - equipment_names: name of the equipment on each edge (same order as edges).
+    - switches: names of the switching and protective devices in the loop.
+    - open_switches: names of the devices in the loop with all their wires open.
+    - phase_counts: number of phases at each node (None if unknown).
+    """
+
+    def __init__(self, nodes, edges, chord):
+        self.nodes = nodes
+        self.edges = edges
+        self.chord = chord
+        self.equipment_names = []
+        self.switches = []
+        self.open_switches = []
+        self.phase_counts = []
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return "<Loop(nodes={n}, switches={s}, min_phases={p})>".format(
+            n=len(self.nodes), s=len(self.switches), p=self.min_phase_count
+        )
+
+    @property
+    def min_phase_count(self):
+        """Returns the minimum number of phases along the loop, None if unknown."""
+        if len(self.phase_counts) == 0 or None in self.phase_counts:
+            return None
+        return min(self.phase_counts)
+
+    @property
+    def is_open(self):
+        """True if the loop is already broken by an open switching device."""
+        return len(self.open_switches) > 0
+
+
+class LoopAnalyzer(object):
+    """
+    Computes the fundamental loops of a Network and the edges to remove to make it radial.
+
+    **Usage:**
+
+        >>> analyzer = LoopAnalyzer(network, source="sourcebus")
+        >>> loops = analyzer.loops()
+        >>> names = analyzer.loop_breaking_equipment()
+
+    The network must have been built. If the attributes have been set (Network.set_attributes),
+    the loops are also described with their switches and phases.
+
+    Everything is computed from a single BFS spanning tree, so the cost is linear
+    in the size of the network plus the total length of the reported loops.
+    """
+
+    def __init__(self, network, source=None):
+        self.network = network
+        self.graph = network.graph
+        self.source = source
+        self.parent = {}
+        self.depth = {}
+        self.chords = []
+        self._loops = None
+        self._build_spanning_tree()
+
+    def _build_spanning_tree(self):
+        """BFS spanning forest of the graph. Starts from the source if it is in the graph."""
+        roots = []
+        if self.source is not None and self.graph.has_node(self.source):
+            roots.append(self.source)
+        roots.extend(self.graph.nodes())
+
+        tree_edges = set()
+        for root in roots:
+            if root in self.depth:
+                continue
+            self.parent[root] = None
+            self.depth[root] = 0
+            queue = deque([root])
+            while queue:
+                node = queue.popleft()
+                for neighbor in self.graph[node]:
+                    if neighbor not in self.depth:
+                        self.parent[neighbor] = node
+                        self.depth[neighbor] = self.depth[node] + 1
+                        tree_edges.add(frozenset((node, neighbor)))
+                        queue.append(neighbor)
+
+        for n1, n2 in self.graph.edges():
+            if n1 != n2 and frozenset((n1, n2)) not in tree_edges:
+                self.chords.append((n1, n2))
+
+    def number_of_loops(self):
+        """Returns the number of fundamental loops (i.e. the cycle rank of the network)."""
+        return len(self.chords)
+
+    def _loop_nodes(self, n1, n2):
+        """Walks up the tree from both ends of a chord until the common ancestor is reached."""
+        path1 = [n1]
+        path2 = [n2]
+        while self.depth[n1] > self.depth[n2]:
+            n1 = self.parent[n1]
+            path1.append(n1)
+        while self.depth[n2] > self.depth[n1]:
+            n2 = self.parent[n2]
+            path2.append(n2)
+        while n1 != n2:
+            n1 = self.parent[n1]
+            n2 = self.parent[n2]
+            path1.append(n1)
+            path2.append(n2)
+        # path1 goes from the chord end to the common ancestor, path2 as well
+        # The loop starts at the common ancestor, goes down to n1, jumps the chord and comes back up
+        return path1[::-1] + path2[:-1]
+
+    def _describe(self, loop):
+        """Fills the equipment, switch and phase information of a loop."""
+        for n1, n2 in loop.edges:
+            data = self.graph[n1][n2]
+            name = data.get("equipment_name", data.get("name"))
+            loop.equipment_names.append(name)
+            if any(data.get(flag) for flag in SWITCHING_FLAGS):
+                loop.switches.append(name)
+                wires = data.get("wires")
+                if wires and all(w.is_open for w in wires):
+                    loop.open_switches.append(name)
+
+        for node in loop.nodes:
+            phases = self.graph.nodes[node].get("phases")
+            if phases is None or len(phases) == 0:
+                loop.phase_counts.append(None)
+            else:
+                loop.phase_counts.append(len(phases))
+
+    def loops(self):
+        """Returns the list of fundamental loops of the network."""
+        if self._loops is None:
+            self._loops = []
+            for n1, n2 in self.chords:
+                nodes = self._loop_nodes(n1, n2)
+                edges = [
+                    (nodes[i], nodes[(i + 1) % len(nodes)]) for i in range(len(nodes))
+                ]
+                loop = Loop(nodes, edges, (n1, n2))
+                self._describe(loop)
+                self._loops.append(loop)
+        return self._loops
+
+    def breaking_edge(self, loop):
+        """
+        Returns the edge to remove to break a loop.
+
+        If the loop contains an open switching device, this is the edge of the device.
+        Otherwise, use the heuristic of removing the edge in the middle of the longest section of the loop
+        having the minimum number of phases. If the phases are unknown, remove the edge the furthest from the source.
+        """
+        for edge, name in zip(loop.edges, loop.equipment_names):
+            if name in loop.open_switches:
+                return edge
+
+        min_phases = loop.min_phase_count
+        if min_phases is None:
+            return max(
+                loop.edges, key=lambda e: min(self.depth[e[0]], self.depth[e[1]])
+            )
+
+        best_start = 0
+        best_length = 0
+        start = None
+        for i, count in enumerate(loop.phase_counts + [None]):
+            if count == min_phases:
+                if start is None:
+                    start = i
+            elif start is not None:
+                if i - start > best_length:
+                    best_start = start
+                    best_length = i - start
+                start = None
+
+        # Middle of the section. For a single node section, this is the edge leaving the node.
+        return loop.edges[best_start + (best_length - 1) // 2]
+
+    def loop_breaking_edges(self):
+        """
+        Returns the list of edges to remove to make the network radial.
+
+        The preferred edge of each loop is given by breaking_edge. Since loops can share edges,
+        the final selection is made with a union-find pass (Kruskal) that keeps all the other edges first,
+        closest to the source first. This guarantees that exactly one edge per fundamental loop is removed
+        and that the network stays connected.
+        """
+        open_edges = set()
+        preferred = set()
+        for loop in self.loops():
+            for edge, name in zip(loop.edges, loop.equipment_names):
+                if name in loop.open_switches:
+                    open_edges.add(frozenset(edge))
+            preferred.add(frozenset(self.breaking_edge(loop)))
+
+        def _key(edge):
+            e = frozenset(edge)
+            return (
+                e in open_edges,
+                e in preferred,
+                min(self.depth[edge[0]], self.depth[edge[1]]),
+            )
+
+        union_find = {}
+
+        def _find(node):
+            root = node
+            while union_find.get(root, root) != root:
+                root = union_find[root]
+            while node != root:
+                union_find[node], node = root, union_find.get(node, node)
+            return root
+
+        to_remove = []
+        for n1, n2 in sorted((e for e in self.graph.edges() if e[0] != e[1]), key=_key):
+            r1 = _find(n1)
+            r2 = _find(n2)
+            if r1 == r2:
+                to_remove.append((n1, n2))
+            else:
+                union_find[r1] = r2
+        return to_remove
+
+    def loop_breaking_equipment(self):
+        """Returns the names of the equipment to remove to make the network radial."""
+        names = []
+        for n1, n2 in self.loop_breaking_edges():
+            data = self.graph[n1][n2]
+            name = data.get("equipment_name", data.get("name"))
+            if name is not None:
+                names.append(name)
+        return names
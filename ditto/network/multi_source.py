@@ -0,0 +1,196 @@
+"""Topology of a model with several power sources, built once and shared between analyses.
+
+The network is built a single time. A virtual super-source connected to every PowerSource
+is used for the BFS, which partitions the graph into source service areas: each node is
+served by the closest source (in number of edges) of its connected component.
+"""
+
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import logging
+from collections import deque
+
+import networkx as nx
+
+from ditto.models.power_source import PowerSource
+from .network import Network
+from .loops import LoopAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class MultiSourceTopology(object):
+    """
+    Shared topology of all the sources of a model.
+
+    **Usage:**
+
+        >>> topology = MultiSourceTopology(model)
+        >>> topology.source_of("node_1")
+        'sourcebus'
+        >>> topology.path("node_1")
+        ['sourcebus', ..., 'node_1']
+
+    Attributes:
+
+    - network: The ditto Network. The graph contains all the equipment attributes and the digraph is oriented from the sources.
+    - graph: Shortcut to network.graph
+    - sources: List of the source nodes (connecting elements of the PowerSource objects).
+    - area: Maps each energized node to the source node serving it.
+    - parent: Maps each energized node to its upstream node (None for the sources).
+    - order: Energized nodes in BFS order from the sources.
+    """
+
+    def __init__(self, model, remove_open_switches=True):
+        """Class CONSTRUCTOR."""
+        self.model = model
+        self.sources = []
+        for obj in model.models:
+            if isinstance(obj, PowerSource):
+                if obj.connecting_element is None:
+                    logger.warning(
+                        "PowerSource {} has a None connecting element".format(obj.name)
+                    )
+                elif obj.connecting_element not in self.sources:
+                    self.sources.append(obj.connecting_element)
+
+        if len(self.sources) == 0:
+            raise ValueError(
+                "Model does not contain any power source. Required to build networkx graph"
+            )
+
+        self.network = Network()
+        self.network.build(model, source=self.sources[0])
+        self.graph = self.network.graph
+        # The digraph of build() only spans the component of the first source.
+        # set_attributes walks the digraph, so orient every component first.
+        self.network.digraph = self._spanning_forest()
+        self.network.set_attributes(model)
+        if remove_open_switches:
+            # This deletes the switches inside the networkx graph only
+            self.network.remove_open_switches(model)
+
+        self.area = {}
+        self.parent = {}
+        self.order = []
+        self._component = {}
+        self._component_sources = []
+        self._unique_path = None
+        self._loops = None
+        self.partition()
+
+    def _spanning_forest(self):
+        """BFS spanning forest of the whole graph, rooted at the sources first."""
+        digraph = nx.DiGraph()
+        digraph.add_nodes_from(self.graph.nodes())
+        roots = [source for source in self.sources if self.graph.has_node(source)]
+        roots.extend(self.graph.nodes())
+        visited = set()
+        for root in roots:
+            if root in visited:
+                continue
+            visited.add(root)
+            for n1, n2 in nx.bfs_edges(self.graph, root):
+                digraph.add_edge(n1, n2)
+                visited.add(n2)
+        return digraph
+
+    def partition(self):
+        """
+        Multi-source BFS (i.e. BFS from a virtual super-source connected to all the sources).
+        Fills the service areas and orients the digraph of the network from the sources.
+        """
+        self.area = {}
+        self.parent = {}
+        self.order = []
+        queue = deque()
+        for source in self.sources:
+            if self.graph.has_node(source) and source not in self.area:
+                self.area[source] = source
+                self.parent[source] = None
+                queue.append(source)
+
+        while queue:
+            node = queue.popleft()
+            self.order.append(node)
+            for neighbor in self.graph[node]:
+                if neighbor not in self.area:
+                    self.area[neighbor] = self.area[node]
+                    self.parent[neighbor] = node
+                    queue.append(neighbor)
+
+        digraph = nx.DiGraph()
+        digraph.add_nodes_from(self.graph.nodes(data=True))
+        for node in self.order:
+            upstream = self.parent[node]
+            if upstream is not None:
+                digraph.add_edge(upstream, node, **self.graph[upstream][node])
+        self.network.digraph = digraph
+
+        self._component = {}
+        self._component_sources = []
+        for idx, component in enumerate(nx.connected_components(self.graph)):
+            for node in component:
+                self._component[node] = idx
+            self._component_sources.append([])
+        for source in self.sources:
+            if source in self._component:
+                self._component_sources[self._component[source]].append(source)
+
+        self._unique_path = None
+        self._loops = None
+
+    def is_energized(self, node):
+        """Returns True if there is a path between the node and a source."""
+        return node in self.area
+
+    def source_of(self, node):
+        """Returns the source node serving the given node, None if the node is not energized."""
+        return self.area.get(node)
+
+    def reachable_sources(self, node):
+        """Returns the list of all the source nodes connected to the given node."""
+        if node not in self._component:
+            return []
+        return self._component_sources[self._component[node]]
+
+    def nodes_in_area(self, source):
+        """Returns the list of nodes in the service area of the given source node."""
+        return [node for node in self.order if self.area[node] == source]
+
+    def path(self, node):
+        """Returns the path from the serving source to the given node, None if the node is not energized."""
+        if node not in self.area:
+            return None
+        path = []
+        while node is not None:
+            path.append(node)
+            node = self.parent[node]
+        return path[::-1]
+
+    def has_unique_path(self, node):
+        """
+        Returns True if the path from the serving source to the node is unique.
+
+        The path is unique if all of its edges are bridges of the graph.
+        This is computed for all nodes at once, going down from the sources.
+        """
+        if self._unique_path is None:
+            bridges = set(frozenset(edge) for edge in nx.bridges(self.graph))
+            self._unique_path = {}
+            for n in self.order:
+                upstream = self.parent[n]
+                if upstream is None:
+                    self._unique_path[n] = True
+                else:
+                    self._unique_path[n] = self._unique_path[upstream] and (
+                        frozenset((upstream, n)) in bridges
+                    )
+        return self._unique_path.get(node, False)
+
+    def loops(self):
+        """Returns the fundamental loops of the network (See ditto.network.loops)."""
+        if self._loops is None:
+            self._loops = LoopAnalyzer(self.network, self.sources[0]).loops()
+        return self._loops
@@ -9,6 +9,7 @@ import traceback
 
 import networkx as nx
 from ditto.models.base import DiTToHasTraits
+from .loops import Loop, LoopAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,7 @@ class Network:
         self.attributes_set = (
             False  # Flag that indicates whether the attributes have been set or not.
         )
+        self._loop_analyzer = None  # Loops of the graph (See loop_analyzer)
 
     def provide_graphs(self, graph, digraph):
         """
@@ -39,12 +41,14 @@ class Network:
         self.graph = graph
         self.digraph = digraph
         self.is_built = True
+        self._loop_analyzer = None
 
     # Only builds connected nodes
     #
     # Nicolas modification: Added source in the args for bfs
     def build(self, model, source="sourcebus"):
         self.graph = nx.Graph()
+        self._loop_analyzer = None
         graph_edges = set()
         graph_nodes = set()
         for i in model.models:
@@ -186,11 +190,7 @@ class Network:
                 self.class_map[i.name] = object_type
 
                 if i.name in graph_nodes:
-                    for attr in tuple(
-                        set(dir(i)) - set(dir(DiTToHasTraits))
-                    ):  # only set attributes from the subclass, not the base class
-                        if attr[0] != "_":
-                            self.digraph.nodes[i.name][attr] = getattr(i, attr)
+                    self.digraph.nodes[i.name].update(self._object_attributes(i))
 
                 if (
                     hasattr(i, "from_element")
@@ -199,43 +199,41 @@ class Network:
                     and i.to_element is not None
                 ):
                     if (i.from_element, i.to_element) in graph_edges:
-                        for attr in tuple(
-                            set(dir(i)) - set(dir(DiTToHasTraits))
-                        ):  # only set attributes from the subclass, not the base class
-                            if attr[0] != "_":
-                                self.digraph[i.from_element][i.to_element][
-                                    attr
-                                ] = getattr(i, attr)
+                        self._copy_edge_attributes(
+                            i, i.from_element, i.to_element, (self.digraph,)
+                        )
 
                     if (i.to_element, i.from_element) in graph_edges:
-                        for attr in tuple(
-                            set(dir(i)) - set(dir(DiTToHasTraits))
-                        ):  # only set attributes from the subclass, not the base class
-                            if attr[0] != "_":
-                                self.digraph[i.to_element][i.from_element][
-                                    attr
-                                ] = getattr(i, attr)
+                        self._copy_edge_attributes(
+                            i, i.to_element, i.from_element, (self.digraph,)
+                        )
 
                 if (
                     hasattr(i, "connecting_element")
                     and i.connecting_element is not None
                 ):
                     if (i.connecting_element, i.name) in graph_edges:
-                        for attr in tuple(
-                            set(dir(i)) - set(dir(DiTToHasTraits))
-                        ):  # only set attributes from the subclass, not the base class
-                            if attr[0] != "_":
-                                if self.digraph.has_edge(i.connecting_element, i.name):
-                                    self.digraph[i.connecting_element][i.name][
-                                        attr
-                                    ] = getattr(i, attr)
-                                else:
-                                    self.digraph.add_edge(
-                                        i.connecting_element, i.name, length=0
-                                    )
-                                    self.digraph[i.connecting_element][i.name][
-                                        attr
-                                    ] = getattr(i, attr)
+                        self._copy_edge_attributes(
+                            i, i.connecting_element, i.name, (self.digraph,)
+                        )
+
+    @staticmethod
+    def _object_attributes(obj):
+        """Returns the public attributes of an object, without those of the DiTToHasTraits base class."""
+        return {
+            attr: getattr(obj, attr)
+            for attr in set(dir(obj)) - set(dir(DiTToHasTraits))
+            if attr[0] != "_"
+        }
+
+    @staticmethod
+    def _copy_edge_attributes(obj, n1, n2, graphs):
+        """Copies the attributes of an object on the edge (n1, n2) of the graphs. Missing edges are added with a zero length."""
+        attributes = Network._object_attributes(obj)
+        for graph in graphs:
+            if not graph.has_edge(n1, n2):
+                graph.add_edge(n1, n2, length=0)
+            graph[n1][n2].update(attributes)
 
     def set_attributes(self, model):
         graph_nodes = set(self.digraph.nodes())
@@ -248,12 +246,9 @@ class Network:
                 self.class_map[i.name] = object_type
 
                 if i.name in graph_nodes:
-                    for attr in tuple(
-                        set(dir(i)) - set(dir(DiTToHasTraits))
-                    ):  # only set attributes from the subclass, not the base class
-                        if attr[0] != "_":
-                            self.graph.nodes[i.name][attr] = getattr(i, attr)
-                            self.digraph.nodes[i.name][attr] = getattr(i, attr)
+                    attributes = self._object_attributes(i)
+                    self.graph.nodes[i.name].update(attributes)
+                    self.digraph.nodes[i.name].update(attributes)
 
                 if (
                     hasattr(i, "from_element")
@@ -262,62 +257,36 @@ class Network:
                     and i.to_element is not None
                 ):
                     if (i.from_element, i.to_element) in graph_edges:
-                        for attr in tuple(
-                            set(dir(i)) - set(dir(DiTToHasTraits))
-                        ):  # only set attributes from the subclass, not the base class
-                            if attr[0] != "_":
-                                self.graph[i.from_element][i.to_element][
-                                    attr
-                                ] = getattr(i, attr)
-                                self.digraph[i.from_element][i.to_element][
-                                    attr
-                                ] = getattr(i, attr)
+                        self._copy_edge_attributes(
+                            i, i.from_element, i.to_element, (self.graph, self.digraph)
+                        )
 
                     if (i.to_element, i.from_element) in graph_edges:
-                        for attr in tuple(
-                            set(dir(i)) - set(dir(DiTToHasTraits))
-                        ):  # only set attributes from the subclass, not the base class
-                            if attr[0] != "_":
-                                self.graph[i.to_element][i.from_element][
-                                    attr
-                                ] = getattr(i, attr)
-                                self.digraph[i.to_element][i.from_element][
-                                    attr
-                                ] = getattr(i, attr)
+                        self._copy_edge_attributes(
+                            i, i.to_element, i.from_element, (self.graph, self.digraph)
+                        )
+
+                    # Edges closing a loop are not part of the BFS digraph
+                    if (
+                        (i.from_element, i.to_element) not in graph_edges
+                        and (i.to_element, i.from_element) not in graph_edges
+                        and self.graph.has_edge(i.from_element, i.to_element)
+                    ):
+                        self._copy_edge_attributes(
+                            i, i.from_element, i.to_element, (self.graph,)
+                        )
 
                 if (
                     hasattr(i, "connecting_element")
                     and i.connecting_element is not None
                 ):
                     if (i.connecting_element, i.name) in graph_edges:
-                        for attr in tuple(
-                            set(dir(i)) - set(dir(DiTToHasTraits))
-                        ):  # only set attributes from the subclass, not the base class
-                            if attr[0] != "_":
-                                if self.graph.has_edge(i.connecting_element, i.name):
-                                    self.graph[i.connecting_element][i.name][
-                                        attr
-                                    ] = getattr(i, attr)
-                                else:
-                                    self.graph.add_edge(
-                                        i.connecting_element, i.name, length=0
-                                    )
-                                    self.graph[i.connecting_element][i.name][
-                                        attr
-                                    ] = getattr(i, attr)
-                                if self.digraph.has_edge(i.connecting_element, i.name):
-                                    self.digraph[i.connecting_element][i.name][
-                                        attr
-                                    ] = getattr(i, attr)
-                                else:
-                                    self.digraph.add_edge(
-                                        i.connecting_element, i.name, length=0
-                                    )
-                                    self.digraph[i.connecting_element][i.name][
-                                        attr
-                                    ] = getattr(i, attr)
+                        self._copy_edge_attributes(
+                            i, i.connecting_element, i.name, (self.graph, self.digraph)
+                        )
 
         self.attributes_set = True
+        self._loop_analyzer = None
 
     def remove_open_switches(self, model):
         for m in model.models:
@@ -340,6 +309,7 @@ class Network:
                         is_open = False
 
                 if is_open:
+                    self._loop_analyzer = None
                     self.graph.remove_edge(m.from_element, m.to_element)
                     if self.digraph.has_edge(m.from_element, m.to_element):
                         self.digraph.remove_edge(m.from_element, m.to_element)
@@ -354,7 +324,8 @@ class Network:
         edge_equipment_name = nx.get_edge_attributes(self.digraph, "equipment_name")
         # import pdb; pdb.set_trace()
         while curr != []:
-            edge_type = edge_equipment[(curr[0], curr_node)]
+            # The edges connecting the power sources to their bus have no equipment
+            edge_type = edge_equipment.get((curr[0], curr_node))
             if edge_type == "PowerTransformer":
                 return edge_equipment_name[(curr[0], curr_node)]
             curr_node = curr[0]  # assuming that the network is a DAG
@@ -462,20 +433,19 @@ class Network:
 
         return internal_edges
 
-    def find_cycles(self):
-        duplicate_cycles = list(nx.simple_cycles(self.digraph))
-        all_cycles = set()
-        final_cycles = []
-        for i in duplicate_cycles:
-            sorted = []
-            for node in i:
-                sorted.append(node)
-            sorted.sort()
-            sorted = tuple(sorted)
-            if not (sorted in all_cycles):
-                all_cycles.add(sorted)
-                final_cycles.append(i)
-        return final_cycles
+    def find_cycles(self, source=None):
+        """Returns the fundamental loops of the network as lists of nodes.
+
+        Loops are computed from a spanning tree of the graph (see ditto.network.loops),
+        instead of enumerating all the simple cycles which is exponential on meshed networks.
+        """
+        return [loop.nodes for loop in self.loop_analyzer(source).loops()]
+
+    def loop_analyzer(self, source=None):
+        """Returns the LoopAnalyzer of the graph, which is kept until the graph or its attributes change."""
+        if self._loop_analyzer is None or self._loop_analyzer.source != source:
+            self._loop_analyzer = LoopAnalyzer(self, source)
+        return self._loop_analyzer
 
     def order_by_phase(self, edge):
         deg_1 = len(self.graph.nodes[edge[0]]["phases"])
@@ -485,56 +455,10 @@ class Network:
         return [edge[0], edge[1]]
 
     def middle_single_phase(self, nodes):
-        at_1p_section = False
-        cnt = 0
-        max_cnt = 0
-        pos_max_cnt = -1
-        min_phase = 1000
-        for i in range(len(nodes)):
-            # logger.debug('phaselen:')
-            # logger.debug(len(self.graph.nodes[nodes[i]]['phases']))
-            if (not "phases" in self.graph.nodes[nodes[i]]) or self.graph.nodes[
-                nodes[i]
-            ]["phases"] == None:
-                pos = rand.randint(0, len(nodes) - 2)
-                order1 = tuple([nodes[pos], nodes[pos + 1]])
-                order2 = tuple([nodes[pos + 1], nodes[pos]])
-                if order1 in self.graph.edges():
-                    return self.graph[order1[0]][order1[1]]["name"]
-                else:
-                    return self.graph[order2[0]][order2[1]]["name"]
-            if len(self.graph.nodes[nodes[i]]["phases"]) < min_phase:
-                min_phase = len(self.graph.nodes[nodes[i]]["phases"])
-        # logger.debug(min_phase)
-        for i in range(len(nodes)):
-            node = nodes[i]
-            if at_1p_section and len(self.graph.nodes[node]["phases"]) > min_phase:
-                if cnt > max_cnt:
-                    max_cnt = cnt
-                    pos_max_cnt = i - 1
-                cnt = 0
-                at_1p_section = False
-            if len(self.graph.nodes[node]["phases"]) == min_phase:
-                cnt = cnt + 1
-                at_1p_section = True
-        if cnt > 0 and cnt > max_cnt:
-            pos_max_cnt = (
-                len(nodes) - 2
-            )  # Shift by 1 to avoid any index out of bounds issues.
-            cnt = max_cnt = cnt
-
-        if pos_max_cnt > -1:
-            order1 = tuple(
-                [nodes[pos_max_cnt - max_cnt / 2], nodes[pos_max_cnt - max_cnt / 2 + 1]]
-            )
-            order2 = tuple(
-                [nodes[pos_max_cnt - max_cnt / 2 + 1], nodes[pos_max_cnt - max_cnt / 2]]
-            )
-            if order1 in self.graph.edges():
-                logger.debug(order1)
-                return self.graph[order1[0]][order1[1]]["name"]
-            else:
-                logger.debug(order2)
-                return self.graph[order2[0]][order2[1]]["name"]
-        else:
-            return ()
+        """Returns the name of the equipment in the middle of the longest single phase section of a loop."""
+        analyzer = self.loop_analyzer()
+        edges = [(nodes[i], nodes[(i + 1) % len(nodes)]) for i in range(len(nodes))]
+        loop = Loop(nodes, edges, None)
+        analyzer._describe(loop)
+        edge = analyzer.breaking_edge(loop)
+        return loop.equipment_names[loop.edges.index(edge)]
@@ -0,0 +1,244 @@
+"""Spatial index over the positions of the elements of a DiTTo model.
+
+The positions (longitude, latitude) of all the positioned elements are stored in NumPy arrays
+and bucketed in a uniform grid. The points are sorted by cell, the cells being numbered column
+by column, such that the points of a column of cells between two rows are a contiguous slice of
+the sorted arrays. Bounding box and radius queries only look at the slices of the columns they
+overlap, and nearest neighbour queries grow a square of cells around the query point until the
+k-th distance found is covered.
+"""
+
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Average number of points per cell of the grid
+POINTS_PER_CELL = 4
+
+
+class SpatialIndex(object):
+    """
+    Index of the positions of the elements of a model for nearest, bounding box and radius queries.
+
+    **Usage:**
+
+        >>> index = model.spatial_index()
+        >>> index.nearest(-105.17, 39.74, k=3, types=Node)
+        ['node_12', 'node_13', 'node_7']
+        >>> index.bbox(-105.2, 39.7, -105.1, 39.8)
+        ['node_12', 'line_4', ...]
+        >>> index.radius(-105.17, 39.74, 0.01)
+        ['node_12', 'load_3']
+
+    Attributes:
+
+    - x, y: Longitude and latitude of the indexed points (one per Position, sorted by grid cell).
+    - owner: Index of the element of each point in names.
+    - names, classes: Name and class of the indexed elements, in model order.
+    - class_types, class_id: Distinct classes of the elements and index of the class of each element in class_types.
+
+    An element with several positions (ex: a line) is found if any of its positions matches the query.
+    Distances are euclidean in the units of the coordinates.
+    Positions without longitude or latitude are ignored.
+
+    The index is a snapshot of the positions: it has to be built again after the positions are modified.
+    """
+
+    def __init__(self, names, classes, x, y, owner):
+        """
+        Class CONSTRUCTOR.
+        x, y and owner give the coordinates of each point and the index of its element in names and classes.
+        """
+        self.names = list(names)
+        self.classes = list(classes)
+        self.class_types = []
+        ids = {}
+        for c in self.classes:
+            if c not in ids:
+                ids[c] = len(self.class_types)
+                self.class_types.append(c)
+        self.class_id = np.array([ids[c] for c in self.classes], dtype=int)
+        # Mask of the class_types matching each types argument of the queries
+        self._type_masks = {}
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        owner = np.asarray(owner, dtype=int)
+
+        if len(x) > 0:
+            self.xmin, self.xmax = x.min(), x.max()
+            self.ymin, self.ymax = y.min(), y.max()
+            area = (self.xmax - self.xmin) * (self.ymax - self.ymin)
+            extent = max(self.xmax - self.xmin, self.ymax - self.ymin)
+            # The second term bounds the number of cells when the points are along a line
+            self.cell_size = max(
+                math.sqrt(area * POINTS_PER_CELL / len(x)),
+                extent * POINTS_PER_CELL / len(x),
+            )
+            if self.cell_size == 0:
+                self.cell_size = 1.0
+        else:
+            self.xmin = self.xmax = self.ymin = self.ymax = 0.0
+            self.cell_size = 1.0
+        self.nx = int((self.xmax - self.xmin) // self.cell_size) + 1
+        self.ny = int((self.ymax - self.ymin) // self.cell_size) + 1
+
+        cells = self._column(x) * self.ny + self._row(y)
+        order = np.argsort(cells, kind="stable")
+        self.x = x[order]
+        self.y = y[order]
+        self.owner = owner[order]
+        # Points of cell c are in [cell_start[c], cell_start[c + 1])
+        self.cell_start = np.zeros(self.nx * self.ny + 1, dtype=int)
+        np.cumsum(
+            np.bincount(cells, minlength=self.nx * self.ny), out=self.cell_start[1:]
+        )
+
+    @classmethod
+    def from_model(cls, model, types=None):
+        """
+        Builds the index of the positions of the elements of the model.
+        Only the elements of the given types (class or tuple of classes) are indexed if types is given.
+        """
+        names = []
+        classes = []
+        x = []
+        y = []
+        owner = []
+        for obj in model.models:
+            positions = getattr(obj, "positions", None)
+            if not positions or getattr(obj, "name", None) is None:
+                continue
+            if types is not None and not isinstance(obj, types):
+                continue
+            found = False
+            for position in positions:
+                if position is None or position.long is None or position.lat is None:
+                    continue
+                x.append(position.long)
+                y.append(position.lat)
+                owner.append(len(names))
+                found = True
+            if found:
+                names.append(obj.name)
+                classes.append(type(obj))
+        return cls(names, classes, x, y, owner)
+
+    def __len__(self):
+        """Returns the number of indexed elements."""
+        return len(self.names)
+
+    def _column(self, x):
+        """Returns the column of cells of the given longitudes (clipped to the grid)."""
+        return np.clip(
+            ((np.asarray(x) - self.xmin) // self.cell_size).astype(int), 0, self.nx - 1
+        )
+
+    def _row(self, y):
+        """Returns the row of cells of the given latitudes (clipped to the grid)."""
+        return np.clip(
+            ((np.asarray(y) - self.ymin) // self.cell_size).astype(int), 0, self.ny - 1
+        )
+
+    def _candidates(self, xmin, ymin, xmax, ymax):
+        """Returns the indices of the points in the cells overlapping the bounding box."""
+        if len(self.x) == 0 or xmax < self.xmin or xmin > self.xmax:
+            return np.zeros(0, dtype=int)
+        if ymax < self.ymin or ymin > self.ymax:
+            return np.zeros(0, dtype=int)
+        c0, c1 = self._column([xmin, xmax])
+        r0, r1 = self._row([ymin, ymax])
+        columns = np.arange(c0, c1 + 1) * self.ny
+        starts = self.cell_start[columns + r0]
+        ends = self.cell_start[columns + r1 + 1]
+        if len(columns) == 1:
+            return np.arange(starts[0], ends[0])
+        return np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+
+    def _type_mask(self, points, types):
+        """Returns the mask of the points whose element is of the given types."""
+        if types is None:
+            return np.ones(len(points), dtype=bool)
+        keep = self._type_masks.get(types)
+        if keep is None:
+            keep = np.array(
+                [issubclass(c, types) for c in self.class_types], dtype=bool
+            )
+            self._type_masks[types] = keep
+        if len(keep) == 0:
+            return np.zeros(len(points), dtype=bool)
+        return keep[self.class_id[self.owner[points]]]
+
+    def _elements(self, points, distances=None):
+        """
+        Returns the names of the elements of the given points, without duplicates.
+        Sorted by distance if distances are given, by model order otherwise.
+        """
+        owners = self.owner[points]
+        if distances is None:
+            return [self.names[i] for i in np.unique(owners)]
+        order = np.lexsort((owners, distances))
+        _, first = np.unique(owners[order], return_index=True)
+        return [self.names[i] for i in owners[order][np.sort(first)]]
+
+    def bbox(self, xmin, ymin, xmax, ymax, types=None):
+        """Returns the names of the elements with a position in the bounding box (bounds included), in model order."""
+        points = self._candidates(xmin, ymin, xmax, ymax)
+        x = self.x[points]
+        y = self.y[points]
+        inside = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+        inside &= self._type_mask(points, types)
+        return self._elements(points[inside])
+
+    def radius(self, x, y, r, types=None):
+        """Returns the names of the elements with a position at a distance at most r of (x, y), closest first."""
+        points = self._candidates(x - r, y - r, x + r, y + r)
+        distances = np.hypot(self.x[points] - x, self.y[points] - y)
+        inside = (distances <= r) & self._type_mask(points, types)
+        return self._elements(points[inside], distances[inside])
+
+    def nearest(self, x, y, k=1, types=None, return_distance=False):
+        """
+        Returns the names of the k elements closest to (x, y), closest first.
+        With return_distance=True, returns a list of (name, distance) tuples.
+        """
+        names = []
+        distances = []
+        if len(self.x) > 0 and k > 0:
+            # Half width of the square of cells around the query point
+            span = self.cell_size
+            # Distance from the query point to the farthest point of the grid
+            limit = math.hypot(
+                max(abs(x - self.xmin), abs(x - self.xmax)),
+                max(abs(y - self.ymin), abs(y - self.ymax)),
+            )
+            while True:
+                points = self._candidates(x - span, y - span, x + span, y + span)
+                points = points[self._type_mask(points, types)]
+                d = np.hypot(self.x[points] - x, self.y[points] - y)
+                owners = self.owner[points]
+                order = np.lexsort((owners, d))
+                _, first = np.unique(owners[order], return_index=True)
+                first = order[np.sort(first)]
+                # All the points within span of the query point are in the square
+                if (len(first) >= k and d[first[k - 1]] <= span) or span > limit:
+                    break
+                span *= 2
+            names = [self.names[i] for i in owners[first[:k]]]
+            distances = d[first[:k]].tolist()
+        if return_distance:
+            return list(zip(names, distances))
+        return names
+
+    def nearest_many(self, x, y, types=None):
+        """Returns the name of the closest element of each point of the arrays x and y (None if nothing is indexed)."""
+        result = []
+        for xi, yi in zip(x, y):
+            names = self.nearest(xi, yi, types=types)
+            result.append(names[0] if len(names) > 0 else None)
+        return result
@@ -4,7 +4,10 @@ import logging
 import math
 import cmath
 import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
+from itertools import groupby
 from six import string_types
 
 import numpy as np
@@ -32,9 +35,46 @@ from ditto.models.phase_storage import PhaseStorage
 
 from ditto.models.base import Unicode
 from ditto.modify.system_structure import system_structure_modifier
+from ditto.readers.cyme.section_index import SectionIndex
 
 logger = logging.getLogger(__name__)
 
+# Scans of the CYME files (See Reader.scan), in the order they are needed by Reader.parse
+SCANS = [
+    "sections",
+    "sources",
+    "nodes",
+    "lines",
+    "transformers",
+    "loads",
+    "regulators",
+    "capacitors",
+    "dg",
+    "network_equivalent",
+    "subnetwork_connections",
+    "head_nodes",
+]
+
+# Kinds of the elements of a section (See Reader.add_section_element).
+# The elements connecting two nodes are placed in series in this order, with their rank
+SERIES_ELEMENTS = {"regulator": 0, "transformer": 1, "line": 2}
+# The shunt elements are connected to the last node of the section
+SHUNT_ELEMENTS = {"load", "photovoltaic", "storage", "capacitor"}
+
+
+def _scan_files(task):
+    """
+    Worker function of the parallel parsing: runs one scan of the CYME files in a worker process
+    and returns its records.
+    """
+    name, files, header_mapping = task
+    reader = Reader(**files)
+    reader.header_mapping = header_mapping
+    try:
+        return getattr(reader, "scan_" + name)()
+    finally:
+        reader.close_files()
+
 
 class Reader(AbstractReader):
     """
@@ -198,11 +238,29 @@ class Reader(AbstractReader):
         else:
             self.load_filename = "load.txt"
 
+        # Number of worker processes used to read the files (See prefetch_scans). None uses all the CPUs
+        if "jobs" in kwargs:
+            self.jobs = kwargs["jobs"]
+        else:
+            self.jobs = 1
+
+        # Records read in advance by the worker processes, by scan name (See scan)
+        self.scans = {}
+
         # Set the Network Type to be None. This is set in the parse_sections() function
         self.network_type = None
 
-        # dictionary of sections to components. Used for identifying elements which are  on the same section (which may cause parallel elements to be created)
-        self.section_duplicates = {}
+        # Index of the DiTTo objects created for each section, as lists of (element kind, object) in the order of creation.
+        # Used for identifying elements which are on the same section (which may cause parallel elements to be created)
+        # See add_section_element and fix_section_overlaps
+        self.section_elements = {}
+
+        # Section indexes of the files, built the first time a file is read (See get_file_content)
+        self.section_indexes = {}
+
+        # Objects of the header lines and compiled FORMAT lines (See header_objects and compile_format)
+        self._header_cache = (None, {})
+        self._format_cache = {}
 
         # Header_mapping.
         #
@@ -328,7 +386,7 @@ class Reader(AbstractReader):
         # Replace the old mapping by the new one
         self.header_mapping = new_mapping
 
-    def get_file_content(self, filename):
+    def get_file_content(self, filename, objects=None):
         """
         Open the requested file and returns the content.
         For convinience, filename can be either the full file path or:
@@ -336,6 +394,9 @@ class Reader(AbstractReader):
             -'network': Will get the content of the network file given in the constructor
             -'equipment': Will get the content of the equipment file given in the constructor
             -'load': Will get the content of the load file given in the constructor
+
+        Each file is scanned only once: the sections of the file are indexed (See SectionIndex) and, if a list of objects
+        of the header mapping is given, the content is restricted to the sections of these objects.
         """
         # Shortcut mapping
         if filename == "network":
@@ -345,16 +406,55 @@ class Reader(AbstractReader):
         elif filename == "load":
             filename = os.path.join(self.data_folder_path, self.load_filename)
 
-        # Open the file and get the content
-        try:
-            with open(filename, "r") as f:
-                content_ = f.readlines()
-        except:
-            logger.warning("Unable to open file {name}".format(name=filename))
-            content_ = []
-            pass
+        # Open the file and index its sections
+        if filename not in self.section_indexes:
+            try:
+                self.section_indexes[filename] = SectionIndex(filename)
+            except:
+                logger.warning("Unable to open file {name}".format(name=filename))
+                self.content = iter([])
+                return
+
+        if objects is None:
+            headers = None
+        else:
+            headers = [h for obj in objects for h in self.header_mapping[obj]]
 
-        self.content = iter(content_)
+        self.content = self.section_indexes[filename].lines(headers)
+
+    def close_files(self):
+        """Closes the files indexed by get_file_content."""
+        for index in self.section_indexes.values():
+            index.close()
+        self.section_indexes = {}
+
+    def scan(self, name):
+        """
+        Returns the records of the files read by the scan_<name> method, which is the first phase of parse_<name>:
+        the scans only tokenize the files into dictionaries of records, and the parsers link these records into DiTTo objects.
+
+        If the scan was submitted to the worker processes (See prefetch_scans), waits for its records.
+        Otherwise, the scan is run here.
+        """
+        if name in self.scans:
+            return self.scans.pop(name).result()
+        return getattr(self, "scan_" + name)()
+
+    def prefetch_scans(self, executor):
+        """
+        Submits all the scans of the CYME files to the executor, such that the three files are read by the worker
+        processes while the records are linked into DiTTo objects in this process.
+        """
+        files = {
+            "data_folder_path": self.data_folder_path,
+            "network_filename": self.network_filename,
+            "equipment_filename": self.equipment_filename,
+            "load_filename": self.load_filename,
+        }
+        for name in SCANS:
+            self.scans[name] = executor.submit(
+                _scan_files, (name, files, self.header_mapping)
+            )
 
     def phase_mapping(self, CYME_value):
         """
@@ -719,6 +819,32 @@ class Reader(AbstractReader):
 
         return res[winding]
 
+    def header_objects(self, line):
+        """
+        Returns the objects of the header mapping whose header is in the given line, if the line is a section header
+        (i.e. starts with '['). The objects of each header line are looked up in the mapping once and cached.
+
+        :param line: Text line from CYME ASCII file
+        :type line: str
+        :returns: The objects of the header line. An empty set if the line is not a section header.
+        :rtype: frozenset
+        """
+        if line[:1] != "[" and line.lstrip()[:1] != "[":
+            return frozenset()
+
+        # The cache is reset when the header mapping changes
+        if self._header_cache[0] is not self.header_mapping:
+            self._header_cache = (self.header_mapping, {})
+
+        cache = self._header_cache[1]
+        if line not in cache:
+            cache[line] = frozenset(
+                obj
+                for obj, headers in self.header_mapping.items()
+                if any(x in line for x in headers)
+            )
+        return cache[line]
+
     def check_object_in_line(self, line, obj):
         """
         Check if the header corresponding to object is in the given line.
@@ -727,7 +853,7 @@ class Reader(AbstractReader):
         :type line: str
         :param obj: Object of interest that exists in the mapping
         :type obj: str
-        :returns: True if the header is in line. False otherwise.
+        :returns: True if the line is a section header containing the header of the object. False otherwise.
         :rtype: bool
         """
         # Safety checks
@@ -752,7 +878,36 @@ class Reader(AbstractReader):
                 )
             )
 
-        return np.any([x in line for x in self.header_mapping[obj]])
+        return obj in self.header_objects(line)
+
+    def compile_format(self, format_line, attribute_list):
+        """
+        Returns the column indices of the attributes of attribute_list given by a FORMAT line (ex: FORMAT_NODE=NodeID,CoordX,...),
+        as a dictionary {attribute: index}. Each FORMAT line is compiled once per list of attributes and cached.
+
+        :param format_line: FORMAT line from CYME ASCII file
+        :type format_line: str
+        :param attribute_list: Attributes of interest (in lower case)
+        :type attribute_list: list
+        :returns: The index of each attribute in the data lines
+        :rtype: dict
+        """
+        key = (format_line, tuple(attribute_list))
+        if key not in self._format_cache:
+            counts = Counter(attribute_list)
+            mapping = {}
+            try:
+                arg_list = format_line.split("=")[1].split(",")
+                for idx, arg in enumerate(arg_list):
+                    # Put everything in lower case
+                    arg = arg.lower().strip("\r\n").strip("\n").strip("\r")
+                    # We want the attributes in the attribute list
+                    if counts.get(arg) == 1:
+                        mapping[arg] = idx
+            except:
+                mapping = {}
+            self._format_cache[key] = mapping
+        return self._format_cache[key]
 
     def parser_helper(self, line, obj_list, attribute_list, mapping, *args, **kwargs):
         """
@@ -762,61 +917,80 @@ class Reader(AbstractReader):
         Also takes the default positions of the attributes (mapping).
         The function returns a list of dictionaries, where each dictionary contains the values of the desired attributes of a CYME object.
         """
-        if isinstance(attribute_list, list):
-            attribute_list = np.array(attribute_list)
+        result = {}
+        for ID, record in self.parser_rows(
+            line, obj_list, attribute_list, mapping, *args, **kwargs
+        ):
+            # Rows with the same ID are kept with a '*' appended to their ID
+            while ID in result:
+                ID += "*"
+            result[ID] = record
 
-        if not isinstance(attribute_list, np.ndarray):
-            raise ValueError("Could not cast attribute list to Numpy array.")
+        return result
 
-        if args and isinstance(args[0], dict):
-            additional_information = args[0]
-        else:
-            additional_information = {}
+    def parser_rows(self, line, obj_list, attribute_list, mapping, *args, **kwargs):
+        """
+        Yields the (ID, record) pairs of the rows read by parser_helper, in the order of the file.
+        The IDs are not made unique, such that large sections can be streamed without keeping their rows (See parse_loads).
+        """
+        # Check the presence of headers in the given line
+        # Most lines are not section headers, so this is done first with a single lookup
+        objects = self.header_objects(line)
+        if len(objects) == 0:
+            return
 
-        # This is in the case of multiple Format= lines
-        if (
-            kwargs and "additional_attributes_list" in kwargs
-        ):  # Currently assume only one set of additional attributes, but can be modified to allow for multiple attribute lists
-            additional_attributes = kwargs["additional_attributes_list"]
-        else:
-            additional_attributes = []
+        for obj in obj_list:
+            if not obj in self.header_mapping:
+                raise ValueError(
+                    "{obj} is not a valid object name for the object<->header mapping.{mapp}".format(
+                        obj=obj, mapp=self.header_mapping
+                    )
+                )
 
-        result = {}
+        # If we have a least one
+        if any(obj in objects for obj in obj_list):
 
-        # Check the presence of headers in the given line
-        checks = [self.check_object_in_line(line, obj) for obj in obj_list]
+            if isinstance(attribute_list, np.ndarray):
+                attribute_list = attribute_list.tolist()
+
+            if not isinstance(attribute_list, list):
+                raise ValueError("Could not cast attribute list to Numpy array.")
+
+            if args and isinstance(args[0], dict):
+                additional_information = args[0]
+            else:
+                additional_information = {}
+
+            # This is in the case of multiple Format= lines
+            if (
+                kwargs and "additional_attributes_list" in kwargs
+            ):  # Currently assume only one set of additional attributes, but can be modified to allow for multiple attribute lists
+                additional_attributes = kwargs["additional_attributes_list"]
+            else:
+                additional_attributes = []
 
-        # If we have a least one
-        if any(checks):
             # Get the next line
-            next_line = next(self.content)
+            try:
+                next_line = next(self.content)
+            except StopIteration:
+                return
 
             # If the next line provides the format, then grab it
             if "format" in next_line.lower():
-                try:
-                    mapping = {}
-                    arg_list = next_line.split("=")[1]
-                    arg_list = arg_list.split(",")
-                    # Put everything in lower case
-                    arg_list = map(lambda x: x.lower().strip("\r\n"), arg_list)
-                    arg_list = map(lambda x: x.strip("\n"), arg_list)
-                    arg_list = map(lambda x: x.strip("\r"), arg_list)
-
-                    # We want the attributes in the attribute list
-                    for idx, arg in enumerate(arg_list):
-                        temp = np.argwhere(arg == attribute_list).flatten()
-                        if len(temp) == 1:
-                            idx2 = temp[0]
-                            mapping[attribute_list[idx2]] = idx
-                except:
-                    pass
+                mapping = self.compile_format(next_line, attribute_list)
 
-                next_line = next(self.content)
+                try:
+                    next_line = next(self.content)
+                except StopIteration:
+                    return
 
             # At this point, we should have the mapping for the parameters of interest
+            # Columns of the attributes, in the order of the attribute list
+            columns = [(k, mapping[k]) for k in attribute_list if k in mapping]
+
             # while next_line[0] not in ['[','',' ','\n','\r\n']:
             while len(next_line) > 2:
-                if "=" not in next_line.lower():
+                if "=" not in next_line:
 
                     data = next_line.split(",")
 
@@ -824,42 +998,26 @@ class Reader(AbstractReader):
 
                     if len(data) > 1:
 
-                        while ID in result:
-                            ID += "*"
-                        result[ID] = {}
-
-                        for k in attribute_list:
-                            try:
-                                result[ID][k] = data[mapping[k]]
-                            except:
-                                pass
+                        n = len(data)
+                        record = {k: data[idx] for k, idx in columns if idx < n}
+                        record.update(additional_information)
 
-                        result[ID].update(additional_information)
+                        yield ID, record
                 elif additional_attributes is not None and additional_attributes != []:
                     try:
-                        mapping = {}
-                        arg_list = next_line.split("=")[1]
-                        arg_list = arg_list.split(",")
-                        # Put everything in lower case
-                        arg_list = map(lambda x: x.lower().strip("\r\n"), arg_list)
-                        arg_list = map(lambda x: x.strip("\n"), arg_list)
-                        arg_list = map(lambda x: x.strip("\r"), arg_list)
-
-                        if isinstance(additional_attributes, list):
-                            additional_attributes = np.array(additional_attributes)
-
-                        if not isinstance(additional_attributes, np.ndarray):
+                        if isinstance(additional_attributes, np.ndarray):
+                            additional_attributes = additional_attributes.tolist()
+
+                        if not isinstance(additional_attributes, list):
                             raise ValueError(
                                 "Could not cast attribute list to Numpy array."
                             )
 
-                        # We want the attributes in the attribute list
-                        for idx, arg in enumerate(arg_list):
-                            temp = np.argwhere(arg == additional_attributes).flatten()
-                            if len(temp) == 1:
-                                idx2 = temp[0]
-                                mapping[additional_attributes[idx2]] = idx
+                        mapping = self.compile_format(next_line, additional_attributes)
                         attribute_list = additional_attributes
+                        columns = [
+                            (k, mapping[k]) for k in attribute_list if k in mapping
+                        ]
                         additional_attributes = []
                     except:
                         logger.warning(
@@ -872,8 +1030,6 @@ class Reader(AbstractReader):
                 except StopIteration:
                     break
 
-        return result
-
     def parse(self, model, **kwargs):
         """
         Parse the CYME model to DiTTo.
@@ -888,34 +1044,50 @@ class Reader(AbstractReader):
         else:
             self.verbose = False
 
-        if self.verbose:
-            logger.info("Parsing the header...")
+        # Phase one: the files are read in worker processes, phase two links the records (See scan)
+        executor = None
+        jobs = self.jobs if self.jobs is not None else os.cpu_count()
+        if jobs > 1:
+            executor = ProcessPoolExecutor(max_workers=jobs)
+            self.prefetch_scans(executor)
+
+        try:
+            if self.verbose:
+                logger.info("Parsing the header...")
 
-        self.parse_header()
+            self.parse_header()
 
-        logger.info("Parsing the sections...")
-        self.parse_sections(model)
+            logger.info("Parsing the sections...")
+            self.parse_sections(model)
 
-        logger.info("Parsing the sources...")
-        self.parse_sources(model)
+            logger.info("Parsing the sources...")
+            self.parse_sources(model)
 
-        # Call parse method of abtract reader
-        super(Reader, self).parse(model, **kwargs)
+            # Call parse method of abtract reader
+            super(Reader, self).parse(model, **kwargs)
 
-        logger.info("Parsing the network equivalents...")
-        self.parse_network_equivalent(model)
+            logger.info("Parsing the network equivalents...")
+            self.parse_network_equivalent(model)
 
-        # The variable self.network_type is set in the parse_sections() function.
-        # i.e. parse_sections
-        if self.network_type == "substation":
-            logger.info("Parsing the subnetwork connections...")
-            self.parse_subnetwork_connections(model)
-        else:
-            logger.info("Parsing the Headnodes...")
-            self.parse_head_nodes(model)
+            # The variable self.network_type is set in the parse_sections() function.
+            # i.e. parse_sections
+            if self.network_type == "substation":
+                logger.info("Parsing the subnetwork connections...")
+                self.parse_subnetwork_connections(model)
+            else:
+                logger.info("Parsing the Headnodes...")
+                self.parse_head_nodes(model)
+        finally:
+            if executor is not None:
+                for future in self.scans.values():
+                    future.cancel()
+                self.scans = {}
+                executor.shutdown()
 
         self.fix_section_overlaps(model)
 
+        self.close_files()
+
         model.set_names()
         modifier = system_structure_modifier(model)
         modifier.set_nominal_voltages_recur()
@@ -970,16 +1142,13 @@ class Reader(AbstractReader):
                 "Could not find [SI] or [IMPERIAL] unit system information. Unable to parse."
             )
 
-    def parse_subnetwork_connections(self, model):
-        """Parse the subnetwork connections.
-        These specify the interconnection points for a substation
-        """
-        model.set_names()
-        self.get_file_content("network")
+    def scan_subnetwork_connections(self):
+        """Reads the [SUBNETWORK CONNECTIONS] records of the network file."""
+        self.get_file_content("network", ["subnetwork_connections"])
         mapp_subnetwork_connections = {"nodeid": 1}
-        self.subnetwork_connections = {}
+        subnetwork_connections = {}
         for line in self.content:
-            self.subnetwork_connections.update(
+            subnetwork_connections.update(
                 self.parser_helper(
                     line,
                     ["subnetwork_connections"],
@@ -988,15 +1157,26 @@ class Reader(AbstractReader):
                 )
             )
 
+        return {"subnetwork_connections": subnetwork_connections}
+
+    def parse_subnetwork_connections(self, model):
+        """Parse the subnetwork connections.
+        These specify the interconnection points for a substation
+        """
+        model.set_names()
+        self.subnetwork_connections = self.scan("subnetwork_connections")[
+            "subnetwork_connections"
+        ]
+
         for key in self.subnetwork_connections:
             model[
                 self.subnetwork_connections[key]["nodeid"]
             ].is_substation_connection = True
 
-    def parse_head_nodes(self, model):
-        """ This parses the [HEADNODES] objects and is used to build Feeder_metadata DiTTo objects which define the feeder names and feeder headnodes"""
+    def scan_head_nodes(self):
+        """Reads the [HEADNODES] records of the network file."""
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content("network", ["headnodes"])
         mapp = {
             "nodeid": 0,
             "networkid": 1,
@@ -1007,15 +1187,21 @@ class Reader(AbstractReader):
                 self.parser_helper(line, ["headnodes"], ["nodeid", "networkid"], mapp)
             )
 
+        return {"headnodes": headnodes}
+
+    def parse_head_nodes(self, model):
+        """ This parses the [HEADNODES] objects and is used to build Feeder_metadata DiTTo objects which define the feeder names and feeder headnodes"""
+        headnodes = self.scan("head_nodes")["headnodes"]
+
         for sid, headnode in headnodes.items():
             feeder_metadata = Feeder_metadata(model)
             feeder_metadata.name = headnode["networkid"].strip().lower()
             feeder_metadata.headnode = headnode["nodeid"].strip().lower()
 
-    def parse_sources(self, model):
-        """Parse the sources."""
+    def scan_sources(self):
+        """Reads the source records of the network file and the substation records of the equipment file."""
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content("network", ["source", "source_equivalent"])
 
         mapp = {"sourceid": 0, "nodeid": 2, "networkid": 3, "desiredvoltage": 4}
         mapp_source_equivalent = {
@@ -1073,7 +1259,7 @@ class Reader(AbstractReader):
             )
 
 
-        self.get_file_content("equipment")
+        self.get_file_content("equipment", ["substation"])
 
         for line in self.content:
             subs.update(
@@ -1081,6 +1267,20 @@ class Reader(AbstractReader):
                     line, ["substation"], ["id", "mva", "kvll", "conn"], mapp_sub
                 )
             )
+
+        return {
+            "sources": sources,
+            "subs": subs,
+            "source_equivalents": source_equivalents,
+        }
+
+    def parse_sources(self, model):
+        """Parse the sources."""
+        records = self.scan("sources")
+        sources = records["sources"]
+        subs = records["subs"]
+        source_equivalents = records["source_equivalents"]
+
         if len(sources.items()) == 0:
             for sid, source_equivalent_data in source_equivalents.items():
                 if source_equivalent_data["loadmodelname"].lower() != "default":
@@ -1330,17 +1530,10 @@ class Reader(AbstractReader):
 
                     #     api_transformer.windings.append(api_winding)
 
-    def parse_nodes(self, model):
-        """
-        Parse the nodes from CYME to DiTTo.
-
-        :param model: DiTTo model
-        :type model: DiTTo model
-        """
-        self._nodes = []
-
+    def scan_nodes(self):
+        """Reads the node and node connector records of the network file."""
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content("network", ["node"])
 
         # Default mapp (positions if all fields are present in the format)
         mapp = {
@@ -1377,7 +1570,7 @@ class Reader(AbstractReader):
                     **kwargs
                 )
             )
-        self.get_file_content("network")
+        self.get_file_content("network", ["node_connector"])
         for line in self.content:
             node_connectors.update(
                 self.parser_helper(
@@ -1385,6 +1578,24 @@ class Reader(AbstractReader):
                 )
             )
 
+        return {
+            "nodes": nodes,
+            "node_connectors": node_connectors,
+        }
+
+    def parse_nodes(self, model):
+        """
+        Parse the nodes from CYME to DiTTo.
+
+        :param model: DiTTo model
+        :type model: DiTTo model
+        """
+        self._nodes = []
+
+        records = self.scan("nodes")
+        nodes = records["nodes"]
+        node_connectors = records["node_connectors"]
+
         for ID, node in nodes.items():
             # Create a new DiTTo node object
             api_node = Node(model)
@@ -1550,43 +1761,14 @@ class Reader(AbstractReader):
 
         return api_wire
 
-    def parse_sections(self, model):
-        """
-        This function is responsible for parsing the sections. It is expecting the following structure:
-        ...
-
-        [SECTION]
-        FORMAT_section=sectionid,fromnodeid,tonodeid,phase
-        FORMAT_Feeder=networkid,headnodeid
-        Feeder=feeder_1,head_feeder_1
-        section_1_feeder_1,node_1,node_2,ABC
-        ...
-        ...
-        Feeder=feeder_2,head_feeder_2
-        section_1_feeder_2,node_1,node_2,ABC
-        ...
-        ...
-
-        **What is done in this function:**
-
-        - We need to create a clear and fast mapping between feeders and sectionids
-        - Same thing, mapping between sectionids and nodes/phases
-        - Since we will be using these structures a lot in the reader, we need something fast that does not involve looping like crazy
-
-        **Data structures:**
-
-        1) feeder_section_mapping: dictionary where keys are network_ids and values are lists of section id_s
-        2) section_feeder_mapping: dictionary where keys are section ids and values are network_ids
-           (to perform the opposite query as 1) without having to look in every lists of section ids until we find the good one...)
-        3) section_phase_mapping: dictionary where keys are section ids and values are tuples (node_1, node_2, phase)
-
-        .. warning:: This should be called prior to any other parser because the other parsers rely on these 3 data structures.
-        """
-        self.feeder_section_mapping = {}
-        self.section_feeder_mapping = {}
-        self.section_phase_mapping = {}
+    def scan_sections(self):
+        """Reads the [SECTION] part of the network file (See parse_sections)."""
+        network_type = None
+        feeder_section_mapping = {}
+        section_feeder_mapping = {}
+        section_phase_mapping = {}
 
-        self.network_data = {}
+        network_data = {}
 
         format_section = None
         format_feeder = None
@@ -1595,7 +1777,7 @@ class Reader(AbstractReader):
         job_is_done = False
 
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content("network", ["section"])
 
         # Loop over the network file
         for line in self.content:
@@ -1651,9 +1833,9 @@ class Reader(AbstractReader):
                             line[:7].lower() == "feeder="
                             or line[:15].lower() == "generalnetwork="
                         ):
-                            self.network_type = "feeder"
+                            network_type = "feeder"
                         if line[:11].lower() == "substation=":
-                            self.network_type = "substation"
+                            network_type = "substation"
 
                         # We should have a format for sections and feeders,
                         # otherwise, raise an error...
@@ -1695,12 +1877,12 @@ class Reader(AbstractReader):
                         _netID = feeder_data[format_feeder.index("networkid")].lower()
 
                         # First, we store all the feeder data in the network_data structure
-                        self.network_data[_netID] = {}
+                        network_data[_netID] = {}
                         for key, value in zip(format_feeder, feeder_data):
-                            self.network_data[_netID][key] = value
+                            network_data[_netID][key] = value
 
                         # Then, we create a new entry in feeder_section_mapping
-                        self.feeder_section_mapping[_netID] = []
+                        feeder_section_mapping[_netID] = []
 
                     # Otherwise, we should have a new section...
                     else:
@@ -1729,25 +1911,67 @@ class Reader(AbstractReader):
                         ].lower()
 
                         # Create a new entry in section_phase_mapping
-                        self.section_phase_mapping[_sectionID] = {}
+                        section_phase_mapping[_sectionID] = {}
 
                         # Populate this new entry
                         for key, value in zip(format_section, section_data):
-                            self.section_phase_mapping[_sectionID][key] = value
+                            section_phase_mapping[_sectionID][key] = value
 
                         # And finally, add a new entry to section_feeder_mapping
-                        self.section_feeder_mapping[_sectionID] = _netID
+                        section_feeder_mapping[_sectionID] = _netID
 
                     # Finally, move on to next line
                     line = next(self.content)
 
-    def parse_lines(self, model):
+        return {
+            "feeder_section_mapping": feeder_section_mapping,
+            "section_feeder_mapping": section_feeder_mapping,
+            "section_phase_mapping": section_phase_mapping,
+            "network_data": network_data,
+            "network_type": network_type,
+        }
+
+    def parse_sections(self, model):
         """
-        Parse the lines from CYME to DiTTo.
+        This function is responsible for parsing the sections. It is expecting the following structure:
+        ...
 
-        :param model: DiTTo model
-        :type model: DiTTo model
+        [SECTION]
+        FORMAT_section=sectionid,fromnodeid,tonodeid,phase
+        FORMAT_Feeder=networkid,headnodeid
+        Feeder=feeder_1,head_feeder_1
+        section_1_feeder_1,node_1,node_2,ABC
+        ...
+        ...
+        Feeder=feeder_2,head_feeder_2
+        section_1_feeder_2,node_1,node_2,ABC
+        ...
+        ...
+
+        **What is done in this function:**
+
+        - We need to create a clear and fast mapping between feeders and sectionids
+        - Same thing, mapping between sectionids and nodes/phases
+        - Since we will be using these structures a lot in the reader, we need something fast that does not involve looping like crazy
+
+        **Data structures:**
+
+        1) feeder_section_mapping: dictionary where keys are network_ids and values are lists of section id_s
+        2) section_feeder_mapping: dictionary where keys are section ids and values are network_ids
+           (to perform the opposite query as 1) without having to look in every lists of section ids until we find the good one...)
+        3) section_phase_mapping: dictionary where keys are section ids and values are tuples (node_1, node_2, phase)
+
+        .. warning:: This should be called prior to any other parser because the other parsers rely on these 3 data structures.
         """
+        records = self.scan("sections")
+        self.feeder_section_mapping = records["feeder_section_mapping"]
+        self.section_feeder_mapping = records["section_feeder_mapping"]
+        self.section_phase_mapping = records["section_phase_mapping"]
+        self.network_data = records["network_data"]
+        self.network_type = records["network_type"]
+
+    def scan_lines(self):
+        """Reads the line, cable and switching device records of the network and equipment files."""
         # Default mapp (positions if all fields are present in the format)
         # These numbers come from the CYME documentation (position of the fields)
         mapp_overhead = {
@@ -1844,7 +2068,7 @@ class Reader(AbstractReader):
             "amps": 5,
             "withstandrating": 15,
         }
-        mapp_cable = {"id": 0, "r1": 1, "r0": 2, "x1": 3, "x0": 4, "amps": 7}
+
         mapp_concentric_neutral_cable = {
             "id": 0,
             "r1": 1,
@@ -1867,63 +2091,20 @@ class Reader(AbstractReader):
 
         mapp_switch_eq = {"id": 0, "amps": 1, "kvll": 6}
 
-        # Instanciate the lists for storing objects
-        self.overhead_lines = []
-        self.underground_lines = []
-        self.sections = []
-        # self.lines=[]
-        self.lines_unbalanced = []
-        # self.spacings=[]
-        # self.conductors=[]
-        self.overhead_by_phase = []
-
-        self.balanced_lines = {}
-        self.unbalanced_lines = {}
-        self.settings = {}
-        self.spacings = {}
-        self.conductors = {}
-        self.concentric_neutral_cable = {}
-        self.cables = {}
-
-        self.network_protectors = {}
-        self.breakers = {}
-        self.fuses = {}
-        self.reclosers = {}
-        self.sectionalizers = {}
-        self.switches = {}
-
-        # Instanciate the list in which we store the DiTTo line objects
-        self._lines = []
-
-        self.section_phase = {}
-
-        mapp_closed_phase = {
-            0: "none",
-            1: "A",
-            2: "B",
-            3: "C",
-            4: "AB",
-            5: "AC",
-            6: "BC",
-            7: "ABC",
-            "0": "none",
-            "1": "A",
-            "2": "B",
-            "3": "C",
-            "4": "AB",
-            "5": "AC",
-            "6": "BC",
-            "7": "ABC",
-            "none": "none",
-            "NONE": "none",
-            "A": "A",
-            "B": "B",
-            "C": "C",
-            "AB": "AB",
-            "AC": "AC",
-            "BC": "BC",
-            "ABC": "ABC",
-        }
+        balanced_lines = {}
+        unbalanced_lines = {}
+        settings = {}
+        spacings = {}
+        conductors = {}
+        concentric_neutral_cable = {}
+        cables = {}
+
+        network_protectors = {}
+        breakers = {}
+        fuses = {}
+        reclosers = {}
+        sectionalizers = {}
+        switches = {}
 
         #####################################################
         #                                                   #
@@ -1932,7 +2113,22 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content(
+            "network",
+            [
+                "overhead_unbalanced_line_settings",
+                "overhead_line_settings",
+                "overhead_byphase_settings",
+                "underground_line_settings",
+                "switch_settings",
+                "sectionalizer_settings",
+                "fuse_settings",
+                "recloser_settings",
+                "breaker_settings",
+                "network_protector_settings",
+                "section",
+            ],
+        )
 
         # Loop over the network file
         for line in self.content:
@@ -1943,8 +2139,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["overhead_unbalanced_line_settings"],
@@ -1960,8 +2156,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["overhead_line_settings"],
@@ -1977,8 +2173,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["overhead_byphase_settings"],
@@ -2007,8 +2203,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["underground_line_settings"],
@@ -2024,8 +2220,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["switch_settings"],
@@ -2041,8 +2237,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["sectionalizer_settings"],
@@ -2058,8 +2254,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["fuse_settings"],
@@ -2075,8 +2271,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["recloser_settings"],
@@ -2092,8 +2288,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["breaker_settings"],
@@ -2109,8 +2305,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["network_protector_settings"],
@@ -2126,8 +2322,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["section"],
@@ -2143,7 +2339,23 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the equipment file
-        self.get_file_content("equipment")
+        self.get_file_content(
+            "equipment",
+            [
+                "line",
+                "unbalanced_line",
+                "spacing_table",
+                "conductor",
+                "concentric_neutral_cable",
+                "cable",
+                "switch",
+                "fuse",
+                "recloser",
+                "sectionalizer",
+                "breaker",
+                "network_protector",
+            ],
+        )
 
         # Loop over the equipment file
         for line in self.content:
@@ -2154,7 +2366,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.balanced_lines.update(
+            balanced_lines.update(
                 self.parser_helper(
                     line,
                     ["line"],
@@ -2182,7 +2394,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.unbalanced_lines.update(
+            unbalanced_lines.update(
                 self.parser_helper(
                     line,
                     ["unbalanced_line"],
@@ -2222,7 +2434,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.spacings.update(
+            spacings.update(
                 self.parser_helper(
                     line,
                     ["spacing_table"],
@@ -2249,7 +2461,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.conductors.update(
+            conductors.update(
                 self.parser_helper(
                     line,
                     ["conductor"],
@@ -2264,7 +2476,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.concentric_neutral_cable.update(
+            concentric_neutral_cable.update(
                 self.parser_helper(
                     line,
                     ["concentric_neutral_cable"],
@@ -2288,7 +2500,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.cables.update(
+            cables.update(
                 self.parser_helper(
                     line,
                     ["cable"],
@@ -2303,7 +2515,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.switches.update(
+            switches.update(
                 self.parser_helper(
                     line, ["switch"], ["id", "amps", "kvll"], mapp_switch_eq
                 )
@@ -2315,7 +2527,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.fuses.update(
+            fuses.update(
                 self.parser_helper(
                     line,
                     ["fuse"],
@@ -2330,7 +2542,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.reclosers.update(
+            reclosers.update(
                 self.parser_helper(
                     line,
                     ["recloser"],
@@ -2345,7 +2557,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.sectionalizers.update(
+            sectionalizers.update(
                 self.parser_helper(
                     line,
                     ["sectionalizer"],
@@ -2360,7 +2572,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.breakers.update(
+            breakers.update(
                 self.parser_helper(
                     line,
                     ["breaker"],
@@ -2375,7 +2587,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.network_protectors.update(
+            network_protectors.update(
                 self.parser_helper(
                     line,
                     ["network_protector"],
@@ -2384,6 +2596,88 @@ class Reader(AbstractReader):
                 )
             )
 
+        return {
+            "balanced_lines": balanced_lines,
+            "unbalanced_lines": unbalanced_lines,
+            "settings": settings,
+            "spacings": spacings,
+            "conductors": conductors,
+            "concentric_neutral_cable": concentric_neutral_cable,
+            "cables": cables,
+            "network_protectors": network_protectors,
+            "breakers": breakers,
+            "fuses": fuses,
+            "reclosers": reclosers,
+            "sectionalizers": sectionalizers,
+            "switches": switches,
+        }
+
+    def parse_lines(self, model):
+        """
+        Parse the lines from CYME to DiTTo.
+
+        :param model: DiTTo model
+        :type model: DiTTo model
+        """
+        records = self.scan("lines")
+        self.balanced_lines = records["balanced_lines"]
+        self.unbalanced_lines = records["unbalanced_lines"]
+        self.settings = records["settings"]
+        self.spacings = records["spacings"]
+        self.conductors = records["conductors"]
+        self.concentric_neutral_cable = records["concentric_neutral_cable"]
+        self.cables = records["cables"]
+        self.network_protectors = records["network_protectors"]
+        self.breakers = records["breakers"]
+        self.fuses = records["fuses"]
+        self.reclosers = records["reclosers"]
+        self.sectionalizers = records["sectionalizers"]
+        self.switches = records["switches"]
+        mapp_cable = {"id": 0, "r1": 1, "r0": 2, "x1": 3, "x0": 4, "amps": 7}
+        # Instanciate the lists for storing objects
+        self.overhead_lines = []
+        self.underground_lines = []
+        self.sections = []
+        # self.lines=[]
+        self.lines_unbalanced = []
+        # self.spacings=[]
+        # self.conductors=[]
+        self.overhead_by_phase = []
+
+        # Instanciate the list in which we store the DiTTo line objects
+        self._lines = []
+
+        self.section_phase = {}
+
+        mapp_closed_phase = {
+            0: "none",
+            1: "A",
+            2: "B",
+            3: "C",
+            4: "AB",
+            5: "AC",
+            6: "BC",
+            7: "ABC",
+            "0": "none",
+            "1": "A",
+            "2": "B",
+            "3": "C",
+            "4": "AB",
+            "5": "AC",
+            "6": "BC",
+            "7": "ABC",
+            "none": "none",
+            "NONE": "none",
+            "A": "A",
+            "B": "B",
+            "C": "C",
+            "AB": "AB",
+            "AC": "AC",
+            "BC": "BC",
+            "ABC": "ABC",
+        }
+
+
         #####################################################
         #                                                   #
         #       JOIN LISTS AND CREATE DITTO OBJECTS         #
@@ -2570,9 +2864,7 @@ class Reader(AbstractReader):
                     api_line = Line(model)
                     for k, v in new_line.items():
                         setattr(api_line, k, v)
-                    if not sectionID in self.section_duplicates:
-                        self.section_duplicates[sectionID] = []
-                    self.section_duplicates[sectionID].append(api_line)
+                    self.add_section_element(sectionID, api_line, "line")
                     continue
 
                 # Sectionalizer
@@ -2656,9 +2948,7 @@ class Reader(AbstractReader):
                     for k, v in new_line.items():
                         setattr(api_line, k, v)
 
-                    if not sectionID in self.section_duplicates:
-                        self.section_duplicates[sectionID] = []
-                    self.section_duplicates[sectionID].append(api_line)
+                    self.add_section_element(sectionID, api_line, "line")
 
                     continue
 
@@ -2741,9 +3031,7 @@ class Reader(AbstractReader):
                     api_line = Line(model)
                     for k, v in new_line.items():
                         setattr(api_line, k, v)
-                    if not sectionID in self.section_duplicates:
-                        self.section_duplicates[sectionID] = []
-                    self.section_duplicates[sectionID].append(api_line)
+                    self.add_section_element(sectionID, api_line, "line")
                     continue
 
                 # recloser
@@ -2827,9 +3115,7 @@ class Reader(AbstractReader):
                     for k, v in new_line.items():
                         setattr(api_line, k, v)
 
-                    if not sectionID in self.section_duplicates:
-                        self.section_duplicates[sectionID] = []
-                    self.section_duplicates[sectionID].append(api_line)
+                    self.add_section_element(sectionID, api_line, "line")
                     continue
 
                 # breaker
@@ -2912,9 +3198,7 @@ class Reader(AbstractReader):
                     for k, v in new_line.items():
                         setattr(api_line, k, v)
 
-                    if not sectionID in self.section_duplicates:
-                        self.section_duplicates[sectionID] = []
-                    self.section_duplicates[sectionID].append(api_line)
+                    self.add_section_element(sectionID, api_line, "line")
                     continue
 
                 # Network Protectors
@@ -3004,9 +3288,7 @@ class Reader(AbstractReader):
                     api_line = Line(model)
                     for k, v in new_line.items():
                         setattr(api_line, k, v)
-                    if not sectionID in self.section_duplicates:
-                        self.section_duplicates[sectionID] = []
-                    self.section_duplicates[sectionID].append(api_line)
+                    self.add_section_element(sectionID, api_line, "line")
                     continue
 
             line_data = None
@@ -3821,17 +4103,12 @@ class Reader(AbstractReader):
 
             # Append the line DiTTo object to the list of DiTTo lines
             self._lines.append(api_line)
-            if not sectionID in self.section_duplicates:
-                self.section_duplicates[sectionID] = []
-            self.section_duplicates[sectionID].append(api_line)
+            self.add_section_element(sectionID, api_line, "line")
 
         return 1
 
-    def parse_capacitors(self, model):
-        """Parse the capacitors from CYME to DiTTo."""
-        # Instanciate the list in which we store the DiTTo capacitor objects
-        self._capacitors = []
-
+    def scan_capacitors(self):
+        """Reads the capacitor records of the network and equipment files."""
         mapp_serie_capacitor_settings = {
             "sectionid": 0,
             "eqid": 2,
@@ -3853,8 +4130,8 @@ class Reader(AbstractReader):
         }
         mapp_serie_capacitor = {"id": 0, "reactance": 6}
         mapp_shunt_capacitor = {"id": 0, "kvar": 1, "kv": 2, "type": 6}
-        self.settings = {}
-        self.capacitors = {}
+        settings = {}
+        capacitors = {}
 
         #####################################################
         #                                                   #
@@ -3863,7 +4140,9 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content(
+            "network", ["serie_capacitor_settings", "shunt_capacitor_settings"]
+        )
 
         # Loop over the network file
         for line in self.content:
@@ -3874,7 +4153,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings.update(
+            settings.update(
                 self.parser_helper(
                     line,
                     ["serie_capacitor_settings"],
@@ -3890,7 +4169,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings.update(
+            settings.update(
                 self.parser_helper(
                     line,
                     ["shunt_capacitor_settings"],
@@ -3919,7 +4198,7 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the equipment file
-        self.get_file_content("equipment")
+        self.get_file_content("equipment", ["serie_capacitor", "shunt_capacitor"])
 
         # Loop over the equipment file
         for line in self.content:
@@ -3930,7 +4209,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.capacitors.update(
+            capacitors.update(
                 self.parser_helper(
                     line, ["serie_capacitor"], ["id", "reactance"], mapp_serie_capacitor
                 )
@@ -3942,7 +4221,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.capacitors.update(
+            capacitors.update(
                 self.parser_helper(
                     line,
                     ["shunt_capacitor"],
@@ -3951,6 +4230,20 @@ class Reader(AbstractReader):
                 )
             )
 
+        return {
+            "settings": settings,
+            "capacitors": capacitors,
+        }
+
+    def parse_capacitors(self, model):
+        """Parse the capacitors from CYME to DiTTo."""
+        # Instanciate the list in which we store the DiTTo capacitor objects
+        self._capacitors = []
+
+        records = self.scan("capacitors")
+        self.settings = records["settings"]
+        self.capacitors = records["capacitors"]
+
         for sectionID, settings in self.settings.items():
 
             sectionID = sectionID.strip("*").lower()
@@ -4157,17 +4450,12 @@ class Reader(AbstractReader):
                 api_capacitor.phase_capacitors.append(api_phaseCapacitor)
 
             self._capacitors.append(api_capacitor)
-            if not sectionID in self.section_duplicates:
-                self.section_duplicates[sectionID] = []
-            self.section_duplicates[sectionID].append(api_capacitor)
+            self.add_section_element(sectionID, api_capacitor, "capacitor")
 
         return 1
 
-    def parse_transformers(self, model):
-        """Parse the transformers from CYME to DiTTo. Since substation transformer can have LTCs attached, when parsing a transformer, we may also create a regulator. LTCs are represented as regulators."""
-        # Instanciate the list in which we store the DiTTo transformer objects
-        self._transformers = []
-
+    def scan_transformers(self):
+        """Reads the transformer records of the network and equipment files."""
         mapp_auto_transformer_settings = {
             "sectionid": 0,
             "eqid": 2,
@@ -4284,12 +4572,12 @@ class Reader(AbstractReader):
             "coordy": 11,
         }
 
-        self.auto_transformers = {}
-        self.grounding_transformers = {}
-        self.three_winding_auto_transformers = {}
-        self.three_winding_transformers = {}
-        self.settings = {}
-        self.transformers = {}
+        auto_transformers = {}
+        grounding_transformers = {}
+        three_winding_auto_transformers = {}
+        three_winding_transformers = {}
+        settings = {}
+        transformers = {}
 
         #####################################################
         #                                                   #
@@ -4298,7 +4586,17 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content(
+            "network",
+            [
+                "auto_transformer_settings",
+                "grounding_transformer_settings",
+                "three_winding_auto_transformer_settings",
+                "three_winding_transformer_settings",
+                "transformer_settings",
+                "phase_shifter_transformer_settings",
+            ],
+        )
 
         # Loop over the network file
         for line in self.content:
@@ -4309,7 +4607,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings.update(
+            settings.update(
                 self.parser_helper(
                     line,
                     ["auto_transformer_settings"],
@@ -4332,7 +4630,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings.update(
+            settings.update(
                 self.parser_helper(
                     line,
                     ["grounding_transformer_settings"],
@@ -4348,7 +4646,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings.update(
+            settings.update(
                 self.parser_helper(
                     line,
                     ["three_winding_auto_transformer_settings"],
@@ -4375,7 +4673,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings.update(
+            settings.update(
                 self.parser_helper(
                     line,
                     ["three_winding_transformer_settings"],
@@ -4402,7 +4700,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings.update(
+            settings.update(
                 self.parser_helper(
                     line,
                     ["transformer_settings"],
@@ -4434,7 +4732,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings.update(
+            settings.update(
                 self.parser_helper(
                     line,
                     ["phase_shifter_transformer_settings"],
@@ -4451,7 +4749,16 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the equipment file
-        self.get_file_content("equipment")
+        self.get_file_content(
+            "equipment",
+            [
+                "auto_transformer",
+                "grounding_transformer",
+                "three_winding_auto_transformer",
+                "three_winding_transformer",
+                "transformer",
+            ],
+        )
 
         # Loop over the equipment file
         for line in self.content:
@@ -4462,7 +4769,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.auto_transformers.update(
+            auto_transformers.update(
                 self.parser_helper(
                     line,
                     ["auto_transformer"],
@@ -4486,7 +4793,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.grounding_transformers.update(
+            grounding_transformers.update(
                 self.parser_helper(
                     line,
                     ["grounding_transformer"],
@@ -4502,7 +4809,7 @@ class Reader(AbstractReader):
             #########################################
             #
             # LTC controls not yet supported for three-winding transformers
-            self.three_winding_auto_transformers.update(
+            three_winding_auto_transformers.update(
                 self.parser_helper(
                     line,
                     ["three_winding_auto_transformer"],
@@ -4527,7 +4834,7 @@ class Reader(AbstractReader):
             #########################################
             #
             # LTC controls not yet supported for three-winding transformers
-            self.three_winding_transformers.update(
+            three_winding_transformers.update(
                 self.parser_helper(
                     line,
                     ["three_winding_transformer"],
@@ -4551,7 +4858,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.transformers.update(
+            transformers.update(
                 self.parser_helper(
                     line,
                     ["transformer"],
@@ -4577,6 +4884,28 @@ class Reader(AbstractReader):
                 )
             )
 
+        return {
+            "auto_transformers": auto_transformers,
+            "grounding_transformers": grounding_transformers,
+            "three_winding_auto_transformers": three_winding_auto_transformers,
+            "three_winding_transformers": three_winding_transformers,
+            "settings": settings,
+            "transformers": transformers,
+        }
+
+    def parse_transformers(self, model):
+        """Parse the transformers from CYME to DiTTo. Since substation transformer can have LTCs attached, when parsing a transformer, we may also create a regulator. LTCs are represented as regulators."""
+        # Instanciate the list in which we store the DiTTo transformer objects
+        self._transformers = []
+
+        records = self.scan("transformers")
+        self.auto_transformers = records["auto_transformers"]
+        self.grounding_transformers = records["grounding_transformers"]
+        self.three_winding_auto_transformers = records["three_winding_auto_transformers"]
+        self.three_winding_transformers = records["three_winding_transformers"]
+        self.settings = records["settings"]
+        self.transformers = records["transformers"]
+
         for sectionID, settings in self.settings.items():
 
             sectionID = sectionID.strip("*").lower()
@@ -4972,24 +5301,12 @@ class Reader(AbstractReader):
 
             # Add the transformer object to the list of transformers
             self._transformers.append(api_transformer)
-            if not sectionID in self.section_duplicates:
-                self.section_duplicates[sectionID] = []
-            self.section_duplicates[sectionID].append(api_transformer)
+            self.add_section_element(sectionID, api_transformer, "transformer")
 
         return 1
 
-    def parse_regulators(self, model):
-        """Parse the regulators from CYME to DiTTo.
-
-        .. note::
-
-        In CYME a regulator does not have to be associated with a transformer (as it is the case for OpenDSS for example).
-        In addition, a regulator can monitor multiple phases.
-        The parser should create the transformers and create separate regulator objects for different phases.
-        """
-        # Instanciate the list in which we store the DiTTo regulator objects
-        self._regulators = []
-
+    def scan_regulators(self):
+        """Reads the regulator records of the network and equipment files."""
         mapp_regulators = {
             "id": 0,
             "type": 1,
@@ -5024,8 +5341,8 @@ class Reader(AbstractReader):
             "conn": 31,
         }
 
-        self.settings = {}
-        self.regulators = {}
+        settings = {}
+        regulators = {}
 
         #####################################################
         #                                                   #
@@ -5034,12 +5351,12 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content("network", ["regulator_settings"])
 
         # Loop over the network file
         for line in self.content:
 
-            self.settings.update(
+            settings.update(
                 self.parser_helper(
                     line,
                     ["regulator_settings"],
@@ -5073,12 +5390,12 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the network file
-        self.get_file_content("equipment")
+        self.get_file_content("equipment", ["regulator"])
 
         # Loop over the network file
         for line in self.content:
 
-            self.regulators.update(
+            regulators.update(
                 self.parser_helper(
                     line,
                     ["regulator"],
@@ -5100,6 +5417,27 @@ class Reader(AbstractReader):
                 )
             )
 
+        return {
+            "settings": settings,
+            "regulators": regulators,
+        }
+
+    def parse_regulators(self, model):
+        """Parse the regulators from CYME to DiTTo.
+
+        .. note::
+
+        In CYME a regulator does not have to be associated with a transformer (as it is the case for OpenDSS for example).
+        In addition, a regulator can monitor multiple phases.
+        The parser should create the transformers and create separate regulator objects for different phases.
+        """
+        # Instanciate the list in which we store the DiTTo regulator objects
+        self._regulators = []
+
+        records = self.scan("regulators")
+        self.settings = records["settings"]
+        self.regulators = records["regulators"]
+
         for sectionID, settings in self.settings.items():
 
             sectionID = sectionID.strip("*").lower()
@@ -5290,20 +5628,13 @@ class Reader(AbstractReader):
                     api_regulator.windings.append(api_winding)
 
                 self._regulators.append(api_regulator)
-                if not sectionID in self.section_duplicates:
-                    self.section_duplicates[sectionID] = []
-                self.section_duplicates[sectionID].append(api_regulator)
+                self.add_section_element(sectionID, api_regulator, "regulator")
 
         return 1
 
-    def parse_network_equivalent(self, model):
-        """Parse Network equivalent objects from CYME into DiTTo.
-            Network Equivalent objects are elements which have been reduced by cyme (using its network reduction capabilities)
-            They encapsulate multiple loads, lines and transformers into one equivalent object
-            This function creates load and line objects to represent the network equivalent objects from CYME
-        """
-
-        self._network_equivalents = {}
+    def scan_network_equivalent(self):
+        """Reads the network equivalent and section records of the network file."""
+        settings = {}
         mapp_section = {"sectionid": 0, "fromnodeid": 1, "tonodeid": 2, "phase": 3}
         mapp_network_equivalents = { 
                 "sectionid":0,
@@ -5345,7 +5676,7 @@ class Reader(AbstractReader):
                 'totallengthc': 41,
                 }
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content("network", ["network_equivalent_setting", "section"])
 
         # Loop over the network file
         for line in self.content:
@@ -5355,8 +5686,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["network_equivalent_setting"],
@@ -5373,8 +5704,8 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.settings = self.update_dict(
-                self.settings,
+            settings = self.update_dict(
+                settings,
                 self.parser_helper(
                     line,
                     ["section"],
@@ -5383,6 +5714,21 @@ class Reader(AbstractReader):
                 ),
             )
 
+        return {"settings": settings}
+
+    def parse_network_equivalent(self, model):
+        """Parse Network equivalent objects from CYME into DiTTo.
+            Network Equivalent objects are elements which have been reduced by cyme (using its network reduction capabilities)
+            They encapsulate multiple loads, lines and transformers into one equivalent object
+            This function creates load and line objects to represent the network equivalent objects from CYME
+        """
+
+        self._network_equivalents = {}
+        # The network equivalent settings are added to the settings of the previous parser
+        self.settings = self.update_dict(
+            self.settings, self.scan("network_equivalent")["settings"]
+        )
+
         for sectionID, settings in self.settings.items():
 
             sectionID = sectionID.strip("*").lower()
@@ -5560,28 +5906,10 @@ class Reader(AbstractReader):
 
 
 
-    def parse_loads(self, model):
-        """Parse the loads from CYME to DiTTo."""
-        # Instanciate the list in which we store the DiTTo load objects
-        self._loads = {}
-
+    def scan_loads(self):
+        """Reads the [LOADS] and [CUSTOMER CLASS] records of the load file (See iter_customer_loads)."""
         mapp_loads = {"sectionid": 0, "devicenumber": 1, "loadtype": 4, "connection": 5}
 
-        mapp_customer_loads = {
-            "sectionid": 0,
-            "devicenumber": 1,
-            "loadtype": 2,
-            "customernumber": 3,
-            "customertype": 4,
-            "loadmodelid": 8,
-            "valuetype": 11,
-            "loadphase": 12,
-            "value1": 13,
-            "value2": 14,
-            "connectedkva": 15,
-            "numberofcustomer": 17,
-        }
-
         mapp_customer_class = {
             "id": 0,
             "constantpower": 4,
@@ -5596,9 +5924,8 @@ class Reader(AbstractReader):
             "constantpowerpq": 22,
         }
 
-        self.loads = {}
-        self.customer_loads = {}
-        self.customer_class = {}
+        loads = {}
+        customer_class = {}
 
         #####################################################
         #                                                   #
@@ -5607,7 +5934,7 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the network file
-        self.get_file_content("load")
+        self.get_file_content("load", ["loads", "customer_class"])
 
         # Loop over the load file
         for line in self.content:
@@ -5618,7 +5945,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.loads.update(
+            loads.update(
                 self.parser_helper(
                     line,
                     ["loads"],
@@ -5627,41 +5954,13 @@ class Reader(AbstractReader):
                 )
             )
 
-            #########################################
-            #                                       #
-            #           CUSTOMER LOADS              #
-            #                                       #
-            #########################################
-            #
-            self.customer_loads.update(
-                self.parser_helper(
-                    line,
-                    ["customer_loads"],
-                    [
-                        "sectionid",
-                        "devicenumber",
-                        "loadtype",
-                        "customernumber",
-                        "customertype",
-                        "loadmodelid",
-                        "valuetype",
-                        "loadphase",
-                        "value1",
-                        "value2",
-                        "connectedkva",
-                        "numberofcustomer",
-                    ],
-                    mapp_customer_loads,
-                )
-            )
-
             #########################################
             #                                       #
             #           CUSTOMER CLASS              #
             #                                       #
             #########################################
             #
-            self.customer_class.update(
+            customer_class.update(
                 self.parser_helper(
                     line,
                     ["customer_class"],
@@ -5682,240 +5981,300 @@ class Reader(AbstractReader):
                 )
             )
 
-        duplicate_loads = set()
-        for sectionID in self.customer_loads.keys():
-            if sectionID.endswith("*"):
-                duplicate_loads.add(sectionID.lower().strip("*"))
-        for sectionID, settings in self.customer_loads.items():
+        return {
+            "loads": loads,
+            "customer_class": customer_class,
+        }
 
-            sectionID = sectionID.strip("*").lower()
+    def iter_customer_loads(self):
+        """
+        Yields the rows of the [CUSTOMER LOADS] sections of the load file grouped by section, as (sectionid, records).
 
-            if sectionID in self.loads:
-                load_data = self.loads[sectionID]
-            else:
-                load_data = {}
+        The rows are streamed from the file and the consecutive rows of a section form a group,
+        such that only the rows of one section are held in memory, however large the load file is.
+        """
+        mapp_customer_loads = {
+            "sectionid": 0,
+            "devicenumber": 1,
+            "loadtype": 2,
+            "customernumber": 3,
+            "customertype": 4,
+            "loadmodelid": 8,
+            "valuetype": 11,
+            "loadphase": 12,
+            "value1": 13,
+            "value2": 14,
+            "connectedkva": 15,
+            "numberofcustomer": 17,
+        }
 
-            if "connectedkva" in settings:
-                connectedkva = float(settings["connectedkva"])
-            else:
-                connectedkva = None
+        self.get_file_content("load", ["customer_loads"])
 
-            if "valuetype" in settings:
-                value_type = int(settings["valuetype"])
+        for line in self.content:
+            rows = self.parser_rows(
+                line,
+                ["customer_loads"],
+                [
+                    "sectionid",
+                    "devicenumber",
+                    "loadtype",
+                    "customernumber",
+                    "customertype",
+                    "loadmodelid",
+                    "valuetype",
+                    "loadphase",
+                    "value1",
+                    "value2",
+                    "connectedkva",
+                    "numberofcustomer",
+                ],
+                mapp_customer_loads,
+            )
+            for ID, group in groupby(rows, key=lambda row: row[0]):
+                yield ID, [settings for _, settings in group]
 
-            if "value1" in settings and "value2" in settings:
-                if (
-                    float(settings["value1"]) == 0.0
-                    and float(settings["value2"]) == 0.0
-                ):
-                    p = 0
-                    q = 0
-                elif value_type == 0:  # P and Q are given
-                    try:
-                        p, q = float(settings["value1"]), float(settings["value2"])
-                    except:
-                        logger.warning(
-                            "WARNING:: Skipping load on section {}".format(sectionID)
-                        )
-                        continue
-                elif value_type == 1:  # KVA and PF are given
-                    try:
-                        kva, PF = (
-                            float(settings["value1"]),
-                            float(settings["value2"]) * 0.01,
-                        )
-                        if kva == 0 and "connectedkva" in settings:
-                            kva = float(settings["connectedkva"])
-                        p = kva * PF
-                        q = math.sqrt(kva ** 2 - p ** 2)
-                    except:
-                        logger.warning(
-                            "WARNING:: Skipping load on section {}".format(sectionID)
-                        )
-                        continue
-                elif value_type == 2:  # P and PF are given
+    def parse_loads(self, model):
+        """Parse the loads from CYME to DiTTo."""
+        # Instanciate the list in which we store the DiTTo load objects
+        self._loads = {}
 
-                    try:
-                        p, PF = float(settings["value1"]), float(settings["value2"])
-                        if 0 <= PF <= 1:
-                            q = p * math.sqrt((1 - PF ** 2) / PF ** 2)
-                        elif 1 < PF <= 100:
-                            PF /= 100.0
-                            q = p * math.sqrt((1 - PF ** 2) / PF ** 2)
-                        else:
-                            logger.warning("problem with PF")
-                            logger.warning(PF)
-                    except:
-                        logger.warning("Skipping load on section {}".format(sectionID))
-                        continue
+        records = self.scan("loads")
+        self.loads = records["loads"]
+        self.customer_class = records["customer_class"]
 
-                elif value_type == 3:  # AMP and PF are given
-                    # TODO
-                    logger.warning(
-                        "WARNING:: Skipping load on section {}".format(sectionID)
-                    )
-                    continue
+        # The customer loads are created section by section while the load file is read
+        for ID, rows in self.iter_customer_loads():
 
-                if p >= 0 or q >= 0:
+            sectionID = ID.strip("*").lower()
 
-                    if "loadphase" in settings:
-                        phases = settings["loadphase"]
-                    else:
-                        phases = []
+            # The rows of a section with several customer loads are fused into a single load.
+            # A section found again further down the file is fused into the load created for its first rows.
+            duplicate = len(rows) > 1 or sectionID in self._loads
 
+            for settings in rows:
 
-                    fused = False
-                    if sectionID in duplicate_loads:
-                        fusion = True
-                        if sectionID in self._loads:
-                            api_load = self._loads[sectionID]
-                            fused = True
-                        elif p != 0:
-                            api_load = Load(model)
-                    else:
-                        fusion = False
-                        api_load = Load(model)
+                if sectionID in self.loads:
+                    load_data = self.loads[sectionID]
+                else:
+                    load_data = {}
 
-                    if fusion and p == 0:
-                        # logger.warning(
-                        #    "WARNING:: Skipping duplicate load on section {} with p=0".format(sectionID)
-                        # )
-                        continue
+                if "connectedkva" in settings:
+                    connectedkva = float(settings["connectedkva"])
+                else:
+                    connectedkva = None
 
-                    try:
-                        if fusion and sectionID in self._loads:
-                            api_load.name += "_" + reduce(
-                                lambda x, y: x + "_" + y, phases
+                if "valuetype" in settings:
+                    value_type = int(settings["valuetype"])
+
+                if "value1" in settings and "value2" in settings:
+                    if (
+                        float(settings["value1"]) == 0.0
+                        and float(settings["value2"]) == 0.0
+                    ):
+                        p = 0
+                        q = 0
+                    elif value_type == 0:  # P and Q are given
+                        try:
+                            p, q = float(settings["value1"]), float(settings["value2"])
+                        except:
+                            logger.warning(
+                                "WARNING:: Skipping load on section {}".format(sectionID)
                             )
-                        else:
-                            api_load.name = (
-                                "Load_"
-                                + sectionID
-                                + "_"
-                                + reduce(lambda x, y: x + "_" + y, phases)
+                            continue
+                    elif value_type == 1:  # KVA and PF are given
+                        try:
+                            kva, PF = (
+                                float(settings["value1"]),
+                                float(settings["value2"]) * 0.01,
                             )
-                    except:
-                        pass
+                            if kva == 0 and "connectedkva" in settings:
+                                kva = float(settings["connectedkva"])
+                            p = kva * PF
+                            q = math.sqrt(kva ** 2 - p ** 2)
+                        except:
+                            logger.warning(
+                                "WARNING:: Skipping load on section {}".format(sectionID)
+                            )
+                            continue
+                    elif value_type == 2:  # P and PF are given
 
-                    try:
-                        if not (fusion and sectionID in self._loads):
-                            if connectedkva is not None:
-                                api_load.transformer_connected_kva = (
-                                    connectedkva * 10 ** 3
-                                )  # DiTTo in var
-                        elif connectedkva is not None:
-                            if api_load.transformer_connected_kva is None:
-                                api_load.transformer_connected_kva = (
-                                    connectedkva * 10 ** 3
-                                )  # DiTTo in var
+                        try:
+                            p, PF = float(settings["value1"]), float(settings["value2"])
+                            if 0 <= PF <= 1:
+                                q = p * math.sqrt((1 - PF ** 2) / PF ** 2)
+                            elif 1 < PF <= 100:
+                                PF /= 100.0
+                                q = p * math.sqrt((1 - PF ** 2) / PF ** 2)
                             else:
-                                api_load.transformer_connected_kva += (
-                                    connectedkva * 10 ** 3
-                                )  # DiTTo in var
-                    except:
-                        pass
+                                logger.warning("problem with PF")
+                                logger.warning(PF)
+                        except:
+                            logger.warning("Skipping load on section {}".format(sectionID))
+                            continue
 
-                    try:
-                        if not (fusion and sectionID in self._loads):
-                            api_load.connection_type = self.connection_configuration_mapping(
-                                load_data["connection"]
-                            )
-                    except:
-                        pass
+                    elif value_type == 3:  # AMP and PF are given
+                        # TODO
+                        logger.warning(
+                            "WARNING:: Skipping load on section {}".format(sectionID)
+                        )
+                        continue
 
-                    if not (fusion and sectionID in self._loads):
-                        if (
-                            "loadtype" in settings
-                            and settings["loadtype"] in self.customer_class
-                        ):
-                            load_type_data = self.customer_class[settings["loadtype"]]
+                    if p >= 0 or q >= 0:
+
+                        if "loadphase" in settings:
+                            phases = settings["loadphase"]
                         else:
-                            load_type_data = {}
+                            phases = []
 
-                    try:
-                        if not (fusion and sectionID in self._loads):
-                            api_load.connecting_element = self.section_phase_mapping[
-                                sectionID
-                            ]["fromnodeid"]
-                    except:
-                        pass
 
-                    api_load.feeder_name = self.section_feeder_mapping[sectionID]
+                        fused = False
+                        if duplicate:
+                            fusion = True
+                            if sectionID in self._loads:
+                                api_load = self._loads[sectionID]
+                                fused = True
+                            elif p != 0:
+                                api_load = Load(model)
+                        else:
+                            fusion = False
+                            api_load = Load(model)
 
-                    api_load.num_users = float(settings["numberofcustomer"])
+                        if fusion and p == 0:
+                            # logger.warning(
+                            #    "WARNING:: Skipping duplicate load on section {} with p=0".format(sectionID)
+                            # )
+                            continue
 
-                    for ph in phases:
                         try:
-                            api_phase_load = PhaseLoad(model)
+                            if fusion and sectionID in self._loads:
+                                api_load.name += "_" + reduce(
+                                    lambda x, y: x + "_" + y, phases
+                                )
+                            else:
+                                api_load.name = (
+                                    "Load_"
+                                    + sectionID
+                                    + "_"
+                                    + reduce(lambda x, y: x + "_" + y, phases)
+                                )
                         except:
-                            raise ValueError(
-                                "Unable to instanciate PhaseLoad DiTTo object."
-                            )
+                            pass
 
                         try:
-                            api_phase_load.phase = ph
+                            if not (fusion and sectionID in self._loads):
+                                if connectedkva is not None:
+                                    api_load.transformer_connected_kva = (
+                                        connectedkva * 10 ** 3
+                                    )  # DiTTo in var
+                            elif connectedkva is not None:
+                                if api_load.transformer_connected_kva is None:
+                                    api_load.transformer_connected_kva = (
+                                        connectedkva * 10 ** 3
+                                    )  # DiTTo in var
+                                else:
+                                    api_load.transformer_connected_kva += (
+                                        connectedkva * 10 ** 3
+                                    )  # DiTTo in var
                         except:
                             pass
 
                         try:
-                            api_phase_load.p, api_phase_load.q = (
-                                10 ** 3 * p / len(phases),
-                                10 ** 3 * q / len(phases),
-                            )
+                            if not (fusion and sectionID in self._loads):
+                                api_load.connection_type = self.connection_configuration_mapping(
+                                    load_data["connection"]
+                                )
                         except:
                             pass
 
-                        # ZIP load parameters
+                        if not (fusion and sectionID in self._loads):
+                            if (
+                                "loadtype" in settings
+                                and settings["loadtype"] in self.customer_class
+                            ):
+                                load_type_data = self.customer_class[settings["loadtype"]]
+                            else:
+                                load_type_data = {}
+
                         try:
-                            api_phase_load.ppercentcurrent = (
-                                float(load_type_data["constantcurrentip"]) / 100.0
-                            )
-                            api_phase_load.qpercentcurrent = (
-                                float(load_type_data["constantcurrentiq"]) / 100.0
-                            )
-                            api_phase_load.ppercentpower = (
-                                float(load_type_data["constantpowerpp"]) / 100.0
-                            )
-                            api_phase_load.qpercentpower = (
-                                float(load_type_data["constantpowerpq"]) / 100.0
-                            )
-                            api_phase_load.ppercentimpedance = (
-                                float(load_type_data["constantimpedancezp"]) / 100.0
-                            )
-                            api_phase_load.qpercentimpedance = (
-                                float(load_type_data["constantimpedancezq"]) / 100.0
-                            )
-                            # api_phase_load.use_zip=1
-                            # api_phase_load.model=8
+                            if not (fusion and sectionID in self._loads):
+                                api_load.connecting_element = self.section_phase_mapping[
+                                    sectionID
+                                ]["fromnodeid"]
                         except:
                             pass
 
-                        # CYME store phase loads with P=0 and Q=0.
-                        # Do not add them to DiTTo (otherwise it will make the validation
-                        # on the number of objects fail since we will have many more loads than there actually are...)
-                        # if api_phase_load.p!=0 or api_phase_load.q!=0:
-                        api_load.phase_loads.append(api_phase_load)
+                        api_load.feeder_name = self.section_feeder_mapping[sectionID]
+
+                        api_load.num_users = float(settings["numberofcustomer"])
+
+                        for ph in phases:
+                            try:
+                                api_phase_load = PhaseLoad(model)
+                            except:
+                                raise ValueError(
+                                    "Unable to instanciate PhaseLoad DiTTo object."
+                                )
+
+                            try:
+                                api_phase_load.phase = ph
+                            except:
+                                pass
+
+                            try:
+                                api_phase_load.p, api_phase_load.q = (
+                                    10 ** 3 * p / len(phases),
+                                    10 ** 3 * q / len(phases),
+                                )
+                            except:
+                                pass
+
+                            # ZIP load parameters
+                            try:
+                                api_phase_load.ppercentcurrent = (
+                                    float(load_type_data["constantcurrentip"]) / 100.0
+                                )
+                                api_phase_load.qpercentcurrent = (
+                                    float(load_type_data["constantcurrentiq"]) / 100.0
+                                )
+                                api_phase_load.ppercentpower = (
+                                    float(load_type_data["constantpowerpp"]) / 100.0
+                                )
+                                api_phase_load.qpercentpower = (
+                                    float(load_type_data["constantpowerpq"]) / 100.0
+                                )
+                                api_phase_load.ppercentimpedance = (
+                                    float(load_type_data["constantimpedancezp"]) / 100.0
+                                )
+                                api_phase_load.qpercentimpedance = (
+                                    float(load_type_data["constantimpedancezq"]) / 100.0
+                                )
+                                # api_phase_load.use_zip=1
+                                # api_phase_load.model=8
+                            except:
+                                pass
+
+                            # CYME store phase loads with P=0 and Q=0.
+                            # Do not add them to DiTTo (otherwise it will make the validation
+                            # on the number of objects fail since we will have many more loads than there actually are...)
+                            # if api_phase_load.p!=0 or api_phase_load.q!=0:
+                            api_load.phase_loads.append(api_phase_load)
 
 
-                    self._loads[sectionID] = api_load
-                    if not sectionID in self.section_duplicates:
-                        self.section_duplicates[sectionID] = []
-                    if not fused: #Because mutiple loads on different phases are joined into a single one
-                        self.section_duplicates[sectionID].append(api_load)
+                        self._loads[sectionID] = api_load
+                        if not fused: #Because mutiple loads on different phases are joined into a single one
+                            self.add_section_element(sectionID, api_load, "load")
 
         return 1
 
-    def parse_dg(self, model):
-        """ Parse the Distributed Generation from CYME to DiTTo. May be respresented as ECGs or PVs.
-            This reads the objets [CONVERTER], [CONVERTER CONTROL SETTING], [LONG TERM DYNAMICS CURVE EXT] [DGGENERATIONMODEL] and in the case when PV is included [PHOTOVOLTAIC SETTINGS]"""
-        self._dgs = []
-        self.converter = {}
-        self.converter_settings = {}
-        self.long_term_dynamics = {}
-        self.photovoltaic_settings = {}
-        self.bess = {}
-        self.bess_settings = {}
-        self.dg_generation = {}
+    def scan_dg(self):
+        """Reads the distributed generation records of the network and equipment files."""
+        converter = {}
+        converter_settings = {}
+        long_term_dynamics = {}
+        photovoltaic_settings = {}
+        bess = {}
+        bess_settings = {}
+        dg_generation = {}
 
         mapp_converter = {
             "devicenumber": 0,
@@ -6011,7 +6370,17 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the network file
-        self.get_file_content("network")
+        self.get_file_content(
+            "network",
+            [
+                "converter",
+                "converter_control_settings",
+                "photovoltaic_settings",
+                "bess_settings",
+                "long_term_dynamics_curve_ext",
+                "dggenerationmodel",
+            ],
+        )
 
         # Loop over the network file
         for line in self.content:
@@ -6022,7 +6391,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
 
-            self.converter.update(
+            converter.update(
                 self.parser_helper(
                     line,
                     ["converter"],
@@ -6048,7 +6417,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
 
-            self.converter_settings.update(
+            converter_settings.update(
                 self.parser_helper(
                     line,
                     ["converter_control_settings"],
@@ -6073,7 +6442,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
 
-            self.photovoltaic_settings.update(
+            photovoltaic_settings.update(
                 self.parser_helper(
                     line,
                     ["photovoltaic_settings"],
@@ -6089,7 +6458,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
 
-            self.bess_settings.update(
+            bess_settings.update(
                 self.parser_helper(
                     line,
                     ["bess_settings"],
@@ -6113,7 +6482,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
 
-            self.long_term_dynamics.update(
+            long_term_dynamics.update(
                 self.parser_helper(
                     line,
                     ["long_term_dynamics_curve_ext"],
@@ -6134,7 +6503,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
 
-            self.dg_generation.update(
+            dg_generation.update(
                 self.parser_helper(
                     line,
                     ["dggenerationmodel"],
@@ -6157,7 +6526,7 @@ class Reader(AbstractReader):
         #####################################################
         #
         # Open the equipment file
-        self.get_file_content("equipment")
+        self.get_file_content("equipment", ["bess"])
 
         # Loop over the equipment file
         for line in self.content:
@@ -6168,7 +6537,7 @@ class Reader(AbstractReader):
             #                                       #
             #########################################
             #
-            self.bess.update(
+            bess.update(
                 self.parser_helper(
                     line,
                     ["bess"],
@@ -6184,6 +6553,29 @@ class Reader(AbstractReader):
                 )
             )
 
+        return {
+            "converter": converter,
+            "converter_settings": converter_settings,
+            "long_term_dynamics": long_term_dynamics,
+            "photovoltaic_settings": photovoltaic_settings,
+            "bess": bess,
+            "bess_settings": bess_settings,
+            "dg_generation": dg_generation,
+        }
+
+    def parse_dg(self, model):
+        """ Parse the Distributed Generation from CYME to DiTTo. May be respresented as ECGs or PVs.
+            This reads the objets [CONVERTER], [CONVERTER CONTROL SETTING], [LONG TERM DYNAMICS CURVE EXT] [DGGENERATIONMODEL] and in the case when PV is included [PHOTOVOLTAIC SETTINGS]"""
+        self._dgs = []
+        records = self.scan("dg")
+        self.converter = records["converter"]
+        self.converter_settings = records["converter_settings"]
+        self.long_term_dynamics = records["long_term_dynamics"]
+        self.photovoltaic_settings = records["photovoltaic_settings"]
+        self.bess = records["bess"]
+        self.bess_settings = records["bess_settings"]
+        self.dg_generation = records["dg_generation"]
+
         api_photovoltaics = {}
         api_bessi = {}
         for sectionID, settings in self.photovoltaic_settings.items():
@@ -6224,9 +6616,7 @@ class Reader(AbstractReader):
             except:
                 pass
 
-            if not sectionID in self.section_duplicates:
-                self.section_duplicates[sectionID] = []
-            self.section_duplicates[sectionID].append(api_photovoltaic)
+            self.add_section_element(sectionID, api_photovoltaic, "photovoltaic")
 
         for sectionID, settings in self.bess_settings.items():
             try:
@@ -6313,9 +6703,7 @@ class Reader(AbstractReader):
             except:
                 pass
 
-            if not sectionID in self.section_duplicates:
-                self.section_duplicates[sectionID] = []
-            self.section_duplicates[sectionID].append(api_bess)
+            self.add_section_element(sectionID, api_bess, "storage")
 
         for deviceID, settings in self.dg_generation.items():
             deviceID = deviceID.strip(
@@ -6445,6 +6833,18 @@ class Reader(AbstractReader):
                 except:
                     pass
 
+    def add_section_element(self, sectionID, element, kind):
+        """
+        Adds a DiTTo object to the index of the elements of its section (See fix_section_overlaps).
+        kind is one of SERIES_ELEMENTS for the elements connecting two nodes, or one of SHUNT_ELEMENTS.
+        """
+        if kind not in SERIES_ELEMENTS and kind not in SHUNT_ELEMENTS:
+            raise ValueError("Unknown section element kind {}".format(kind))
+        if sectionID in self.section_elements:
+            self.section_elements[sectionID].append((kind, element))
+        else:
+            self.section_elements[sectionID] = [(kind, element)]
+
     def fix_section_overlaps(self, model, **kwargs):
         """
         Some sections will have multiple components included in them (e.g. a line, transformer and capacitor).
@@ -6454,90 +6854,101 @@ class Reader(AbstractReader):
         Place components in series:
             Regulator -> Transformer -> Line -> (Loads, PV, BESS, Capacitors)
 
+        The components of each section are indexed by kind as they are created (See add_section_element),
+        so this is a single pass over the sections.
+
         :param model: DiTTo model
         :type model: DiTTo model
         :param verbose: Set the verbose mode. Optional. Default=True
         :type verbose: bool
+        :returns: Statistics on the sections: number of sections, of sections with multiple elements,
+            of sections split with intermediate nodes and number of intermediate nodes created
+        :rtype: dict
         """
-        model.set_names()
-        multiple_elements = {}
-        for i,j in self.section_duplicates.items():
-            if len(j)>1:
-                multiple_elements[i] = j
-
-        for sectionID in multiple_elements:
-            connectors = []
-            regulators = []
-            transformers = []
-            lines = [] #Warning - if multiple lines are used the names will be the same
-            loads = []
-            pvs = []
-            bess = []
-            capacitors = []
-
-            from_element = None
-            to_element = None
-            connector_count = 0
-
-            for element in multiple_elements[sectionID]:
-                if isinstance(element,Regulator):
-                    regulators.append(element)
-                    from_element = element.from_element
-                    to_element = element.to_element
-                    connector_count+=1
-                if isinstance(element,PowerTransformer):
-                    transformers.append(element)
-                    from_element = element.from_element
-                    to_element = element.to_element
-                    connector_count+=1
-                if isinstance(element,Line):
-                    lines.append(element)
-                    from_element = element.from_element
-                    to_element = element.to_element
-                    connector_count+=1
-                if isinstance(element,Load):
-                    loads.append(element)
-                if isinstance(element,Storage):
-                    bess.append(element)
-                if isinstance(element,Capacitor):
-                    capacitors.append(element)
-
-            connectors = [regulators,transformers,lines]
-            non_connectors = [loads,bess,pvs,capacitors]
-
-            if from_element is None or to_element is None: # i.e. just loads, pvs and caps so no problem
+        statistics = {
+            "sections": len(self.section_elements),
+            "multiple_elements": 0,
+            "split_sections": 0,
+            "intermediate_nodes": 0,
+        }
+        names_set = False
+
+        for sectionID, elements in self.section_elements.items():
+            if len(elements) < 2:
                 continue
+            statistics["multiple_elements"] += 1
+
+            # Connectors in series order (elements of the same kind in the order of creation)
+            connectors = sorted(
+                (
+                    (SERIES_ELEMENTS[kind], element)
+                    for kind, element in elements
+                    if kind in SERIES_ELEMENTS
+                ),
+                key=lambda connector: connector[0],
+            )
+            if len(connectors) == 0:  # i.e. just loads, pvs and caps so no problem
+                continue
+
+            # The section nodes are the ones of the last connector created
+            last_connector = [
+                element for kind, element in elements if kind in SERIES_ELEMENTS
+            ][-1]
+            from_element = last_connector.from_element
+            to_element = last_connector.to_element
+            if from_element is None or to_element is None:
+                continue
+
+            # The names are needed to get the original from node
+            if not names_set:
+                model.set_names()
+                names_set = True
+
+            connector_count = len(connectors)
+            if connector_count > 1:
+                statistics["split_sections"] += 1
 
             original_from_element = from_element
             original_from_node = model[from_element]
             intermediate_count = 0
-            for connector in connectors:
-                for element in connector:
-                    if from_element != original_from_element:
-                        element.from_element = from_element
-
-                    # Regulators go between the same two nodes
-                    if isinstance(element,Regulator):
-                        from_element = original_from_element+'_reg'
-                    else:
-                        from_element = original_from_element+'_sec_'+str(intermediate_count)
-                    intermediate_count +=1
-                    if intermediate_count != connector_count:
-                        element.to_element = from_element
-                        api_node = Node(model)
-                        api_node.name = from_element
-                        if original_from_node.positions is not None:
-                            api_positions = []
-                            for position in original_from_node.positions:
-                                api_position = Position(model)
-                                api_position.long = position.long
-                                api_position.lat = position.lat
-                                api_positions.append(api_position)
-                            api_node.positions = api_positions #set the positions to be the same as in the original
+            for rank, element in connectors:
+                if from_element != original_from_element:
+                    element.from_element = from_element
+
+                # Regulators go between the same two nodes
+                if rank == SERIES_ELEMENTS["regulator"]:
+                    from_element = original_from_element + "_reg"
+                else:
+                    from_element = (
+                        original_from_element + "_sec_" + str(intermediate_count)
+                    )
+                intermediate_count += 1
+                if intermediate_count != connector_count:
+                    element.to_element = from_element
+                    api_node = Node(model)
+                    api_node.name = from_element
+                    statistics["intermediate_nodes"] += 1
+                    if original_from_node.positions is not None:
+                        api_positions = []
+                        for position in original_from_node.positions:
+                            api_position = Position(model)
+                            api_position.long = position.long
+                            api_position.lat = position.lat
+                            api_positions.append(api_position)
+                        api_node.positions = api_positions  # set the positions to be the same as in the original
 
             # Assumes we have had at least one connecting element added
             # Connect these all to the final to-node
-            for non_connector in non_connectors:
-                for element in non_connector:
+            for kind, element in elements:
+                if kind in SHUNT_ELEMENTS:
                     element.connecting_element = to_element
 
+        logger.info(
+            "{split} of the {multiple} sections with multiple elements were split with {nodes} intermediate nodes ({sections} sections)".format(
+                split=statistics["split_sections"],
+                multiple=statistics["multiple_elements"],
+                nodes=statistics["intermediate_nodes"],
+                sections=statistics["sections"],
+            )
+        )
+        return statistics
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import io
+import mmap
+import re
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Section headers are the lines starting with '[' (ex: [SECTION], [OVERHEADLINE SETTING]...)
+HEADER_PATTERN = re.compile(rb"^[ \t]*\[", re.M)
+
+# Size of the blocks in which the sections are decoded, such that large sections are not copied at once
+BLOCK_SIZE = 1 << 20
+
+
+class SectionIndex(object):
+    """
+    Index of the sections of a CYME ASCII file.
+
+    The file is memory-mapped and scanned once for the section headers. Each section spans from its header line
+    to the next header line (or to the end of the file), and the lines before the first header form a section without header.
+
+    **Usage:**
+
+    >>> index = SectionIndex('network.txt')
+    >>> for line in index.lines(['[SECTION]']):
+    >>>     ...
+
+    .. note:: The lines are decoded like open(filename, 'r') would (default encoding and universal newlines),
+        such that the parsers see the same lines as when reading the whole file.
+    """
+
+    def __init__(self, filename):
+        """Class CONSTRUCTOR."""
+        self.filename = filename
+        self.headers = []
+        self.ranges = []
+        with open(filename, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                self._data = b""
+        self._scan()
+
+    def _scan(self):
+        """Finds the headers and the byte range of each section."""
+        starts = [match.start() for match in HEADER_PATTERN.finditer(self._data)]
+        if len(starts) == 0 or starts[0] > 0:
+            self.headers.append(None)
+            starts.insert(0, 0)
+        for start in starts[len(self.headers) :]:
+            end = self._data.find(b"\n", start)
+            if end == -1:
+                end = len(self._data)
+            self.headers.append(self._data[start:end].decode().strip())
+        ends = starts[1:] + [len(self._data)]
+        self.ranges = list(zip(starts, ends))
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def sections(self, headers=None):
+        """
+        Returns the indices of the sections whose header line contains one of the given headers,
+        in the order of the file, or of all the sections if headers is None.
+        """
+        if headers is None:
+            return list(range(len(self.ranges)))
+        return [
+            k
+            for k, header in enumerate(self.headers)
+            if header is not None and any(h in header for h in headers)
+        ]
+
+    def lines(self, headers=None):
+        """
+        Yields the lines of the sections whose header line contains one of the given headers (See sections),
+        or all the lines of the file if headers is None.
+        """
+        if headers is None:
+            chunks = [(0, len(self._data))]
+        else:
+            chunks = [self.ranges[k] for k in self.sections(headers)]
+        for start, end in chunks:
+            while start < end:
+                # Blocks end after a newline, such that no line is split between two blocks
+                stop = min(start + BLOCK_SIZE, end)
+                if stop < end:
+                    newline = self._data.rfind(b"\n", start, stop)
+                    if newline == -1:
+                        newline = self._data.find(b"\n", stop, end)
+                    stop = end if newline == -1 else newline + 1
+                for line in io.TextIOWrapper(io.BytesIO(self._data[start:stop])):
+                    yield line
+                start = stop
+
+    def close(self):
+        """Closes the memory map of the file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b""
@@ -2,8 +2,6 @@ from __future__ import absolute_import, division, print_function
 from builtins import super, range, zip, round, map
 
 from datetime import datetime
-from datetime import timedelta
-from croniter import croniter
 import logging
 import math
 import sys
@@ -32,6 +30,7 @@ from ditto.models.capacitor import Capacitor
 from ditto.models.phase_capacitor import PhaseCapacitor
 from ditto.models.powertransformer import PowerTransformer
 from ditto.models.winding import Winding
+from ditto.models.timeseries import Timeseries
 from ditto.models.phase_winding import PhaseWinding
 
 from ditto.formats.gridlabd import gridlabd
@@ -39,9 +38,26 @@ from ditto.formats.gridlabd import base
 from ditto.models.base import Unicode
 
 from ..abstract_reader import AbstractReader
+from .tokenizer import GLMTokenizer
+from .schedule import compile_schedule
 
 logger = logging.getLogger(__name__)
 
+# Classes of objects which are not read
+IGNORED_CLASSES = {
+    "house",
+    "solar",
+    "inverter",
+    "waterheater",
+    "climate",
+    "ZIPload",
+    "tape.recorder",
+    "player",
+    "tape.collector",
+    "tape.group_recorder",
+    "recorder",
+}
+
 
 class Reader(AbstractReader):
     """
@@ -54,9 +70,14 @@ class Reader(AbstractReader):
     all_api_objects = {}
 
     def __init__(self, **kwargs):
-        """Gridlabd class CONSTRUCTOR."""
+        """Gridlabd class CONSTRUCTOR.
+
+        With schedule_interval (in seconds), the loads using schedules get the yearly profiles of the schedules
+        at this interval as Timeseries.
+        """
 
         self.input_file = kwargs.get("input_file", "./input.glm")
+        self.schedule_interval = kwargs.get("schedule_interval", None)
         super(Reader, self).__init__(**kwargs)
 
     def compute_spacing(self, spacing, conductors, default_height=30):
@@ -492,129 +513,69 @@ class Reader(AbstractReader):
             matrix = matrix_reduced
         return matrix
 
+    def schedule_timeseries(self, model, schedules, data, year):
+        """
+        Timeseries of the schedule used by a load power (data: schedule name and scale factor, split at the '*').
+        The yearly profile of the schedule is computed once and shared by the Timeseries.
+        Returns an empty list without schedule_interval or schedule.
+        """
+        if self.schedule_interval is None or len(data) != 2:
+            return []
+        for name, scale_factor in [data, data[::-1]]:
+            if name in schedules:
+                api_timeseries = Timeseries(model)
+                api_timeseries.data = schedules[name].yearly_profile(
+                    year, self.schedule_interval
+                )
+                api_timeseries.data_label = name
+                api_timeseries.data_type = "float"
+                api_timeseries.interval = self.schedule_interval
+                api_timeseries.loaded = 1
+                api_timeseries.scale_factor = float(scale_factor)
+                return [api_timeseries]
+        return []
+
     def parse(self, model, origin_datetime="2017 Jun 1 2:00PM"):
         origin_datetime = datetime.strptime(origin_datetime, "%Y %b %d %I:%M%p")
-        delta_datetime = timedelta(minutes=1)
-        sub_datetime = origin_datetime - delta_datetime
-
-        inputfile = open(self.input_file, "r")
-        all_rows = inputfile.readlines()
-        curr_object = None
-        curr_schedule = None
-        ignore_elements = False
-        found_schedule = False
-        all_includes = []
+
+        # Compiled schedules, and their values at origin_datetime
+        schedules = {}
         all_schedules = {}
-        for row in all_rows:
-            if row[:8] == "#include":
-                entries = row.split()
-                location = entries[1].strip('"')
-                include_file = open(location, "r")
-                include_rows = include_file.readlines()
-                all_includes = all_includes + include_rows
-        all_rows = all_rows + all_includes
-        for row in all_rows:
-            row = row.strip()
-
-            if row[:2] == "//":
+        tokenizer = GLMTokenizer(self.input_file)
+        for record in tokenizer.records():
+            if record["type"] == "schedule":
+                schedule = compile_schedule(
+                    record["name"], tuple(tuple(row) for row in record["rows"])
+                )
+                schedules[record["name"]] = schedule
+                value = schedule.value(origin_datetime)
+                if value is not None:
+                    all_schedules[record["name"]] = value
                 continue
-            entries = row.split()
-            if len(entries) > 0 and entries[0] == "object":
-                if curr_object is None:
-                    obj = entries[1].split(":")
-                    obj_class = obj[0]
-                    if (
-                        obj_class == "house"
-                        or obj_class == "solar"
-                        or obj_class == "inverter"
-                        or obj_class == "waterheater"
-                        or obj_class == "climate"
-                        or obj_class == "ZIPload"
-                        or obj_class == "tape.recorder"
-                        or obj_class == "player"
-                        or obj_class == "tape.collector"
-                        or obj_class == "tape.group_recorder"
-                        or obj_class == "recorder"
-                    ):
-                        continue
-                    curr_object = getattr(gridlabd, obj_class)()
-                    if len(obj) > 1:
-                        curr_object["name"] = obj_class + ":" + obj[1]
-                else:
-                    ignore_elements = True
 
-            elif len(entries) > 0 and entries[0] == "schedule":
-                if curr_schedule is None:
-                    schedule = entries[1]
-                    schedule_bracket_cnt = 1
-                curr_schedule = schedule
-
-            else:
-                if curr_object == None and curr_schedule == None:
-                    continue
-                if curr_object != None:
-                    entries = row.split()
-                    if len(entries) > 1:
-                        element = entries[0]
-                        value = entries[1]
-                        if value[-1] == ";":
-                            value = value[:-1]
-                        if len(entries) > 2:
-                            units = entries[2]
-                            # TODO: Deal with units correctly
-                            # print element,value,units
-                            # if units[0] =='k':
-                            #    value = value/1000.0
-                        # Assuming no nested objects for now.
-                        curr_object[element] = value
-
-                    if len(row) >= 1:
-                        if row[-1] == "}" or row[-2:] == "};":
-                            if ignore_elements:  # Assumes only one layer of nesting
-                                ignore_elements = False
-                            else:
-                                try:
-                                    self.all_gld_objects[
-                                        curr_object["name"]
-                                    ] = curr_object
-                                    curr_object = None
-                                except:
-
-                                    if (
-                                        curr_object["from"] != None
-                                        and curr_object["to"] != None
-                                    ):
-                                        curr_object["name"] = (
-                                            curr_object["from"]
-                                            + "-"
-                                            + curr_object["to"]
-                                        )
-                                        self.all_gld_objects[
-                                            curr_object["name"]
-                                        ] = curr_object
+            obj_class = record["class"]
+            if obj_class in IGNORED_CLASSES:
+                continue
+            curr_object = getattr(gridlabd, obj_class)()
+            if record["name"] is not None:
+                curr_object["name"] = record["name"]
+            if (
+                record["parent"] is not None
+                and "parent" in curr_object._property_names
+            ):
+                curr_object["parent"] = record["parent"]
+            # TODO: Deal with units correctly
+            for element, value, units in record["properties"]:
+                curr_object[element] = value
 
-                                    else:
-                                        logger.debug("Warning object missing a name")
-                                    curr_object = None
-                if curr_schedule != None:
-                    row = row.strip(";")
-                    entries = row.split()
-                    if len(entries) > 5 and not found_schedule:
-                        cron = " ".join(entries[:-1])
-                        value = entries[-1]
-                        iter = croniter(cron, sub_datetime)
-                        if iter.get_next(datetime) == origin_datetime:
-                            found_schedule = True
-                            all_schedules[curr_schedule] = value
-
-                    if len(row) >= 1:
-                        if row[-1] == "}":
-                            schedule_bracket_cnt = schedule_bracket_cnt - 1
-                        if row[0] == "{":
-                            schedule_bracket_cnt = schedule_bracket_cnt + 1
-                        if schedule_bracket_cnt == 0:
-                            curr_schedule = None
-                            found_schedule = False
+            try:
+                self.all_gld_objects[curr_object["name"]] = curr_object
+            except:
+                if curr_object["from"] != None and curr_object["to"] != None:
+                    curr_object["name"] = curr_object["from"] + "-" + curr_object["to"]
+                    self.all_gld_objects[curr_object["name"]] = curr_object
+                else:
+                    logger.debug("Warning object missing a name")
 
         logger.debug(all_schedules)
         for obj_name, obj in self.all_gld_objects.items():
@@ -946,6 +907,7 @@ class Reader(AbstractReader):
 
                 phases = []
                 phaseloads = []
+                timeseries = []
                 try:
                     for i in obj["phases"].strip('"'):
                         if i == "A" or i == "B" or i == "C":
@@ -1062,6 +1024,11 @@ class Reader(AbstractReader):
                                 phaseload.p = float(all_schedules[data[1]]) * float(
                                     data[0]
                                 )
+                            timeseries.extend(
+                                self.schedule_timeseries(
+                                    model, schedules, data, origin_datetime.year
+                                )
+                            )
 
                         try:
                             # Require all six elements to compute the ZIP load model
@@ -1190,6 +1157,11 @@ class Reader(AbstractReader):
                                 phaseload.p = float(all_schedules[data[1]]) * float(
                                     data[0]
                                 )
+                            timeseries.extend(
+                                self.schedule_timeseries(
+                                    model, schedules, data, origin_datetime.year
+                                )
+                            )
 
                         try:
                             # Require all six elements to compute the ZIP load model
@@ -1318,6 +1290,11 @@ class Reader(AbstractReader):
                                 phaseload.p = float(all_schedules[data[1]]) * float(
                                     data[0]
                                 )
+                            timeseries.extend(
+                                self.schedule_timeseries(
+                                    model, schedules, data, origin_datetime.year
+                                )
+                            )
 
                         try:
                             # Require all six elements to compute the ZIP load model
@@ -1348,6 +1325,8 @@ class Reader(AbstractReader):
 
                 if num_phases > 0:
                     api_load.phase_loads = phaseloads
+                if len(timeseries) > 0:
+                    api_load.timeseries = timeseries
 
             if obj_type == "fuse":
                 api_line = Line(model)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+from functools import lru_cache
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Fields of the rows of a schedule, with their ranges: minute hour day month weekday value
+FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def parse_field(text, low, high):
+    """
+    Boolean mask (indexed by the values from 0 to high) of the values matched by a field of a schedule row.
+    The fields are written as in cron: *, 5, 1-5, 1,3,5, */15, 0-30/10...
+    """
+    mask = np.zeros(high + 1, dtype=bool)
+    for part in text.split(","):
+        values, _, step = part.partition("/")
+        step = int(step) if step != "" else 1
+        if values == "*":
+            start, end = low, high
+        elif "-" in values:
+            start, end = [int(v) for v in values.split("-", 1)]
+        else:
+            start = int(values)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError("Invalid schedule field {}".format(text))
+        mask[start : end + 1 : step] = True
+    return mask
+
+
+class ScheduleRow(object):
+    """Compiled row of a schedule."""
+
+    def __init__(self, entries):
+        """Class CONSTRUCTOR."""
+        minutes, hours, days, months, weekdays = [
+            parse_field(text, low, high)
+            for text, (low, high) in zip(entries[:5], FIELDS)
+        ]
+        # Sunday is 0 or 7
+        weekdays[0] |= weekdays[7]
+        self.minutes = minutes
+        self.hours = hours
+        self.days = days
+        self.months = months
+        self.weekdays = weekdays[:7]
+        # As in cron, a time matches the day or the weekday when both are restricted
+        self.day_or = entries[2] != "*" and entries[4] != "*"
+        self.value = float(entries[-1])
+
+    def match(self, minute, hour, day, month, weekday):
+        """Boolean array of the times (given by their fields) matched by the row."""
+        match = self.minutes[minute] & self.hours[hour] & self.months[month]
+        if self.day_or:
+            return match & (self.days[day] | self.weekdays[weekday])
+        return match & self.days[day] & self.weekdays[weekday]
+
+
+class Schedule(object):
+    """
+    GridLAB-D schedule, compiled once into vectorized lookups.
+
+    **Usage:**
+
+    >>> schedule = compile_schedule('residential', (('*', '0-5', '*', '*', '*', '0.5'), ('*', '6-23', '*', '*', '*', '1.0')))
+    >>> schedule.value(datetime(2017, 6, 1, 14))
+    1.0
+    >>> schedule.profile(datetime(2017, 1, 1), 8760, 3600)
+
+    The value of a time is the value of the first row matching it (None, or NaN for arrays, when none matches).
+    The profiles are cached, such that the objects using the same schedule share them.
+    """
+
+    def __init__(self, name, rows):
+        """Class CONSTRUCTOR."""
+        self.name = name
+        self.rows = []
+        for entries in rows:
+            if len(entries) <= 5:
+                continue
+            try:
+                self.rows.append(ScheduleRow(entries))
+            except ValueError:
+                logger.warning(
+                    "Unable to read row {} of schedule {}".format(
+                        " ".join(entries), name
+                    )
+                )
+        self.profiles = {}
+
+    def values(self, index):
+        """Values of the schedule at the times of a pandas DatetimeIndex (or of anything it can be built from)."""
+        index = pd.DatetimeIndex(index)
+        fields = (
+            index.minute.values,
+            index.hour.values,
+            index.day.values,
+            index.month.values,
+            # pandas weekdays start on Monday, cron weekdays on Sunday
+            (index.dayofweek.values + 1) % 7,
+        )
+        values = np.full(len(index), np.nan)
+        # The first matching row wins
+        for row in reversed(self.rows):
+            values[row.match(*fields)] = row.value
+        return values
+
+    def value(self, timestamp):
+        """Value of the schedule at a time, or None when no row matches it."""
+        value = self.values([timestamp])[0]
+        return None if np.isnan(value) else value
+
+    def profile(self, start, periods, interval):
+        """
+        DataFrame of the values of the schedule over periods intervals (in seconds) from start.
+        The times matched by no row get 0, like in GridLAB-D.
+        """
+        key = (pd.Timestamp(start), periods, interval)
+        if key not in self.profiles:
+            index = pd.date_range(
+                start, periods=periods, freq=pd.Timedelta(seconds=interval)
+            )
+            self.profiles[key] = pd.DataFrame(
+                {self.name: np.nan_to_num(self.values(index))}, index=index
+            )
+        return self.profiles[key]
+
+    def yearly_profile(self, year, interval):
+        """Profile of the schedule over a year (See profile)."""
+        start = datetime(year, 1, 1)
+        seconds = (datetime(year + 1, 1, 1) - start).total_seconds()
+        return self.profile(start, int(seconds // interval), interval)
+
+
+@lru_cache(maxsize=256)
+def compile_schedule(name, rows):
+    """Compiled Schedule of a name and rows (tuples of the tokens of the rows), cached accross objects and parses."""
+    return Schedule(name, rows)
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tokens of a GLM line: quoted strings, comments, punctuation and words (names, values, units...)
+TOKEN_PATTERN = re.compile(
+    r'"(?:[^"\\]|\\.)*"?|\'(?:[^\'\\]|\\.)*\'?|//.*|[{};]|[^\s{};"\']+'
+)
+
+# Tokens ending a property or a row of a schedule
+PROPERTY_SEPARATORS = {";", "{", "}", "object"}
+SCHEDULE_SEPARATORS = {";", "{", "}"}
+
+# Macros ${NAME} replaced by the value of a #define
+MACRO_PATTERN = re.compile(r"\$\{(\w+)\}")
+
+
+def tokenize(line):
+    """Tokens of a GLM line, without the comment."""
+    if '"' in line or "'" in line:
+        return [token for token in TOKEN_PATTERN.findall(line) if token[:2] != "//"]
+    # Faster without quoted strings
+    if "//" in line:
+        line = line[: line.index("//")]
+    if ";" in line:
+        line = line.replace(";", " ; ")
+    if "{" in line:
+        line = line.replace("{", " { ")
+    if "}" in line:
+        line = line.replace("}", " } ")
+    return line.split()
+
+
+class GLMTokenizer(object):
+    """
+    Streaming tokenizer of GridLAB-D models.
+
+    The lines of the model are read one at a time, the #include files are read in place (recursively) and the objects
+    are yielded as soon as they are closed, such that only the current object is held in memory.
+
+    **Usage:**
+
+    >>> tokenizer = GLMTokenizer('model.glm')
+    >>> for record in tokenizer.records():
+    >>>     if record['type'] == 'object':
+    >>>         ...
+
+    The records are dictionaries:
+
+    - objects: {'type': 'object', 'class': 'load', 'name': 'load:1' (or None), 'parent': name of the enclosing object (or None),
+      'properties': [(property name, value, unit or None), ...]}
+    - schedules: {'type': 'schedule', 'name': 'residential', 'rows': [['0-5', '*', '*', '*', '*', '0.5'], ...]}
+
+    .. note::
+        - The preprocessor directives #include, #define (with ${NAME} macros) and #set are supported.
+          The defines and the global variables set are available in defines and globals.
+        - Nested objects are yielded after the object enclosing them, with the enclosing object as parent.
+          An object defined as a property value (ex: configuration object line_configuration {...};) is yielded the same way,
+          and the property value is the name of this object.
+        - The properties end at the first semicolon or at the end of the line.
+        - Values are kept as written (quotes included). The unit is what follows the value, if anything.
+        - The other blocks (module, clock, class...) are skipped.
+    """
+
+    def __init__(self, filename, defines=None):
+        """Class CONSTRUCTOR."""
+        self.filename = filename
+        self.defines = dict(defines) if defines is not None else {}
+        self.globals = {}
+        # Files read, in the order of the #include directives
+        self.includes = []
+
+    def lines(self, filename=None, _stack=None):
+        """
+        Yields the lines of the model, reading the #include files in place.
+        Raises a ValueError if a file includes itself (directly or not).
+        """
+        if filename is None:
+            filename = self.filename
+        path = os.path.abspath(filename)
+        stack = [] if _stack is None else _stack
+        if path in stack:
+            raise ValueError(
+                "Circular #include of {} in {}".format(filename, " -> ".join(stack))
+            )
+        stack.append(path)
+        self.includes.append(path)
+        with open(filename, "r") as f:
+            for line in f:
+                if "#" not in line or line.lstrip()[:1] != "#":
+                    if "${" in line:
+                        line = MACRO_PATTERN.sub(self._macro, line)
+                    yield line
+                    continue
+                stripped = line.strip()
+                directive, _, argument = stripped.partition(" ")
+                argument = MACRO_PATTERN.sub(self._macro, argument.strip())
+                if directive == "#include":
+                    include = argument.strip("\"<>'")
+                    # Relative paths are relative to the including file, or to the current directory
+                    relative = os.path.join(os.path.dirname(filename), include)
+                    if os.path.exists(relative):
+                        include = relative
+                    yield from self.lines(include, stack)
+                elif directive == "#define":
+                    name, _, value = argument.partition("=")
+                    self.defines[name.strip()] = value.strip()
+                elif directive == "#set":
+                    name, _, value = argument.partition("=")
+                    self.globals[name.strip()] = value.strip()
+                else:
+                    logger.debug("Ignoring GLM directive {}".format(stripped))
+        stack.pop()
+
+    def _macro(self, match):
+        if match.group(1) in self.defines:
+            return self.defines[match.group(1)]
+        logger.warning("Undefined GLM macro {}".format(match.group(0)))
+        return match.group(0)
+
+    def records(self):
+        """Yields the objects and schedules of the model (See GLMTokenizer)."""
+        # Open objects, innermost last: [record, nested records, property waiting for an inline object]
+        stack = []
+        # Object or schedule record whose opening brace is expected
+        header = None
+        schedule = None
+        schedule_depth = 0
+        skip_depth = 0
+        for line in self.lines():
+            tokens = tokenize(line)
+            n_tokens = len(tokens)
+            row = []
+            i = 0
+            while i < n_tokens:
+                token = tokens[i]
+                i += 1
+                if stack and header is None and skip_depth == 0:
+                    # Body of an object
+                    if token not in PROPERTY_SEPARATORS:
+                        # Property: name followed by the value and the unit, up to a semicolon or the end of the line
+                        j = i
+                        while j < n_tokens and tokens[j] not in PROPERTY_SEPARATORS:
+                            j += 1
+                        if j < n_tokens and tokens[j] == "object":
+                            # The value is an object, defined inline
+                            stack[-1][2] = token
+                        elif j > i:
+                            stack[-1][0]["properties"].append(
+                                (
+                                    token,
+                                    tokens[i],
+                                    " ".join(tokens[i + 1 : j]) if j > i + 1 else None,
+                                )
+                            )
+                        if j < n_tokens and tokens[j] == ";":
+                            j += 1
+                        i = j
+                    elif token == "}":
+                        record, nested, _ = stack.pop()
+                        if stack:
+                            parent = stack[-1]
+                            parent[1].append(record)
+                            parent[1].extend(nested)
+                            if parent[2] is not None:
+                                parent[0]["properties"].append(
+                                    (parent[2], self._name(record), None)
+                                )
+                                parent[2] = None
+                        else:
+                            # The parents are known once the enclosing objects are closed
+                            yield record
+                            for child in nested:
+                                if isinstance(child["parent"], dict):
+                                    child["parent"] = self._name(child["parent"])
+                                yield child
+                    elif token == "object":
+                        header = self._object_record(stack[-1][0])
+                    elif token == "{":
+                        skip_depth = 1
+                elif skip_depth > 0:
+                    if token == "{":
+                        skip_depth += 1
+                    elif token == "}":
+                        skip_depth -= 1
+                elif header is not None:
+                    if token == "{":
+                        if header["type"] == "schedule":
+                            schedule = header
+                            schedule_depth = 1
+                        else:
+                            stack.append([header, [], None])
+                        header = None
+                    elif header["type"] == "schedule":
+                        if header["name"] is None:
+                            header["name"] = token
+                    elif header["class"] is None:
+                        header["class"] = token.partition(":")[0]
+                        if ":" in token:
+                            header["name"] = token
+                elif schedule is not None:
+                    # Rows end at a semicolon, a brace or the end of the line
+                    if token in SCHEDULE_SEPARATORS:
+                        if row:
+                            schedule["rows"].append(row)
+                            row = []
+                        if token == "{":
+                            schedule_depth += 1
+                        elif token == "}":
+                            schedule_depth -= 1
+                            if schedule_depth == 0:
+                                yield schedule
+                                schedule = None
+                    else:
+                        row.append(token)
+                elif token == "object":
+                    header = self._object_record(None)
+                elif token == "schedule":
+                    header = {"type": "schedule", "name": None, "rows": []}
+                elif token == "{":
+                    skip_depth = 1
+            if schedule is not None and row:
+                schedule["rows"].append(row)
+
+    def _object_record(self, parent):
+        return {
+            "type": "object",
+            "class": None,
+            "name": None,
+            "parent": parent,
+            "properties": [],
+        }
+
+    def _name(self, record):
+        """Name of an object record: class:name in the header or name property."""
+        if record["name"] is not None:
+            return record["name"]
+        for name, value, unit in record["properties"]:
+            if name == "name":
+                return value
+        return None
@@ -0,0 +1,610 @@
+# -*- coding: utf-8 -*-
+
+"""
+Properties of the OpenDSS classes read by the native OpenDSS script parser (See dss_script.py).
+
+For each class, the list of the (property name, default value) pairs in the order of the OpenDSS engine
+(the order matters for the positional parameters), with the default values formatted like the engine reports them.
+{name} is replaced by the name of the element (ex: the default buses of a line are {name}_1 and {name}_2).
+"""
+
+from __future__ import absolute_import, division, print_function
+
+PROPERTIES = {
+    "vsource": [
+        ("bus1", "sourcebus"),
+        ("basekv", "115"),
+        ("pu", "1"),
+        ("angle", "0"),
+        ("frequency", "60"),
+        ("phases", "3"),
+        ("MVAsc3", "2000"),
+        ("MVAsc1", "2100"),
+        ("x1r1", "4"),
+        ("x0r0", "3"),
+        ("Isc3", "10040.8742467761"),
+        ("Isc1", "10542.9179591149"),
+        ("R1", "1.60376682055275"),
+        ("X1", "6.41506728221101"),
+        ("R0", "1.79603583012335"),
+        ("X0", "5.38810749037006"),
+        ("ScanType", "Positive"),
+        ("Sequence", "Positive"),
+        ("bus2", "sourcebus.0.0.0"),
+        ("Z1", "[1.6037668205527518, 6.4150672822110071]"),
+        ("Z0", "[1.7960358301233548, 5.3881074903700643]"),
+        ("Z2", "[1.6037668205527518, 6.4150672822110071]"),
+        ("puZ1", "[0.012126781251816649, 0.048507125007266595]"),
+        ("puZ0", "[0.013580611191859016, 0.040741833575577042]"),
+        ("puZ2", "[0.012126781251816649, 0.048507125007266595]"),
+        ("baseMVA", "100"),
+        ("Yearly", ""),
+        ("Daily", ""),
+        ("Duty", ""),
+        ("Model", "Thevenin"),
+        ("puZideal", "[9.9999999999999995E-7, 0.001]"),
+        ("spectrum", "defaultvsource"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "line": [
+        ("bus1", "{name}_1"),
+        ("bus2", "{name}_2"),
+        ("linecode", ""),
+        ("length", "1"),
+        ("phases", "3"),
+        ("r1", "0.058"),
+        ("x1", "0.1206"),
+        ("r0", "0.1784"),
+        ("x0", "0.4047"),
+        ("C1", "3.4"),
+        ("C0", "1.6"),
+        (
+            "rmatrix",
+            "[0.098133333333333322 |0.040133333333333333 0.098133333333333322 |0.040133333333333333 0.040133333333333333 0.098133333333333322 ]",
+        ),
+        (
+            "xmatrix",
+            "[0.21529999999999999 |0.094700000000000006 0.21529999999999999 |0.094700000000000006 0.094700000000000006 0.21529999999999999 ]",
+        ),
+        (
+            "cmatrix",
+            "[2.7999999999999998 |-0.59999999999999987 2.7999999999999998 |-0.59999999999999987 -0.59999999999999987 2.7999999999999998 ]",
+        ),
+        ("Switch", "No"),
+        ("Rg", "0.01805"),
+        ("Xg", "0.155081"),
+        ("rho", "100"),
+        ("geometry", ""),
+        ("units", "none"),
+        ("spacing", ""),
+        ("wires", "[]"),
+        ("EarthModel", "Deri"),
+        ("cncables", "[]"),
+        ("tscables", "[]"),
+        ("B1", "1.28176980266464"),
+        ("B0", "0.60318578948924"),
+        ("Seasons", "1"),
+        ("Ratings", "[ 400]"),
+        ("LineType", "oh"),
+        ("normamps", "400"),
+        ("emergamps", "600"),
+        ("faultrate", "0.1"),
+        ("pctperm", "20"),
+        ("repair", "3"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "linecode": [
+        ("nphases", "3"),
+        ("r1", "0.058"),
+        ("x1", "0.1206"),
+        ("r0", "0.1784"),
+        ("x0", "0.4047"),
+        ("C1", "3.4"),
+        ("C0", "1.6"),
+        ("units", "none"),
+        (
+            "rmatrix",
+            "[0.098133333333333322 |0.040133333333333333 0.098133333333333322 |0.040133333333333333 0.040133333333333333 0.098133333333333322 ]",
+        ),
+        (
+            "xmatrix",
+            "[0.21529999999999999 |0.094700000000000006 0.21529999999999999 |0.094700000000000006 0.094700000000000006 0.21529999999999999 ]",
+        ),
+        (
+            "cmatrix",
+            "[2.7999999999999998 |-0.59999999999999987 2.7999999999999998 |-0.59999999999999987 -0.59999999999999987 2.7999999999999998 ]",
+        ),
+        ("baseFreq", "60"),
+        ("normamps", "400"),
+        ("emergamps", "600"),
+        ("faultrate", "0.1"),
+        ("pctperm", "20"),
+        ("repair", "0"),
+        ("Kron", "No"),
+        ("Rg", "0.01805"),
+        ("Xg", "0.155081"),
+        ("rho", "100"),
+        ("neutral", "3"),
+        ("B1", "1.28176980266464"),
+        ("B0", "0.60318578948924"),
+        ("Seasons", "1"),
+        ("Ratings", "[ 400]"),
+        ("LineType", "oh"),
+        ("like", ""),
+    ],
+    "linegeometry": [
+        ("nconds", "0"),
+        ("nphases", "0"),
+        ("cond", "1"),
+        ("wire", ""),
+        ("x", "0"),
+        ("h", "0"),
+        ("units", "ft"),
+        ("normamps", "0"),
+        ("emergamps", "0"),
+        ("reduce", "No"),
+        ("spacing", ""),
+        ("wires", "[]"),
+        ("cncable", ""),
+        ("tscable", ""),
+        ("cncables", "[]"),
+        ("tscables", "[]"),
+        ("Seasons", "1"),
+        ("Ratings", "[ 0]"),
+        ("LineType", "oh"),
+        ("like", ""),
+    ],
+    "wiredata": [
+        ("Rdc", "-1"),
+        ("Rac", "-1"),
+        ("Runits", "none"),
+        ("GMRac", "-1"),
+        ("GMRunits", "none"),
+        ("radius", "-1"),
+        ("radunits", "none"),
+        ("normamps", "-1"),
+        ("emergamps", "-1"),
+        ("diam", "-2"),
+        ("Seasons", "1"),
+        ("Ratings", "[ -1]"),
+        ("Capradius", "-1"),
+        ("like", ""),
+    ],
+    "cndata": [
+        ("k", "2"),
+        ("DiaStrand", "-1"),
+        ("GmrStrand", "-1"),
+        ("Rstrand", "-1"),
+        ("EpsR", "2.3"),
+        ("InsLayer", "-1"),
+        ("DiaIns", "-1"),
+        ("DiaCable", "-1"),
+        ("Rdc", "-1"),
+        ("Rac", "-1"),
+        ("Runits", "none"),
+        ("GMRac", "-1"),
+        ("GMRunits", "none"),
+        ("radius", "-1"),
+        ("radunits", "none"),
+        ("normamps", "-1"),
+        ("emergamps", "-1"),
+        ("diam", "-2"),
+        ("Seasons", "1"),
+        ("Ratings", "[ -1]"),
+        ("Capradius", "-1"),
+        ("like", ""),
+    ],
+    "transformer": [
+        ("phases", "3"),
+        ("windings", "2"),
+        ("wdg", "1"),
+        ("bus", "{name}_1"),
+        ("conn", "wye"),
+        ("kV", "12.47"),
+        ("kVA", "1000"),
+        ("tap", "1"),
+        ("%R", "0.2"),
+        ("Rneut", "-1"),
+        ("Xneut", "0"),
+        ("buses", "[{name}_1, {name}_2, ]"),
+        ("conns", "[wye, wye, ]"),
+        ("kVs", "[12.47, 12.47, ]"),
+        ("kVAs", "[1000, 1000, ]"),
+        ("taps", "[1, 1, ]"),
+        ("XHL", "7"),
+        ("XHT", "35"),
+        ("XLT", "30"),
+        ("Xscarray", "[ 7]"),
+        ("thermal", "2"),
+        ("n", "0.8"),
+        ("m", "0.8"),
+        ("flrise", "65"),
+        ("hsrise", "15"),
+        ("%loadloss", "0.4"),
+        ("%noloadloss", "0"),
+        ("normhkVA", "1100"),
+        ("emerghkVA", "1500"),
+        ("sub", "No"),
+        ("MaxTap", "1.1"),
+        ("MinTap", "0.9"),
+        ("NumTaps", "32"),
+        ("subname", ""),
+        ("%imag", "0"),
+        ("ppm_antifloat", "1"),
+        ("%Rs", "[0.2, 0.2, ]"),
+        ("bank", ""),
+        ("XfmrCode", ""),
+        ("XRConst", "No"),
+        ("X12", "7"),
+        ("X13", "35"),
+        ("X23", "30"),
+        ("LeadLag", "Lag"),
+        ("WdgCurrents", "0, (0), 0, (0), 0, (0), 0, (0), 0, (0), 0, (0), "),
+        ("Core", "shell"),
+        ("RdcOhms", "0.0881171766666667"),
+        ("Seasons", "1"),
+        ("Ratings", "[ 1100]"),
+        ("normamps", "50.9290534168876"),
+        ("emergamps", "69.4487092048467"),
+        ("faultrate", "0.007"),
+        ("pctperm", "0"),
+        ("repair", "0"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "xfmrcode": [
+        ("phases", "3"),
+        ("windings", "2"),
+        ("wdg", "1"),
+        ("conn", "wye"),
+        ("kV", "12.47"),
+        ("kVA", "1000"),
+        ("tap", "1"),
+        ("%R", "0.2"),
+        ("Rneut", "-1"),
+        ("Xneut", "0"),
+        ("conns", "[wye, wye, ]"),
+        ("kVs", "[12.47, 12.47, ]"),
+        ("kVAs", "[1000, 1000, ]"),
+        ("taps", "[1, 1, ]"),
+        ("Xhl", "7"),
+        ("Xht", "35"),
+        ("Xlt", "30"),
+        ("Xscarray", "[ 0]"),
+        ("thermal", "2"),
+        ("n", "0.8"),
+        ("m", "0.8"),
+        ("flrise", "65"),
+        ("hsrise", "15"),
+        ("%loadloss", "0.4"),
+        ("%noloadloss", "0"),
+        ("normhkVA", "1100"),
+        ("emerghkVA", "1500"),
+        ("MaxTap", "1.1"),
+        ("MinTap", "0.9"),
+        ("NumTaps", "32"),
+        ("%imag", "0"),
+        ("ppm_antifloat", "1"),
+        ("%Rs", "[0.2, 0.2, ]"),
+        ("X12", "7"),
+        ("X13", "35"),
+        ("X23", "30"),
+        ("RdcOhms", "0.26435153"),
+        ("Seasons", "1"),
+        ("Ratings", "[ 600]"),
+        ("like", ""),
+    ],
+    "regcontrol": [
+        ("transformer", ""),
+        ("winding", "1"),
+        ("vreg", "120"),
+        ("band", "3"),
+        ("ptratio", "60"),
+        ("CTprim", "300"),
+        ("R", "0"),
+        ("X", "0"),
+        ("bus", ""),
+        ("delay", "15"),
+        ("reversible", "No"),
+        ("revvreg", "120"),
+        ("revband", "3"),
+        ("revR", "0"),
+        ("revX", "0"),
+        ("tapdelay", "2"),
+        ("debugtrace", "No"),
+        ("maxtapchange", "16"),
+        ("inversetime", "No"),
+        ("tapwinding", "1"),
+        ("vlimit", "0"),
+        ("PTphase", ""),
+        ("revThreshold", "100"),
+        ("revDelay", "60"),
+        ("revNeutral", "No"),
+        ("EventLog", "Yes"),
+        ("RemotePTRatio", "60"),
+        ("TapNum", "0"),
+        ("Reset", "No"),
+        ("LDC_Z", "0"),
+        ("rev_Z", "0"),
+        ("Cogen", "No"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "load": [
+        ("phases", "3"),
+        ("bus1", "{name}_1"),
+        ("kV", "12.47"),
+        ("kW", "10"),
+        ("pf", "0.88"),
+        ("model", "1"),
+        ("yearly", ""),
+        ("daily", ""),
+        ("duty", ""),
+        ("growth", ""),
+        ("conn", "wye"),
+        ("kvar", "5.39742822138087"),
+        ("Rneut", "-1"),
+        ("Xneut", "0"),
+        ("status", "Variable"),
+        ("class", "1"),
+        ("Vminpu", "0.95"),
+        ("Vmaxpu", "1.05"),
+        ("Vminnorm", "0"),
+        ("Vminemerg", "0"),
+        ("xfkVA", "0"),
+        ("allocationfactor", "0.5"),
+        ("kVA", "11.3636363636364"),
+        ("%mean", "50"),
+        ("%stddev", "10"),
+        ("CVRwatts", "1"),
+        ("CVRvars", "2"),
+        ("kwh", "0"),
+        ("kwhdays", "30"),
+        ("Cfactor", "4"),
+        ("CVRcurve", ""),
+        ("NumCust", "1"),
+        ("ZIPV", "[ 0 0 0 0 0 0 0]"),
+        ("%SeriesRL", "50"),
+        ("RelWeight", "1"),
+        ("Vlowpu", "0.5"),
+        ("puXharm", "0"),
+        ("XRharm", "6"),
+        ("spectrum", "defaultload"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "capacitor": [
+        ("bus1", "{name}_1"),
+        ("bus2", "{name}_1.0.0.0"),
+        ("phases", "3"),
+        ("kvar", "[ 1200]"),
+        ("kv", "12.47"),
+        ("conn", "wye"),
+        ("cmatrix", ""),
+        ("cuf", "[ 20.47]"),
+        ("R", "[ 0]"),
+        ("XL", "[ 0]"),
+        ("Harm", "[ 0]"),
+        ("Numsteps", "1"),
+        ("states", "[ 1]"),
+        ("normamps", "75.0046059412344"),
+        ("emergamps", "100.006141254979"),
+        ("faultrate", "0.0005"),
+        ("pctperm", "100"),
+        ("repair", "3"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "capcontrol": [
+        ("element", ""),
+        ("terminal", "1"),
+        ("capacitor", ""),
+        ("type", "Current"),
+        ("PTratio", "60"),
+        ("CTratio", "60"),
+        ("ONsetting", "300"),
+        ("OFFsetting", "200"),
+        ("Delay", "15"),
+        ("VoltOverride", "No"),
+        ("Vmax", "126"),
+        ("Vmin", "115"),
+        ("DelayOFF", "15"),
+        ("DeadTime", "300"),
+        ("CTPhase", ""),
+        ("PTPhase", ""),
+        ("VBus", ""),
+        ("EventLog", "Yes"),
+        ("UserModel", ""),
+        ("UserData", ""),
+        ("pctMinkvar", "50"),
+        ("Reset", "No"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "reactor": [
+        ("bus1", "{name}_1"),
+        ("bus2", "{name}_1.0.0.0"),
+        ("phases", "3"),
+        ("kvar", "100"),
+        ("kv", "12.47"),
+        ("conn", "wye"),
+        ("Rmatrix", ""),
+        ("Xmatrix", ""),
+        ("Parallel", "No"),
+        ("R", "0"),
+        ("X", "1555.009"),
+        ("Rp", "0"),
+        ("Z1", "[0, 0]"),
+        ("Z2", "[0, 0]"),
+        ("Z0", "[0, 0]"),
+        ("Z", "[0, 0]"),
+        ("RCurve", ""),
+        ("LCurve", ""),
+        ("LmH", "4124.78948170642"),
+        ("normamps", "4.62991394698978"),
+        ("emergamps", "6.25038382843621"),
+        ("faultrate", "0.0005"),
+        ("pctperm", "100"),
+        ("repair", "3"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "fuse": [
+        ("MonitoredObj", ""),
+        ("MonitoredTerm", "1"),
+        ("SwitchedObj", ""),
+        ("SwitchedTerm", "1"),
+        ("FuseCurve", "tlink"),
+        ("RatedCurrent", "1"),
+        ("Delay", "0"),
+        ("Action", ""),
+        ("Normal", "[closed, closed, closed, , , , ]"),
+        ("State", "[closed, closed, closed, , , , ]"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "recloser": [
+        ("MonitoredObj", ""),
+        ("MonitoredTerm", "1"),
+        ("SwitchedObj", ""),
+        ("SwitchedTerm", "1"),
+        ("NumFast", "1"),
+        ("PhaseFast", "a"),
+        ("PhaseDelayed", "d"),
+        ("GroundFast", ""),
+        ("GroundDelayed", ""),
+        ("PhaseTrip", "1"),
+        ("GroundTrip", "1"),
+        ("PhaseInst", "0"),
+        ("GroundInst", "0"),
+        ("Reset", "15"),
+        ("Shots", "4"),
+        ("RecloseIntervals", "[ 0.5 2 2]"),
+        ("Delay", "0"),
+        ("Action", "close"),
+        ("TDPhFast", "1"),
+        ("TDGrFast", "1"),
+        ("TDPhDelayed", "1"),
+        ("TDGrDelayed", "1"),
+        ("Normal", "closed"),
+        ("State", "closed"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "storage": [
+        ("phases", "3"),
+        ("bus1", "{name}_1"),
+        ("kv", "12.47"),
+        ("conn", "wye"),
+        ("kW", "-0.25"),
+        ("kvar", "0"),
+        ("pf", "1"),
+        ("kVA", "25"),
+        ("%Cutin", "0"),
+        ("%Cutout", "0"),
+        ("EffCurve", ""),
+        ("VarFollowInverter", "No"),
+        ("kvarMax", "25"),
+        ("kvarMaxAbs", "25"),
+        ("WattPriority", "No"),
+        ("PFPriority", "No"),
+        ("%PminNoVars", "-1"),
+        ("%PminkvarMax", "-1"),
+        ("kWrated", "25"),
+        ("%kWrated", "100"),
+        ("kWhrated", "50"),
+        ("kWhstored", "50"),
+        ("%stored", "100"),
+        ("%reserve", "20"),
+        ("State", "Idling"),
+        ("%Discharge", "100"),
+        ("%Charge", "100"),
+        ("%EffCharge", "90"),
+        ("%EffDischarge", "90"),
+        ("%IdlingkW", "1"),
+        ("%R", "0"),
+        ("%X", "50"),
+        ("model", "1"),
+        ("Vminpu", "0.9"),
+        ("Vmaxpu", "1.1"),
+        ("Balanced", "No"),
+        ("LimitCurrent", "No"),
+        ("yearly", ""),
+        ("daily", ""),
+        ("duty", ""),
+        ("DispMode", "Default"),
+        ("DischargeTrigger", "0"),
+        ("ChargeTrigger", "0"),
+        ("TimeChargeTrig", "2"),
+        ("class", "1"),
+        ("DynaDLL", ""),
+        ("DynaData", ""),
+        ("UserModel", ""),
+        ("UserData", ""),
+        ("debugtrace", "No"),
+        ("spectrum", ""),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+    "generator": [
+        ("phases", "3"),
+        ("bus1", "{name}_1"),
+        ("kv", "12.47"),
+        ("kW", "1000"),
+        ("pf", "0.88"),
+        ("kvar", "60"),
+        ("model", "1"),
+        ("Vminpu", "0.9"),
+        ("Vmaxpu", "1.1"),
+        ("yearly", ""),
+        ("daily", ""),
+        ("duty", ""),
+        ("dispmode", "Default"),
+        ("dispvalue", "0"),
+        ("conn", "wye"),
+        ("status", "Variable"),
+        ("class", "1"),
+        ("Vpu", "1"),
+        ("maxkvar", "120"),
+        ("minkvar", "-120"),
+        ("pvfactor", "0.1"),
+        ("forceon", "No"),
+        ("kVA", "1200"),
+        ("MVA", "1.2"),
+        ("Xd", "1"),
+        ("Xdp", "0.28"),
+        ("Xdpp", "0.2"),
+        ("H", "1"),
+        ("D", "0"),
+        ("UserModel", ""),
+        ("UserData", ""),
+        ("ShaftModel", ""),
+        ("ShaftData", ""),
+        ("DutyStart", "0"),
+        ("debugtrace", "No"),
+        ("Balanced", "No"),
+        ("XRdp", "20"),
+        ("UseFuel", "No"),
+        ("FuelkWh", "0"),
+        ("%Fuel", "100"),
+        ("%Reserve", "20"),
+        ("Refuel", "No"),
+        ("spectrum", "defaultgen"),
+        ("basefreq", "60"),
+        ("enabled", "Yes"),
+        ("like", ""),
+    ],
+}
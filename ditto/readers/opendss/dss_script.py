@@ -0,0 +1,1872 @@
+# -*- coding: utf-8 -*-
+
+"""
+Native parser of the OpenDSS scripts, independent of the OpenDSS engine.
+
+The .dss files are read line by line (New, Edit, ~ / More, Class.name.property=value, Redirect, Compile,
+Clear, Set voltagebases, Calcvoltagebases, Solve, BusCoords, Enable, Disable, BatchEdit...) and the
+properties of the elements are stored as strings formatted like the engine reports them, such that
+DSSScript.class_to_dict returns the same data as reading the classes from OpenDSSDirect.
+
+The derived properties computed by the engine and used by the OpenDSS reader are computed as well:
+line impedance matrices from the sequence impedances and the linecodes (with the length unit conversions),
+source impedances from the short circuit powers or currents, load powers from the different specifications,
+transformer winding data, wire radius and resistances, storage powers...
+The voltage bases of the buses (Calcvoltagebases) are estimated by propagating the source voltage through
+the lines and the transformer ratios, and choosing the closest voltage base.
+
+.. warning:: The impedances of the lines defined from geometries, spacings or wires are not computed (Carson equations),
+    their impedance matrices are empty.
+
+.. warning:: The circuit is not solved: the tap positions of the transformers are the ones of the scripts,
+    without the changes made by the regulator controls when the engine solves the circuit.
+"""
+
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import cmath
+import copy
+import logging
+import math
+import os
+import re
+from collections import deque
+
+import numpy as np
+
+from ditto.readers.opendss.dss_properties import PROPERTIES
+
+logger = logging.getLogger(__name__)
+
+SQRT3 = math.sqrt(3)
+
+# Default voltage bases of the engine (kV, line to line)
+DEFAULT_VOLTAGE_BASES = [0.208, 0.48, 12.47, 24.9, 34.5, 115.0, 230.0]
+
+# Length units and their length in meters
+UNITS = [
+    ("none", 1.0),
+    ("mi", 1609.344),
+    ("kft", 304.8),
+    ("km", 1000.0),
+    ("m", 1.0),
+    ("ft", 0.3048),
+    ("in", 0.0254),
+    ("cm", 0.01),
+    ("mm", 0.001),
+]
+UNIT_LENGTHS = dict(UNITS)
+
+# Names of the classes as reported by the engine (ex: in the element of a CapControl)
+CLASS_NAMES = {
+    "vsource": "Vsource",
+    "isource": "Isource",
+    "line": "Line",
+    "linecode": "LineCode",
+    "linegeometry": "LineGeometry",
+    "wiredata": "WireData",
+    "cndata": "CNData",
+    "transformer": "Transformer",
+    "xfmrcode": "XfmrCode",
+    "regcontrol": "RegControl",
+    "load": "Load",
+    "capacitor": "Capacitor",
+    "capcontrol": "CapControl",
+    "reactor": "Reactor",
+    "fuse": "Fuse",
+    "recloser": "Recloser",
+    "storage": "Storage",
+    "generator": "Generator",
+    "pvsystem": "PVSystem",
+}
+
+# Classes of the elements connected to buses
+CIRCUIT_CLASSES = [
+    "vsource",
+    "isource",
+    "line",
+    "reactor",
+    "transformer",
+    "capacitor",
+    "load",
+    "storage",
+    "generator",
+    "pvsystem",
+    "fault",
+]
+
+# Properties referencing other objects, whose names are lower case
+REFERENCES = set(
+    [
+        "bus",
+        "bus1",
+        "bus2",
+        "linecode",
+        "geometry",
+        "spacing",
+        "yearly",
+        "daily",
+        "duty",
+        "growth",
+        "spectrum",
+        "transformer",
+        "capacitor",
+        "xfmrcode",
+        "wire",
+        "cncable",
+        "tscable",
+        "cvrcurve",
+        "fusecurve",
+    ]
+)
+
+# Commands of the scripts (abbreviations are accepted)
+COMMANDS = [
+    "new",
+    "edit",
+    "more",
+    "~",
+    "redirect",
+    "compile",
+    "clear",
+    "clearall",
+    "set",
+    "calcvoltagebases",
+    "solve",
+    "buscoords",
+    "latlongcoords",
+    "disable",
+    "enable",
+    "batchedit",
+]
+
+# Characters enclosing the values
+QUOTES = {'"': '"', "'": "'", "(": ")", "[": "]", "{": "}"}
+
+# Operators of the RPN expressions in parenthesis (ex: XHL=(8 1000 /))
+RPN_BINARY = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": lambda a, b: a / b,
+    "^": lambda a, b: a ** b,
+}
+RPN_UNARY = {
+    "sqr": lambda a: a * a,
+    "sqrt": math.sqrt,
+    "inv": lambda a: 1.0 / a,
+    "ln": math.log,
+    "exp": math.exp,
+    "log10": math.log10,
+}
+
+
+def parse_value(string):
+    """
+    Parses a value reported by the engine: lists [...] and tuples (...) of values, booleans, strings otherwise.
+    Same parsing as the private opendssdirect.utils._evaluate_expression, which the readers do not rely on.
+    """
+    if "[" in string and "]" in string:
+        return [
+            parse_value(x.strip())
+            for x in string.replace("[", "").replace("]", "").split(",")
+            if x.strip() != ""
+        ]
+    elif string.startswith("(") and string.endswith(")"):
+        return tuple(
+            parse_value(x.strip())
+            for x in string.replace("(", "").replace(")", "").split(",")
+            if x.strip() != ""
+        )
+    elif string.lower() == "true":
+        return True
+    elif string.lower() == "false":
+        return False
+    return string
+
+
+def _strip_comment(line):
+    """Removes the comment (after ! or //) at the end of a line, outside of quotes."""
+    closing = None
+    for i, c in enumerate(line):
+        if closing is not None:
+            if c == closing:
+                closing = None
+        elif c in QUOTES:
+            closing = QUOTES[c]
+        elif c == "!" or (c == "/" and line[i + 1 : i + 2] == "/"):
+            return line[:i]
+    return line
+
+
+def _read_value(text, i):
+    """Reads the value starting at position i. Returns the value (without the quotes) and the position after it."""
+    n = len(text)
+    if text[i] in QUOTES:
+        opening = text[i]
+        closing = QUOTES[opening]
+        depth = 1
+        j = i + 1
+        while j < n:
+            if text[j] == closing and closing != opening:
+                depth -= 1
+            elif text[j] == opening and closing != opening:
+                depth += 1
+            elif text[j] == closing:
+                depth = 0
+            if depth == 0:
+                break
+            j += 1
+        return text[i + 1 : j], j + 1
+    j = i
+    while j < n and text[j] not in " \t,":
+        j += 1
+    return text[i:j], j
+
+
+def split_parameters(text):
+    """
+    Splits a command line into a list of (name, value) pairs.
+    The name is None for the positional parameters.
+
+    >>> split_parameters('New Line.L1 bus1=b1 bus2 = b2, phases=(3) ')
+    [(None, 'New'), (None, 'Line.L1'), ('bus1', 'b1'), ('bus2', 'b2'), ('phases', '3')]
+    """
+    parameters = []
+    n = len(text)
+    i = 0
+    while True:
+        while i < n and text[i] in " \t,":
+            i += 1
+        if i >= n:
+            break
+        name = None
+        if text[i] not in QUOTES:
+            j = i
+            while j < n and text[j] not in " \t,=":
+                j += 1
+            k = j
+            while k < n and text[k] in " \t":
+                k += 1
+            if k < n and text[k] == "=":
+                name = text[i:j]
+                i = k + 1
+                while i < n and text[i] in " \t":
+                    i += 1
+                if i >= n:
+                    parameters.append((name, ""))
+                    break
+        value, i = _read_value(text, i)
+        parameters.append((name, value))
+    return parameters
+
+
+def _number(text):
+    """Parses a number, or evaluates an RPN expression (ex: '8 1000 /')."""
+    tokens = text.replace(",", " ").split()
+    if len(tokens) == 1:
+        return float(tokens[0])
+    stack = []
+    for token in tokens:
+        operator = token.lower()
+        if operator in RPN_BINARY:
+            b = stack.pop()
+            a = stack.pop()
+            stack.append(RPN_BINARY[operator](a, b))
+        elif operator in RPN_UNARY:
+            stack.append(RPN_UNARY[operator](stack.pop()))
+        elif operator == "pi":
+            stack.append(math.pi)
+        elif operator == "swap":
+            stack[-2], stack[-1] = stack[-1], stack[-2]
+        else:
+            stack.append(float(token))
+    return stack[-1]
+
+
+def _numbers(text):
+    """Parses an array of numbers (separated by spaces, commas or |)."""
+    return [float(x) for x in re.split(r"[\s,|]+", text.strip()) if x != ""]
+
+
+def _strings(text):
+    """Parses an array of strings (separated by spaces or commas)."""
+    return [x for x in re.split(r"[\s,]+", text.strip()) if x != ""]
+
+
+def _matrix(text, size):
+    """
+    Parses a lower triangular (or full) matrix with rows separated by |, like the engine:
+    the row i takes its first i+1 values, and the values are read sequentially if there is no |.
+    """
+    if "|" in text:
+        rows = [_numbers(row) for row in text.split("|")]
+    else:
+        values = _numbers(text)
+        rows = []
+        for i in range(size):
+            rows.append(values[: i + 1])
+            values = values[i + 1 :]
+    matrix = np.zeros((size, size))
+    for i in range(min(size, len(rows))):
+        for j, value in enumerate(rows[i][: i + 1]):
+            matrix[i, j] = value
+            matrix[j, i] = value
+    return matrix
+
+
+def _format(value, digits=15):
+    """Formats a number like the engine reports the scalar properties."""
+    return "{:.{}g}".format(value, digits)
+
+
+def _format_matrix(matrix):
+    """Formats a matrix like the engine: '[a |b c |d e f ]' (lower triangle)."""
+    rows = [
+        " ".join("{:.17g}".format(matrix[i, j]) for j in range(i + 1))
+        for i in range(len(matrix))
+    ]
+    return "[" + " |".join(rows) + " ]"
+
+
+def _format_array(values, digits=15):
+    """Formats an array of numbers like the engine: '[ a b c]'."""
+    return "[ " + " ".join(_format(v, digits) for v in values) + "]"
+
+
+def _format_list(values):
+    """Formats an array of strings or numbers like the engine: '[a, b, ]'."""
+    return "[" + "".join("{}, ".format(v) for v in values) + "]"
+
+
+def _yes_no(text):
+    """Interprets a boolean like the engine (y, yes, t, true...)."""
+    return "Yes" if text.strip().lower()[:1] in ("y", "t") else "No"
+
+
+def _connection(text):
+    """Returns wye or delta."""
+    return "delta" if text.strip().lower() in ("d", "delta", "ll") else "wye"
+
+
+def _units(text):
+    """Returns the name of a length unit (none if unknown)."""
+    text = text.strip().lower()
+    if text.startswith("me"):
+        return "m"
+    for name, _ in UNITS:
+        if text == name:
+            return name
+    for name, _ in UNITS:
+        if name != "m" and text[:2] == name[:2]:
+            return name
+    return "none"
+
+
+def _enum(text, choices):
+    """Returns the first of the choices starting with the text (case insensitive), or the text."""
+    for choice in choices:
+        if choice.lower().startswith(text.strip().lower()):
+            return choice
+    return text
+
+
+def _bus_base(bus):
+    """Returns the name of a bus without the nodes."""
+    return bus.split(".")[0]
+
+
+def _bus_nodes(bus, defaults):
+    """Returns the nodes of the conductors of a terminal: the nodes of the bus name and the defaults."""
+    nodes = list(defaults)
+    for i, node in enumerate(bus.split(".")[1:]):
+        if i < len(nodes) and node != "":
+            try:
+                nodes[i] = int(node)
+            except ValueError:
+                pass
+    return nodes
+
+
+def _reference(text):
+    """Returns the name of an element as reported by the engine (ex: line.L1 -> Line.l1)."""
+    if "." not in text:
+        return text.lower()
+    class_name, name = text.split(".", 1)
+    return "{}.{}".format(CLASS_NAMES.get(class_name.lower(), class_name), name.lower())
+
+
+class Element(object):
+    """
+    Element of an OpenDSS class.
+    The properties are stored in values as strings formatted like the engine reports them.
+    The classes with derived properties override set (called for each property assigned) and report.
+    """
+
+    # Lookup of the property names (lower case name -> name), by class
+    _lookups = {}
+
+    def __init__(self, script, class_name, name):
+        """Class CONSTRUCTOR."""
+        self.script = script
+        self.class_name = class_name
+        self.name = name
+        self.names = [p for p, _ in PROPERTIES.get(class_name, [])]
+        self.values = dict(
+            (p, default.replace("{name}", name))
+            for p, default in PROPERTIES.get(class_name, [])
+        )
+        # Properties explicitly set
+        self.specified = set()
+
+    def property_name(self, key):
+        """
+        Returns the name of the property matching the key: the property with the same name (case insensitive),
+        or the first property starting with the key like the engine. Returns None for unknown properties.
+        """
+        if self.class_name not in self._lookups:
+            self._lookups[self.class_name] = dict((p.lower(), p) for p in self.names)
+        lookup = self._lookups[self.class_name]
+        key = key.lower()
+        if key in lookup:
+            return lookup[key]
+        for p in self.names:
+            if p.lower().startswith(key):
+                return p
+        if len(self.names) == 0:
+            # Class without known properties: every property is stored as is
+            return key
+        return None
+
+    def edit(self, parameters):
+        """Assigns the (name, value) pairs. The positional values are assigned to the properties following the last one."""
+        index = 0
+        for key, value in parameters:
+            if key is None:
+                if index >= len(self.names):
+                    # The properties of the classes not read are unknown
+                    if self.names:
+                        logger.warning(
+                            "Too many parameters for {}.{}: {}".format(
+                                self.class_name, self.name, value
+                            )
+                        )
+                    continue
+                prop = self.names[index]
+            else:
+                prop = self.property_name(key)
+                if prop is None:
+                    logger.warning(
+                        'Unknown parameter "{}" for object "{}.{}"'.format(
+                            key, self.class_name, self.name
+                        )
+                    )
+                    continue
+            if prop in self.names:
+                index = self.names.index(prop) + 1
+            try:
+                if prop == "like":
+                    other = self.script.get(self.class_name, value)
+                    if other is None:
+                        logger.warning(
+                            "Like object {}.{} not found".format(self.class_name, value)
+                        )
+                        continue
+                    self.like(other)
+                else:
+                    self.set(prop, value)
+                    self.specified.add(prop)
+            except (ValueError, IndexError, ZeroDivisionError):
+                logger.warning(
+                    'Unable to set {}.{}.{}="{}"'.format(
+                        self.class_name, self.name, prop, value
+                    )
+                )
+        self.recalc()
+
+    def set(self, prop, value):
+        """Stores the value of a property, formatted like the engine."""
+        default = self.values.get(prop, "")
+        key = prop.lower()
+        if default in ("Yes", "No"):
+            value = _yes_no(value)
+        elif key in ("conn", "conns"):
+            value = (
+                _connection(value)
+                if key == "conn"
+                else _format_list(_connection(c) for c in _strings(value))
+            )
+        elif key in ("units", "runits", "gmrunits", "radunits"):
+            value = _units(value)
+        elif key in REFERENCES:
+            value = value.lower()
+        else:
+            try:
+                float(default)
+                value = _format(_number(value))
+            except ValueError:
+                pass
+        self.values[prop] = value
+
+    def like(self, other):
+        """Copies the properties of another element of the same class."""
+        for attribute, value in other.__dict__.items():
+            if attribute not in ("script", "class_name", "name"):
+                setattr(self, attribute, copy.deepcopy(value))
+
+    def recalc(self):
+        """Updates the derived properties (called after each command editing the element, like the engine)."""
+        pass
+
+    def enabled(self):
+        return self.values.get("enabled", "Yes") == "Yes"
+
+    def terminals(self):
+        """Returns the bus names of the terminals of the element."""
+        return []
+
+    def report(self):
+        """Returns the values of the properties as reported by the engine."""
+        return self.values
+
+
+class Vsource(Element):
+    """Voltage source (the source of the circuit is Vsource.source)."""
+
+    def __init__(self, script, class_name, name):
+        super().__init__(script, class_name, name)
+        # Specification of the impedances: mvasc, isc, z or puz
+        self.specification = "mvasc"
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key in ("mvasc3", "mvasc1"):
+            self.specification = "mvasc"
+        elif key in ("isc3", "isc1"):
+            self.specification = "isc"
+        elif key in ("r1", "x1", "r0", "x0"):
+            self.specification = "z"
+        elif key in ("z1", "z0"):
+            self.specification = "z"
+            r, x = _numbers(value)[:2]
+            self.values["R" + key[1]] = _format(r)
+            self.values["X" + key[1]] = _format(x)
+            return
+        elif key in ("puz1", "puz0"):
+            self.specification = "puz"
+            r, x = _numbers(value)[:2]
+            self.values[prop] = "[{:.17g}, {:.17g}]".format(r, x)
+            return
+        super().set(prop, value)
+        if key == "bus1":
+            self.values["bus2"] = _bus_base(self.values["bus1"]) + ".0" * int(
+                self.values["phases"]
+            )
+
+    def _float(self, prop):
+        return float(self.values[prop])
+
+    def recalc(self):
+        """Computes the impedances from the last specification (short circuit powers or currents, impedances)."""
+        kv = self._float("basekv")
+        zbase = kv ** 2 / self._float("baseMVA")
+        # The single phase short circuit current of a single phase source is on the line to line voltage
+        kv1 = kv if self.values["phases"] == "1" else SQRT3 * kv
+        if self.specification == "isc":
+            self.values["MVAsc3"] = _format(SQRT3 * kv * self._float("Isc3") / 1000.0)
+            self.values["MVAsc1"] = _format(kv1 * self._float("Isc1") / 1000.0)
+        if self.specification in ("mvasc", "isc"):
+            mvasc3 = self._float("MVAsc3")
+            mvasc1 = self._float("MVAsc1")
+            x1r1 = self._float("x1r1")
+            x0r0 = self._float("x0r0")
+            r1 = kv ** 2 / mvasc3 / math.sqrt(1.0 + x1r1 ** 2)
+            x1 = r1 * x1r1
+            # |2 Z1 + Z0| = 3 kV^2 / MVAsc1 with Z0 = R0 (1 + j x0r0)
+            a = 1.0 + x0r0 ** 2
+            b = 4.0 * (r1 + x1 * x0r0)
+            c = 4.0 * (r1 ** 2 + x1 ** 2) - (3.0 * kv ** 2 / mvasc1) ** 2
+            r0 = (-b + math.sqrt(b * b - 4.0 * a * c)) / (2.0 * a)
+            z1 = complex(r1, x1)
+            z0 = complex(r0, r0 * x0r0)
+        else:
+            if self.specification == "puz":
+                z1 = complex(*_numbers(self.values["puZ1"])[:2]) * zbase
+                z0 = complex(*_numbers(self.values["puZ0"])[:2]) * zbase
+            else:
+                z1 = complex(self._float("R1"), self._float("X1"))
+                z0 = complex(self._float("R0"), self._float("X0"))
+            if abs(z1) > 0:
+                self.values["MVAsc3"] = _format(kv ** 2 / abs(z1))
+            if abs(2 * z1 + z0) > 0:
+                self.values["MVAsc1"] = _format(3.0 * kv ** 2 / abs(2 * z1 + z0))
+        if self.specification != "isc" and kv > 0:
+            self.values["Isc3"] = _format(self._float("MVAsc3") * 1000.0 / (SQRT3 * kv))
+            self.values["Isc1"] = _format(self._float("MVAsc1") * 1000.0 / kv1)
+        self.values["R1"] = _format(z1.real)
+        self.values["X1"] = _format(z1.imag)
+        self.values["R0"] = _format(z0.real)
+        self.values["X0"] = _format(z0.imag)
+        for prop, z in [("Z1", z1), ("Z0", z0), ("Z2", z1)]:
+            self.values[prop] = "[{:.17g}, {:.17g}]".format(z.real, z.imag)
+            self.values["pu" + prop] = "[{:.17g}, {:.17g}]".format(
+                z.real / zbase, z.imag / zbase
+            )
+
+    def terminals(self):
+        return [self.values["bus1"]]
+
+
+class Impedance(object):
+    """
+    Impedances per unit length of a line or a linecode: sequence impedances (ohms) and capacitances (nF),
+    or matrices given explicitly.
+    """
+
+    def __init__(self, line=False):
+        """Class CONSTRUCTOR. line is True for the impedances of a line, False for a linecode."""
+        self.line = line
+        self.nphases = 3
+        self.sequence = {
+            "r1": 0.058,
+            "x1": 0.1206,
+            "r0": 0.1784,
+            "x0": 0.4047,
+            "c1": 3.4,
+            "c0": 1.6,
+        }
+        # Matrices given explicitly (None if computed from the sequence values)
+        self.z = None
+        self.c = None
+
+    def set_sequence(self, key, value):
+        self.sequence[key] = value
+        self.z = None
+        self.c = None
+
+    def set_phases(self, nphases):
+        """Changes the number of phases. Returns False if the matrices were given explicitly, like the engine."""
+        if nphases == self.nphases:
+            return True
+        if self.z is not None:
+            return False
+        self.nphases = nphases
+        return True
+
+    def set_matrix(self, key, text):
+        z, c = self.matrices()
+        matrix = _matrix(text, self.nphases)
+        if key == "rmatrix":
+            z = matrix + 1j * z.imag
+        elif key == "xmatrix":
+            z = z.real + 1j * matrix
+        else:
+            c = matrix
+        self.z = z
+        self.c = c
+
+    def kron(self, neutral):
+        """
+        Eliminates the conductors from the neutral (index starting at 1) to the last one with a Kron reduction
+        of the impedance matrix. Like the engine, only the matrices given explicitly are reduced, and the
+        capacitance matrix is truncated.
+        """
+        if self.z is None or not 1 < neutral <= self.nphases:
+            return
+        z = self.z
+        for k in range(self.nphases - 1, neutral - 2, -1):
+            keep = list(range(k))
+            z = z[np.ix_(keep, keep)] - np.outer(z[keep, k], z[k, keep]) / z[k, k]
+        self.nphases = neutral - 1
+        self.z = z
+        self.c = self.c[: self.nphases, : self.nphases]
+
+    def matrices(self):
+        """Returns the impedance and capacitance matrices."""
+        if self.z is not None:
+            return self.z, self.c
+        s = self.sequence
+        if self.nphases == 1 and self.line:
+            # Single phase line: the zero sequence values are the positive sequence values
+            for key in ("r", "x", "c"):
+                s[key + "0"] = s[key + "1"]
+        z1 = complex(s["r1"], s["x1"])
+        z0 = complex(s["r0"], s["x0"])
+        # Multiplied by 1/3 like the engine, to get the same roundings
+        third = 1.0 / 3.0
+        zs = (z1 * 2.0 + z0) * third
+        zm = (z0 - z1) * third
+        cs = (s["c1"] * 2.0 + s["c0"]) * third
+        cm = (s["c0"] - s["c1"]) * third
+        n = self.nphases
+        z = np.full((n, n), zm, dtype=complex)
+        c = np.full((n, n), cm)
+        np.fill_diagonal(z, zs)
+        np.fill_diagonal(c, cs)
+        return z, c
+
+    def report(self, values, factor=1.0):
+        """
+        Writes the sequence values and the matrices (multiplied by the unit conversion factor) in values.
+        Like the engine, the susceptances B1 and B0 are not converted.
+        """
+        z, c = self.matrices()
+        for key, prop in [
+            ("r1", "r1"),
+            ("x1", "x1"),
+            ("r0", "r0"),
+            ("x0", "x0"),
+            ("c1", "C1"),
+            ("c0", "C0"),
+        ]:
+            if self.z is None:
+                values[prop] = _format(self.sequence[key] * factor)
+            else:
+                values[prop] = "----"
+        values["rmatrix"] = _format_matrix(z.real * factor)
+        values["xmatrix"] = _format_matrix(z.imag * factor)
+        values["cmatrix"] = _format_matrix(c * factor)
+        if "B1" in values:
+            # Susceptances in microsiemens
+            basefreq = (
+                values["basefreq"] if "basefreq" in values else values["baseFreq"]
+            )
+            omega = 2.0 * math.pi * float(basefreq) / 1000.0
+            for key, prop in [("c1", "B1"), ("c0", "B0")]:
+                if self.z is None:
+                    values[prop] = _format(self.sequence[key] * omega)
+                else:
+                    values[prop] = "----"
+
+
+class LineCode(Element):
+    """Linecode: impedances per unit length shared by lines."""
+
+    def __init__(self, script, class_name, name):
+        super().__init__(script, class_name, name)
+        self.impedance = Impedance()
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key == "nphases":
+            if not self.impedance.set_phases(int(_number(value))):
+                self.impedance = Impedance()
+                self.impedance.nphases = int(_number(value))
+            # The neutral is the last conductor by default
+            self.values["neutral"] = str(self.impedance.nphases)
+        elif key == "kron":
+            if _yes_no(value) == "Yes":
+                self.impedance.kron(int(_number(self.values["neutral"])))
+                if self.impedance.z is not None:
+                    self.values["neutral"] = "0"
+            return
+        elif key in self.impedance.sequence:
+            self.impedance.set_sequence(key, _number(value))
+        elif key in ("rmatrix", "xmatrix", "cmatrix"):
+            self.impedance.set_matrix(key, value)
+        super().set(prop, value)
+
+    def recalc(self):
+        self.values["nphases"] = str(self.impedance.nphases)
+        self.impedance.report(self.values)
+
+
+class Line(Element):
+    """
+    Line. The impedances are stored in the units of the linecode (or of the values given), and converted
+    to the units of the line when they are reported, like the engine.
+    """
+
+    def __init__(self, script, class_name, name):
+        super().__init__(script, class_name, name)
+        self.impedance = Impedance(line=True)
+        # Units of the impedances stored and conversion factor to the units of the line
+        self.impedance_units = "none"
+        self.factor = 1.0
+        # Impedances computed from a geometry, spacing or wires (not supported)
+        self.geometry = False
+
+    def _reset_units(self):
+        self.impedance_units = "none"
+        self.factor = 1.0
+        self.values["units"] = "none"
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key == "linecode":
+            linecode = self.script.get("linecode", value)
+            if linecode is None:
+                logger.warning(
+                    "Linecode {} of line {} not found".format(value, self.name)
+                )
+            else:
+                self.impedance = copy.deepcopy(linecode.impedance)
+                self.impedance.line = True
+                self.impedance_units = linecode.values["units"]
+                self.factor = 1.0
+                units = self.values["units"]
+                if units != "none" and self.impedance_units != "none":
+                    self.factor = (
+                        UNIT_LENGTHS[units] / UNIT_LENGTHS[self.impedance_units]
+                    )
+                self.values["normamps"] = linecode.values["normamps"]
+                self.values["emergamps"] = linecode.values["emergamps"]
+                self.geometry = False
+        elif key == "phases":
+            if not self.impedance.set_phases(int(_number(value))):
+                logger.warning(
+                    "Illegal change of the number of phases of line {}".format(
+                        self.name
+                    )
+                )
+                return
+        elif key in self.impedance.sequence:
+            self.impedance.set_sequence(key, _number(value))
+            self.values["linecode"] = ""
+            self.geometry = False
+            self._reset_units()
+            return
+        elif key in ("rmatrix", "xmatrix", "cmatrix"):
+            self.impedance.set_matrix(key, value)
+            self.values["linecode"] = ""
+            self.geometry = False
+            self._reset_units()
+            return
+        elif key == "units":
+            units = _units(value)
+            if self.impedance_units != "none" and units != "none":
+                self.factor = UNIT_LENGTHS[units] / UNIT_LENGTHS[self.impedance_units]
+            else:
+                self.impedance_units = units
+                self.factor = 1.0
+        elif key == "switch" and _yes_no(value) == "Yes":
+            self.impedance = Impedance(line=True)
+            self.impedance.nphases = int(self.values["phases"])
+            for k, v in [("r1", 1.0), ("x1", 1.0), ("r0", 1.0), ("x0", 1.0)]:
+                self.impedance.sequence[k] = v
+            self.impedance.sequence["c1"] = 1.1
+            self.impedance.sequence["c0"] = 1.0
+            self.values["length"] = "0.001"
+            self.geometry = False
+            self._reset_units()
+        elif key == "geometry":
+            geometry = self.script.get("linegeometry", value)
+            if geometry is not None:
+                self.impedance.z = None
+                # The line has one phase per conductor of the geometry, unless the neutrals are reduced
+                if geometry.values.get("reduce") == "Yes":
+                    self.impedance.nphases = int(geometry.values["nphases"])
+                else:
+                    self.impedance.nphases = int(geometry.values["nconds"])
+                self.values["normamps"] = geometry.values["normamps"]
+                self.values["emergamps"] = geometry.values["emergamps"]
+                self.values["Ratings"] = geometry.values["Ratings"]
+            self.geometry = True
+        elif key in ("spacing", "wires", "cncables", "tscables"):
+            self.geometry = True
+            if key != "spacing":
+                value = _format_list(w.lower() for w in _strings(value))
+                self.values[prop] = value
+                return
+        super().set(prop, value)
+
+    def like(self, other):
+        bus1, bus2 = self.values["bus1"], self.values["bus2"]
+        super().like(other)
+        self.values["bus1"], self.values["bus2"] = bus1, bus2
+        self.values["linecode"] = ""
+
+    def recalc(self):
+        self.values["phases"] = str(self.impedance.nphases)
+        self.impedance.report(self.values, self.factor)
+        if self.geometry:
+            for prop in ("r1", "x1", "r0", "x0", "C1", "C0", "B1", "B0"):
+                self.values[prop] = "----"
+            for prop in ("rmatrix", "xmatrix", "cmatrix"):
+                self.values[prop] = "----"
+
+    def terminals(self):
+        return [self.values["bus1"], self.values["bus2"]]
+
+
+class WireData(Element):
+    """Conductor data (also the base of the concentric neutral cables)."""
+
+    def set(self, prop, value):
+        key = prop.lower()
+        super().set(prop, value)
+        if key == "diam":
+            self.values["radius"] = _format(float(self.values["diam"]) / 2.0)
+        elif key == "radius":
+            self.values["diam"] = _format(float(self.values["radius"]) * 2.0)
+        elif key == "rdc":
+            if "Rac" not in self.specified:
+                self.values["Rac"] = _format(float(self.values["Rdc"]) * 1.02)
+        elif key == "rac":
+            if "Rdc" not in self.specified:
+                self.values["Rdc"] = _format(float(self.values["Rac"]) / 1.02)
+
+    def recalc(self):
+        if "GMRac" not in self.specified and float(self.values["radius"]) > 0:
+            self.values["GMRac"] = _format(0.7788 * float(self.values["radius"]))
+        if "emergamps" not in self.specified and float(self.values["normamps"]) > 0:
+            self.values["emergamps"] = _format(1.5 * float(self.values["normamps"]))
+        if "Capradius" not in self.specified:
+            self.values["Capradius"] = self.values["radius"]
+
+
+class LineGeometry(Element):
+    """Line geometry: positions and wires of the conductors (cond selects the conductor of the properties x, h, units, wire)."""
+
+    def __init__(self, script, class_name, name):
+        super().__init__(script, class_name, name)
+        self.x = []
+        self.h = []
+        self.units = []
+        self.wires = []
+        self.cond = 0
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key == "nconds":
+            n = int(_number(value))
+            for attribute, default in [
+                ("x", 0.0),
+                ("h", 0.0),
+                ("units", "ft"),
+                ("wires", ""),
+            ]:
+                values = getattr(self, attribute)
+                setattr(self, attribute, (values + [default] * n)[:n])
+            if "nphases" not in self.specified:
+                self.values["nphases"] = str(n)
+        elif key == "cond":
+            self.cond = int(_number(value)) - 1
+        elif key in ("x", "h"):
+            getattr(self, key)[self.cond] = _number(value)
+            return
+        elif key == "units":
+            # The units apply to the following conductors too
+            for i in range(self.cond, len(self.units)):
+                self.units[i] = _units(value)
+            return
+        elif key in ("wire", "cncable", "tscable"):
+            self.wires[self.cond] = value.lower()
+            if self.cond == 0:
+                wire = self.script.get("wiredata", value)
+                if key == "wire" and wire is not None:
+                    for amps in ("normamps", "emergamps"):
+                        self.values[amps] = _format(max(float(wire.values[amps]), 0))
+            for p in ("wire", "cncable", "tscable"):
+                self.values[p] = value.lower()
+            return
+        elif key in ("wires", "cncables", "tscables"):
+            for i, wire in enumerate(_strings(value)[: len(self.wires)]):
+                self.wires[i] = wire.lower()
+            return
+        super().set(prop, value)
+
+    def recalc(self):
+        self.values["nconds"] = str(len(self.x))
+        self.values["cond"] = str(self.cond + 1)
+        wires = _format_list(self.wires)
+        for prop in ("wires", "cncables", "tscables"):
+            self.values[prop] = wires
+        if len(self.x) > 0:
+            self.values["x"] = _format(self.x[self.cond])
+            self.values["h"] = _format(self.h[self.cond])
+            self.values["units"] = self.units[self.cond]
+
+
+class Transformer(Element):
+    """
+    Transformer (also the base of the XfmrCode class, without buses).
+    The winding properties (bus, conn, kV...) apply to the active winding selected by wdg,
+    the array properties (buses, conns, kVs...) to all the windings.
+    """
+
+    # Winding properties and the corresponding array properties
+    WINDING = {
+        "bus": "bus",
+        "conn": "conn",
+        "kv": "kV",
+        "kva": "kVA",
+        "tap": "tap",
+        "%r": "%R",
+        "rneut": "Rneut",
+        "xneut": "Xneut",
+    }
+    ARRAYS = {
+        "buses": "bus",
+        "conns": "conn",
+        "kvs": "kV",
+        "kvas": "kVA",
+        "taps": "tap",
+        "%rs": "%R",
+    }
+    # Short circuit reactances and their index in Xscarray
+    REACTANCES = {"xhl": 0, "x12": 0, "xht": 1, "x13": 1, "xlt": 2, "x23": 2}
+
+    def __init__(self, script, class_name, name):
+        super().__init__(script, class_name, name)
+        self.windings = [self._winding(i) for i in range(2)]
+        self.wdg = 0
+        self.xsc = [7.0]
+
+    def _winding(self, i):
+        """Default winding i."""
+        return {
+            "bus": "{}_{}".format(self.name, i + 1),
+            "conn": "wye",
+            "kV": 12.47,
+            "kVA": 1000.0,
+            "tap": 1.0,
+            "%R": 0.2,
+            "Rneut": -1.0,
+            "Xneut": 0.0,
+        }
+
+    def _set_winding(self, i, prop, value):
+        if prop == "bus":
+            self.windings[i][prop] = value.lower()
+        elif prop == "conn":
+            self.windings[i][prop] = _connection(value)
+        else:
+            self.windings[i][prop] = _number(value)
+
+    def _update_ratings(self):
+        """Default ratings of the transformer from the rating of the first winding."""
+        kva = self.windings[0]["kVA"]
+        if "normhkVA" not in self.specified:
+            self.values["normhkVA"] = _format(1.1 * kva)
+        if "emerghkVA" not in self.specified:
+            self.values["emerghkVA"] = _format(1.5 * kva)
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key == "windings":
+            n = int(_number(value))
+            self.windings = (
+                self.windings + [self._winding(i) for i in range(len(self.windings), n)]
+            )[:n]
+            size = n * (n - 1) // 2
+            self.xsc = (self.xsc + [30.0] * size)[:size]
+            self.wdg = min(self.wdg, n - 1)
+        elif key == "wdg":
+            wdg = int(_number(value)) - 1
+            if 0 <= wdg < len(self.windings):
+                self.wdg = wdg
+        elif key in self.WINDING:
+            self._set_winding(self.wdg, self.WINDING[key], value)
+            if key == "kva":
+                kva = self.windings[self.wdg]["kVA"]
+                if self.wdg == 0:
+                    for winding in self.windings[1:]:
+                        winding["kVA"] = kva
+                    self._update_ratings()
+                elif len(self.windings) == 2:
+                    self.windings[0]["kVA"] = kva
+            return
+        elif key in self.ARRAYS:
+            for i, v in enumerate(_strings(value)[: len(self.windings)]):
+                self._set_winding(i, self.ARRAYS[key], v)
+                self.wdg = i
+            if key == "kvas":
+                self._update_ratings()
+            return
+        elif key in self.REACTANCES:
+            index = self.REACTANCES[key]
+            if index < len(self.xsc):
+                self.xsc[index] = _number(value)
+            # XHL and X12, XHT and X13, XLT and X23 are the same properties
+            for alias, i in self.REACTANCES.items():
+                if i == index:
+                    self.values[self.property_name(alias)] = _format(_number(value))
+            return
+        elif key == "xscarray":
+            for i, v in enumerate(_numbers(value)[: len(self.xsc)]):
+                self.xsc[i] = v
+            return
+        elif key == "%loadloss":
+            for winding in self.windings[:2]:
+                winding["%R"] = _number(value) / 2.0
+            return
+        elif key == "xfmrcode":
+            code = self.script.get("xfmrcode", value)
+            if code is None:
+                logger.warning(
+                    "XfmrCode {} of transformer {} not found".format(value, self.name)
+                )
+            else:
+                self._copy(code, keep=("bus", "sub"))
+        super().set(prop, value)
+
+    def _copy(self, other, keep):
+        """Copies the data of another transformer or XfmrCode, except the properties in keep."""
+        lookup = dict((p.lower(), p) for p in self.names)
+        for prop, value in other.values.items():
+            if prop.lower() in lookup and prop.lower() not in keep + ("like",):
+                self.values[lookup[prop.lower()]] = value
+        buses = [w["bus"] for w in self.windings]
+        self.windings = copy.deepcopy(other.windings)
+        for i, winding in enumerate(self.windings):
+            winding["bus"] = (
+                buses[i] if i < len(buses) else "{}_{}".format(self.name, i + 1)
+            )
+        self.xsc = list(other.xsc)
+        self.wdg = other.wdg
+        for prop in ("normhkVA", "emerghkVA"):
+            if prop in other.specified:
+                self.specified.add(prop)
+
+    def like(self, other):
+        self._copy(other, keep=("bus", "buses", "sub"))
+
+    def recalc(self):
+        self.values["windings"] = str(len(self.windings))
+        self.values["wdg"] = str(self.wdg + 1)
+        winding = self.windings[self.wdg]
+        for prop in self.WINDING.values():
+            if prop in self.values:
+                self.values[prop] = (
+                    winding[prop] if prop in ("bus", "conn") else _format(winding[prop])
+                )
+        for key, prop in self.ARRAYS.items():
+            name = self.property_name(key)
+            if name is not None and name.lower() == key:
+                # The engine reports the resistances with 7 significant digits
+                digits = 7 if prop == "%R" else 15
+                self.values[name] = _format_list(
+                    w[prop] if prop in ("bus", "conn") else _format(w[prop], digits)
+                    for w in self.windings
+                )
+        self.values["Xscarray"] = _format_array(self.xsc, 6)
+        if "normamps" in self.values:
+            phases = int(self.values["phases"])
+            kv = winding = self.windings[0]["kV"]
+            if phases > 1:
+                kv /= SQRT3
+            for prop, rating in [("normamps", "normhkVA"), ("emergamps", "emerghkVA")]:
+                self.values[prop] = _format(float(self.values[rating]) / (kv * phases))
+        if len(self.windings) > 1:
+            self.values["%loadloss"] = _format(
+                self.windings[0]["%R"] + self.windings[1]["%R"]
+            )
+
+    def terminals(self):
+        return [w["bus"] for w in self.windings]
+
+
+class XfmrCode(Transformer):
+    """Transformer code: the data of a transformer, without buses."""
+
+    def terminals(self):
+        return []
+
+
+class RegControl(Element):
+    """Regulator control."""
+
+    def set(self, prop, value):
+        if prop.lower() == "ptphase":
+            # The engine only reports the values max and min
+            value = value.lower() if value.lower() in ("max", "min") else ""
+            self.values[prop] = value
+            return
+        super().set(prop, value)
+        # The tap winding and the remote PT ratio follow the winding and the PT ratio unless they are given
+        key = prop.lower()
+        if key == "winding" and "tapwinding" not in self.specified:
+            self.values["tapwinding"] = self.values[prop]
+        elif key == "ptratio" and "RemotePTRatio" not in self.specified:
+            self.values["RemotePTRatio"] = self.values[prop]
+
+
+class Load(Element):
+    """
+    Load. The powers are specified by kW and pf, kW and kvar, kVA and pf, or xfkVA (allocation)
+    like the engine: the last of these properties defines the specification.
+    """
+
+    def __init__(self, script, class_name, name):
+        super().__init__(script, class_name, name)
+        self.specification = "kw_pf"
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key == "kw":
+            self.specification = "kw_pf"
+        elif key == "kvar":
+            self.specification = "kw_kvar"
+        elif key == "kva":
+            self.specification = "kva_pf"
+        elif key == "xfkva":
+            self.specification = "xfkva"
+        elif key == "pf" and self.specification == "kw_kvar":
+            # The power factor is computed from kW and kvar
+            return
+        elif key == "zipv":
+            self.values[prop] = _format_array(_numbers(value))
+            return
+        elif key == "status":
+            self.values[prop] = _enum(value, ["Variable", "Fixed", "Exempt"])
+            return
+        super().set(prop, value)
+
+    def recalc(self):
+        pf = float(self.values["pf"])
+        if self.specification == "kw_kvar":
+            kw = float(self.values["kW"])
+            kvar = float(self.values["kvar"])
+            kva = math.hypot(kw, kvar)
+            if kva > 0:
+                pf = kw / kva
+                if kw * kvar < 0:
+                    pf = -pf
+            self.values["pf"] = _format(pf)
+            self.values["kVA"] = _format(kva)
+            return
+        if self.specification == "kva_pf":
+            kw = float(self.values["kVA"]) * abs(pf)
+        elif self.specification == "xfkva":
+            kw = (
+                float(self.values["xfkVA"])
+                * float(self.values["allocationfactor"])
+                * abs(pf)
+            )
+        else:
+            kw = float(self.values["kW"])
+        kvar = kw * math.sqrt(1.0 / pf ** 2 - 1.0) if pf != 0 else 0.0
+        if pf < 0:
+            kvar = -kvar
+        self.values["kW"] = _format(kw)
+        self.values["kvar"] = _format(kvar)
+        if self.specification == "kw_pf":
+            self.values["kVA"] = _format(kw / abs(pf))
+
+    def terminals(self):
+        return [self.values["bus1"]]
+
+
+class Capacitor(Element):
+    """Capacitor bank. The array properties have one value per step."""
+
+    STEPS = {"kvar": 1200.0, "r": 0.0, "xl": 0.0, "harm": 0.0, "states": 1.0}
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key in self.STEPS:
+            steps = int(self.values["Numsteps"])
+            values = _numbers(value)[:steps]
+            self.values[prop] = _format_array(
+                values + [self.STEPS[key]] * (steps - len(values))
+            )
+            return
+        super().set(prop, value)
+        if key == "bus1" and "bus2" not in self.specified:
+            self.values["bus2"] = _bus_base(self.values["bus1"]) + ".0" * int(
+                self.values["phases"]
+            )
+        elif key == "numsteps":
+            for p in self.names:
+                if p.lower() in self.STEPS:
+                    values = _numbers(self.values[p][1:-1])
+                    self.set(p, " ".join(_format(v) for v in values))
+
+    def recalc(self):
+        """Computes the capacitances and the ampacities from the kvar of the steps."""
+        kvar = _numbers(self.values["kvar"][1:-1])
+        phases = int(self.values["phases"])
+        # Voltage of each phase: line to line for delta or single phase capacitors
+        kv = float(self.values["kv"])
+        if phases > 1 and self.values["conn"] == "wye":
+            kv /= SQRT3
+        if kv <= 0:
+            return
+        if "cuf" not in self.specified:
+            omega = 2.0 * math.pi * float(self.values["basefreq"])
+            self.values["cuf"] = _format_array(
+                [q / phases * 1000.0 / (omega * kv ** 2) for q in kvar], 6
+            )
+        # The ampacities are 135% and 180% of the rated current
+        current = sum(kvar) / phases / kv
+        for prop, factor in [("normamps", 1.35), ("emergamps", 1.8)]:
+            if prop not in self.specified:
+                self.values[prop] = _format(factor * current)
+
+    def terminals(self):
+        return [self.values["bus1"], self.values["bus2"]]
+
+
+class Reactor(Element):
+    """Reactor: shunt reactor, or series reactor if bus2 is another bus."""
+
+    def set(self, prop, value):
+        super().set(prop, value)
+        if prop.lower() == "bus1" and "bus2" not in self.specified:
+            self.values["bus2"] = _bus_base(self.values["bus1"]) + ".0" * int(
+                self.values["phases"]
+            )
+
+    def terminals(self):
+        return [self.values["bus1"], self.values["bus2"]]
+
+
+class Control(Element):
+    """Control or protection element (CapControl, Fuse, Recloser...) monitoring another element."""
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key in ("element", "monitoredobj", "switchedobj"):
+            self.values[prop] = _reference(value)
+            if key == "monitoredobj" and "SwitchedObj" not in self.specified:
+                self.values["SwitchedObj"] = self.values[prop]
+            return
+        if key == "type":
+            self.values[prop] = _enum(
+                value, ["Current", "Voltage", "kvar", "PF", "Time", "Follow"]
+            )
+            return
+        if key in ("ptphase", "ctphase"):
+            # The engine only reports the values max, min and avg
+            value = value.lower()
+            self.values[prop] = value if value in ("max", "min", "avg") else ""
+            return
+        super().set(prop, value)
+
+
+class Storage(Element):
+    """
+    Storage. The stored energy is given by %stored, and the power by the state and the
+    percentages of the rated power (%Discharge, %Charge, %IdlingkW) like the engine.
+    """
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key == "state":
+            self.values[prop] = _enum(value, ["Idling", "Charging", "Discharging"])
+            return
+        if key == "kw":
+            kw = _number(value)
+            kw_rated = float(self.values["kWrated"])
+            if kw > 0:
+                self.values["%Discharge"] = _format(kw / kw_rated * 100.0)
+            elif kw < 0:
+                self.values["%Charge"] = _format(-kw / kw_rated * 100.0)
+            return
+        super().set(prop, value)
+        if key == "kwhstored":
+            self.values["%stored"] = _format(
+                float(self.values["kWhstored"]) / float(self.values["kWhrated"]) * 100.0
+            )
+        elif key == "kwrated" and "kVA" not in self.specified:
+            self.values["kVA"] = self.values["kWrated"]
+
+    def recalc(self):
+        kw_rated = float(self.values["kWrated"])
+        stored = float(self.values["%stored"])
+        self.values["kWhstored"] = _format(
+            stored * float(self.values["kWhrated"]) / 100.0
+        )
+        state = self.values["State"]
+        if state == "Charging" and stored >= 100.0:
+            state = "Idling"
+        elif state == "Discharging" and stored <= float(self.values["%reserve"]):
+            state = "Idling"
+        self.values["State"] = state
+        if state == "Discharging":
+            kw = float(self.values["%Discharge"]) * kw_rated / 100.0
+        elif state == "Charging":
+            kw = -float(self.values["%Charge"]) * kw_rated / 100.0
+        else:
+            kw = -float(self.values["%IdlingkW"]) * kw_rated / 100.0
+        self.values["kW"] = _format(kw)
+
+    def terminals(self):
+        return [self.values["bus1"]]
+
+
+class Generator(Element):
+    """Generator. kvar is computed from kW and pf, or pf from kW and kvar (the last one specified)."""
+
+    def __init__(self, script, class_name, name):
+        super().__init__(script, class_name, name)
+        self.kvar_specified = False
+
+    def set(self, prop, value):
+        key = prop.lower()
+        if key == "kvar":
+            self.kvar_specified = True
+        elif key == "pf":
+            self.kvar_specified = False
+        super().set(prop, value)
+        if key == "mva":
+            self.values["kVA"] = _format(float(self.values["MVA"]) * 1000.0)
+            self.specified.add("kVA")
+
+    def recalc(self):
+        kw = float(self.values["kW"])
+        if self.kvar_specified:
+            kvar = float(self.values["kvar"])
+            kva = math.hypot(kw, kvar)
+            pf = kw / kva if kva > 0 else 1.0
+            if kw * kvar < 0:
+                pf = -pf
+            self.values["pf"] = _format(pf)
+        else:
+            pf = float(self.values["pf"])
+            kvar = kw * math.sqrt(1.0 / pf ** 2 - 1.0) if pf != 0 else 0.0
+            self.values["kvar"] = _format(-kvar if pf < 0 else kvar)
+        if "kVA" not in self.specified:
+            self.values["kVA"] = _format(1.2 * kw)
+        self.values["MVA"] = _format(float(self.values["kVA"]) / 1000.0)
+
+    def terminals(self):
+        return [self.values["bus1"]]
+
+
+# Classes of the elements with derived properties
+ELEMENTS = {
+    "vsource": Vsource,
+    "line": Line,
+    "linecode": LineCode,
+    "linegeometry": LineGeometry,
+    "wiredata": WireData,
+    "cndata": WireData,
+    "transformer": Transformer,
+    "xfmrcode": XfmrCode,
+    "regcontrol": RegControl,
+    "load": Load,
+    "capacitor": Capacitor,
+    "capcontrol": Control,
+    "reactor": Reactor,
+    "fuse": Control,
+    "recloser": Control,
+    "storage": Storage,
+    "generator": Generator,
+}
+
+
+class DSSScript(object):
+    """
+    Circuit defined by OpenDSS scripts, read without the OpenDSS engine.
+
+    **Usage:**
+
+        >>> script = DSSScript()
+        >>> script.redirect("./master.dss")
+        >>> lines = script.class_to_dict("Line")
+        >>> lines["Line.l1"]["bus1"]
+        'b1.1.2.3'
+        >>> script.kv_bases()["b1"]
+        7.199557856794634
+
+    class_to_dict returns the same dictionaries as reading the classes from the engine
+    (See ditto.readers.opendss.read._dss_class_to_dict).
+    """
+
+    def __init__(self):
+        """Class CONSTRUCTOR."""
+        self.directory = os.getcwd()
+        self.clear()
+
+    def clear(self):
+        """Removes all the elements (Clear command)."""
+        # Elements by class, in definition order
+        self.elements = {}
+        # Elements connected to buses, in definition order
+        self.circuit_elements = []
+        self.active = None
+        self.voltage_bases = list(DEFAULT_VOLTAGE_BASES)
+        self.options = {}
+        self.coordinates = {}
+        self.solved = False
+        self.voltage_bases_computed = False
+
+    def get(self, class_name, name):
+        """Returns an element (None if it does not exist)."""
+        return self.elements.get(class_name.lower(), {}).get(name.lower())
+
+    def redirect(self, path, restore_directory=True):
+        """
+        Runs the commands of a file, line by line. The relative paths of the file are relative to its directory.
+        The current directory is restored at the end, unless restore_directory is False (Compile command).
+        """
+        path = os.path.join(self.directory, path)
+        previous = self.directory
+        self.directory = os.path.dirname(os.path.abspath(path))
+        try:
+            with open(path, "r") as f:
+                block_comment = False
+                for line in f:
+                    stripped = line.strip()
+                    if block_comment:
+                        if "*/" in stripped:
+                            block_comment = False
+                        continue
+                    if stripped.startswith("/*"):
+                        block_comment = "*/" not in stripped
+                        continue
+                    self.command(stripped)
+        except IOError:
+            logger.error("Unable to redirect to file {}".format(path))
+        finally:
+            if restore_directory:
+                self.directory = previous
+
+    def command(self, line):
+        """Runs an OpenDSS command."""
+        parameters = split_parameters(_strip_comment(line))
+        if len(parameters) == 0:
+            return
+        key, verb = parameters[0]
+        if key is not None:
+            # Class.name.property=value or property=value (active element)
+            if "." in key:
+                element_name, prop = key.rsplit(".", 1)
+                element = self._element(element_name)
+                parameters = [(prop, verb)] + parameters[1:]
+            else:
+                element = self.active
+            if element is not None:
+                element.edit(parameters)
+                self.active = element
+            return
+
+        verb = verb.lower()
+        command = None
+        for c in COMMANDS:
+            if c == verb or (c.startswith(verb) and verb != ""):
+                command = c
+                break
+        arguments = parameters[1:]
+        if command in ("new", "edit") and len(arguments) > 0:
+            _, element_name = arguments[0]
+            if command == "new":
+                self._new(element_name, arguments[1:])
+            else:
+                element = self._element(element_name)
+                if element is not None:
+                    element.edit(arguments[1:])
+                    self.active = element
+        elif command in ("more", "~"):
+            if self.active is not None:
+                self.active.edit(arguments)
+        elif command in ("redirect", "compile") and len(arguments) > 0:
+            self.redirect(arguments[0][1], restore_directory=command == "redirect")
+        elif command in ("clear", "clearall"):
+            self.clear()
+        elif command == "set":
+            for key, value in arguments:
+                if key is None:
+                    continue
+                if key.lower().startswith("voltageb"):
+                    self.voltage_bases = _numbers(value)
+                else:
+                    self.options[key.lower()] = value
+        elif command == "calcvoltagebases":
+            self.voltage_bases_computed = True
+        elif command == "solve":
+            self.solved = True
+        elif command in ("buscoords", "latlongcoords") and len(arguments) > 0:
+            self._read_coordinates(arguments[0][1])
+        elif command in ("enable", "disable") and len(arguments) > 0:
+            element = self._element(arguments[0][1])
+            if element is not None:
+                element.values["enabled"] = "Yes" if command == "enable" else "No"
+        elif command == "batchedit" and len(arguments) > 0:
+            class_name, pattern = arguments[0][1].split(".", 1)
+            regex = re.compile(pattern, re.IGNORECASE)
+            for name, element in self.elements.get(class_name.lower(), {}).items():
+                if regex.search(name):
+                    element.edit(arguments[1:])
+        else:
+            logger.debug("Command ignored: {}".format(line))
+
+    def _element(self, element_name):
+        """Returns the element Class.name, logging an error if it does not exist."""
+        if "." not in element_name:
+            logger.error("Invalid element name {}".format(element_name))
+            return None
+        class_name, name = element_name.split(".", 1)
+        element = self.get(class_name, name)
+        if element is None:
+            logger.error("Element {} not found".format(element_name))
+        return element
+
+    def _new(self, element_name, parameters):
+        """Defines a new element (New Class.name ...)."""
+        if "." not in element_name:
+            logger.error("Invalid element name {}".format(element_name))
+            return
+        class_name, name = element_name.split(".", 1)
+        class_name = class_name.lower()
+        name = name.lower()
+        if class_name == "circuit":
+            # The circuit is defined by its source
+            self.clear()
+            class_name = "vsource"
+            name = "source"
+        elements = self.elements.setdefault(class_name, {})
+        if name in elements:
+            logger.warning(
+                "Duplicate new element definition: {}. Element being redefined.".format(
+                    element_name
+                )
+            )
+            element = elements[name]
+        else:
+            element = ELEMENTS.get(class_name, Element)(self, class_name, name)
+            element.recalc()
+            elements[name] = element
+            if class_name in CIRCUIT_CLASSES:
+                self.circuit_elements.append(element)
+        element.edit(parameters)
+        self.active = element
+
+    def _read_coordinates(self, path):
+        """Reads the coordinates of the buses (name, x, y on each line)."""
+        path = os.path.join(self.directory, path)
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    values = [v for _, v in split_parameters(_strip_comment(line))]
+                    if len(values) >= 3:
+                        try:
+                            self.coordinates[values[0].lower()] = (
+                                float(values[1]),
+                                float(values[2]),
+                            )
+                        except ValueError:
+                            pass
+        except IOError:
+            logger.error("Unable to read bus coordinates file {}".format(path))
+
+    def class_to_dict(self, class_name, properties=None):
+        """
+        Returns the elements of a class as a dictionary mapping '<class_name>.<element name>'
+        to the dictionary of the properties of the element, like _dss_class_to_dict in the OpenDSS reader.
+
+        :param class_name: Name of the OpenDSS class (ex: Line, linecode...)
+        :type class_name: str
+        :param properties: If given, only these properties are read (names are case insensitive)
+        :type properties: List(str)
+        :returns: The properties of the elements of the class
+        :rtype: dict
+        """
+        key = class_name.lower()
+        if key not in PROPERTIES:
+            raise NotImplementedError(
+                "OpenDSS class {} is not supported.".format(class_name)
+            )
+        names = [p for p, _ in PROPERTIES[key]]
+        if properties is not None:
+            wanted = set(p.lower() for p in properties)
+            names = [p for p in names if p.lower() in wanted]
+        conductors = key == "linegeometry" and (
+            properties is None or wanted & set(["x", "h", "units"])
+        )
+        data = {}
+        for name, element in self.elements.get(key, {}).items():
+            values = element.report()
+            data["{}.{}".format(class_name, name)] = values = dict(
+                (p, parse_value(values[p])) for p in names
+            )
+            if conductors:
+                values["x"] = list(element.x)
+                values["h"] = list(element.h)
+                values["units"] = list(element.units)
+        return data
+
+    def _connections(self, element):
+        """Returns the bus names and the nodes of the conductors of the terminals of an element."""
+        phases = int(float(element.values.get("phases", "3") or 3))
+        connections = []
+        for bus in element.terminals():
+            defaults = list(range(1, phases + 1))
+            if element.class_name == "transformer":
+                defaults.append(0)
+            connections.append((_bus_base(bus), _bus_nodes(bus, defaults)))
+        return connections
+
+    def bus_names(self):
+        """
+        Returns the names of the buses of the enabled elements, in definition order.
+        Like the engine, the list of buses is only established by Solve or Calcvoltagebases.
+        """
+        if not self.solved and not self.voltage_bases_computed:
+            return []
+        names = []
+        for element in self.circuit_elements:
+            if not element.enabled():
+                continue
+            for bus, _ in self._connections(element):
+                if bus != "" and bus not in names:
+                    names.append(bus)
+        return names
+
+    def kv_bases(self):
+        """
+        Returns the voltage base (kV, line to neutral) of each bus, like the engine after Calcvoltagebases
+        (0 if the voltage bases were not computed).
+
+        The voltages are propagated from the sources through the lines and the transformers (winding ratios),
+        and the voltage base closest to the line to line voltage of the first node of each bus is chosen.
+        """
+        names = self.bus_names()
+        if not self.voltage_bases_computed:
+            return dict((bus, 0.0) for bus in names)
+        voltages = self._propagate_voltages()
+        first_nodes = {}
+        for element in self.circuit_elements:
+            if element.enabled():
+                for bus, nodes in self._connections(element):
+                    for node in nodes:
+                        if node != 0 and bus not in first_nodes:
+                            first_nodes[bus] = node
+        kv_bases = {}
+        for bus in names:
+            kv = abs(voltages.get(bus, {}).get(first_nodes.get(bus), 0.0)) * SQRT3
+            best = None
+            for base in self.voltage_bases:
+                if base > 0 and (
+                    best is None or abs(1.0 - kv / base) < abs(1.0 - kv / best)
+                ):
+                    best = base
+            kv_bases[bus] = best / SQRT3 if best is not None else 0.0
+        return kv_bases
+
+    def _propagate_voltages(self):
+        """Returns the voltages (kV, complex) of the nodes of the buses: bus -> {node: voltage}."""
+        voltages = {}
+        connected = {}
+        queue = deque()
+        for element in self.circuit_elements:
+            if not element.enabled():
+                continue
+            connections = self._connections(element)
+            if element.class_name == "vsource":
+                bus, nodes = connections[0]
+                phases = len(nodes)
+                kv = float(element.values["basekv"]) * float(element.values["pu"])
+                if phases > 1:
+                    kv /= SQRT3
+                angle = float(element.values["angle"])
+                for k, node in enumerate(nodes):
+                    if node != 0:
+                        voltages.setdefault(bus, {})[node] = cmath.rect(
+                            kv, math.radians(angle - k * 360.0 / phases)
+                        )
+                queue.append(bus)
+            elif element.class_name in ("line", "reactor", "transformer"):
+                if element.class_name == "reactor" and (
+                    connections[0][0] == connections[1][0]
+                ):
+                    continue
+                for bus, _ in connections:
+                    connected.setdefault(bus, []).append((element, connections))
+
+        while queue:
+            bus = queue.popleft()
+            for element, connections in connected.get(bus, []):
+                if element.class_name == "transformer":
+                    changed = self._propagate_transformer(
+                        element, connections, voltages
+                    )
+                else:
+                    changed = self._propagate_line(connections, voltages)
+                queue.extend(changed)
+        return voltages
+
+    @staticmethod
+    def _propagate_line(connections, voltages):
+        """Copies the voltages of the nodes of a line (or series reactor) between its terminals."""
+        changed = []
+        (bus1, nodes1), (bus2, nodes2) = connections
+        v1 = voltages.setdefault(bus1, {})
+        v2 = voltages.setdefault(bus2, {})
+        for n1, n2 in zip(nodes1, nodes2):
+            for (va, na), (vb, nb), bus in [
+                ((v1, n1), (v2, n2), bus2),
+                ((v2, n2), (v1, n1), bus1),
+            ]:
+                if na in va and nb != 0 and nb not in vb:
+                    vb[nb] = va[na]
+                    if bus not in changed:
+                        changed.append(bus)
+        return changed
+
+    @staticmethod
+    def _propagate_transformer(element, connections, voltages):
+        """Computes the voltages of the windings of a transformer from a winding with known voltages."""
+        phases = int(element.values["phases"])
+        windings = []
+        for winding, (bus, nodes) in zip(element.windings, connections):
+            if winding["conn"] == "wye":
+                pairs = [(nodes[k], nodes[phases]) for k in range(phases)]
+            elif phases == 1:
+                pairs = [(nodes[0], nodes[1])]
+            elif phases == 2:
+                # Like the engine, the first winding of a two phase delta is connected to the third conductor
+                pairs = [(nodes[0], nodes[2]), (nodes[1], nodes[0])]
+            else:
+                pairs = [(nodes[k], nodes[(k + 1) % phases]) for k in range(phases)]
+            rating = winding["kV"] * winding["tap"]
+            if phases > 1 and winding["conn"] == "wye":
+                rating /= SQRT3
+            windings.append((bus, winding["conn"], pairs, rating))
+
+        def voltage(bus, node):
+            if node == 0:
+                return 0.0
+            return voltages.get(bus, {}).get(node)
+
+        phase_voltages = None
+        for bus, conn, pairs, rating in windings:
+            values = []
+            for a, b in pairs:
+                va = voltage(bus, a)
+                vb = voltage(bus, b)
+                if vb is None and conn == "wye":
+                    vb = 0.0
+                if va is None or vb is None:
+                    break
+                values.append((va - vb) / rating)
+            else:
+                phase_voltages = values
+                break
+        if phase_voltages is None:
+            return []
+
+        changed = []
+        for bus, conn, pairs, rating in windings:
+            known = voltages.setdefault(bus, {})
+            before = len(known)
+            targets = [v * rating for v in phase_voltages]
+            if conn == "wye":
+                for (a, b), v in zip(pairs, targets):
+                    vb = voltage(bus, b) or 0.0
+                    if a != 0 and a not in known:
+                        known[a] = vb + v
+            elif all(voltage(bus, n) is None for pair in pairs for n in pair):
+                # Floating delta winding: voltages balanced around the ground
+                if len(pairs) == 1:
+                    (a, b), v = pairs[0], targets[0]
+                    known[a] = v / 2.0
+                    if b != 0:
+                        known[b] = -v / 2.0
+                else:
+                    for k, (a, _) in enumerate(pairs):
+                        known[a] = (targets[k] - targets[k - 1]) / 3.0
+            else:
+                for _ in range(len(pairs)):
+                    for (a, b), v in zip(pairs, targets):
+                        va, vb = voltage(bus, a), voltage(bus, b)
+                        if va is not None and vb is None and b != 0:
+                            known[b] = va - v
+                        elif vb is not None and va is None and a != 0:
+                            known[a] = vb + v
+            if len(known) > before:
+                changed.append(bus)
+        return changed
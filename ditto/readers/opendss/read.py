@@ -21,6 +21,7 @@ import opendssdirect as dss
 
 # Ditto imports
 from ditto.readers.abstract_reader import AbstractReader
+from ditto.readers.opendss.dss_script import DSSScript, parse_value
 from ditto.store import Store
 from ditto.models.node import Node
 from ditto.models.line import Line
@@ -46,6 +47,9 @@ from ditto.models.base import Unicode
 
 logger = logging.getLogger(__name__)
 
+# Properties of the linecodes used by parse_lines
+LINECODE_PROPERTIES = ["units", "faultrate", "rmatrix", "xmatrix", "cmatrix"]
+
 
 def timeit(method):
     def timed(*args, **kw):
@@ -65,6 +69,8 @@ class Reader(AbstractReader):
 
     :param log_file: Name/path of the log file. Optional. Default='./OpenDSS_reader.log'
     :type log_file: str
+    :param mode: 'opendssdirect' to run the DSS files with the OpenDSS engine, or 'native' to read them with the native parser of ditto.readers.opendss.dss_script. Optional. Default='opendssdirect'
+    :type mode: str
 
     **Constructor:**
 
@@ -74,6 +80,11 @@ class Reader(AbstractReader):
 
     The reader uses OpenDSSDirect heavily. <https://github.com/NREL/OpenDSSDirect.py>
     For more information on this package contact Dheepak Krishnamurthy.
+
+    .. note:: The native mode does not need the OpenDSS engine to compile the circuit, but it does not run the power flows:
+        the tap positions of the regulators are the ones of the DSS files (the controls are not applied by Solve),
+        the voltage bases of the buses are estimated from the transformer ratios, and the impedances of the lines
+        defined from geometries, spacings or wires are not computed.
     """
 
     register_names = ["dss", "opendss", "OpenDSS", "DSS"]
@@ -118,6 +129,15 @@ class Reader(AbstractReader):
         # self.DSS_file_names={'Nodes': 'buscoords.dss',
         #                     'master': 'master.dss'}
 
+        self.mode = kwargs.get("mode", "opendssdirect")
+        if self.mode not in ["opendssdirect", "native"]:
+            raise ValueError("Unknown OpenDSS reader mode {}".format(self.mode))
+        # Native parser of the DSS files (native mode)
+        self.dss_script = None
+        # Elements of the OpenDSS classes and their indexes, read once per parse (See _class_snapshot)
+        self._snapshots = {}
+        self._indexes = {}
+
         self.is_opendssdirect_built = False
         self.all_object_names = []
         logger.info("OpenDSS--->DiTTo reader instanciated")
@@ -152,6 +172,45 @@ class Reader(AbstractReader):
         except:
             logger.error("Unable to execute the following command: \n" + string)
 
+    def _class_to_dict(self, class_name, properties=None):
+        """
+        Returns the elements of an OpenDSS class as a dictionary mapping '<class_name>.<element name>'
+        to the dictionary of their properties, read from the engine or from the native parser depending on the mode.
+        See _dss_class_to_dict.
+        """
+        if self.mode == "native":
+            return self.dss_script.class_to_dict(class_name, properties)
+        return _dss_class_to_dict(class_name, properties)
+
+    def _class_snapshot(self, class_name, properties=None):
+        """
+        Returns the elements of an OpenDSS class like _class_to_dict, but reads them only once per parse.
+        The snapshot is shared by all the parsers and must not be modified.
+        """
+        key = (class_name, None if properties is None else tuple(properties))
+        if key not in self._snapshots:
+            self._snapshots[key] = self._class_to_dict(class_name, properties)
+        return self._snapshots[key]
+
+    def _class_index(self, class_name, property_name=None, properties=None):
+        """
+        Returns the names of the elements of an OpenDSS class (keys of _class_snapshot) indexed by the lower case
+        value of one of their properties (ex: the RegControls by transformer), or by their lower case element name
+        if property_name is None. Each value maps to the list of the matching elements, in the order of the class.
+        """
+        key = (class_name, property_name, None if properties is None else tuple(properties))
+        if key not in self._indexes:
+            index = {}
+            for name, data in self._class_snapshot(class_name, properties).items():
+                if property_name is None:
+                    value = name.split(".", 1)[1]
+                else:
+                    value = data.get(property_name)
+                if isinstance(value, string_types):
+                    index.setdefault(value.lower(), []).append(name)
+            self._indexes[key] = index
+        return self._indexes[key]
+
     def phase_mapping(self, dss_phase):
         """Map the phases of OpenDSS (1, 2, or 3) into DiTTo phases ('A', 'B', or 'C').
 
@@ -198,6 +257,16 @@ class Reader(AbstractReader):
         """
         logger.info("Reading DSS file {name}...".format(name=master_dss_file))
 
+        self._snapshots = {}
+        self._indexes = {}
+
+        if self.mode == "native":
+            self.dss_script = DSSScript()
+            self.dss_script.redirect(master_dss_file)
+            self.is_opendssdirect_built = True
+            logger.info("DSS files read with the native parser")
+            return 1
+
         try:
             self.function("redirect {master_file}".format(master_file=master_dss_file))
         except:
@@ -227,6 +296,8 @@ class Reader(AbstractReader):
         """
         start = time.time()
         self.source_name = "Sourcebus"
+        self._snapshots = {}
+        self._indexes = {}
         # In order to parse, we need that opendssdirect was previously run
         if not self.is_opendssdirect_built:
             self.build_opendssdirect(self.DSS_file_names["master"])
@@ -262,14 +333,22 @@ class Reader(AbstractReader):
         .. warning: This has to be called last in parse.
         """
         model.set_names()
-        AllBusNames = dss.Circuit.AllBusNames()
+        if self.mode == "native":
+            kv_bases = self.dss_script.kv_bases()
+            AllBusNames = self.dss_script.bus_names()
+        else:
+            AllBusNames = dss.Circuit.AllBusNames()
         for bus_name in AllBusNames:
-            # Set the active bus
-            dss.Circuit.SetActiveBus(bus_name)
+            if self.mode == "native":
+                kv_base = kv_bases[bus_name]
+            else:
+                # Set the active bus
+                dss.Circuit.SetActiveBus(bus_name)
+                kv_base = dss.Bus.kVBase()
             # Set the nominal voltage of the corresponding node in the DiTTo Model
             try:
                 model[bus_name.lower()].nominal_voltage = (
-                    dss.Bus.kVBase() * math.sqrt(3) * 10 ** 3
+                    kv_base * math.sqrt(3) * 10 ** 3
                 )  # DiTTo in volts
             except:
                 print("Could not set nominal voltage for bus {b}".format(b=bus_name))
@@ -342,7 +421,7 @@ class Reader(AbstractReader):
         :returns: 1 for success, -1 for failure
         :rtype: int
         """
-        sources = _dss_class_to_dict("Vsource")
+        sources = self._class_to_dict("Vsource")
 
         for source_name, source_data in sources.items():
 
@@ -581,7 +660,7 @@ class Reader(AbstractReader):
                     buses[name]["positions"] = [X, Y]
 
         # Extract the line data
-        lines = _dss_class_to_dict("line")
+        lines = self._class_to_dict("line", ["bus1", "bus2", "phases"])
 
         # Loop over the lines to get the phases
         for name, data in lines.items():
@@ -659,7 +738,7 @@ class Reader(AbstractReader):
                 buses[b2_name]["phases"] = np.unique(buses[b2_name]["phases"]).tolist()
 
         # Extract the transformer data
-        transformers = _dss_class_to_dict("transformer")
+        transformers = self._class_to_dict("transformer", ["buses", "phases"])
         # Loop over the transformers to get the phases
         for name, data in transformers.items():
 
@@ -696,7 +775,7 @@ class Reader(AbstractReader):
                     ).tolist()
 
         # Extract the load data
-        loads = _dss_class_to_dict("load")
+        loads = self._class_to_dict("load", ["bus1", "phases"])
         # Loop over the loads to get the phases
         for name, data in loads.items():
             # Parse bus1 data
@@ -775,19 +854,19 @@ class Reader(AbstractReader):
         # Here, we get all the line names which have a fuse
         # Even if a fuse is disabled we identify it as a fuse.
         # If the line is disabled we ignore it unless it's a switch
-        fuses = _dss_class_to_dict("Fuse")
-        fuses_names = [
+        fuses = self._class_to_dict("Fuse", ["MonitoredObj"])
+        fuses_names = set(
             d["MonitoredObj"].lower().split(".")[1] for name, d in fuses.items()
-        ]
+        )
 
         # In the same way, reclosers are also attached to line objects
-        reclosers = _dss_class_to_dict("recloser")
-        reclosers_names = [
+        reclosers = self._class_to_dict("recloser", ["MonitoredObj"])
+        reclosers_names = set(
             d["MonitoredObj"].lower().split(".")[1] for name, d in reclosers.items()
-        ]
+        )
 
         start = time.time()
-        lines = _dss_class_to_dict("Line")
+        lines = self._class_to_dict("Line")
 
         middle = time.time()
         logger.debug("Line class to dataframe= {}".format(middle - start))
@@ -828,7 +907,7 @@ class Reader(AbstractReader):
 
             # If we have a valid linecode, try to get the data
             if linecode is not None:
-                linecodes = _dss_class_to_dict("linecode")
+                linecodes = self._class_snapshot("linecode", LINECODE_PROPERTIES)
                 if "linecode." + linecode.lower() in linecodes:
                     linecode_data = linecodes["linecode." + linecode.lower()]
                 else:
@@ -1075,7 +1154,7 @@ class Reader(AbstractReader):
             # If we have a geometry code, try to get the corresponding data
             if line_geometry_code is not None:
                 try:
-                    line_geometries = _dss_class_to_dict("linegeometry")
+                    line_geometries = self._class_snapshot("linegeometry")
                     this_line_geometry = line_geometries[
                         "linegeometry.{}".format(line_geometry_code)
                     ]
@@ -1269,15 +1348,15 @@ class Reader(AbstractReader):
                     is_cable = False
                     if this_line_wireData_code is not None:
                         try:
-                            all_wire_data = _dss_class_to_dict("wiredata")
-                            CNData = _dss_class_to_dict("CNData")
-                            for cnname, cnvalues in CNData.items():
-                                if this_line_wireData_code == cnname.split(".")[1]:
-                                    is_cable = True
-                                    this_line_wireData = CNData[
-                                        "CNData.{}".format(cnname.split(".")[1])
-                                    ]
-                                    api_line.line_type = "underground"
+                            all_wire_data = self._class_snapshot("wiredata")
+                            CNData = self._class_snapshot("CNData")
+                            cable_names = self._class_index("CNData").get(
+                                this_line_wireData_code.lower(), []
+                            )
+                            if len(cable_names) > 0:
+                                is_cable = True
+                                this_line_wireData = CNData[cable_names[-1]]
+                                api_line.line_type = "underground"
                             if is_cable is False:
                                 this_line_wireData = all_wire_data[
                                     "wiredata.{}".format(this_line_wireData_code)
@@ -1454,15 +1533,16 @@ class Reader(AbstractReader):
 
                     # Concentric Neutral
                     if is_cable == True:
-                        cndata = _dss_class_to_dict("CNData")
+                        cndata = self._class_snapshot("CNData")
                         if cndata is not None:
-                            for name, data in cndata.items():
+                            for cable_name in cable_names:
+                                cable_data = cndata[cable_name]
                                 try:
-                                    gmr_unit = data["GMRunits"]
+                                    gmr_unit = cable_data["GMRunits"]
                                 except:
                                     logger(
                                         "Could not find the GMRunits for {name}.".format(
-                                            name=name
+                                            name=cable_name
                                         )
                                     )
                                 if gmr_unit is not None:
@@ -1470,17 +1550,17 @@ class Reader(AbstractReader):
                                         wires[
                                             p
                                         ].concentric_neutral_gmr = self.convert_to_meters(
-                                            float(data["GmrStrand"]), gmr_unit
+                                            float(cable_data["GmrStrand"]), gmr_unit
                                         )
                                     except:
                                         logger("Could not convert to GMRunits")
 
                                 try:
-                                    r_unit = data["Runits"]
+                                    r_unit = cable_data["Runits"]
                                 except:
                                     logger(
                                         "Could not find the Runits for {name}.".format(
-                                            name=name
+                                            name=cable_name
                                         )
                                     )
                                 if r_unit is not None:
@@ -1488,17 +1568,17 @@ class Reader(AbstractReader):
                                         wires[
                                             p
                                         ].concentric_neutral_resistance = self.convert_to_meters(
-                                            float(data["Rstrand"]), r_unit
+                                            float(cable_data["Rstrand"]), r_unit
                                         )
                                     except:
                                         logger("Could not convert to  Runits")
 
                                 try:
-                                    rad_unit = data["radunits"]
+                                    rad_unit = cable_data["radunits"]
                                 except:
                                     logger(
                                         "Could not find the Radunits for {name}.".format(
-                                            name=name
+                                            name=cable_name
                                         )
                                     )
                                 if rad_unit is not None:
@@ -1506,21 +1586,21 @@ class Reader(AbstractReader):
                                         wires[
                                             p
                                         ].concentric_neutral_diameter = self.convert_to_meters(
-                                            float(data["DiaStrand"]), data["radunits"]
+                                            float(cable_data["DiaStrand"]), cable_data["radunits"]
                                         )
                                         wires[
                                             p
                                         ].concentric_neutral_outside_diameter = self.convert_to_meters(
-                                            float(data["DiaCable"]), data["radunits"]
+                                            float(cable_data["DiaCable"]), cable_data["radunits"]
                                         )
                                         wires[
                                             p
                                         ].insulation_thickness = self.convert_to_meters(
-                                            float(data["InsLayer"]), data["radunits"]
+                                            float(cable_data["InsLayer"]), cable_data["radunits"]
                                         )
                                     except:
                                         logger("Could not convert to radunits")
-                                wires[p].concentric_neutral_nstrand = int(data["k"])
+                                wires[p].concentric_neutral_nstrand = int(cable_data["k"])
 
             api_line.wires = wires
             self._lines.append(api_line)
@@ -1539,9 +1619,15 @@ class Reader(AbstractReader):
         :rtype: int
         """
 
-        transformers = _dss_class_to_dict("transformer")
+        transformers = self._class_to_dict("transformer")
         self._transformers = []
 
+        # Compensator settings of the regulators, by controlled transformer
+        regulators = self._class_snapshot("RegControl", ["transformer", "R", "X"])
+        regulators_by_transformer = self._class_index(
+            "RegControl", "transformer", ["transformer", "R", "X"]
+        )
+
         for name, data in transformers.items():
 
             # Skip Transformer object if disabled
@@ -1786,18 +1872,14 @@ class Reader(AbstractReader):
                     except:
                         pass
 
-                    regulators = _dss_class_to_dict("RegControl")
-                    for reg_name, reg_data in regulators.items():
-
-                        if (
-                            "transformer" in reg_data
-                            and reg_data["transformer"].lower()
-                            == api_transformer.name.lower()
-                        ):
-                            if "R" in reg_data:
-                                phase_windings[p].compensator_r = float(reg_data["R"])
-                            if "X" in reg_data:
-                                phase_windings[p].compensator_x = float(reg_data["X"])
+                    for reg_name in regulators_by_transformer.get(
+                        api_transformer.name.lower(), []
+                    ):
+                        reg_data = regulators[reg_name]
+                        if "R" in reg_data:
+                            phase_windings[p].compensator_r = float(reg_data["R"])
+                        if "X" in reg_data:
+                            phase_windings[p].compensator_x = float(reg_data["X"])
 
                 # Store the phase winding objects in the winding objects
                 for pw in phase_windings:
@@ -1840,8 +1922,8 @@ class Reader(AbstractReader):
         :returns: 1 for success, -1 for failure
         :rtype: int
         """
-        regulators = _dss_class_to_dict("RegControl")
-        transformers = _dss_class_to_dict("Transformer")
+        regulators = self._class_to_dict("RegControl")
+        transformers = self._class_to_dict("Transformer")
         self._regulators = []
 
         for name, data in regulators.items():
@@ -2164,8 +2246,9 @@ class Reader(AbstractReader):
         :returns: 1 for success, -1 for failure
         :rtype: int
         """
-        capacitors = _dss_class_to_dict("capacitor")
-        cap_control = _dss_class_to_dict("CapControl")
+        capacitors = self._class_to_dict("capacitor")
+        cap_control = self._class_snapshot("CapControl")
+        controls_by_capacitor = self._class_index("CapControl", "capacitor")
         self._capacitors = []
 
         for name, data in capacitors.items():
@@ -2209,10 +2292,9 @@ class Reader(AbstractReader):
 
             control_id = None
             # Find the capControl that corresponds to the capacitor if any
-            for capc_name, capc_data in cap_control.items():
-                if capc_data["capacitor"].lower() == api_capacitor.name:
-                    control_id = capc_name
-                    break
+            controls = controls_by_capacitor.get(api_capacitor.name, [])
+            if len(controls) > 0:
+                control_id = controls[0]
 
             # delay
             try:
@@ -2373,7 +2455,7 @@ class Reader(AbstractReader):
         :returns: 1 for success, -1 for failure
         :rtype: int
         """
-        loads = _dss_class_to_dict("Load")
+        loads = self._class_to_dict("Load")
         self._loads = []
 
         for name, data in loads.items():
@@ -2602,7 +2684,7 @@ class Reader(AbstractReader):
 
     def parse_storage(self, model):
         """Parse the storages."""
-        storages = _dss_class_to_dict("storage")
+        storages = self._class_to_dict("storage")
 
         for name, data in storages.items():
 
@@ -2767,7 +2849,7 @@ class Reader(AbstractReader):
         :rtype: int
         """
         
-        generators = _dss_class_to_dict("generator")
+        generators = self._class_to_dict("generator")
         self._generators = []
 
         for name, data in generators.items():
@@ -2852,5 +2934,67 @@ class Reader(AbstractReader):
     
         return 1
 
-def _dss_class_to_dict(class_name):
-    return dss.utils.class_to_dataframe(class_name).to_dict(orient="index")
+def _dss_class_to_dict(class_name, properties=None):
+    """
+    Returns the elements of an OpenDSS class as a dictionary mapping '<class_name>.<element name>'
+    to the dictionary of the properties of the element.
+
+    The values are parsed like opendssdirect.utils.class_to_dataframe (lists for arrays, booleans...)
+    but the elements are read directly from the engine, without building a pandas DataFrame.
+    The property names are read once per class, since all the elements of a class share them.
+
+    :param class_name: Name of the OpenDSS class (ex: Line, linecode...)
+    :type class_name: str
+    :param properties: If given, only these properties are read (names are case insensitive)
+    :type properties: List(str)
+    :returns: The properties of the elements of the class
+    :rtype: dict
+    """
+    dss.Circuit.SetActiveClass(class_name)
+    if class_name.lower() != dss.ActiveClass.ActiveClassName().lower():
+        raise NotImplementedError(
+            "OpenDSS class {} is not supported.".format(class_name)
+        )
+    element_names = dss.ActiveClass.AllNames()
+    data = {}
+    if len(element_names) == 0:
+        return data
+
+    dss.ActiveClass.Name(element_names[0])
+    property_names = dss.Element.AllPropertyNames()
+    if properties is not None:
+        wanted = set(p.lower() for p in properties)
+        selected = [
+            (str(idx + 1), n)
+            for idx, n in enumerate(property_names)
+            if n.lower() in wanted
+        ]
+    else:
+        selected = [(str(idx + 1), n) for idx, n in enumerate(property_names)]
+
+    # Line geometries: the positions of the conductors are only available through commands
+    # (See opendssdirect.utils._clean_data)
+    conductors = "nconds" in property_names and (
+        properties is None or wanted & set(["x", "h", "units"])
+    )
+
+    for element in element_names:
+        name = "{class_name}.{element}".format(class_name=class_name, element=element)
+        dss.ActiveClass.Name(element)
+        values = {
+            n: parse_value(dss.Properties.Value(idx)) for idx, n in selected
+        }
+        if conductors:
+            x = []
+            h = []
+            units = []
+            for cond in range(1, int(dss.Properties.Value("nconds")) + 1):
+                dss.run_command("{name}.cond={cond}".format(name=name, cond=cond))
+                x.append(float(dss.run_command("? {name}.x".format(name=name))))
+                h.append(float(dss.run_command("? {name}.h".format(name=name))))
+                units.append(dss.run_command("? {name}.units".format(name=name)))
+            values["x"] = x
+            values["h"] = h
+            values["units"] = units
+        data[name] = values
+    return data
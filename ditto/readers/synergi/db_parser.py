@@ -22,6 +22,9 @@ class DbParser:
         if "warehouse" in kwargs:
             self.paths["warehouse"] = kwargs["warehouse"]
 
+        # Number of tables exported at the same time (None uses all the CPUs)
+        self.jobs = kwargs.get("jobs", 1)
+
         self.ParseSynergiDatabase()
 
     def ParseSynergiDatabase(self):
@@ -36,15 +39,18 @@ class DbParser:
             print("Opening warehouse database - ", self.paths["warehouse"])
             table_list_warehouse = mdb.list_tables(self.paths["warehouse"])
 
-        for table in table_list:
-            self.SynergiDictionary[table] = self.ToLowerCase(
-                mdb.read_table(self.paths["Synergi File"], table)
-            )
+        tables = mdb.read_tables(
+            self.paths["Synergi File"], table_list, max_workers=self.jobs
+        )
+        for table, df in tables.items():
+            self.SynergiDictionary[table] = self.ToLowerCase(df)
 
-        for table in table_list_warehouse:
-            self.SynergiDictionary[table] = self.ToLowerCase(
-                mdb.read_table(self.paths["warehouse"], table)
+        if len(table_list_warehouse) > 0:
+            tables = mdb.read_tables(
+                self.paths["warehouse"], table_list_warehouse, max_workers=self.jobs
             )
+            for table, df in tables.items():
+                self.SynergiDictionary[table] = self.ToLowerCase(df)
         return
 
     def ToLowerCase(self, df):
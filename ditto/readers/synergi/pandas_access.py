@@ -6,9 +6,11 @@
 import re
 import platform
 import subprocess
+import threading
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from StringIO import StringIO as BytesIO
@@ -25,6 +27,17 @@ current_dir = os.path.realpath(os.path.dirname(__file__))
 path_to_mdbtools = os.path.join(current_dir, "mdbtools","bin")
 path_to_mdbtools_win = os.path.join(current_dir, "mdbtools")
 
+# Schemas read by get_schema, by database file
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+
+def _mdbtools_executable(name):
+    """Path of an executable of mdbtools (mdb-tables, mdb-schema, mdb-export)."""
+    if platform.system() == "Windows":
+        return os.path.join(path_to_mdbtools_win, name + ".exe")
+    return os.path.join(path_to_mdbtools, name)
+
 
 def list_tables(rdb_file, encoding="latin-1"):
     """
@@ -34,15 +47,9 @@ def list_tables(rdb_file, encoding="latin-1"):
         actually be UTF-8.
     :return: A list of the tables in a given database.
     """
-    operating_system = platform.system()
-    if operating_system == 'Windows':
-        tables = subprocess.check_output(
-            [os.path.join(path_to_mdbtools_win, "mdb-tables.exe"), rdb_file]
-        ).decode(encoding)
-    else:
-        tables = subprocess.check_output(
-            [os.path.join(path_to_mdbtools, "mdb-tables"), rdb_file]
-        ).decode(encoding)
+    tables = subprocess.check_output(
+        [_mdbtools_executable("mdb-tables"), rdb_file]
+    ).decode(encoding)
     return tables.strip().split(" ")
 
 
@@ -76,15 +83,7 @@ def read_schema(rdb_file, encoding="utf8"):
         spits out UTF-8, exclusively.
     :return: a dictionary of table -> column -> access_data_type
     """
-    operating_system = platform.system()
-    if operating_system == 'Windows':
-        output = subprocess.check_output(
-            [os.path.join(path_to_mdbtools_win, "mdb-schema.exe"), rdb_file]
-        )
-    else:
-        output = subprocess.check_output(
-            [os.path.join(path_to_mdbtools, "mdb-schema"), rdb_file]
-        )
+    output = subprocess.check_output([_mdbtools_executable("mdb-schema"), rdb_file])
     lines = output.decode(encoding).splitlines()
     schema_ddl = "\n".join(l for l in lines if l and not l.startswith("-"))
 
@@ -95,6 +94,21 @@ def read_schema(rdb_file, encoding="utf8"):
     return schema
 
 
+def get_schema(rdb_file, encoding="utf8"):
+    """
+    Same as `read_schema`, but the schema of a database file is read once and
+    cached, until the file is modified.
+    :param rdb_file: The MS Access database file.
+    :param encoding: The schema encoding.
+    :return: a dictionary of table -> column -> access_data_type
+    """
+    key = (os.path.realpath(rdb_file), os.path.getmtime(rdb_file), encoding)
+    with _schemas_lock:
+        if key not in _schemas:
+            _schemas[key] = read_schema(rdb_file, encoding)
+        return _schemas[key]
+
+
 def to_pandas_schema(schema, implicit_string=True):
     """
     :param schema: the output of `read_schema`
@@ -124,7 +138,8 @@ def read_table(rdb_file, table_name, *args, **kwargs):
     cases. If you set the `dtype` keyword argument also, it overrides
     inferences. The `schema_encoding keyword argument passes through to
     `read_schema`. The `implicit_string` argument passes through to
-    `to_pandas_schema`.
+    `to_pandas_schema`. The schema is read once per database file (See
+    `get_schema`).
     I recommend setting `chunksize=k`, where k is some reasonable number of
     rows. This is a simple interface, that doesn't do basic things like
     counting the number of rows ahead of time. You may inadvertently start
@@ -137,21 +152,52 @@ def read_table(rdb_file, table_name, *args, **kwargs):
     :return: a pandas `DataFrame` (or, `TextFileReader` if you set
         `chunksize=k`)
     """
-    operating_system = platform.system()
     if kwargs.pop("converters_from_schema", True):
         specified_dtypes = kwargs.pop("dtype", {})
         schema_encoding = kwargs.pop("schema_encoding", "utf8")
-        schemas = to_pandas_schema(
-            read_schema(rdb_file, schema_encoding), kwargs.pop("implicit_string", True)
-        )
-        dtypes = schemas[table_name]
+        schema = get_schema(rdb_file, schema_encoding)
+        dtypes = to_pandas_schema(
+            {table_name: schema[table_name]}, kwargs.pop("implicit_string", True)
+        )[table_name]
         dtypes.update(specified_dtypes)
         if dtypes != {}:
             kwargs["dtype"] = dtypes
 
-    if operating_system == 'Windows':
-        cmd = [os.path.join(path_to_mdbtools_win, "mdb-export.exe"), rdb_file, table_name]
-    else:
-        cmd = [os.path.join(path_to_mdbtools, "mdb-export"), rdb_file, table_name]
+    cmd = [_mdbtools_executable("mdb-export"), rdb_file, table_name]
     proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
-    return pd.read_csv(proc.stdout, *args, **kwargs)
+    if kwargs.get("chunksize") is not None or kwargs.get("iterator", False):
+        return pd.read_csv(proc.stdout, *args, **kwargs)
+    try:
+        return pd.read_csv(proc.stdout, *args, **kwargs)
+    finally:
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def read_tables(rdb_file, table_names, max_workers=None, *args, **kwargs):
+    """
+    Read several tables of a MS Access database as Pandas DataFrames.
+    The tables are exported concurrently, by at most `max_workers`
+    `mdb-export` processes, each streaming into `pd.read_csv` (See
+    `read_table`).
+    :param rdb_file: The MS Access database file.
+    :param table_names: The names of the tables to process.
+    :param max_workers: The maximum number of tables exported at the same
+        time. None uses the number of CPUs.
+    :param args: positional arguments passed to `read_table`
+    :param kwargs: keyword arguments passed to `read_table`
+    :return: a dictionary of table -> pandas `DataFrame`, in the order of
+        `table_names`
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (
+                table_name,
+                executor.submit(read_table, rdb_file, table_name, *args, **kwargs),
+            )
+            for table_name in table_names
+        ]
+        return {table_name: future.result() for table_name, future in futures}
@@ -94,6 +94,9 @@ class Reader(AbstractReader):
         else:
             self.ware_house_input_file = "warehouse.mdb"
 
+        # Number of tables of the databases exported at the same time (None uses all the CPUs)
+        self.jobs = kwargs.get("jobs", 1)
+
         self.SynergiData = None
         self.node_nominal_voltage_mapping = dict()
         self.feeder_substation_mapping = dict()
@@ -127,10 +130,10 @@ class Reader(AbstractReader):
                 os.path.dirname(self.input_file), self.ware_house_input_file
             )
             self.SynergiData = DbParser(
-                self.input_file, warehouse=self.ware_house_input_file
+                self.input_file, warehouse=self.ware_house_input_file, jobs=self.jobs
             )
         else:
-            self.SynergiData = DbParser(self.input_file)
+            self.SynergiData = DbParser(self.input_file, jobs=self.jobs)
 
         ####################################################################################
         ####################################################################################
@@ -25,6 +25,8 @@ import logging
 import types
 from functools import partial
 from .network.network import Network
+from .network.loops import LoopAnalyzer
+from .network.spatial import SpatialIndex
 
 from .core import DiTToBase, DiTToTypeError
 from .modify.modify import Modifier
@@ -126,6 +128,16 @@ class Store(object):
             self._network.build(self)
         self._network.set_attributes(self)
 
+    def spatial_index(self, types=None):
+        """
+        Builds a spatial index over the positions of the elements (See ditto.network.spatial.SpatialIndex).
+        Only the elements of the given types are indexed if types is given.
+
+        >>> index = M.spatial_index(types=Node)
+        >>> index.nearest(-105.17, 39.74)
+        """
+        return SpatialIndex.from_model(self, types)
+
     def print_networkx(self):
         logger.debug("Printing Nodes...")
         self._network.print_nodes()
@@ -134,21 +146,20 @@ class Store(object):
         # logger.debug('Printing Attributes...')
         # self._network.print_attrs()
 
-    def delete_cycles(self):
-        """ First convert graph to directed graph (doubles the edges hence creating length 2 cycles)
-        Then find cycles of length greater than 2
+    def delete_cycles(self, source=None):
+        """ Find the fundamental loops of the network from a spanning tree (see ditto.network.loops)
         Use heuristic of removing edge in the middle of the longest single phase section of the loop
         If no single phase sections, remove edge the furthest from the source
+        Loops containing an open switching device are broken at the device.
         """
-        for i in self._network.find_cycles():
-            if len(i) > 2:
-                logger.debug("Detected cycle {cycle}".format(cycle=i))
-                edge = self._network.middle_single_phase(i)
-                for j in self.models:
-                    if hasattr(j, "name") and j.name == edge:
-                        logger.debug("deleting " + edge)
-                        modifier = Modifier()
-                        modifier.delete_element(self, j)
+        self.set_names()
+        analyzer = LoopAnalyzer(self._network, source)
+        modifier = Modifier()
+        logger.debug("Detected {n} cycles".format(n=analyzer.number_of_loops()))
+        for name in analyzer.loop_breaking_equipment():
+            if name in self._model_names:
+                logger.debug("deleting " + name)
+                modifier.delete_element(self, self[name])
         self.build_networkx()
 
     def direct_from_source(self, source="sourcebus"):
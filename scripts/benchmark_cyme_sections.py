@@ -0,0 +1,146 @@
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from ditto.readers.cyme.read import Reader
+
+logger = logging.getLogger(__name__)
+
+# Sections of the network file read by the parsers of the CYME reader, one entry per scan of the file
+NETWORK_SCANS = [
+    None,
+    ["section"],
+    ["source", "source_equivalent"],
+    ["node"],
+    ["node_connector"],
+    [
+        "overhead_unbalanced_line_settings",
+        "overhead_line_settings",
+        "overhead_byphase_settings",
+        "underground_line_settings",
+        "switch_settings",
+        "sectionalizer_settings",
+        "fuse_settings",
+        "recloser_settings",
+        "breaker_settings",
+        "network_protector_settings",
+        "section",
+    ],
+    ["serie_capacitor_settings", "shunt_capacitor_settings"],
+    [
+        "auto_transformer_settings",
+        "grounding_transformer_settings",
+        "three_winding_auto_transformer_settings",
+        "three_winding_transformer_settings",
+        "transformer_settings",
+        "phase_shifter_transformer_settings",
+    ],
+    ["regulator_settings"],
+    ["network_equivalent_setting", "section"],
+    [
+        "converter",
+        "converter_control_settings",
+        "photovoltaic_settings",
+        "bess_settings",
+        "long_term_dynamics_curve_ext",
+        "dggenerationmodel",
+    ],
+    ["headnodes"],
+]
+
+
+def main():
+    """Benchmark of the scans of the CYME network file by the CYME reader.
+
+**Usage:**
+
+$ python benchmark_cyme_sections.py -d ../tests/data/big_cases/cyme/ieee_123node
+
+$ python benchmark_cyme_sections.py -n 1000000
+
+This times the scans of the network file done by the parsers of the CYME reader:
+
+- readlines: the whole file is read for each parser, as the reader did previously,
+- index: the file is indexed once (SectionIndex) and each parser only reads the lines of its sections.
+
+With -n, a synthetic network with the given number of sections (and as many nodes and overhead lines) is used.
+
+"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-d", dest="data_folder_path", default=None)
+    parser.add_argument("-n", dest="sections", type=int, default=None)
+    results = parser.parse_args()
+
+    directory = None
+    if results.sections is not None:
+        directory = tempfile.mkdtemp()
+        write_synthetic_network(
+            os.path.join(directory, "network.txt"), results.sections
+        )
+        results.data_folder_path = directory
+
+    try:
+        filename = os.path.join(results.data_folder_path, "network.txt")
+        print(
+            "{} ({:.1f} MB)".format(filename, os.path.getsize(filename) / 1024.0 ** 2)
+        )
+
+        start = time.perf_counter()
+        readlines = 0
+        for _ in NETWORK_SCANS:
+            with open(filename, "r") as f:
+                readlines += sum(1 for line in f.readlines())
+        readlines_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reader = Reader(data_folder_path=results.data_folder_path)
+        index = 0
+        for objects in NETWORK_SCANS:
+            reader.get_file_content("network", objects)
+            index += sum(1 for line in reader.content)
+        reader.close_files()
+        index_time = time.perf_counter() - start
+
+        print("{:<12}{:>14}{:>12}".format("", "lines_read", "time_s"))
+        print("{:<12}{:>14}{:>12.3f}".format("readlines", readlines, readlines_time))
+        print("{:<12}{:>14}{:>12.3f}".format("index", index, index_time))
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory)
+
+
+def write_synthetic_network(filename, n_sections):
+    """Writes a CYME network file with a radial feeder of n_sections overhead line sections."""
+    with open(filename, "w") as f:
+        f.write("[GENERAL]\nCYME_VERSION=8.00\n\n[SI]\n\n")
+        f.write("[NODE]\nFORMAT_NODE=NodeID,CoordX,CoordY\n")
+        for k in range(n_sections + 1):
+            f.write("N{k},{k}.0,0.0\n".format(k=k))
+        f.write("\n[HEADNODES]\nFORMAT_HEADNODES=NodeID,NetworkID\nN0,F1\n\n")
+        f.write("[SECTION]\n")
+        f.write(
+            "FORMAT_SECTION=SectionID,FromNodeID,FromNodeIndex,ToNodeID,ToNodeIndex,Phase,SubNetworkId\n"
+        )
+        f.write(
+            "FORMAT_FEEDER=NetworkID,HeadNodeID,CoordSet,Year,Description,Color,LoadFactor,LossLoadFactorK,Group1,Group2,Group3,Group4,Group5,Group6\n"
+        )
+        f.write("FEEDER=F1,N0,1,-1,,,1.0,0.15,,,,,,\n")
+        for k in range(n_sections):
+            f.write("S{k},N{k},0,N{l},0,ABC,\n".format(k=k, l=k + 1))
+        f.write("\n[OVERHEADLINE SETTING]\n")
+        f.write(
+            "FORMAT_OVERHEADLINESETTING=SectionID,DeviceNumber,LineCableID,Length,ConnectionStatus\n"
+        )
+        for k in range(n_sections):
+            f.write("S{k},S{k},LINE1,100.0,0\n".format(k=k))
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import argparse
+import logging
+import random
+import time
+
+import numpy as np
+from scipy.spatial import ConvexHull
+
+from ditto.store import Store
+from ditto.models.node import Node
+from ditto.models.line import Line
+from ditto.models.load import Load
+from ditto.models.position import Position
+from ditto.models.power_source import PowerSource
+from ditto.metrics.network_analysis import NetworkAnalyzer, footprint
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Benchmark of the footprint metrics (convex hull area, bounding box, densities) on a synthetic multi-feeder system.
+
+**Usage:**
+
+$ python benchmark_footprint.py -f 50 -n 2000
+
+This builds 50 radial feeders of 2000 nodes around a source, with loads and lines having intermediate positions,
+and compares the time spent gathering the points and computing the footprints of all the feeders with:
+
+- collect_points and footprint (NumPy arrays per feeder gathered in one pass),
+- the previous approach, appending the points of each object to Python lists and deduplicating them in a set.
+
+"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-f", dest="feeders", type=int, default=10)
+    parser.add_argument("-n", dest="nodes", type=int, default=1000)
+    parser.add_argument("-s", dest="seed", type=int, default=0)
+    results = parser.parse_args()
+
+    m, feeder_nodes = build_system(results.feeders, results.nodes, results.seed)
+    start = time.perf_counter()
+    net = NetworkAnalyzer(m, True, "sourcebus")
+    feeder_names = sorted(feeder_nodes)
+    net.add_feeder_information(
+        feeder_names,
+        [feeder_nodes[f] for f in feeder_names],
+        {f: "sourcebus" for f in feeder_names},
+        "synthetic",
+    )
+    net.split_network_into_feeders()
+    print("Network and feeder split: {:.2f}s".format(time.perf_counter() - start))
+
+    start = time.perf_counter()
+    net.collect_points(feeder_names)
+    areas = [footprint(net.points[f])["hull_area"] for f in feeder_names]
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_areas = legacy_footprints(net, feeder_names)
+    legacy = time.perf_counter() - start
+
+    assert np.allclose(areas, legacy_areas)
+    n_points = sum(len(net.points[f]) for f in feeder_names)
+    print("{} feeders, {} points".format(len(feeder_names), n_points))
+    print("Arrays per feeder: {:.3f}s".format(vectorized))
+    print("Python lists:      {:.3f}s".format(legacy))
+
+
+def build_system(n_feeders, n_nodes, seed):
+    """Builds radial feeders around a source. Returns the model and the nodes of each feeder."""
+    rng = random.Random(seed)
+    m = Store()
+    Node(m, name="sourcebus", positions=[Position(m, long=0, lat=0)])
+    PowerSource(m, name="source", connecting_element="sourcebus", is_sourcebus=1)
+    feeder_nodes = {}
+    for f in range(n_feeders):
+        angle = 2 * np.pi * f / n_feeders
+        head = (5000 * np.cos(angle), 5000 * np.sin(angle))
+        names = []
+        coordinates = {"sourcebus": (0, 0)}
+        for i in range(n_nodes):
+            name = "f{}_n{}".format(f, i)
+            x = head[0] + rng.gauss(0, 1000)
+            y = head[1] + rng.gauss(0, 1000)
+            Node(m, name=name, positions=[Position(m, long=x, lat=y)])
+            upstream = "sourcebus" if i == 0 else names[rng.randrange(i)]
+            x0, y0 = coordinates[upstream]
+            Line(
+                m,
+                name="f{}_l{}".format(f, i),
+                from_element=upstream,
+                to_element=name,
+                length=100,
+                positions=[Position(m, long=(x + x0) / 2, lat=(y + y0) / 2)],
+            )
+            if rng.random() < 0.5:
+                Load(
+                    m,
+                    name="f{}_load{}".format(f, i),
+                    connecting_element=name,
+                    positions=[Position(m, long=x + 10, lat=y + 10)],
+                )
+            names.append(name)
+            coordinates[name] = (x, y)
+        feeder_nodes["feeder_{}".format(f)] = names
+    m.set_names()
+    return m, feeder_nodes
+
+
+def legacy_footprints(net, feeder_names):
+    """Previous approach: points appended object by object to Python lists, deduplicated in a set."""
+    points = {}
+    for obj in net.model.models:
+        if hasattr(obj, "name") and getattr(obj, "positions", None):
+            feeder_name = net.get_feeder(obj)
+            if feeder_name is None:
+                continue
+            for position in obj.positions:
+                if feeder_name in points:
+                    points[feeder_name].append([position.long, position.lat])
+                else:
+                    points[feeder_name] = [[position.long, position.lat]]
+    areas = []
+    for feeder_name in feeder_names:
+        _points = np.array(points[feeder_name])
+        unique_points = set()
+        for arr in _points:
+            unique_points.add(tuple(list(arr)))
+        areas.append(ConvexHull(_points).volume)
+    return areas
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from ditto.readers.gridlabd.tokenizer import GLMTokenizer
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Benchmark of the reading of the GridLAB-D models by the GridLAB-D reader.
+
+**Usage:**
+
+$ python benchmark_glm_tokenizer.py -i ../tests/data/big_cases/gridlabd/ieee_123node/123_node.glm
+
+$ python benchmark_glm_tokenizer.py -n 200000
+
+This times the reading of the objects of the model, and the peak memory used:
+
+- readlines: the whole model is read in memory and split row by row, as the reader did previously,
+- tokenizer: the model is streamed by GLMTokenizer, one object at a time.
+
+With -n, a synthetic model with the given number of nodes (and as many overhead lines, in an included file) is used.
+
+"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", dest="input_file", default=None)
+    parser.add_argument("-n", dest="nodes", type=int, default=None)
+    parser.add_argument("-r", dest="repeat", type=int, default=10)
+    results = parser.parse_args()
+
+    directory = None
+    if results.nodes is not None:
+        directory = tempfile.mkdtemp()
+        results.input_file = os.path.join(directory, "model.glm")
+        write_synthetic_model(results.input_file, results.nodes)
+
+    try:
+        print(
+            "{} ({:.1f} MB)".format(
+                results.input_file, os.path.getsize(results.input_file) / 1024.0 ** 2
+            )
+        )
+        print("{:<12}{:>10}{:>12}{:>14}".format("", "objects", "time_s", "peak_MB"))
+        for name, read in [("readlines", read_rows), ("tokenizer", read_records)]:
+            start = time.perf_counter()
+            for _ in range(results.repeat):
+                objects = read(results.input_file)
+            elapsed = (time.perf_counter() - start) / results.repeat
+
+            tracemalloc.start()
+            read(results.input_file)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                "{:<12}{:>10}{:>12.4f}{:>14.1f}".format(
+                    name, objects, elapsed, peak / 1024.0 ** 2
+                )
+            )
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory)
+
+
+def read_rows(filename):
+    """Reads the objects of a model like the GridLAB-D reader did before GLMTokenizer. Returns the number of objects."""
+    all_rows = open(filename, "r").readlines()
+    all_includes = []
+    for row in all_rows:
+        if row[:8] == "#include":
+            location = row.split()[1].strip('"')
+            location = os.path.join(os.path.dirname(filename), location)
+            all_includes = all_includes + open(location, "r").readlines()
+    all_rows = all_rows + all_includes
+    objects = 0
+    curr_object = None
+    for row in all_rows:
+        row = row.strip()
+        if row[:2] == "//":
+            continue
+        entries = row.split()
+        if len(entries) > 0 and entries[0] == "object":
+            curr_object = {"class": entries[1].split(":")[0]}
+        elif curr_object is not None:
+            if len(entries) > 1:
+                value = entries[1]
+                if value[-1] == ";":
+                    value = value[:-1]
+                curr_object[entries[0]] = value
+            if len(row) >= 1 and (row[-1] == "}" or row[-2:] == "};"):
+                objects += 1
+                curr_object = None
+    return objects
+
+
+def read_records(filename):
+    """Reads the objects of a model with GLMTokenizer. Returns the number of objects."""
+    objects = 0
+    for record in GLMTokenizer(filename).records():
+        if record["type"] == "object":
+            objects += 1
+    return objects
+
+
+def write_synthetic_model(filename, n_nodes):
+    """Writes a GridLAB-D model of a radial feeder with n_nodes nodes. The lines are in lines.glm, included by the model."""
+    with open(filename, "w") as f:
+        f.write("// Synthetic radial feeder\n#define VOLTAGE=2401.7771\n")
+        f.write("object overhead_line_conductor:1 {\n")
+        f.write(
+            "     geometric_mean_radius 0.0244 ft;\n     resistance 0.306 Ohm/mile;\n}\n"
+        )
+        for k in range(n_nodes + 1):
+            f.write("object node:{k} {{\n".format(k=k))
+            f.write("     phases ABCN;\n     name n{k};\n".format(k=k))
+            f.write("     nominal_voltage ${VOLTAGE};\n}\n")
+        f.write('#include "lines.glm"\n')
+    with open(os.path.join(os.path.dirname(filename), "lines.glm"), "w") as f:
+        for k in range(n_nodes):
+            f.write("object overhead_line:{k} {{\n".format(k=k))
+            f.write("     phases ABCN;\n     name l{k};\n".format(k=k))
+            f.write(
+                "     from n{k};\n     to n{l};\n     length 100 ft; // feet\n}}\n".format(
+                    k=k, l=k + 1
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
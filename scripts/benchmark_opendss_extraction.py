@@ -0,0 +1,98 @@
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import argparse
+import logging
+import time
+
+import opendssdirect as dss
+
+from ditto.readers.opendss.read import _dss_class_to_dict
+
+logger = logging.getLogger(__name__)
+
+CLASSES = [
+    "Vsource",
+    "Line",
+    "linecode",
+    "linegeometry",
+    "wiredata",
+    "CNData",
+    "Transformer",
+    "RegControl",
+    "Load",
+    "capacitor",
+    "CapControl",
+    "Fuse",
+    "recloser",
+    "storage",
+    "generator",
+]
+
+
+def main():
+    """Benchmark of the extraction of the OpenDSS classes read by the OpenDSS reader.
+
+**Usage:**
+
+$ python benchmark_opendss_extraction.py -m ../tests/data/big_cases/opendss/epri_j1/master.dss
+
+This compiles the circuit and compares, for each class, the time spent getting the properties of all the elements with:
+
+- _dss_class_to_dict (elements and properties read directly from the engine),
+- opendssdirect.utils.class_to_dataframe followed by DataFrame.to_dict, as the reader did previously.
+
+Both results are checked to be identical.
+
+"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-m", dest="master_file", required=True)
+    parser.add_argument("-r", dest="repeat", type=int, default=3)
+    results = parser.parse_args()
+
+    dss.run_command("clear")
+    dss.run_command("redirect {}".format(results.master_file))
+
+    print(
+        "{:<14}{:>10}{:>14}{:>12}".format(
+            "class", "elements", "dataframe_s", "direct_s"
+        )
+    )
+    total_dataframe = total_direct = 0
+    for class_name in CLASSES:
+        dataframe = min(
+            timed(
+                lambda: dss.utils.class_to_dataframe(class_name).to_dict(orient="index")
+            )
+            for _ in range(results.repeat)
+        )
+        direct = min(
+            timed(lambda: _dss_class_to_dict(class_name)) for _ in range(results.repeat)
+        )
+        elements = _dss_class_to_dict(class_name)
+        assert elements == dss.utils.class_to_dataframe(class_name).to_dict(
+            orient="index"
+        )
+        total_dataframe += dataframe
+        total_direct += direct
+        print(
+            "{:<14}{:>10}{:>14.4f}{:>12.4f}".format(
+                class_name, len(elements), dataframe, direct
+            )
+        )
+    print(
+        "{:<14}{:>10}{:>14.4f}{:>12.4f}".format(
+            "total", "", total_dataframe, total_direct
+        )
+    )
+
+
+def timed(function):
+    """Returns the time spent calling the function."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
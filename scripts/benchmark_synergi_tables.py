@@ -0,0 +1,104 @@
+from __future__ import absolute_import, division, print_function
+from builtins import super, range, zip, round, map
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from ditto.readers.synergi import pandas_access
+
+logger = logging.getLogger(__name__)
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+
+def main():
+    """Benchmark of the export of the tables of a Synergi database.
+
+**Usage:**
+
+$ python benchmark_synergi_tables.py -n 300 -j 8
+
+$ python benchmark_synergi_tables.py -i network.mdb -j 8
+
+This times the reading of all the tables of a database as DataFrames:
+
+- sequential: the schema is read for each table and the tables are exported one after the other, as the reader did previously,
+- cached: the schema is read once and the tables are exported one after the other,
+- parallel: the schema is read once and the tables are exported by -j mdb-export processes at the same time.
+
+Without -i, a synthetic database with -n tables is exported by the stubs of mdbtools of the tests
+(tests/readers/synergi/mdbtools), each export taking at least -d seconds.
+
+"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", dest="input_file", default=None)
+    parser.add_argument("-n", dest="tables", type=int, default=300)
+    parser.add_argument("-r", dest="rows", type=int, default=100)
+    parser.add_argument("-d", dest="delay", type=float, default=0.01)
+    parser.add_argument("-j", dest="jobs", type=int, default=None)
+    results = parser.parse_args()
+
+    directory = None
+    if results.input_file is None:
+        directory = tempfile.mkdtemp()
+        results.input_file = os.path.join(directory, "network.mdb")
+        write_synthetic_database(
+            results.input_file, results.tables, results.rows, results.delay
+        )
+        pandas_access.path_to_mdbtools = os.path.join(
+            current_directory, "..", "tests", "readers", "synergi", "mdbtools", "bin"
+        )
+
+    try:
+        tables = pandas_access.list_tables(results.input_file)
+        print("{} ({} tables)".format(results.input_file, len(tables)))
+
+        start = time.perf_counter()
+        for table in tables:
+            pandas_access._schemas.clear()
+            pandas_access.read_table(results.input_file, table)
+        sequential_time = time.perf_counter() - start
+
+        pandas_access._schemas.clear()
+        start = time.perf_counter()
+        pandas_access.read_tables(results.input_file, tables, max_workers=1)
+        cached_time = time.perf_counter() - start
+
+        pandas_access._schemas.clear()
+        start = time.perf_counter()
+        pandas_access.read_tables(results.input_file, tables, max_workers=results.jobs)
+        parallel_time = time.perf_counter() - start
+
+        print("{:<12}{:>12}".format("", "time_s"))
+        print("{:<12}{:>12.3f}".format("sequential", sequential_time))
+        print("{:<12}{:>12.3f}".format("cached", cached_time))
+        print("{:<12}{:>12.3f}".format("parallel", parallel_time))
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory)
+
+
+def write_synthetic_database(filename, n_tables, n_rows, delay):
+    """Writes the JSON description of a database read by the stubs of mdbtools of the tests."""
+    tables = {}
+    for k in range(n_tables):
+        tables["Table{}".format(k)] = {
+            "columns": {
+                "ObjectId": "Text (50)",
+                "Length": "Double",
+                "Phases": "Long Integer",
+                "Description": "Text (255)",
+            },
+            "rows": n_rows,
+        }
+    with open(filename, "w") as f:
+        json.dump({"tables": tables, "delay": delay}, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -48,7 +48,7 @@ extras_requires = [
 
 opendss_requires = ["OpenDSSDirect.py~=0.7", "pandas", numpy_dependency]
 dew_requires = [numpy_dependency, "xlrd~=2.0"]
-gridlabd_requires = ["croniter~=1.3", numpy_dependency]
+gridlabd_requires = ["pandas", numpy_dependency]
 cyme_requires = [numpy_dependency]
 ephasor_requires = [numpy_dependency, "pandas"]
 synergi_requires = [
@@ -0,0 +1,88 @@
+import pytest
+
+from ditto.readers.cyme.read import Reader
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("[NODE]\n", {"node"}),
+        ("[NODE CONNECTOR]\r\n", {"node_connector"}),
+        ("[CABLE CONCENTRIC NEUTRAL]\n", {"concentric_neutral_cable"}),
+        ("[UNKNOWN SECTION]\n", set()),
+        ("N1,[NODE],0\n", set()),
+        ("\n", set()),
+    ],
+)
+def test_header_objects(line, expected):
+    reader = Reader()
+    assert reader.header_objects(line) == expected
+    assert reader.check_object_in_line(line, "node") == ("node" in expected)
+
+
+def test_header_objects_mapping_update():
+    reader = Reader()
+    assert reader.header_objects("[NODES]\n") == set()
+    reader.header_mapping = dict(reader.header_mapping, node=["[NODES]"])
+    assert reader.header_objects("[NODES]\n") == {"node"}
+
+
+def test_compile_format():
+    reader = Reader()
+    mapping = reader.compile_format(
+        "FORMAT_NODE=NodeID,CoordX,CoordY,RatedVoltage\r\n",
+        ["nodeid", "ratedvoltage", "coordz"],
+    )
+    assert mapping == {"nodeid": 0, "ratedvoltage": 3}
+    assert reader.compile_format("[NODE]\n", ["nodeid"]) == {}
+
+
+def test_parser_helper():
+    reader = Reader()
+    reader.content = iter(
+        [
+            "FORMAT_NODE=NodeID,CoordX,CoordY\n",
+            "N1,1.0,2.0\n",
+            "N1,3.0\n",
+            "N2\n",
+            "\n",
+            "[SECTION]\n",
+        ]
+    )
+    result = reader.parser_helper(
+        "[NODE]\n", ["node"], ["nodeid", "coordx", "coordy"], {}, {"feeder": "f1"}
+    )
+    assert result == {
+        "N1": {"nodeid": "N1", "coordx": "1.0", "coordy": "2.0\n", "feeder": "f1"},
+        "N1*": {"nodeid": "N1", "coordx": "3.0\n", "feeder": "f1"},
+    }
+    assert next(reader.content) == "[SECTION]\n"
+    assert reader.parser_helper("N1,1.0,2.0\n", ["node"], ["nodeid"], {}) == {}
+
+
+def test_parser_rows():
+    reader = Reader()
+    reader.content = iter(
+        ["FORMAT_NODE=NodeID,CoordX,CoordY\n", "N1,1.0,2.0\n", "N1,3.0,4.0\n", "\n"]
+    )
+    rows = reader.parser_rows("[NODE]\n", ["node"], ["nodeid", "coordx"], {})
+    assert list(rows) == [
+        ("N1", {"nodeid": "N1", "coordx": "1.0"}),
+        ("N1", {"nodeid": "N1", "coordx": "3.0"}),
+    ]
+
+
+def test_iter_customer_loads(tmpdir):
+    with open(str(tmpdir.join("load.txt")), "w") as f:
+        f.write(
+            "[CUSTOMER LOADS]\n"
+            "FORMAT_CUSTOMERLOADS=SectionID,DeviceNumber,LoadType,LoadPhase,Value1\n"
+            "S1,L1,SPOT,A,1\nS1,L1,SPOT,B,1\nS2,L2,SPOT,A,1\nS1,L3,SPOT,C,1\n\n"
+        )
+    reader = Reader(data_folder_path=str(tmpdir))
+    groups = [
+        (ID, [row["loadphase"] for row in rows])
+        for ID, rows in reader.iter_customer_loads()
+    ]
+    assert groups == [("S1", ["A", "B"]), ("S2", ["A"]), ("S1", ["C"])]
+    reader.close_files()
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from ditto.readers.cyme.read import Reader
+from ditto.readers.cyme import section_index
+from ditto.readers.cyme.section_index import SectionIndex
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+NETWORK = (
+    "[GENERAL]\r\nCYME_VERSION=8.00\r\n\r\n[SI]\r\n\r\n"
+    "[NODE]\r\nFORMAT_NODE=NodeID,CoordX,CoordY\r\nN1,0,0\r\nN2,1,0\r\n\r\n"
+    "[SECTION]\r\nFORMAT_SECTION=SectionID,FromNodeID,ToNodeID\r\nS1,N1,N2\r\n\r\n"
+    "[NODE CONNECTOR]\r\nFORMAT_NODECONNECTOR=NodeID,CoordX,CoordY\r\nN1,0,1"
+)
+
+
+def test_section_index(tmpdir):
+    filename = str(tmpdir.join("network.txt"))
+    with open(filename, "w", newline="") as f:
+        f.write(NETWORK)
+    index = SectionIndex(filename)
+
+    assert index.headers == [
+        "[GENERAL]",
+        "[SI]",
+        "[NODE]",
+        "[SECTION]",
+        "[NODE CONNECTOR]",
+    ]
+    with open(filename, "r") as f:
+        assert list(index.lines()) == f.readlines()
+    assert list(index.lines(["[NODE]"])) == [
+        "[NODE]\n",
+        "FORMAT_NODE=NodeID,CoordX,CoordY\n",
+        "N1,0,0\n",
+        "N2,1,0\n",
+        "\n",
+    ]
+    assert index.sections(["[NODE CONNECTOR]", "[SI]"]) == [1, 4]
+    assert list(index.lines(["[BREAKER]"])) == []
+    index.close()
+
+
+@pytest.mark.parametrize("filename", ["network", "equipment", "load"])
+def test_get_file_content(filename):
+    data_folder_path = os.path.join(
+        current_directory, "../../data/small_cases/cyme/ieee_13node"
+    )
+    reader = Reader(data_folder_path=data_folder_path, load_filename="load.txt")
+    reader.get_file_content(filename)
+    with open(os.path.join(data_folder_path, filename + ".txt"), "r") as f:
+        lines = f.readlines()
+    assert list(reader.content) == lines
+
+    # Restricting the content to the sections of some objects keeps the lines of these sections only
+    objects = ["node", "section", "line", "conductor", "loads", "customer_loads"]
+    reader.get_file_content(filename, objects)
+    headers = [h for obj in objects for h in reader.header_mapping[obj]]
+    expected = []
+    keep = False
+    for line in lines:
+        if line.lstrip().startswith("["):
+            keep = any(h in line for h in headers)
+        if keep:
+            expected.append(line)
+    assert list(reader.content) == expected
+    reader.close_files()
+
+
+def test_section_index_blocks(tmpdir, monkeypatch):
+    filename = str(tmpdir.join("network.txt"))
+    with open(filename, "w", newline="") as f:
+        f.write(NETWORK)
+    # Sections larger than a block are decoded in several blocks, without splitting the lines
+    monkeypatch.setattr(section_index, "BLOCK_SIZE", 7)
+    index = SectionIndex(filename)
+    with open(filename, "r") as f:
+        assert list(index.lines()) == f.readlines()
+    assert list(index.lines(["[NODE]"]))[2:4] == ["N1,0,0\n", "N2,1,0\n"]
+    index.close()
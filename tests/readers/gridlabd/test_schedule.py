@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ditto.models.load import Load
+from ditto.readers.gridlabd.read import Reader
+from ditto.readers.gridlabd.schedule import compile_schedule, parse_field
+from ditto.store import Store
+
+ROWS = (
+    ("*", "0-5", "*", "*", "1-5", "0.5"),
+    ("*/15", "6-11", "1,15", "*", "0,6", "0.7"),
+    ("0-29", "12-23", "*", "6-8", "*", "1.2"),
+    ("*", "*", "10-20", "*", "*", "0.9"),
+)
+
+MODEL = """
+schedule residential {
+    * 0-5 * * * 0.5
+    * 6-23 * * * 1.0
+}
+object node:1 {
+    name n1;
+    phases ABCN;
+    bustype SWING;
+    nominal_voltage 2401.7771;
+}
+object load:2 {
+    name l2;
+    parent n1;
+    phases AB;
+    nominal_voltage 2401.7771;
+    base_power_A residential*5;
+    base_power_B 2*residential;
+}
+"""
+
+
+@pytest.mark.parametrize(
+    "text, low, high, expected",
+    [
+        ("*", 0, 6, [0, 1, 2, 3, 4, 5, 6]),
+        ("1-3,5", 0, 6, [1, 2, 3, 5]),
+        ("*/15", 0, 59, [0, 15, 30, 45]),
+        ("10/20", 0, 59, [10, 30, 50]),
+        ("12", 1, 12, [12]),
+    ],
+)
+def test_parse_field(text, low, high, expected):
+    assert np.flatnonzero(parse_field(text, low, high)).tolist() == expected
+
+
+def test_parse_field_invalid():
+    with pytest.raises(ValueError):
+        parse_field("0-13", 1, 12)
+
+
+def test_schedule_croniter():
+    croniter = pytest.importorskip("croniter").croniter
+    schedule = compile_schedule("test", ROWS)
+    times = [datetime(2017, 1, 1) + timedelta(minutes=17 * k) for k in range(2000)]
+    values = schedule.values(times)
+    for time, value in zip(times, values):
+        # Value of the first row matching the time, as the reader computed it with croniter
+        expected = np.nan
+        for row in ROWS:
+            cron = croniter(" ".join(row[:-1]), time - timedelta(minutes=1))
+            if cron.get_next(datetime) == time:
+                expected = float(row[-1])
+                break
+        assert value == expected or (np.isnan(value) and np.isnan(expected))
+    assert schedule.value(datetime(2017, 6, 1, 2)) == 0.5
+    assert schedule.value(datetime(2017, 1, 3, 8)) is None
+
+
+def test_schedule_profile():
+    schedule = compile_schedule("test", ROWS)
+    assert compile_schedule("test", ROWS) is schedule
+    profile = schedule.yearly_profile(2016, 3600)
+    assert len(profile) == 8784
+    assert profile.index[0] == pd.Timestamp(2016, 1, 1)
+    assert not profile["test"].isnull().any()
+    # Profiles are computed once
+    assert schedule.yearly_profile(2016, 3600) is profile
+
+
+def test_reader_schedules(tmpdir, monkeypatch):
+    filename = str(tmpdir.join("model.glm"))
+    with open(filename, "w") as f:
+        f.write(MODEL)
+    monkeypatch.setattr(Reader, "all_gld_objects", {})
+    model = Store()
+    Reader(input_file=filename, schedule_interval=3600).parse(
+        model, origin_datetime="2017 Jun 1 2:00AM"
+    )
+    load = [obj for obj in model.models if isinstance(obj, Load)][0]
+    assert [(p.phase, p.p) for p in load.phase_loads] == [("A", 2.5), ("B", 1.0)]
+    assert [(t.data_label, t.scale_factor) for t in load.timeseries] == [
+        ("residential", 5.0),
+        ("residential", 2.0),
+    ]
+    assert load.timeseries[0].data is load.timeseries[1].data
+    assert load.timeseries[0].data["residential"].tolist()[:8] == [0.5] * 6 + [1.0] * 2
@@ -0,0 +1,144 @@
+import os
+
+import pytest
+
+from ditto.readers.gridlabd.tokenizer import GLMTokenizer, tokenize
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+
+def write(directory, filename, content):
+    with open(str(directory.join(filename)), "w") as f:
+        f.write(content)
+    return str(directory.join(filename))
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("  phases ABCN; // comment\n", ["phases", "ABCN", ";"]),
+        ("object load:1{\n", ["object", "load:1", "{"]),
+        ("length 100 ft;}\n", ["length", "100", "ft", ";", "}"]),
+        ('name "load 1; A"; // "comment"\n', ["name", '"load 1; A"', ";"]),
+        (
+            "timestamp '2000-01-01 0:00:00';\n",
+            ["timestamp", "'2000-01-01 0:00:00'", ";"],
+        ),
+        ("// object node {\n", []),
+    ],
+)
+def test_tokenize(line, expected):
+    assert tokenize(line) == expected
+
+
+def test_records(tmpdir):
+    filename = write(
+        tmpdir,
+        "model.glm",
+        """// Model
+clock {
+    timestamp '2000-01-01 0:00:00';
+}
+module powerflow {
+    solver_method NR;
+}
+#define VOLTAGE=2401.7771
+#set relax_naming_rules=1
+object meter:1 {
+    phases ABCN;
+    nominal_voltage ${VOLTAGE} V; // volts
+    object triplex_meter {
+        name tm1;
+        object house {
+            floor_area 1500 sf;
+        };
+    };
+    name m1
+    configuration object line_configuration {
+        name lc1;
+    };
+}
+schedule residential {
+    * 0-5 * * * 0.5
+    * 6-23 * * * 1.0;
+}
+object load:2 { name "load 2"; phases A; }
+""",
+    )
+    tokenizer = GLMTokenizer(filename)
+    records = list(tokenizer.records())
+    assert [(r["type"], r.get("class"), r["name"]) for r in records] == [
+        ("object", "meter", "meter:1"),
+        ("object", "triplex_meter", None),
+        ("object", "house", None),
+        ("object", "line_configuration", None),
+        ("schedule", None, "residential"),
+        ("object", "load", "load:2"),
+    ]
+    assert records[0]["parent"] is None
+    assert records[0]["properties"] == [
+        ("phases", "ABCN", None),
+        ("nominal_voltage", "2401.7771", "V"),
+        ("name", "m1", None),
+        ("configuration", "lc1", None),
+    ]
+    assert records[1]["parent"] == "meter:1"
+    assert records[2]["parent"] == "tm1"
+    assert records[2]["properties"] == [("floor_area", "1500", "sf")]
+    assert records[4]["rows"] == [
+        ["*", "0-5", "*", "*", "*", "0.5"],
+        ["*", "6-23", "*", "*", "*", "1.0"],
+    ]
+    assert records[5]["properties"] == [
+        ("name", '"load 2"', None),
+        ("phases", "A", None),
+    ]
+    assert tokenizer.defines == {"VOLTAGE": "2401.7771"}
+    assert tokenizer.globals == {"relax_naming_rules": "1"}
+
+
+def test_records_include(tmpdir):
+    tmpdir.mkdir("lines")
+    write(
+        tmpdir,
+        "model.glm",
+        'object node:1 {\n}\n#include "lines/lines.glm"\nobject node:3 {\n}\n',
+    )
+    write(
+        tmpdir.join("lines"),
+        "lines.glm",
+        '#include "conductors.glm"\nobject overhead_line:2 {\n}\n',
+    )
+    write(
+        tmpdir.join("lines"),
+        "conductors.glm",
+        "object overhead_line_conductor:4 {\n}\n",
+    )
+    tokenizer = GLMTokenizer(str(tmpdir.join("model.glm")))
+    # Included files are read in place, relatively to the including file
+    assert [r["name"] for r in tokenizer.records()] == [
+        "node:1",
+        "overhead_line_conductor:4",
+        "overhead_line:2",
+        "node:3",
+    ]
+    assert len(tokenizer.includes) == 3
+
+
+def test_records_include_cycle(tmpdir):
+    write(tmpdir, "a.glm", '#include "b.glm"\n')
+    write(tmpdir, "b.glm", 'object node:1 {\n}\n#include "a.glm"\n')
+    with pytest.raises(ValueError):
+        list(GLMTokenizer(str(tmpdir.join("a.glm"))).records())
+
+
+def test_records_ieee_123node():
+    filename = os.path.join(
+        current_directory,
+        "../../data/big_cases/gridlabd/ieee_123node/123_node.glm",
+    )
+    records = list(GLMTokenizer(filename).records())
+    assert len(records) == 302
+    assert all(r["type"] == "object" and r["parent"] is None for r in records)
+    node = [r for r in records if r["name"] == "node:150"][0]
+    assert ("name", "150", None) in node["properties"]
@@ -263,3 +263,18 @@ def test_linegeometries():
         assert phased_wires[p].resistance == pytest.approx(
             0.076705 * 1609.34 * 0.00328084, 0.00001
         )
+
+
+def test_concentric_neutral_cables():
+    m = Store()
+    r = Reader(master_file=os.path.join(current_directory, "test_cndata.dss"))
+    r.parse(m)
+    m.set_names()
+
+    # Each line uses the concentric neutral data of its own cables
+    for line_name, k, gmr_strand in [("line1", 13, 2), ("line2", 6, 1)]:
+        assert m[line_name].line_type == "underground"
+        assert len(m[line_name].wires) == 3
+        for wire in m[line_name].wires:
+            assert wire.concentric_neutral_nstrand == k
+            assert wire.concentric_neutral_gmr == pytest.approx(gmr_strand * 0.0254)
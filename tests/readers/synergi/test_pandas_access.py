@@ -0,0 +1,84 @@
+import json
+import os
+import platform
+
+import numpy as np
+import pytest
+
+from ditto.readers.synergi import pandas_access
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+# Stubs of mdb-tables, mdb-schema and mdb-export reading databases described by JSON files
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows", reason="The mdbtools stubs are Python scripts"
+)
+
+DATABASE = {
+    "tables": {
+        "Node": {
+            "columns": {"NodeId": "Text (50)", "X": "Double", "Y": "Double"},
+            "rows": 3,
+        },
+        "Line": {
+            "columns": {
+                "SectionId": "Text (50)",
+                "Phases": "Long Integer",
+                "Z": "Double",
+            },
+            "rows": 2,
+        },
+        "Device": {"columns": {"DeviceId": "Text (50)", "Z": "Double"}, "rows": 0},
+    }
+}
+
+
+@pytest.fixture
+def database(tmpdir, monkeypatch):
+    monkeypatch.setattr(
+        pandas_access,
+        "path_to_mdbtools",
+        os.path.join(current_directory, "mdbtools", "bin"),
+    )
+    filename = str(tmpdir.join("database.mdb"))
+    with open(filename, "w") as f:
+        json.dump(DATABASE, f)
+    return filename
+
+
+def test_read_table(database):
+    assert pandas_access.list_tables(database) == ["Node", "Line", "Device"]
+    df = pandas_access.read_table(database, "Line")
+    assert df["SectionId"].tolist() == ["SECTIONID_0", "SECTIONID_1"]
+    assert df["Phases"].dtype == np.int_
+    assert df["Z"].tolist() == [0.0, 0.5]
+
+
+def test_schema_cache(database, monkeypatch):
+    calls = []
+    original_read_schema = pandas_access.read_schema
+
+    def read_schema(rdb_file, encoding="utf8"):
+        calls.append(rdb_file)
+        return original_read_schema(rdb_file, encoding)
+
+    monkeypatch.setattr(pandas_access, "read_schema", read_schema)
+    for table in ["Node", "Line", "Device"]:
+        pandas_access.read_table(database, table)
+    assert calls == [database]
+
+    # The schema is read again when the database is modified
+    os.utime(database, (0, 0))
+    pandas_access.read_table(database, "Node")
+    assert calls == [database, database]
+
+
+def test_read_tables(database):
+    tables = pandas_access.read_tables(
+        database, ["Device", "Node", "Line"], max_workers=2
+    )
+    assert list(tables) == ["Device", "Node", "Line"]
+    for table, df in tables.items():
+        assert df.equals(pandas_access.read_table(database, table))
+    assert len(tables["Node"]) == 3
+    assert len(tables["Device"]) == 0
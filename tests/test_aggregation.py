@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+test_aggregation
+----------------------------------
+
+Tests the bottom-up aggregation of the loads downstream of the devices
+"""
+
+import math
+import os
+
+import pytest
+
+from ditto.store import Store
+from ditto.models.node import Node
+from ditto.models.line import Line
+from ditto.models.load import Load
+from ditto.models.phase_load import PhaseLoad
+from ditto.models.photovoltaic import Photovoltaic
+from ditto.models.powertransformer import PowerTransformer
+from ditto.network.network import Network
+from ditto.network.aggregation import DownstreamAggregator, QUANTITIES
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+# Loads of the IEEE 13 node feeder: (kW, kvar)
+IEEE_13NODE_LOADS = {
+    "load_671": (1155, 660),
+    "load_634a": (160, 110),
+    "load_634b": (120, 90),
+    "load_634c": (120, 90),
+    "load_645": (170, 125),
+    "load_646": (230, 132),
+    "load_692": (170, 151),
+    "load_675a": (485, 190),
+    "load_675b": (68, 60),
+    "load_675c": (290, 212),
+    "load_611": (170, 80),
+    "load_652": (128, 86),
+    "load_670a": (17, 10),
+    "load_670b": (66, 38),
+    "load_670c": (117, 68),
+}
+
+
+def build_ieee_13node_aggregator():
+    """
+    IEEE 13 node feeder with the line 684652 used as a fuse and a 5kW PV at 652.
+    Returns the model and its DownstreamAggregator.
+    """
+    from ditto.readers.opendss.read import Reader
+
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(
+            current_directory,
+            "data",
+            "small_cases",
+            "opendss",
+            "ieee_13node",
+            "master.dss",
+        )
+    )
+    r.parse(m)
+    m.set_names()
+    m["684652"].is_fuse = True
+    Photovoltaic(m, name="pv", connecting_element="652", rated_power=5000)
+    network = Network()
+    network.build(m, source="sourcebus")
+    network.set_attributes(m)
+    return m, DownstreamAggregator(m, network.digraph)
+
+
+def test_downstream_totals_opendss():
+    m, aggregator = build_ieee_13node_aggregator()
+    assert sorted(aggregator.devices.index) == [
+        "684652",
+        "reg1",
+        "reg2",
+        "reg3",
+        "regulator_reg1",
+        "regulator_reg2",
+        "regulator_reg3",
+        "sub",
+        "xfm1",
+    ]
+
+    # Everything is downstream of the substation
+    assert aggregator.downstream_loads("sub") == list(IEEE_13NODE_LOADS)
+    totals = aggregator.totals("sub")
+    assert set(totals) == set(QUANTITIES)
+    assert totals["p_kw"] == pytest.approx(3466)
+    assert totals["q_kvar"] == pytest.approx(2102)
+    assert totals["num_loads"] == 15
+    assert totals["num_customers"] == 15
+    assert totals["der_kw"] == pytest.approx(5)
+    assert aggregator.totals("regulator_reg2") == totals
+
+    # Three single phase loads at 634 behind XFM1
+    assert aggregator.downstream_loads("xfm1") == [
+        "load_634a",
+        "load_634b",
+        "load_634c",
+    ]
+    totals = aggregator.totals("xfm1")
+    assert totals["p_kw"] == pytest.approx(400)
+    assert totals["q_kvar"] == pytest.approx(290)
+    assert totals["kva"] == pytest.approx(math.hypot(160, 110) + 2 * 150)
+    assert totals["der_kw"] == 0
+
+    assert aggregator.downstream_loads("684652") == ["load_652"]
+    totals = aggregator.totals("684652")
+    assert totals["p_kw"] == pytest.approx(128)
+    assert totals["der_kw"] == pytest.approx(5)
+
+
+def test_nearest_device_mapping_opendss():
+    m, aggregator = build_ieee_13node_aggregator()
+
+    # The loads at 634 are behind XFM1, the other loads are only behind the substation
+    behind_sub = [name for name in IEEE_13NODE_LOADS if not name.startswith("load_634")]
+    assert aggregator.load_mapping("PowerTransformer") == {
+        "sub": behind_sub,
+        "xfm1": ["load_634a", "load_634b", "load_634c"],
+    }
+    assert aggregator.load_mapping("PowerTransformer", unique=True) == {
+        "sub": behind_sub
+    }
+    assert aggregator.load_mapping("ProtectiveDevice") == {"684652": ["load_652"]}
+
+
+def test_totals_of_loads_duplicate_names():
+    m = Store()
+    for name in ["n0", "n1", "n2"]:
+        Node(m, name=name)
+    PowerTransformer(m, name="t1", from_element="n0", to_element="n1")
+    Line(m, name="l2", from_element="n1", to_element="n2", length=1)
+    # Two loads share a name: the last one is the one found by name in the Store
+    for p in [1000, 3000]:
+        Load(
+            m,
+            name="load",
+            connecting_element="n2",
+            phase_loads=[PhaseLoad(m, phase="A", p=p, q=0)],
+        )
+    network = Network()
+    network.build(m, source="n0")
+    network.set_attributes(m)
+    aggregator = DownstreamAggregator(m, network.digraph)
+
+    assert aggregator.load_mapping("PowerTransformer") == {"t1": ["load"]}
+    totals = aggregator.totals_of_loads(["load", "load"])
+    assert totals["p_kw"] == pytest.approx(3)
+    assert totals["num_loads"] == 1
+    with pytest.raises(KeyError):
+        aggregator.totals_of_loads(["unknown"])
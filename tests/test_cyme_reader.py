@@ -215,3 +215,84 @@ def test_switches():
 
             else:
                 raise ValueError("Unknown line name {name}".format(name=obj.name))
+
+
+def test_parallel_parsing():
+    """
+    Tests that reading the files in worker processes gives the same model as the sequential reader.
+    """
+    from ditto.readers.cyme.read import Reader
+
+    def values(obj):
+        if isinstance(obj, list):
+            return [values(x) for x in obj]
+        if hasattr(obj, "_trait_values"):
+            return sorted(
+                (k, values(v))
+                for k, v in obj._trait_values.items()
+                if not k.startswith("_")
+            )
+        return repr(obj)
+
+    data_folder_path = os.path.join(
+        current_directory, "data", "big_cases", "cyme", "ieee_123node"
+    )
+    models = []
+    for jobs in [1, 2]:
+        m = Store()
+        r = Reader(
+            data_folder_path=data_folder_path, load_filename="load.txt", jobs=jobs
+        )
+        r.parse(m)
+        assert r.scans == {}
+        models.append([(type(obj).__name__, values(obj)) for obj in m.models])
+
+    assert len(models[0]) > 0
+    assert models[0] == models[1]
+
+
+def test_fix_section_overlaps():
+    """
+    Tests that the elements of a section are placed in series and the shunt elements connected to the last node.
+    """
+    from ditto.readers.cyme.read import Reader
+    from ditto.models.node import Node
+    from ditto.models.line import Line
+    from ditto.models.load import Load
+    from ditto.models.regulator import Regulator
+    from ditto.models.powertransformer import PowerTransformer
+
+    m = Store()
+    for name in ["n1", "n2", "n3", "n4"]:
+        node = Node(m)
+        node.name = name
+    r = Reader()
+    line = Line(m, name="s1_line", from_element="n1", to_element="n2")
+    load = Load(m, name="s1_load", connecting_element="n1")
+    transformer = PowerTransformer(
+        m, name="s1_transformer", from_element="n1", to_element="n2"
+    )
+    r.add_section_element("s1", line, "line")
+    r.add_section_element("s1", load, "load")
+    r.add_section_element("s1", transformer, "transformer")
+    r.add_section_element("s2", Line(m, from_element="n2", to_element="n3"), "line")
+    load = Load(m, name="s3_load", connecting_element="n3")
+    regulator = Regulator(m, name="s3_regulator", from_element="n3", to_element="n4")
+    r.add_section_element("s3", load, "load")
+    r.add_section_element("s3", regulator, "regulator")
+
+    statistics = r.fix_section_overlaps(m)
+    assert statistics == {
+        "sections": 3,
+        "multiple_elements": 2,
+        "split_sections": 1,
+        "intermediate_nodes": 1,
+    }
+    # Transformer -> Line, through an intermediate node
+    assert (transformer.from_element, transformer.to_element) == ("n1", "n1_sec_0")
+    assert (line.from_element, line.to_element) == ("n1_sec_0", "n2")
+    assert m["s1_load"].connecting_element == "n2"
+    assert m["s3_load"].connecting_element == "n4"
+
+    with pt.raises(ValueError):
+        r.add_section_element("s1", line, "switch")
@@ -86,3 +86,34 @@ def test_metric_computation_cli():
     p.wait()
     if p.returncode != 0:
         raise Exception("Error in ditto cli: {}".format(p.returncode))
+
+
+def test_opendss_fleet_cli():
+    output_path = tempfile.TemporaryDirectory()
+    p = subprocess.Popen(
+        shlex.split(
+            """ ditto-cli convert --from="opendss" --to="opendss" --input="./tests/data/small_cases/opendss/ieee_4node/master.dss" --input="./tests/data/small_cases/opendss/ieee_13node/master.dss" --output="{}" --jobs=2 """.format(
+                output_path.name
+            ).strip()
+        )
+    )
+    p.wait()
+    if p.returncode != 0:
+        raise Exception("Error in ditto cli: {}".format(p.returncode))
+    for feeder in ["ieee_4node", "ieee_13node"]:
+        assert os.path.exists(os.path.join(output_path.name, feeder, "Master.dss"))
+
+
+def test_opendss_metric_cli():
+    output_path = tempfile.TemporaryDirectory()
+    p = subprocess.Popen(
+        shlex.split(
+            """ ditto-cli metric --from="opendss" --to="json" --input="./tests/data/small_cases/opendss/ieee_13node/master.dss" --feeder=False --output="{}" """.format(
+                output_path.name
+            ).strip()
+        )
+    )
+    p.wait()
+    if p.returncode != 0:
+        raise Exception("Error in ditto cli: {}".format(p.returncode))
+    assert len(os.listdir(output_path.name)) > 0
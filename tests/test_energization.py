@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+test_energization
+----------------------------------
+
+Tests the switch-state-aware views of the DiTTo network
+"""
+
+import os
+
+from ditto.store import Store
+from ditto.models.node import Node
+from ditto.models.line import Line
+from ditto.models.wire import Wire
+from ditto.models.power_source import PowerSource
+from ditto.network.energization import EnergizationView
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+
+def test_switch_toggles_opendss():
+    from ditto.readers.opendss.read import Reader
+
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(
+            current_directory,
+            "data",
+            "small_cases",
+            "opendss",
+            "ieee_13node",
+            "master.dss",
+        )
+    )
+    r.parse(m)
+    view = EnergizationView.from_model(m)
+    n_edges = view.graph.number_of_edges()
+
+    # 16 buses, the power source, 15 loads and 2 capacitors
+    assert view.switch_names == ["671692"]
+    assert view.open_switches() == []
+    assert view.number_of_energized_nodes() == 34
+    assert view.source_of("675") == "sourcebus"
+
+    # Opening the switch 671-692 de-energizes 692, 675 and the elements connected to them
+    downstream = set(
+        ["692", "675", "cap1", "load_692", "load_675a", "load_675b", "load_675c"]
+    )
+    view.open_switch("671692")
+    assert view.open_switches() == ["671692"]
+    assert view.number_of_energized_nodes() == 34 - len(downstream)
+    assert not any(view.is_energized(node) for node in downstream)
+    assert view.source_of("675") is None
+    assert view.source_of("680") == "sourcebus"
+    assert downstream in [set(c) for c in view.connected_components()]
+    assert not view.graph_view().has_edge("671", "692")
+
+    view.toggle_switch("671692")
+    assert view.number_of_energized_nodes() == 34
+    assert len(view.connected_components()) == 1
+
+    # The graph is never modified
+    assert view.graph.number_of_edges() == n_edges
+
+
+def test_service_areas_and_sweep():
+    m = Store()
+    for name in ["s1", "a1", "a2", "s2", "b1"]:
+        Node(m, name=name)
+    PowerSource(m, name="src1", connecting_element="s1")
+    PowerSource(m, name="src2", connecting_element="s2")
+    for name, n1, n2, is_switch, is_open in [
+        ("l1", "s1", "a1", False, False),
+        ("sw1", "a1", "a2", True, False),
+        ("tie", "a2", "b1", True, True),
+        ("l2", "s2", "b1", False, False),
+    ]:
+        Line(
+            m,
+            name=name,
+            from_element=n1,
+            to_element=n2,
+            is_switch=is_switch,
+            wires=[Wire(m, phase="A", is_open=is_open)],
+        )
+    view = EnergizationView.from_model(m)
+    assert view.source_of("a2") == "s1"
+
+    # Transfer a2 to the second source
+    view.open_switch("sw1")
+    assert view.source_of("a2") is None
+    view.close_switch("tie")
+    assert view.source_of("a2") == "s2"
+    assert view.service_area("s2") == set(["s2", "src2", "b1", "a2"])
+
+    # Sweep over all the configurations of the two devices
+    results = {}
+    for state in [(True, True), (True, False), (False, True), (False, False)]:
+        mask = [None, None]
+        mask[view.switch_names.index("sw1")] = state[0]
+        mask[view.switch_names.index("tie")] = state[1]
+        view.set_state(mask)
+        results[state] = view.number_of_energized_nodes()
+    assert results == {
+        (True, True): 7,
+        (True, False): 7,
+        (False, True): 7,
+        (False, False): 6,
+    }
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+test_fleet_converter
+----------------------------------
+
+Tests the parsing of several feeders in parallel worker processes
+"""
+
+import os
+import warnings
+
+from ditto.store import Store
+from ditto.readers.opendss.read import Reader
+from ditto.fleet_converter import FleetConverter, feeder_names
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+FEEDERS = ["ieee_4node", "ieee_13node", "storage_test"]
+
+
+def test_fleet_parse(monkeypatch):
+    monkeypatch.setattr(Reader, "format_name", "opendss", raising=False)
+    input_paths = [
+        os.path.join(
+            current_directory, "data/small_cases/opendss", feeder, "master.dss"
+        )
+        for feeder in FEEDERS
+    ]
+    progress = []
+    fleet = FleetConverter(
+        Reader,
+        None,
+        input_paths,
+        None,
+        jobs=2,
+        progress=lambda done, total, summary: progress.append((done, total)),
+    )
+    summaries = fleet.parse()
+
+    assert sorted(progress) == [(1, 3), (2, 3), (3, 3)]
+    assert [summary["feeder"] for summary in summaries] == FEEDERS
+    assert all(summary["error"] is None for summary in summaries)
+    for feeder, input_path in zip(FEEDERS, input_paths):
+        m = Store()
+        Reader(master_file=input_path).parse(m)
+        m.set_names()
+        parsed = fleet.models[feeder]
+        assert len(parsed.models) == len(m.models)
+        assert sorted(parsed.model_names) == sorted(m.model_names)
+        assert all(getattr(obj, "_model", parsed) is parsed for obj in parsed.models)
+
+    merged = FleetConverter(Reader, None, input_paths, None, jobs=2, merge=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UserWarning)
+        merged.parse()
+    names = [obj.name for obj in merged.m.models if getattr(obj, "name", None)]
+    assert len(names) == len(set(names))
+    assert sorted(names) == sorted(
+        "{}_{}".format(feeder, name)
+        for feeder, model in fleet.models.items()
+        for name in model.model_names
+    )
+    line = merged.m["ieee_13node_671692"]
+    assert line.from_element == "ieee_13node_671"
+    assert line.to_element == "ieee_13node_692"
+    assert merged.m["ieee_4node_sourcebus"] is not merged.m["ieee_13node_sourcebus"]
+
+
+def test_feeder_names():
+    assert feeder_names(["a/master.dss", "b/master.dss", "c/feeder.dss"]) == [
+        "a",
+        "b",
+        "feeder",
+    ]
+    assert feeder_names(["a/master.dss", "x/a/master.dss"]) == ["a_0", "a_1"]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+"""
+test_gridlabd_format.py
+----------------------------------
+
+Tests for the GridLAB-D classes generated from the schema
+"""
+import pytest
+
+from ditto.formats.gridlabd import gridlabd
+
+
+def test_property_names():
+    # The properties of the parents are inherited (load <- node <- powerflow)
+    assert gridlabd.powerflow._property_names <= gridlabd.node._property_names
+    assert gridlabd.node._property_names <= gridlabd.load._property_names
+    assert "constant_power_A" in gridlabd.load._property_names
+    assert "constant_power_A" not in gridlabd.node._property_names
+    assert len(gridlabd.load._all_properties) == len(gridlabd.load._property_names)
+
+
+def test_setitem():
+    load = gridlabd.load(name="load:1", parent="node:1")
+    load["constant_power_A"] = "1000+200j"
+    assert load["name"] == "load:1"
+    assert load["parent"] == "node:1"
+    assert load["constant_power_A"] == "1000+200j"
+    with pytest.raises(AttributeError):
+        load["unknown"] = 1
+    with pytest.raises(AttributeError):
+        gridlabd.node()["constant_power_A"] = "1000+200j"
@@ -76,3 +76,575 @@ def test_metric_extraction():
 
         # Export them to JSON
         net.export_json(os.path.join(output_path, "metrics.json"))
+
+
+def test_metric_extraction_per_feeder_parallel():
+    """
+        This test splits the IEEE 13 node feeder into two feeders and checks that computing
+        the metrics per feeder in worker processes gives the same results as the serial computation.
+    """
+    import networkx as nx
+    import numpy as np
+    from ditto.readers.opendss.read import Reader
+    from ditto.store import Store
+    from ditto.modify.system_structure import system_structure_modifier
+    from ditto.metrics.network_analysis import NetworkAnalyzer as network_analyzer
+
+    def compute_metrics(jobs):
+        m = Store()
+        r = Reader(
+            master_file=os.path.join(
+                current_directory, "data/small_cases/opendss/ieee_13node/master.dss"
+            ),
+            buscoordinates_file=os.path.join(
+                current_directory, "data/small_cases/opendss/ieee_13node/buscoord.dss"
+            ),
+        )
+        r.parse(m)
+        m.set_names()
+        modifier = system_structure_modifier(m)
+        modifier.set_nominal_voltages_recur()
+        modifier.set_nominal_voltages_recur_line()
+
+        net = network_analyzer(modifier.model, True, "sourcebus")
+        net.model.set_names()
+        feeder_1 = ["670"] + list(nx.descendants(net.G.digraph, "670"))
+        feeder_2 = [n for n in net.G.graph.nodes() if n not in feeder_1]
+        net.add_feeder_information(
+            ["feeder_1", "feeder_2"],
+            [feeder_1, feeder_2],
+            {"feeder_1": "632", "feeder_2": "sourcebus"},
+            "test",
+        )
+        net.split_network_into_feeders()
+        net.tag_objects()
+        net.compute_all_metrics_per_feeder(jobs=jobs)
+        return net.results
+
+    serial = compute_metrics(1)
+    parallel = compute_metrics(2)
+
+    assert list(serial.keys()) == list(parallel.keys())
+    for feeder_name in serial:
+        assert serial[feeder_name].keys() == parallel[feeder_name].keys()
+        for key, value in serial[feeder_name].items():
+            if isinstance(value, float) and np.isnan(value):
+                assert np.isnan(parallel[feeder_name][key])
+            else:
+                assert value == parallel[feeder_name][key], key
+    assert serial["feeder_2"]["num_distribution_transformers"] == 2
+
+
+def test_single_pass_distance_metrics():
+    """
+        This test builds a random radial network and checks the distance metrics computed from a
+        single traversal against the networkx all pairs computations.
+    """
+    import random
+    import networkx as nx
+    import numpy as np
+    from ditto.store import Store
+    from ditto.models.node import Node
+    from ditto.models.line import Line
+    from ditto.models.wire import Wire
+    from ditto.models.power_source import PowerSource
+    from ditto.metrics.network_analysis import NetworkAnalyzer as network_analyzer
+
+    rng = random.Random(0)
+    m = Store()
+    for i in range(300):
+        Node(m, name="n{}".format(i))
+    PowerSource(m, name="Vsource.source", connecting_element="n0", is_sourcebus=1)
+    for i in range(1, 300):
+        Line(
+            m,
+            name="l{}".format(i),
+            from_element="n{}".format(rng.randrange(i)),
+            to_element="n{}".format(i),
+            length=rng.uniform(10, 100),
+            wires=[Wire(m, phase="A")],
+        )
+    m.set_names()
+    net = network_analyzer(m, True, "n0")
+    graph = net.G.graph
+
+    assert net.diameter() == nx.diameter(graph)
+    assert np.isclose(net.average_path_length(), nx.average_shortest_path_length(graph))
+
+    expected = max(
+        nx.shortest_path_length(graph, "n0", node, weight="length")
+        for node in graph.nodes()
+    )
+    assert np.isclose(net.furtherest_node_miles(), expected * 0.000621371)
+    assert np.isclose(net.furtherest_node_miles_clever(), expected * 0.000621371)
+    assert len(net.source_distance_distribution()) == graph.number_of_nodes()
+
+    # Not a tree anymore: falls back to networkx
+    loop = graph.copy()
+    loop.add_edge("n10", "n250", length=1)
+    assert net.tree_hop_statistics(loop) is None
+    assert net.diameter(loop) == nx.diameter(loop)
+
+
+def test_columnar_scalar_metrics():
+    """
+        This test checks the scalar metrics computed from the columnar extracts on the IEEE 13 node feeder,
+        after an edit of the model, then splits it in two feeders and checks the per feeder metrics and
+        the group-by reduction used for the per feeder results.
+    """
+    import networkx as nx
+    import numpy as np
+    from ditto.readers.opendss.read import Reader
+    from ditto.models.phase_load import PhaseLoad
+    from ditto.store import Store
+    from ditto.modify.system_structure import system_structure_modifier
+    from ditto.metrics.network_analysis import NetworkAnalyzer as network_analyzer
+
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(
+            current_directory, "data/small_cases/opendss/ieee_13node/master.dss"
+        ),
+        buscoordinates_file=os.path.join(
+            current_directory, "data/small_cases/opendss/ieee_13node/buscoord.dss"
+        ),
+    )
+    r.parse(m)
+    m.set_names()
+    modifier = system_structure_modifier(m)
+    modifier.set_nominal_voltages_recur()
+    modifier.set_nominal_voltages_recur_line()
+
+    net = network_analyzer(modifier.model, True, "sourcebus")
+    net.LV_threshold = 3000
+    net.MV_threshold = 200000
+
+    assert net.lv_length_miles() == 0
+    assert net.mv_length_miles() == pytest.approx(1.55365119356)
+    assert net.length_mvXph_miles(1) == pytest.approx(0.20833326888)
+    assert net.length_mvXph_miles(3) == pytest.approx(1.1369846558)
+    assert net.total_demand() == pytest.approx(3466.0)
+    assert net.total_reactive_power() == pytest.approx(2102.0)
+    assert net.number_of_loads_LV_Xph(1) == 3
+    assert net.number_of_loads_MV_3ph() == 1
+    assert net.percentage_load_LV_kW_phX("A") == pytest.approx(40.0)
+    assert net.number_of_regulators() == 3
+    assert net.number_of_capacitors() == 2
+    assert net.number_of_switches() == 1
+    with pytest.raises(ValueError):
+        net.length_lvXph_miles(4)
+    with pytest.raises(ValueError):
+        net.number_of_loads_LV_Xph(2)
+
+    # The metrics follow the edits of the model
+    phase_loads = [obj for obj in m.models if isinstance(obj, PhaseLoad)]
+    for phase_load in phase_loads:
+        phase_load.p *= 2
+    assert net.total_demand() == pytest.approx(2 * 3466.0)
+    for phase_load in phase_loads:
+        phase_load.p /= 2
+    assert net.total_demand() == pytest.approx(3466.0)
+
+    feeder_1 = ["670"] + list(nx.descendants(net.G.digraph, "670"))
+    feeder_2 = [n for n in net.G.graph.nodes() if n not in feeder_1]
+    net.add_feeder_information(
+        ["feeder_1", "feeder_2"],
+        [feeder_1, feeder_2],
+        {"feeder_1": "632", "feeder_2": "sourcebus"},
+        "test",
+    )
+    net.split_network_into_feeders()
+
+    # The metrics of the feeders add up to the metrics of the network
+    feeder_names = ["feeder_1", "feeder_2"]
+    assert sum(
+        net.mv_length_miles(feeder_name=f) for f in feeder_names
+    ) == pytest.approx(net.mv_length_miles())
+    assert sum(
+        net.total_demand(feeder_name=f) for f in feeder_names
+    ) == pytest.approx(net.total_demand())
+    assert sum(
+        net.number_of_loads_LV_Xph(1, feeder_name=f) for f in feeder_names
+    ) == net.number_of_loads_LV_Xph(1)
+    assert net.total_reactive_power(feeder_name="feeder_1") != pytest.approx(
+        net.total_reactive_power()
+    )
+
+    # The additive results of the feeders come from one group-by reduction
+    table = net.scalar_metrics_per_feeder()
+    net.compute_all_metrics_per_feeder()
+    assert table.loc[feeder_names, "num_regulators"].sum() == 3
+    for feeder_name in feeder_names:
+        results = net.results[feeder_name]
+        for key in ["mv_len_mi", "mv_1ph_len_mi", "mv_3ph_len_mi", "lv_len_mi"]:
+            assert results[key] == pytest.approx(
+                table.loc[feeder_name, key] * 0.000621371
+            )
+        for key in ["num_regulators", "num_capacitors", "num_switches"]:
+            assert results[key] == table.loc[feeder_name, key]
+        assert results["sum_lv_pha_load_kw"] == pytest.approx(
+            table.loc[feeder_name, "sum_lv_pha_load_kw"] * 10 ** -3
+        )
+
+
+def test_refresh_recomputes_affected_feeders():
+    """
+        This test splits the IEEE 13 node feeder into two feeders, edits the model (with Modifier.merge
+        and by adding a load), and checks that refresh only recomputes the affected feeder and gives the
+        same results as a computation from scratch.
+    """
+    import networkx as nx
+    import numpy as np
+    from ditto.readers.opendss.read import Reader
+    from ditto.store import Store
+    from ditto.models.line import Line
+    from ditto.models.load import Load
+    from ditto.models.phase_load import PhaseLoad
+    from ditto.modify.modify import Modifier
+    from ditto.modify.system_structure import system_structure_modifier
+    from ditto.metrics.network_analysis import NetworkAnalyzer as network_analyzer
+
+    def read_model():
+        m = Store()
+        r = Reader(
+            master_file=os.path.join(
+                current_directory, "data/small_cases/opendss/ieee_13node/master.dss"
+            ),
+            buscoordinates_file=os.path.join(
+                current_directory, "data/small_cases/opendss/ieee_13node/buscoord.dss"
+            ),
+        )
+        r.parse(m)
+        m.set_names()
+        modifier = system_structure_modifier(m)
+        modifier.set_nominal_voltages_recur()
+        modifier.set_nominal_voltages_recur_line()
+        return modifier.model
+
+    def edit_lengths(m):
+        layer = Store()
+        Line(layer, name="645646", length=500)
+        Modifier().merge(m, layer)
+
+    def edit_transformer_voltage(m):
+        # XFM1 (633 to 634) steps down to 2.4kV instead of 480V: the loads at 634 are no longer LV
+        m["xfm1"].windings[1].nominal_voltage = 2400
+
+    def add_load(m):
+        Load(
+            m,
+            name="load_new",
+            connecting_element="646",
+            nominal_voltage=4160,
+            phase_loads=[PhaseLoad(m, phase="B", p=100000, q=20000)],
+        )
+
+    def analyze(m):
+        net = network_analyzer(m, True, "sourcebus")
+        net.model.set_names()
+        feeder_1 = ["670"] + list(nx.descendants(net.G.digraph, "670"))
+        feeder_2 = [n for n in net.G.graph.nodes() if n not in feeder_1]
+        net.add_feeder_information(
+            ["feeder_1", "feeder_2"],
+            [feeder_1, feeder_2],
+            {"feeder_1": "632", "feeder_2": "sourcebus"},
+            "test",
+        )
+        net.split_network_into_feeders()
+        net.tag_objects()
+        net.compute_all_metrics_per_feeder()
+        return net
+
+    def assert_same_results(results, expected):
+        assert results.keys() == expected.keys()
+        for feeder_name in expected:
+            for key, value in expected[feeder_name].items():
+                if isinstance(value, float) and np.isnan(value):
+                    assert np.isnan(results[feeder_name][key]), key
+                else:
+                    assert results[feeder_name][key] == pytest.approx(value), key
+
+    net = analyze(read_model())
+    assert net.refresh() == []
+    before = {k: dict(v) for k, v in net.results.items()}
+
+    edit_lengths(net.model)
+    assert net.refresh() == ["feeder_2"]
+    assert net.results["feeder_1"] == before["feeder_1"]
+    assert net.results["feeder_2"]["lv_len_mi"] + net.results["feeder_2"][
+        "mv_len_mi"
+    ] != pytest.approx(
+        before["feeder_2"]["lv_len_mi"] + before["feeder_2"]["mv_len_mi"]
+    )
+    m = read_model()
+    edit_lengths(m)
+    assert_same_results(net.results, analyze(m).results)
+
+    add_load(net.model)
+    assert net.refresh() == ["feeder_2"]
+    add_load(m)
+    assert_same_results(net.results, analyze(m).results)
+    assert net.refresh() == []
+
+    num_lv_loads = net.results["feeder_2"]["num_lv_1ph_loads"]
+    edit_transformer_voltage(net.model)
+    assert net.refresh() == ["feeder_2"]
+    assert net.model["634"].nominal_voltage == 2400
+    assert net.results["feeder_2"]["num_lv_1ph_loads"] == num_lv_loads - 3
+    edit_transformer_voltage(m)
+    assert_same_results(net.results, analyze(m).results)
+
+
+def test_metrics_table_export():
+    """
+        This test computes the metrics per feeder of the IEEE 13 node feeder split in two feeders,
+        appends the metrics table twice to a partitioned csv dataset and reads it back with its types.
+    """
+    import networkx as nx
+    from ditto.readers.opendss.read import Reader
+    from ditto.store import Store
+    from ditto.modify.system_structure import system_structure_modifier
+    from ditto.metrics.network_analysis import NetworkAnalyzer as network_analyzer
+    from ditto.metrics.network_analysis import read_metrics_table
+
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(
+            current_directory, "data/small_cases/opendss/ieee_13node/master.dss"
+        ),
+        buscoordinates_file=os.path.join(
+            current_directory, "data/small_cases/opendss/ieee_13node/buscoord.dss"
+        ),
+    )
+    r.parse(m)
+    m.set_names()
+    modifier = system_structure_modifier(m)
+    modifier.set_nominal_voltages_recur()
+    modifier.set_nominal_voltages_recur_line()
+
+    net = network_analyzer(modifier.model, True, "sourcebus")
+    net.model.set_names()
+    feeder_1 = ["670"] + list(nx.descendants(net.G.digraph, "670"))
+    feeder_2 = [n for n in net.G.graph.nodes() if n not in feeder_1]
+    net.add_feeder_information(
+        ["feeder_1", "feeder_2"],
+        [feeder_1, feeder_2],
+        {"feeder_1": "632", "feeder_2": "sourcebus"},
+        "test",
+    )
+    net.split_network_into_feeders()
+    net.tag_objects()
+    net.compute_all_metrics_per_feeder()
+
+    table = net.metrics_table(region="west")
+    assert list(table["feeder_name"]) == list(net.results.keys())
+    assert table.columns[0] == "feeder_name"
+    assert str(table["feeder_name"].dtype) == "string"
+    assert str(table["num_regulators"].dtype) == "Int64"
+    assert str(table["sum_load_kw"].dtype) == "float64"
+    assert (table["region"] == "west").all()
+    for feeder_name, row in zip(table["feeder_name"], table.itertuples()):
+        assert row.sum_load_kw == pytest.approx(net.results[feeder_name]["sum_load_kw"])
+
+    with pytest.raises(ValueError):
+        net.export_table(tempfile.mkdtemp(), output_format="xlsx")
+
+    output_path = os.path.join(tempfile.mkdtemp(), "metrics")
+    paths = []
+    for _ in range(2):
+        paths += net.export_table(
+            output_path, output_format="csv", partition_by=["region"], region="west"
+        )
+    assert len(paths) == 2 and len(set(paths)) == 2
+    assert all(os.path.dirname(p).endswith("region=west") for p in paths)
+
+    result = read_metrics_table(output_path)
+    assert len(result) == 2 * len(table)
+    assert set(result.columns) == set(table.columns)
+    for column in table.columns:
+        assert result[column].dtype == table[column].dtype
+    assert list(result["feeder_name"]) == 2 * list(table["feeder_name"])
+
+
+def test_metrics_table_parquet():
+    """
+        This test appends the metrics table of the IEEE 4 node feeder to a parquet dataset.
+    """
+    pytest.importorskip("pyarrow")
+    from ditto.readers.opendss.read import Reader
+    from ditto.store import Store
+    from ditto.metrics.network_analysis import NetworkAnalyzer as network_analyzer
+    from ditto.metrics.network_analysis import read_metrics_table
+
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(
+            current_directory, "data/small_cases/opendss/ieee_4node/master.dss"
+        )
+    )
+    r.parse(m)
+    m.set_names()
+    net = network_analyzer(m, True, "sourcebus")
+    net.compute_all_metrics()
+
+    output_path = os.path.join(tempfile.mkdtemp(), "metrics")
+    net.export_table(output_path)
+    net.export_table(output_path)
+    result = read_metrics_table(output_path)
+    assert len(result) == 2
+    assert str(result["num_regulators"].dtype) == "Int64"
+
+
+def test_metric_profiling():
+    """
+        This test records the timing of the metrics of the IEEE 13 node feeder split in two feeders,
+        in the current process and in worker processes, and checks the calls and object counts of the report.
+    """
+    import networkx as nx
+    from ditto.readers.opendss.read import Reader
+    from ditto.store import Store
+    from ditto.models.line import Line
+    from ditto.metrics.network_analysis import NetworkAnalyzer as network_analyzer
+
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(
+            current_directory, "data/small_cases/opendss/ieee_13node/master.dss"
+        ),
+        buscoordinates_file=os.path.join(
+            current_directory, "data/small_cases/opendss/ieee_13node/buscoord.dss"
+        ),
+    )
+    r.parse(m)
+    m.set_names()
+
+    net = network_analyzer(m, True, "sourcebus")
+    net.model.set_names()
+    feeder_1 = ["670"] + list(nx.descendants(net.G.digraph, "670"))
+    feeder_2 = [n for n in net.G.graph.nodes() if n not in feeder_1]
+    net.add_feeder_information(
+        ["feeder_1", "feeder_2"],
+        [feeder_1, feeder_2],
+        {"feeder_1": "632", "feeder_2": "sourcebus"},
+        "test",
+    )
+    net.split_network_into_feeders()
+    net.tag_objects()
+    net.compute_all_metrics_per_feeder()
+    expected = net.results
+
+    with pytest.raises(ValueError):
+        net.profiling_report()
+
+    n_lines = len(
+        [
+            obj
+            for obj in m.models
+            if isinstance(obj, Line) and net.get_feeder(obj) is not None
+        ]
+    )
+    for jobs in [1, 2]:
+        net.enable_profiling()
+        net.compute_all_metrics_per_feeder(jobs=jobs)
+        report = net.profiling_report()
+        assert list(report.columns) == [
+            "calls",
+            "objects",
+            "total_s",
+            "mean_s",
+            "max_s",
+            "share_pct",
+        ]
+        assert (report["total_s"].diff().dropna() <= 0).all()
+        assert report.at["analyze_object.Line", "calls"] == n_lines
+        assert report.at["analyze_object.Line", "objects"] == n_lines
+        assert report.at["setup_results_data_structure", "calls"] == 2
+        assert report.at["post_process_feeder_results", "calls"] == 2
+        assert report.at["diameter", "objects"] == net.G.graph.number_of_nodes()
+        assert "analyze_objects" in report.index
+        assert report["share_pct"].sum() == pytest.approx(100)
+        assert net.results.keys() == expected.keys()
+        for feeder_name in expected:
+            assert net.results[feeder_name]["num_regulators"] == (
+                expected[feeder_name]["num_regulators"]
+            )
+            assert net.results[feeder_name]["sum_load_kw"] == pytest.approx(
+                expected[feeder_name]["sum_load_kw"]
+            )
+
+    profiler = net.profiler
+    records = dict((k, list(v)) for k, v in profiler.records.items())
+    net.disable_profiling()
+    net.compute_all_metrics_per_feeder()
+    assert net.profiler is None
+    assert profiler.records == records
+
+
+def test_footprint_metrics():
+    """
+        This test checks the footprint of simple sets of points, and the points gathered per feeder
+        for the IEEE 13 node feeder split in two feeders.
+    """
+    import networkx as nx
+    import numpy as np
+    from ditto.readers.opendss.read import Reader
+    from ditto.store import Store
+    from ditto.metrics.network_analysis import NetworkAnalyzer as network_analyzer
+    from ditto.metrics.network_analysis import footprint
+
+    # Square of 2 by 2 with duplicated and inner points
+    shape = footprint([[0, 0], [2, 0], [2, 2], [0, 2], [1, 1], [0, 0]])
+    assert shape == {"num_unique_points": 5, "width": 2, "height": 2, "hull_area": 4}
+    # Aligned points have no area
+    assert footprint([[0, 0], [1, 1], [2, 2]])["hull_area"] == 0
+    assert footprint(np.zeros((0, 2)))["num_unique_points"] == 0
+
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(
+            current_directory, "data/small_cases/opendss/ieee_13node/master.dss"
+        ),
+        buscoordinates_file=os.path.join(
+            current_directory, "data/small_cases/opendss/ieee_13node/buscoord.dss"
+        ),
+    )
+    r.parse(m)
+    m.set_names()
+    net = network_analyzer(m, True, "sourcebus")
+    net.model.set_names()
+    feeder_1 = ["670"] + list(nx.descendants(net.G.digraph, "670"))
+    feeder_2 = [n for n in net.G.graph.nodes() if n not in feeder_1]
+    net.add_feeder_information(
+        ["feeder_1", "feeder_2"],
+        [feeder_1, feeder_2],
+        {"feeder_1": "632", "feeder_2": "sourcebus"},
+        "test",
+    )
+    net.split_network_into_feeders()
+    net.tag_objects()
+    net.compute_all_metrics_per_feeder()
+
+    for feeder_name in ["feeder_1", "feeder_2"]:
+        expected = [
+            [p.long, p.lat]
+            for obj in m.models
+            if getattr(obj, "positions", None) and net.get_feeder(obj) == feeder_name
+            for p in obj.positions
+        ]
+        points = net.points[feeder_name]
+        assert points.shape == (len(expected), 2)
+        assert points.tolist() == expected
+
+        results = net.results[feeder_name]
+        x, y = points[:, 0], points[:, 1]
+        assert results["bbox_width_km"] == pytest.approx((x.max() - x.min()) * 1e-3)
+        assert results["bbox_height_km"] == pytest.approx((y.max() - y.min()) * 1e-3)
+        area = footprint(points)["hull_area"]
+        assert area > 0
+        assert results["convex_hull_area_km2"] == pytest.approx(area * 1e-6)
+        assert results["cust_density_km2"] == pytest.approx(
+            results["num_customers"] / (area * 1e-6)
+        )
+        assert results["cust_density"] == pytest.approx(
+            results["num_customers"] / (area * 3.86102e-7)
+        )
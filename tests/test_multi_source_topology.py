@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""
+test_multi_source_topology
+----------------------------------
+
+Tests the shared topology of models with several power sources
+"""
+from ditto.store import Store
+from ditto.models.node import Node
+from ditto.models.line import Line
+from ditto.models.load import Load
+from ditto.models.wire import Wire
+from ditto.models.power_source import PowerSource
+from ditto.network.multi_source import MultiSourceTopology
+from ditto.consistency.check_loops import check_loops
+from ditto.consistency.check_loads_connected import check_loads_connected
+from ditto.consistency.check_unique_path import check_unique_path
+
+
+def build_two_feeders(m, tie_is_open):
+    """Two radial feeders s1-a1-a2 and s2-b1-b2 with a tie switch between a2 and b2."""
+    for name in ["s1", "a1", "a2", "s2", "b1", "b2"]:
+        Node(m, name=name)
+    PowerSource(m, name="src1", connecting_element="s1", is_sourcebus=True)
+    PowerSource(m, name="src2", connecting_element="s2", is_sourcebus=True)
+    for n1, n2 in [("s1", "a1"), ("a1", "a2"), ("s2", "b1"), ("b1", "b2")]:
+        Line(
+            m,
+            name=n1 + n2,
+            from_element=n1,
+            to_element=n2,
+            wires=[Wire(m, phase="A", is_open=False)],
+        )
+    Line(
+        m,
+        name="tie",
+        from_element="a2",
+        to_element="b2",
+        is_switch=True,
+        wires=[Wire(m, phase="A", is_open=tie_is_open)],
+    )
+    Load(m, name="load_a", connecting_element="a2")
+    Load(m, name="load_b", connecting_element="b1")
+
+
+def test_service_areas_open_tie():
+    m = Store()
+    build_two_feeders(m, tie_is_open=True)
+    m.set_names()
+    topology = MultiSourceTopology(m)
+
+    assert topology.sources == ["s1", "s2"]
+    assert topology.source_of("load_a") == "s1"
+    assert topology.source_of("load_b") == "s2"
+    assert topology.path("load_a") == ["s1", "a1", "a2", "load_a"]
+    assert topology.reachable_sources("a2") == ["s1"]
+    assert sorted(topology.nodes_in_area("s2")) == ["b1", "b2", "load_b", "s2", "src2"]
+    assert topology.network.digraph.has_edge("a1", "a2")
+    assert not topology.network.digraph.has_edge("a2", "a1")
+
+    # All the checks run on the same topology
+    assert check_loops(m, topology=topology)
+    assert check_loads_connected(m, topology=topology)
+    assert check_unique_path(m, topology=topology)
+
+
+def test_service_areas_closed_tie():
+    m = Store()
+    build_two_feeders(m, tie_is_open=False)
+    m.set_names()
+    topology = MultiSourceTopology(m)
+
+    # The tie connects the two feeders. Each node is served by the closest source
+    assert topology.source_of("b2") == "s2"
+    assert topology.source_of("a2") == "s1"
+    assert topology.reachable_sources("a2") == ["s1", "s2"]
+    assert topology.has_unique_path("load_a")
+    assert not check_loads_connected(m, verbose=False, topology=topology)
+
+
+def test_attributes_disconnected_substations():
+    m = Store()
+    for name in ["s1", "a1", "a2", "s2", "b1", "b2"]:
+        Node(m, name=name)
+    PowerSource(m, name="src1", connecting_element="s1", is_sourcebus=True)
+    PowerSource(m, name="src2", connecting_element="s2", is_sourcebus=True)
+    for n1, n2 in [("s1", "a1"), ("a1", "a2"), ("s2", "b1"), ("b1", "b2")]:
+        Line(
+            m,
+            name=n1 + n2,
+            from_element=n1,
+            to_element=n2,
+            wires=[Wire(m, phase="A", is_open=False)],
+        )
+    m.set_names()
+    topology = MultiSourceTopology(m)
+
+    # Both substations get their node and edge attributes, not only the first one
+    for node in ["a2", "b2"]:
+        assert topology.graph.nodes[node]["name"] == node
+        assert topology.network.digraph.nodes[node]["name"] == node
+    for n1, n2 in [("a1", "a2"), ("b1", "b2")]:
+        assert topology.graph[n1][n2]["name"] == n1 + n2
+        assert len(topology.network.digraph[n1][n2]["wires"]) == 1
+    assert topology.source_of("b2") == "s2"
+    assert topology.reachable_sources("b2") == ["s2"]
+
+
+def test_shared_topology_opendss():
+    import os
+    from ditto.readers.opendss.read import Reader
+    from ditto.models.powertransformer import PowerTransformer
+    from ditto.consistency.check_transformer_phase_path import (
+        check_transformer_phase_path,
+    )
+
+    case = os.path.join(
+        os.path.realpath(os.path.dirname(__file__)),
+        "data",
+        "small_cases",
+        "opendss_broken",
+        "ieee_13node_phases_off",
+    )
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(case, "master.dss"),
+        buscoords_file=os.path.join(case, "buscoords.dss"),
+    )
+    r.parse(m)
+    for i in m.models:
+        if isinstance(i, PowerTransformer):
+            i.is_substation = True
+
+    # The checks give the same results on a shared topology as on their own
+    topology = MultiSourceTopology(m)
+    assert check_loops(m, verbose=False, topology=topology) == check_loops(
+        m, verbose=False
+    )
+    assert check_loads_connected(
+        m, verbose=False, topology=topology
+    ) == check_loads_connected(m, verbose=False)
+    assert check_unique_path(
+        m, show_all=True, verbose=False, topology=topology
+    ) == check_unique_path(m, show_all=True, verbose=False)
+    assert check_transformer_phase_path(
+        m, needs_transformers=False, verbose=False, topology=topology
+    ) == check_transformer_phase_path(m, needs_transformers=False, verbose=False)
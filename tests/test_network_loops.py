@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""
+test_network_loops
+----------------------------------
+
+Tests the loop analysis of the DiTTo network
+"""
+
+import os
+
+import networkx as nx
+
+from ditto.store import Store
+from ditto.models.node import Node
+from ditto.models.line import Line
+from ditto.models.wire import Wire
+from ditto.models.base import Unicode
+from ditto.network.network import Network
+from ditto.network.loops import LoopAnalyzer
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+
+def test_fundamental_loop_opendss():
+    from ditto.readers.opendss.read import Reader
+
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(
+            current_directory,
+            "data",
+            "small_cases",
+            "opendss_broken",
+            "ieee_13node_loop",
+            "master.dss",
+        )
+    )
+    r.parse(m)
+    m.set_names()
+    m.build_networkx()
+    network = m._network
+
+    # The line 684652_bad (684.1 to 645.1) closes the loop 632-670-671-684-645
+    analyzer = network.loop_analyzer()
+    assert analyzer is network.loop_analyzer()
+    (loop,) = analyzer.loops()
+    assert loop.nodes == ["632", "670", "671", "684", "645"]
+    assert loop.equipment_names == [
+        "632670",
+        "670671",
+        "671684",
+        "684652_bad",
+        "632645",
+    ]
+    assert loop.switches == []
+    # 684 is the only node with two phases (A and C): the loop is broken at the edge leaving it
+    assert loop.phase_counts == [3, 3, 3, 2, 3]
+    assert analyzer.loop_breaking_equipment() == ["684652_bad"]
+    assert network.middle_single_phase(loop.nodes) == "684652_bad"
+
+    # Setting the attributes again resets the analyzer
+    network.set_attributes(m)
+    assert network.loop_analyzer() is not analyzer
+
+
+def test_loop_switch_and_phase_composition():
+    m = Store()
+    for name, phases in [
+        ("a", "ABC"),
+        ("b", "ABC"),
+        ("c", "A"),
+        ("d", "A"),
+        ("e", "A"),
+        ("f", "A"),
+    ]:
+        Node(m, name=name, phases=[Unicode(p) for p in phases])
+    for n1, n2, phases, is_switch in [
+        ("a", "b", "ABC", False),
+        ("b", "c", "A", False),
+        ("c", "d", "A", False),
+        ("d", "e", "A", False),
+        ("e", "f", "A", False),
+        ("f", "a", "A", True),
+    ]:
+        Line(
+            m,
+            name="{}{}".format(n1, n2),
+            from_element=n1,
+            to_element=n2,
+            is_switch=is_switch,
+            wires=[Wire(m, phase=p, is_open=False) for p in phases],
+        )
+    network = Network()
+    network.build(m, source="a")
+    network.set_attributes(m)
+
+    analyzer = LoopAnalyzer(network, source="a")
+    (loop,) = analyzer.loops()
+    assert sorted(loop.nodes) == ["a", "b", "c", "d", "e", "f"]
+    assert loop.switches == ["fa"]
+    assert not loop.is_open
+    assert loop.min_phase_count == 1
+    # Middle of the single phase section c-d-e-f
+    assert analyzer.loop_breaking_equipment() == ["de"]
+
+    # Opening the switch breaks the loop at the switch
+    m.set_names()
+    for wire in m["fa"].wires:
+        wire.is_open = True
+    network.set_attributes(m)
+    analyzer = LoopAnalyzer(network, source="a")
+    assert analyzer.loops()[0].is_open
+    assert analyzer.loop_breaking_equipment() == ["fa"]
+
+
+def test_delete_cycles_opendss():
+    from ditto.readers.opendss.read import Reader
+
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(
+            current_directory,
+            "data",
+            "small_cases",
+            "opendss_broken",
+            "ieee_13node_loop",
+            "master.dss",
+        )
+    )
+    r.parse(m)
+    m.set_names()
+    m.build_networkx()
+    assert len(m._network.find_cycles()) == 1
+
+    m.delete_cycles()
+    assert len(m._network.find_cycles()) == 0
+    assert nx.is_forest(m._network.graph)
+
+
+def test_open_switch_closing_loop():
+    m = Store()
+    for name in ["a", "b", "c", "d"]:
+        Node(m, name=name, phases=[Unicode(p) for p in "ABC"])
+    # The BFS spanning tree from a is a-b, a-d, b-c, so the switch d-c is the chord of the loop
+    for n1, n2, is_switch, is_open in [
+        ("a", "b", False, False),
+        ("b", "c", False, False),
+        ("a", "d", False, False),
+        ("d", "c", True, True),
+    ]:
+        Line(
+            m,
+            name="{}{}".format(n1, n2),
+            from_element=n1,
+            to_element=n2,
+            is_switch=is_switch,
+            wires=[Wire(m, phase=p, is_open=is_open) for p in "ABC"],
+        )
+    network = Network()
+    network.build(m, source="a")
+    network.set_attributes(m)
+    assert network.graph["d"]["c"]["is_switch"]
+
+    analyzer = LoopAnalyzer(network, source="a")
+    (loop,) = analyzer.loops()
+    assert loop.switches == ["dc"]
+    assert loop.is_open
+    assert analyzer.loop_breaking_equipment() == ["dc"]
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+test_opendss_native
+----------------------------------
+
+Tests the native parser of the OpenDSS scripts against the OpenDSS engine
+"""
+
+import math
+import os
+
+import pytest
+
+import opendssdirect as dss
+
+from ditto.store import Store
+from ditto.models.line import Line
+from ditto.models.load import Load
+from ditto.readers.opendss.read import Reader, _dss_class_to_dict
+from ditto.readers.opendss.dss_script import DSSScript, parse_value, split_parameters
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+CLASSES = [
+    "Vsource",
+    "Line",
+    "linecode",
+    "linegeometry",
+    "wiredata",
+    "Transformer",
+    "RegControl",
+    "Load",
+    "capacitor",
+    "CapControl",
+    "Fuse",
+    "storage",
+    "generator",
+]
+
+# Properties computed by the engine but not read by the OpenDSS reader (the capacitance matrix,
+# failure rates... of the capacitors are not initialized by the engine), and tap positions changed
+# by the regulator controls when the circuit is solved
+IGNORED = [
+    "WdgCurrents",
+    "RdcOhms",
+    "EarthModel",
+    "faultrate",
+    "pctperm",
+    "maxkvar",
+    "minkvar",
+    "Normal",
+    "State",
+    "TapNum",
+    "tap",
+    "taps",
+]
+
+MASTER_FILES = [
+    "data/small_cases/opendss/ieee_13node/master.dss",
+    "data/small_cases/opendss/storage_test/master.dss",
+    "readers/opendss/Capacitors/test_capacitor_connectivity.dss",
+    "readers/opendss/Lines/test_fuses.dss",
+    "readers/opendss/Lines/test_linecodes.dss",
+    "readers/opendss/Lines/test_switches.dss",
+    "readers/opendss/Loads/test_loads.dss",
+    "readers/opendss/Regulators/test_regulators.dss",
+    "readers/opendss/Transformers/test_transformer_kv.dss",
+]
+
+
+def same(a, b):
+    """Compares the values of two properties, the numbers with a relative tolerance."""
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, str) and isinstance(b, str) and "|" in a:
+        return same(a.replace("|", " ").split(), b.replace("|", " ").split())
+    try:
+        return math.isclose(float(a), float(b), rel_tol=1e-9, abs_tol=1e-12)
+    except (TypeError, ValueError):
+        return a == b
+
+
+@pytest.mark.parametrize("master_file", MASTER_FILES)
+def test_script_matches_engine(master_file):
+    master_file = os.path.join(current_directory, master_file)
+    directory = os.getcwd()
+    dss.run_command("clear")
+    dss.run_command("redirect {}".format(master_file))
+    os.chdir(directory)
+    script = DSSScript()
+    script.redirect(master_file)
+
+    for class_name in CLASSES:
+        expected = _dss_class_to_dict(class_name)
+        parsed = script.class_to_dict(class_name)
+        assert sorted(parsed) == sorted(expected)
+        for name, values in expected.items():
+            for prop, value in values.items():
+                if prop in IGNORED or (class_name, prop) == ("capacitor", "cmatrix"):
+                    continue
+                assert same(parsed[name][prop], value), (name, prop)
+
+    assert script.bus_names() == [b.lower() for b in dss.Circuit.AllBusNames()]
+    kv_bases = script.kv_bases()
+    for bus_name in dss.Circuit.AllBusNames():
+        dss.Circuit.SetActiveBus(bus_name)
+        assert kv_bases[bus_name.lower()] == pytest.approx(dss.Bus.kVBase())
+
+
+def test_split_parameters():
+    assert split_parameters("New Line.l1 bus1=a.1 bus2 = b.1, length=(2 3 *)") == [
+        (None, "New"),
+        (None, "Line.l1"),
+        ("bus1", "a.1"),
+        ("bus2", "b.1"),
+        ("length", "2 3 *"),
+    ]
+    assert split_parameters('~ kvs=[12.47 "0.48"] conns=(delta wye)') == [
+        (None, "~"),
+        ("kvs", '12.47 "0.48"'),
+        ("conns", "delta wye"),
+    ]
+
+
+def test_parse_value():
+    assert parse_value("[1, 2.5, ]") == ["1", "2.5"]
+    assert parse_value("(a, b)") == ("a", "b")
+    assert parse_value("True") is True
+    assert parse_value("false") is False
+    assert parse_value("12.47") == "12.47"
+
+
+def test_native_reader():
+    master_file = os.path.join(
+        current_directory, "data/small_cases/opendss/ieee_13node/master.dss"
+    )
+    models = []
+    for mode in ["opendssdirect", "native"]:
+        m = Store()
+        r = Reader(master_file=master_file, mode=mode)
+        r.parse(m)
+        m.set_names()
+        models.append(m)
+    m, native = models
+
+    assert sorted(native.model_names) == sorted(m.model_names)
+    for name, obj in m.model_names.items():
+        assert getattr(native[name], "nominal_voltage", None) == pytest.approx(
+            getattr(obj, "nominal_voltage", None)
+        )
+        if isinstance(obj, Line):
+            assert native[name].length == obj.length
+            for row, native_row in zip(
+                obj.impedance_matrix, native[name].impedance_matrix
+            ):
+                assert native_row == pytest.approx(row)
+        elif isinstance(obj, Load):
+            for phase_load, native_load in zip(
+                obj.phase_loads, native[name].phase_loads
+            ):
+                assert native_load.p == pytest.approx(phase_load.p)
+                assert native_load.q == pytest.approx(phase_load.q)
+
+    with pytest.raises(ValueError):
+        Reader(master_file=master_file, mode="engine")
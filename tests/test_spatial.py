@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""
+test_spatial
+----------------------------------
+
+Tests the spatial index over the positions of the DiTTo elements
+"""
+
+import math
+import os
+
+import pytest
+
+from ditto.store import Store
+from ditto.models.node import Node
+from ditto.models.power_source import PowerSource
+from ditto.models.position import Position
+from ditto.network.spatial import SpatialIndex
+
+current_directory = os.path.realpath(os.path.dirname(__file__))
+
+
+def test_queries_opendss():
+    from ditto.readers.opendss.read import Reader
+
+    path = os.path.join(
+        current_directory, "data", "small_cases", "opendss", "ieee_13node"
+    )
+    m = Store()
+    r = Reader(
+        master_file=os.path.join(path, "master.dss"),
+        buscoordinates_file=os.path.join(path, "buscoord.dss"),
+    )
+    r.parse(m)
+    m.set_names()
+    # Intermediate positions of the line from 684 (100, 100) to 652 (100, 0)
+    m["684652"].positions = [Position(m, long=100, lat=y) for y in [75, 50, 25]]
+    # Elements without usable positions are not indexed
+    Node(m, name="no_position")
+
+    # The 16 buses of buscoord.dss, the power source and the line
+    index = m.spatial_index()
+    node_index = m.spatial_index(types=Node)
+    assert len(index) == 18
+    assert len(node_index) == 16
+
+    # 671 is at (200, 100) and 692 at (250, 100)
+    result = index.nearest(205, 95, k=2, types=Node, return_distance=True)
+    assert [name for name, _ in result] == ["671", "692"]
+    assert [d for _, d in result] == pytest.approx(
+        [math.hypot(5, 5), math.hypot(45, 5)]
+    )
+
+    # 632 (200, 250), RG60 (200, 300) and 670 (200, 200) are within 60 of (210, 255)
+    assert index.radius(210, 255, 60) == ["632", "rg60", "670"]
+    assert index.radius(210, 255, 60, types=PowerSource) == []
+
+    assert sorted(index.bbox(90, 90, 260, 260)) == [
+        "632",
+        "645",
+        "670",
+        "671",
+        "684",
+        "692",
+    ]
+    assert node_index.nearest_many([0, 400], [240, 110]) == ["646", "675"]
+    assert index.nearest(190, 10, types=PowerSource) == ["Vsource.source"]
+
+    # The line is found once, at its closest position
+    result = index.nearest(110, 30, k=2, return_distance=True)
+    assert [name for name, _ in result] == ["684652", "652"]
+    assert [d for _, d in result] == pytest.approx(
+        [math.hypot(10, 5), math.hypot(10, 30)]
+    )
+
+    # The class mask of each types argument is computed once
+    assert sorted(index._type_masks, key=str) == sorted([Node, PowerSource], key=str)
+    assert len(index.class_types) == len(set(index.classes))
+
+
+def test_degenerate_indexes():
+    m = Store()
+    assert m.spatial_index().nearest(0, 0) == []
+    assert m.spatial_index().nearest_many([0], [0]) == [None]
+    assert m.spatial_index().bbox(-1, -1, 1, 1) == []
+
+    # All the points at the same place, and points along a line
+    index = SpatialIndex(["a", "b", "c"], [Node] * 3, [1, 1, 1], [2, 2, 2], [0, 1, 2])
+    assert index.nearest(0, 0, k=2) == ["a", "b"]
+    assert index.radius(1, 2, 0) == ["a", "b", "c"]
+    x = [float(i) for i in range(1000)]
+    index = SpatialIndex(x, [Node] * 1000, x, [0.0] * 1000, list(range(1000)))
+    assert index.nx * index.ny <= 1000
+    assert index.nearest(500.2, 3.0, k=2) == [500.0, 501.0]
+    assert index.bbox(10.5, -1, 13, 1) == [11.0, 12.0, 13.0]